@@ -2,32 +2,184 @@ import subprocess
 import shutil
 import re
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+from .metrics import observe_command, command_label, command_serial
+from .tracing import get_logger, span
+
+log = get_logger("adb")
+
+
+def run_adb(cmd: list, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run, timed per command type and device (see metrics) and traced."""
+    start = time.perf_counter()
+    ok = False
+    try:
+        with span(f"adb.{command_label(cmd)}", serial=command_serial(cmd)):
+            result = subprocess.run(cmd, **kwargs)
+        ok = result.returncode == 0
+        return result
+    finally:
+        observe_command(cmd, time.perf_counter() - start, ok)
+
+
+def parse_wm_size(output: str) -> Optional[Tuple[int, int]]:
+    """Parses `wm size` output ("Physical size: 1080x2400")."""
+    for line in output.strip().split('\n'):
+        if "Physical size:" in line:
+            try:
+                width, height = map(int, line.split("Physical size:")[1].strip().split("x"))
+                return (width, height)
+            except ValueError:
+                pass
+    return None
+
+
+def parse_wm_density(output: str) -> Optional[int]:
+    """
+    Parses `wm density` output, preferring the override.
+    "Physical density: 480\nOverride density: 420"
+    """
+    override_val = None
+    physical_val = None
+
+    for line in output.strip().split('\n'):
+        line = line.strip()
+        if "Override density:" in line:
+            try:
+                override_val = int(line.split(":")[1].strip())
+            except ValueError:
+                pass
+        elif "Physical density:" in line:
+            try:
+                physical_val = int(line.split(":")[1].strip())
+            except ValueError:
+                pass
+
+    return override_val if override_val is not None else physical_val
+
+
+# Android audio stream types by name
+VOLUME_STREAMS = {
+    'music': '3',
+    'ring': '2',
+    'alarm': '4',
+    'notification': '5',
+    'system': '1',
+    'voice_call': '0'
+}
+
+BATTERY_STATUS = {"1": "unknown", "2": "charging", "3": "discharging", "4": "not charging", "5": "full"}
+
+# Battery and storage in one shell round trip (see parse_status)
+STATUS_SCRIPT = "dumpsys battery; echo @df; df /data"
+
+
+def parse_devices(output: str) -> List[Dict[str, str]]:
+    """Parses `adb devices -l` into [{serial, model, status}]."""
+    devices = []
+    # Skip first line "List of devices attached"
+    for line in output.strip().split('\n')[1:]:
+        if not line.strip():
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        model = "Unknown"
+        model_match = re.search(r'model:(\S+)', line)
+        if model_match:
+            model = model_match.group(1).replace("_", " ")
+        devices.append({"serial": parts[0], "model": model, "status": parts[1]})
+    return devices
+
+
+def parse_packages(output: str) -> List[str]:
+    """Package names from `pm list packages` output."""
+    return [line.replace("package:", "").strip() for line in output.strip().split('\n') if line.startswith("package:")]
+
+
+def parse_battery(output: str) -> Dict[str, Optional[object]]:
+    """level (%), status and temperature (Celsius) from `dumpsys battery`."""
+    info = {"level": None, "status": None, "temperature": None}
+    for line in output.split('\n'):
+        key, _, value = line.partition(':')
+        key = key.strip().lower()
+        value = value.strip()
+        try:
+            if key == "level" and info["level"] is None:
+                info["level"] = int(value)
+            elif key == "status" and info["status"] is None:
+                info["status"] = BATTERY_STATUS.get(value, "unknown")
+            elif key == "temperature" and info["temperature"] is None:
+                # Battery temperature is in tenths of a degree Celsius
+                info["temperature"] = int(value) / 10.0
+        except ValueError:
+            pass
+    return info
+
+
+def parse_df(output: str) -> Optional[Dict[str, int]]:
+    """total/used/free in MB from the first filesystem line of `df`."""
+    # Format: Filesystem      1K-blocks    Used Available Use% Mounted on
+    lines = output.strip().split('\n')
+    if len(lines) >= 2:
+        parts = lines[1].split()
+        if len(parts) >= 4:
+            try:
+                return {
+                    "total": int(parts[1]) // 1024,  # Convert to MB
+                    "used": int(parts[2]) // 1024,
+                    "free": int(parts[3]) // 1024
+                }
+            except ValueError:
+                pass
+    return None
+
+
+def parse_status(serial: str, output: str) -> Dict[str, object]:
+    """Device status fields from STATUS_SCRIPT output; empty output leaves them unknown."""
+    battery_out, _, df_out = output.partition("@df")
+    battery = parse_battery(battery_out)
+    return {
+        "battery_level": battery["level"],
+        "battery_status": battery["status"],
+        "temperature": battery["temperature"],
+        "storage": parse_df(df_out.strip("\n")),
+        "network_type": "wifi" if ":" in serial else "usb",
+    }
+
 
 class ADBHandler:
     def __init__(self):
         self.adb_path = shutil.which("adb")
+        # Optional low-latency path for key events: callable(serial, keycodes) -> bool
+        self.key_injector = None
 
-    def connect(self, address: str) -> bool:
+    def connect(self, address: str, timeout: float = None) -> bool:
         """Connects to a device via TCP/IP."""
         if not self.adb_path:
             return False
             
         try:
-            subprocess.run([self.adb_path, "connect", address], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
+            result = run_adb(
+                [self.adb_path, "connect", address],
+                check=True, capture_output=True, text=True, timeout=timeout
+            )
+            # adb exits 0 on "failed to connect to ..." too; the verdict is in the output
+            return "connected to" in result.stdout
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return False
 
-    def disconnect(self, address: str) -> bool:
+    def disconnect(self, address: str, timeout: float = 5) -> bool:
         """Disconnects a device."""
         if not self.adb_path:
             return False
             
         try:
-            subprocess.run([self.adb_path, "disconnect", address], check=True, capture_output=True)
+            run_adb([self.adb_path, "disconnect", address], check=True, capture_output=True, timeout=timeout)
             return True
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return False
 
     def get_devices(self) -> List[Dict[str, str]]:
@@ -35,37 +187,16 @@ class ADBHandler:
             return []
 
         try:
-            result = subprocess.run(
+            result = run_adb(
                 [self.adb_path, "devices", "-l"],
                 capture_output=True, text=True, check=True
             )
-            devices = []
-            # Skip first line "List of devices attached"
-            for line in result.stdout.strip().split('\n')[1:]:
-                if not line.strip():
-                    continue
-                
-                parts = line.split()
-                serial = parts[0]
-                status = parts[1]
-                model = "Unknown"
-                
-                # Robust model extraction
-                model_match = re.search(r'model:(\S+)', line)
-                if model_match:
-                    model = model_match.group(1).replace("_", " ")
-                    
-                devices.append({
-                    "serial": serial,
-                    "model": model,
-                    "status": status
-                })
-            return devices
+            return parse_devices(result.stdout)
         except subprocess.CalledProcessError as e:
-            print(f"ADB Error: {e}")
+            log.error("ADB Error: %s", e)
             return []
         except Exception as e:
-            print(f"General Error: {e}")
+            log.error("General Error: %s", e)
             return []
 
     def get_installed_packages(self, serial: str) -> List[str]:
@@ -75,14 +206,10 @@ class ADBHandler:
         try:
             # -3 to list third-party apps only, usually more relevant
             cmd = [self.adb_path, "-s", serial, "shell", "pm", "list", "packages", "-3"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            packages = []
-            for line in result.stdout.strip().split('\n'):
-                if line.startswith("package:"):
-                    packages.append(line.replace("package:", "").strip())
-            return sorted(packages)
+            result = run_adb(cmd, capture_output=True, text=True, check=True)
+            return sorted(parse_packages(result.stdout))
         except Exception as e:
-            print(f"Error fetching packages for {serial}: {e}")
+            log.error("Error fetching packages for %s: %s", serial, e)
             return []
 
     def get_device_resolution(self, serial: str) -> tuple[int, int]:
@@ -93,15 +220,12 @@ class ADBHandler:
 
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "wm", "size"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            # Output format: "Physical size: 1080x2400"
-            output = result.stdout.strip()
-            if "Physical size:" in output:
-                res_str = output.split("Physical size:")[1].strip()
-                width, height = map(int, res_str.split("x"))
-                return (width, height)
+            result = run_adb(cmd, capture_output=True, text=True, check=True)
+            resolution = parse_wm_size(result.stdout)
+            if resolution:
+                return resolution
         except Exception as e:
-            print(f"Error fetching resolution for {serial}: {e}")
+            log.error("Error fetching resolution for %s: %s", serial, e)
         
         return default_res
 
@@ -113,37 +237,12 @@ class ADBHandler:
 
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "wm", "density"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            output = result.stdout.strip()
-            
-            # Output examples:
-            # "Physical density: 480"
-            # "Physical density: 480\nOverride density: 420"
-            
-            override_val = None
-            physical_val = None
-
-            for line in output.split('\n'):
-                line = line.strip()
-                if "Override density:" in line:
-                    try:
-                        override_val = int(line.split(":")[1].strip())
-                    except ValueError:
-                        pass
-                elif "Physical density:" in line:
-                    try:
-                        physical_val = int(line.split(":")[1].strip())
-                    except ValueError:
-                        pass
-            
-            # Prefer override if it exists
-            if override_val is not None:
-                return override_val
-            if physical_val is not None:
-                return physical_val
-                
+            result = run_adb(cmd, capture_output=True, text=True, check=True)
+            density = parse_wm_density(result.stdout)
+            if density:
+                return density
         except Exception as e:
-            print(f"Error fetching density for {serial}: {e}")
+            log.error("Error fetching density for %s: %s", serial, e)
         
         return default_density
 
@@ -160,7 +259,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "pm", "dump", package_name
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_adb(cmd, capture_output=True, text=True, check=True)
             
             # Look for label in the dump output
             for line in result.stdout.split('\n'):
@@ -174,7 +273,7 @@ class ADBHandler:
                         if label:
                             return label
         except Exception as e:
-            print(f"Error fetching label for {package_name}: {e}")
+            log.error("Error fetching label for %s: %s", package_name, e)
         
         # Fallback: use package name
         if "." in package_name:
@@ -205,7 +304,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "pm", "path", package_name
             ]
-            apk_result = subprocess.run(apk_path_cmd, capture_output=True, text=True, check=True)
+            apk_result = run_adb(apk_path_cmd, capture_output=True, text=True, check=True)
             
             if not apk_result.stdout.strip():
                 return None
@@ -292,7 +391,7 @@ class ADBHandler:
                                     break
                 
                 except Exception as e:
-                    print(f"Error extracting icon from APK: {e}")
+                    log.error("Error extracting icon from APK: %s", e)
                 
                 finally:
                     # Clean up temp APK
@@ -306,9 +405,9 @@ class ADBHandler:
                     return cache_file
                     
             except subprocess.TimeoutExpired:
-                print(f"Timeout pulling APK for {package_name}")
+                log.warning("Timeout pulling APK for %s", package_name)
             except Exception as e:
-                print(f"Error pulling APK for {package_name}: {e}")
+                log.error("Error pulling APK for %s: %s", package_name, e)
                 if os.path.exists(temp_apk):
                     try:
                         os.remove(temp_apk)
@@ -316,7 +415,7 @@ class ADBHandler:
                         pass
         
         except Exception as e:
-            print(f"Error fetching icon for {package_name}: {e}")
+            log.error("Error fetching icon for %s: %s", package_name, e)
         
         return None
 
@@ -327,17 +426,10 @@ class ADBHandler:
         
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "dumpsys", "battery"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-            
-            for line in result.stdout.split('\n'):
-                if 'level:' in line.lower():
-                    try:
-                        level = int(line.split(':')[1].strip())
-                        return level
-                    except (ValueError, IndexError):
-                        pass
+            result = run_adb(cmd, capture_output=True, text=True, check=True, timeout=5)
+            return parse_battery(result.stdout)["level"]
         except Exception as e:
-            print(f"Error fetching battery for {serial}: {e}")
+            log.error("Error fetching battery for %s: %s", serial, e)
         
         return None
 
@@ -348,22 +440,10 @@ class ADBHandler:
         
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "dumpsys", "battery"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-            
-            for line in result.stdout.split('\n'):
-                if 'status:' in line.lower():
-                    status_code = line.split(':')[1].strip()
-                    # Status codes: 1=unknown, 2=charging, 3=discharging, 4=not charging, 5=full
-                    status_map = {
-                        "1": "unknown",
-                        "2": "charging",
-                        "3": "discharging",
-                        "4": "not charging",
-                        "5": "full"
-                    }
-                    return status_map.get(status_code, "unknown")
+            result = run_adb(cmd, capture_output=True, text=True, check=True, timeout=5)
+            return parse_battery(result.stdout)["status"]
         except Exception as e:
-            print(f"Error fetching battery status for {serial}: {e}")
+            log.error("Error fetching battery status for %s: %s", serial, e)
         
         return None
 
@@ -375,18 +455,10 @@ class ADBHandler:
         try:
             # Try to get battery temperature first (most reliable)
             cmd = [self.adb_path, "-s", serial, "shell", "dumpsys", "battery"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-            
-            for line in result.stdout.split('\n'):
-                if 'temperature:' in line.lower():
-                    try:
-                        temp = int(line.split(':')[1].strip())
-                        # Battery temperature is in tenths of a degree Celsius
-                        return temp / 10.0
-                    except (ValueError, IndexError):
-                        pass
+            result = run_adb(cmd, capture_output=True, text=True, check=True, timeout=5)
+            return parse_battery(result.stdout)["temperature"]
         except Exception as e:
-            print(f"Error fetching temperature for {serial}: {e}")
+            log.error("Error fetching temperature for %s: %s", serial, e)
         
         return None
 
@@ -397,28 +469,10 @@ class ADBHandler:
         
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "df", "/data"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-            
-            # Parse df output
-            # Format: Filesystem      1K-blocks    Used Available Use% Mounted on
-            lines = result.stdout.strip().split('\n')
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 4:
-                    try:
-                        total_kb = int(parts[1])
-                        used_kb = int(parts[2])
-                        free_kb = int(parts[3])
-                        
-                        return {
-                            "total": total_kb // 1024,  # Convert to MB
-                            "used": used_kb // 1024,
-                            "free": free_kb // 1024
-                        }
-                    except (ValueError, IndexError):
-                        pass
+            result = run_adb(cmd, capture_output=True, text=True, check=True, timeout=5)
+            return parse_df(result.stdout)
         except Exception as e:
-            print(f"Error fetching storage for {serial}: {e}")
+            log.error("Error fetching storage for %s: %s", serial, e)
         
         return None
 
@@ -433,14 +487,15 @@ class ADBHandler:
         return "usb"
 
     def get_device_status_info(self, serial: str) -> Dict[str, any]:
-        """Gets all device status information at once."""
-        return {
-            "battery_level": self.get_battery_level(serial),
-            "battery_status": self.get_battery_status(serial),
-            "temperature": self.get_device_temperature(serial),
-            "storage": self.get_storage_info(serial),
-            "network_type": self.get_network_type(serial)
-        }
+        """Gets all device status information at once, from a single adb call."""
+        output = ""
+        if self.adb_path:
+            try:
+                cmd = [self.adb_path, "-s", serial, "shell", STATUS_SCRIPT]
+                output = run_adb(cmd, capture_output=True, text=True, timeout=5).stdout
+            except Exception as e:
+                log.error("Error fetching status for %s: %s", serial, e)
+        return parse_status(serial, output)
 
     def push_file(self, serial: str, local_path: str, remote_path: str, callback=None) -> bool:
         """
@@ -462,10 +517,10 @@ class ADBHandler:
                 process.wait()
                 return process.returncode == 0
             else:
-                result = subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+                result = run_adb(cmd, check=True, capture_output=True, timeout=300)
                 return True
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, Exception) as e:
-            print(f"Error pushing file to {serial}: {e}")
+            log.error("Error pushing file to %s: %s", serial, e)
             return False
 
     def pull_file(self, serial: str, remote_path: str, local_path: str, callback=None) -> bool:
@@ -486,10 +541,10 @@ class ADBHandler:
                 process.wait()
                 return process.returncode == 0
             else:
-                result = subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+                result = run_adb(cmd, check=True, capture_output=True, timeout=300)
                 return True
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, Exception) as e:
-            print(f"Error pulling file from {serial}: {e}")
+            log.error("Error pulling file from %s: %s", serial, e)
             return False
 
     def list_files(self, serial: str, remote_path: str = "/sdcard") -> List[Dict[str, str]]:
@@ -499,7 +554,7 @@ class ADBHandler:
         
         try:
             cmd = [self.adb_path, "-s", serial, "shell", "ls", "-lh", remote_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=10)
+            result = run_adb(cmd, capture_output=True, text=True, check=True, timeout=10)
             
             files = []
             for line in result.stdout.strip().split('\n'):
@@ -515,32 +570,37 @@ class ADBHandler:
             
             return files
         except Exception as e:
-            print(f"Error listing files on {serial}: {e}")
+            log.error("Error listing files on %s: %s", serial, e)
             return []
 
     def get_clipboard(self, serial: str) -> Optional[str]:
-        """Get clipboard content from Android device."""
+        """
+        One-shot read of the Android clipboard.
+        Shell users can't read the clipboard on Android 10+, so this goes through
+        a short-lived scrcpy-server control channel. For continuous sync keep a
+        channel open instead (see control_channel.ControlChannelPool).
+        """
         if not self.adb_path:
             return None
         
+        from .control_channel import ControlChannel
+        received = []
+        done = threading.Event()
+        
+        def on_clipboard(_serial, text):
+            received.append(text)
+            done.set()
+        
+        channel = ControlChannel(self.adb_path, serial, on_clipboard=on_clipboard)
         try:
-            # Method 1: Try using service call (Android 10+)
-            # This requires root or special permissions, so may not work
-            # Method 2: Use a clipboard manager app like Clipper
-            # Method 3: Use dumpsys (requires root)
-            
-            # For now, we'll use a workaround: try to get via service call
-            # Note: This may not work without root or special permissions
-            cmd = [self.adb_path, "-s", serial, "shell", "service", "call", "clipboard", "1"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            
-            # Parse result - format is complex binary data
-            # For simplicity, we'll return None and let the UI handle it
-            # A better solution would require a clipboard manager app
-            return None
+            if not channel.open() or not channel.request_clipboard():
+                return None
+            done.wait(3)
+            return received[0] if received else None
         except Exception as e:
-            # Silently fail - clipboard access requires special permissions
             return None
+        finally:
+            channel.close()
 
     def set_clipboard(self, serial: str, text: str) -> bool:
         """Set clipboard content on Android device."""
@@ -554,7 +614,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "am", "broadcast", "-a", "clipper.set", "-e", "text", text
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
                 return True
             
@@ -566,6 +626,30 @@ class ADBHandler:
             # Return False to indicate it may not have worked
             return False
     
+    def send_keyevents(self, serial: str, keycodes: List[int]) -> bool:
+        """
+        Injects a sequence of key events.
+        Uses the key injector when one is set, otherwise a single `input keyevent`
+        call carrying the whole sequence (one JVM start instead of one per key).
+        """
+        if not self.adb_path or not keycodes:
+            return False
+        
+        if self.key_injector:
+            try:
+                if self.key_injector(serial, keycodes):
+                    return True
+            except Exception:
+                pass
+        
+        try:
+            cmd = [self.adb_path, "-s", serial, "shell", "input", "keyevent"] + [str(k) for k in keycodes]
+            result = run_adb(cmd, capture_output=True, timeout=5 + len(keycodes))
+            return result.returncode == 0
+        except Exception as e:
+            log.error("Error sending key events to %s: %s", serial, e)
+            return False
+    
     def capture_screenshot(self, serial: str, save_path: str) -> bool:
         """Capture screenshot from device and save to local path."""
         if not self.adb_path:
@@ -574,14 +658,14 @@ class ADBHandler:
         try:
             # Use screencap command and pipe to file
             cmd = [self.adb_path, "-s", serial, "shell", "screencap", "-p"]
-            result = subprocess.run(cmd, capture_output=True, check=True, timeout=10)
+            result = run_adb(cmd, capture_output=True, check=True, timeout=10)
             
             # Write the PNG data to file
             with open(save_path, 'wb') as f:
                 f.write(result.stdout)
             return True
         except Exception as e:
-            print(f"Error capturing screenshot from {serial}: {e}")
+            log.error("Error capturing screenshot from %s: %s", serial, e)
             return False
     
     def set_volume(self, serial: str, stream: str, level: int) -> bool:
@@ -594,24 +678,14 @@ class ADBHandler:
             return False
         
         try:
-            # Map stream names to Android stream types
-            stream_map = {
-                'music': '3',
-                'ring': '2',
-                'alarm': '4',
-                'notification': '5',
-                'system': '1',
-                'voice_call': '0'
-            }
-            
-            stream_type = stream_map.get(stream.lower(), '3')  # Default to music
+            stream_type = VOLUME_STREAMS.get(stream.lower(), '3')  # Default to music
             
             # Method 1: Use media volume command (Android 7.0+)
             cmd = [
                 self.adb_path, "-s", serial, "shell",
                 "media", "volume", "--set", str(level), "--stream", stream_type
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 2: Fallback to service call (requires root or special permissions)
             if result.returncode != 0:
@@ -621,7 +695,7 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "service", "call", "audio", "3", "i32", stream_type, "i32", str(level)
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 3: Use key events as last resort (less precise)
             if result.returncode != 0:
@@ -630,18 +704,12 @@ class ADBHandler:
                 current_vol = self.get_volume(serial, stream) or 0
                 diff = level - current_vol
                 if diff != 0:
-                    keycode = "KEYCODE_VOLUME_UP" if diff > 0 else "KEYCODE_VOLUME_DOWN"
-                    for _ in range(abs(diff)):
-                        cmd = [
-                            self.adb_path, "-s", serial, "shell",
-                            "input", "keyevent", keycode
-                        ]
-                        subprocess.run(cmd, capture_output=True, timeout=2)
-                    return True
+                    keycode = 24 if diff > 0 else 25  # KEYCODE_VOLUME_UP / KEYCODE_VOLUME_DOWN
+                    return self.send_keyevents(serial, [keycode] * abs(diff))
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting volume for {serial}: {e}")
+            log.error("Error setting volume for %s: %s", serial, e)
             return False
     
     def get_volume(self, serial: str, stream: str) -> Optional[int]:
@@ -650,24 +718,14 @@ class ADBHandler:
             return None
         
         try:
-            # Map stream names to Android stream types
-            stream_map = {
-                'music': '3',
-                'ring': '2',
-                'alarm': '4',
-                'notification': '5',
-                'system': '1',
-                'voice_call': '0'
-            }
-            
-            stream_type = stream_map.get(stream.lower(), '3')  # Default to music
+            stream_type = VOLUME_STREAMS.get(stream.lower(), '3')  # Default to music
             
             # Method 1: Use media volume command
             cmd = [
                 self.adb_path, "-s", serial, "shell",
                 "media", "volume", "--get", "--stream", stream_type
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 # Parse output like "volume is 7"
@@ -686,7 +744,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "dumpsys", "audio"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
                 # Parse dumpsys output - this is complex and device-specific
                 # For now, return None if we can't get it
@@ -713,7 +771,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "put", "system", "screen_brightness", str(level)
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 2: If that fails, try direct file write (requires root)
             if result.returncode != 0:
@@ -721,7 +779,7 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "su", "-c", f"echo {level} > /sys/class/leds/lcd-backlight/brightness"
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 3: Use service call (alternative method)
             if result.returncode != 0:
@@ -730,11 +788,11 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "service", "call", "power", "28", "i32", str(level)
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting brightness for {serial}: {e}")
+            log.error("Error setting brightness for %s: %s", serial, e)
             return False
     
     def get_brightness(self, serial: str) -> Optional[int]:
@@ -747,7 +805,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "get", "system", "screen_brightness"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 try:
@@ -773,10 +831,10 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "put", "system", "accelerometer_rotation", value
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting rotation lock for {serial}: {e}")
+            log.error("Error setting rotation lock for %s: %s", serial, e)
             return False
     
     def get_rotation_lock(self, serial: str) -> Optional[bool]:
@@ -789,7 +847,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "get", "system", "accelerometer_rotation"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 value = result.stdout.strip()
@@ -809,7 +867,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "put", "global", "airplane_mode_on", value
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Also need to broadcast the change
             if result.returncode == 0:
@@ -818,11 +876,11 @@ class ADBHandler:
                     "am", "broadcast", "-a", "android.intent.action.AIRPLANE_MODE",
                     "--ez", "state", value
                 ]
-                subprocess.run(broadcast_cmd, capture_output=True, timeout=5)
+                run_adb(broadcast_cmd, capture_output=True, timeout=5)
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting airplane mode for {serial}: {e}")
+            log.error("Error setting airplane mode for %s: %s", serial, e)
             return False
     
     def get_airplane_mode(self, serial: str) -> Optional[bool]:
@@ -835,7 +893,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "get", "global", "airplane_mode_on"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 value = result.stdout.strip()
@@ -855,7 +913,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "svc", "wifi", "enable" if enabled else "disable"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 2: Use settings put (may require WRITE_SETTINGS permission)
             if result.returncode != 0:
@@ -864,7 +922,7 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "settings", "put", "global", "wifi_on", value
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 3: Use service call (alternative)
             if result.returncode != 0:
@@ -872,11 +930,11 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "service", "call", "wifi", "13", "i32", "1" if enabled else "0"
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting WiFi for {serial}: {e}")
+            log.error("Error setting WiFi for %s: %s", serial, e)
             return False
     
     def get_wifi_enabled(self, serial: str) -> Optional[bool]:
@@ -889,7 +947,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "get", "global", "wifi_on"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 value = result.stdout.strip()
@@ -909,7 +967,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "svc", "bluetooth", "enable" if enabled else "disable"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 2: Use settings put (may require WRITE_SETTINGS permission)
             if result.returncode != 0:
@@ -918,7 +976,7 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "settings", "put", "global", "bluetooth_on", value
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             # Method 3: Use service call (alternative)
             if result.returncode != 0:
@@ -926,11 +984,11 @@ class ADBHandler:
                     self.adb_path, "-s", serial, "shell",
                     "service", "call", "bluetooth_manager", "6" if enabled else "8"
                 ]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+                result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             return result.returncode == 0
         except Exception as e:
-            print(f"Error setting Bluetooth for {serial}: {e}")
+            log.error("Error setting Bluetooth for %s: %s", serial, e)
             return False
     
     def get_bluetooth_enabled(self, serial: str) -> Optional[bool]:
@@ -943,7 +1001,7 @@ class ADBHandler:
                 self.adb_path, "-s", serial, "shell",
                 "settings", "get", "global", "bluetooth_on"
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            result = run_adb(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
                 value = result.stdout.strip()
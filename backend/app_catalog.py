@@ -0,0 +1,189 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from .app_search import AppSearchIndex
+
+LAUNCHER_QUERY = ("cmd package query-activities --brief "
+                  "-a android.intent.action.MAIN -c android.intent.category.LAUNCHER")
+
+# Launchable activities plus every package's version code in one shell round trip
+CATALOG_SCRIPT = "; ".join([
+    "echo @launchable", LAUNCHER_QUERY,
+    "echo @versions", "pm list packages --show-versioncode",
+])
+
+
+def guess_label(package: str) -> str:
+    """Cheap display name from the package (pm dump per app is too slow for a catalog)."""
+    if "." in package:
+        return package.split(".")[-1].capitalize()
+    return package
+
+
+def parse_launchable(output: str) -> List[str]:
+    """Package names from `query-activities --brief` output, in order, without duplicates."""
+    packages = []
+    seen = set()
+    for line in output.splitlines():
+        line = line.strip()
+        if not line or line.startswith("Activity") or "/" not in line:
+            continue
+        package = line.split("/")[0]
+        if package not in seen:
+            seen.add(package)
+            packages.append(package)
+    return packages
+
+
+def parse_versions(output: str) -> Dict[str, str]:
+    """{package: versionCode} from `pm list packages --show-versioncode`."""
+    versions = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("package:"):
+            continue
+        package, _, rest = line[len("package:"):].partition(" ")
+        version = rest.split("versionCode:", 1)[1].split()[0] if "versionCode:" in rest else ""
+        versions[package] = version
+    return versions
+
+
+def parse_catalog(output: str) -> List[Dict]:
+    """Catalog entries {package, name, version, launchable} from CATALOG_SCRIPT output."""
+    sections = {"launchable": [], "versions": []}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("@"):
+            current = line[1:].strip()
+            continue
+        if current in sections:
+            sections[current].append(line)
+    launchable = set(parse_launchable("\n".join(sections["launchable"])))
+    versions = parse_versions("\n".join(sections["versions"]))
+    for package in launchable:
+        versions.setdefault(package, "")
+    return [
+        {"package": package, "name": guess_label(package), "version": version,
+         "launchable": package in launchable}
+        for package, version in versions.items()
+    ]
+
+
+class GlobalAppIndex:
+    """
+    Every connected device's app catalog in one place.
+
+    Per device it keeps package -> (label, version, launchable); across
+    devices it keeps package -> {serial: version} and one fuzzy search
+    index keyed by package, so "which devices have X, at which versions"
+    is a dictionary lookup and a search is one AppSearchIndex query no
+    matter how many devices contributed. update_device() applies only
+    the difference from the previous catalog of that device.
+    """
+
+    def __init__(self):
+        self._catalogs: Dict[str, Dict[str, Tuple[str, str, bool]]] = {}
+        self._installs: Dict[str, Dict[str, str]] = {}
+        self._search = AppSearchIndex()
+
+    def __len__(self):
+        return len(self._installs)
+
+    def serials(self) -> List[str]:
+        return list(self._catalogs)
+
+    def update_device(self, serial: str, apps: Iterable[Dict]) -> bool:
+        """Replaces serial's catalog; True if the index changed."""
+        new = {
+            app["package"]: (app.get("name") or guess_label(app["package"]), str(app.get("version") or ""),
+                             bool(app.get("launchable", True)))
+            for app in apps if app.get("package")
+        }
+        old = self._catalogs.get(serial, {})
+        if serial in self._catalogs and new == old:
+            return False
+        for package in old.keys() - new.keys():
+            self._uninstall(serial, package)
+        for package, (label, version, _) in new.items():
+            if old.get(package) != new[package]:
+                self._installs.setdefault(package, {})[serial] = version
+                if package not in self._search:
+                    self._search.add(package, label, package)
+        self._catalogs[serial] = new
+        return True
+
+    def remove_device(self, serial: str) -> bool:
+        old = self._catalogs.pop(serial, None)
+        if old is None:
+            return False
+        for package in old:
+            self._uninstall(serial, package)
+        return True
+
+    def set_app(self, serial: str, app: Dict) -> bool:
+        """
+        Adds or updates one app of serial's catalog, e.g. after installing it,
+        without re-reading the device; True if the index changed. Devices
+        whose catalog was never fetched are left to their first fetch.
+        """
+        catalog = self._catalogs.get(serial)
+        package = app.get("package")
+        if catalog is None or not package:
+            return False
+        new = (app.get("name") or guess_label(package), str(app.get("version") or ""), bool(app.get("launchable", True)))
+        if catalog.get(package) == new:
+            return False
+        catalog[package] = new
+        self._installs.setdefault(package, {})[serial] = new[1]
+        if package not in self._search:
+            self._search.add(package, new[0], package)
+        return True
+
+    def remove_app(self, serial: str, package: str) -> bool:
+        """Drops one app from serial's catalog (after uninstalling it); True if it was there."""
+        catalog = self._catalogs.get(serial)
+        if not catalog or package not in catalog:
+            return False
+        del catalog[package]
+        self._uninstall(serial, package)
+        return True
+
+    def _uninstall(self, serial: str, package: str):
+        devices = self._installs.get(package)
+        if devices is None:
+            return
+        devices.pop(serial, None)
+        if not devices:
+            del self._installs[package]
+            self._search.remove(package)
+
+    def _label(self, package: str) -> str:
+        serial = next(iter(self._installs[package]))
+        return self._catalogs[serial][package][0]
+
+    def installs(self, package: str) -> Dict[str, str]:
+        """{serial: versionCode} of the devices that have package."""
+        return dict(self._installs.get(package, {}))
+
+    def entry(self, package: str) -> Optional[Dict]:
+        devices = self._installs.get(package)
+        if not devices:
+            return None
+        label, launchable = package, False
+        for serial in devices:
+            app = self._catalogs[serial][package]
+            label = app[0]
+            launchable = launchable or app[2]
+        return {
+            "package": package,
+            "label": label,
+            "launchable": launchable,
+            "devices": [{"serial": serial, "version": version} for serial, version in sorted(devices.items())],
+            "versions": sorted({version for version in devices.values() if version}),
+        }
+
+    def search(self, query: str, limit: int = 100) -> List[Dict]:
+        """Best matches for query (or every app by label when query is empty)."""
+        if query.strip():
+            packages = self._search.search(query, limit)
+        else:
+            packages = sorted(self._installs, key=lambda p: self._label(p).lower())[:limit]
+        return [self.entry(package) for package in packages]
@@ -0,0 +1,282 @@
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from .adb_handler import run_adb
+from .logcat import LogEntry, LogRing, LogcatStream, format_entry
+from .scrcpy_handler import ScrcpySession
+from .tracing import get_logger
+
+log = get_logger("logcat")
+
+# Activity manager event-log tags about an app process, and which field holds its PID
+PROCESS_EVENTS = ("am_proc_start", "am_proc_died", "am_crash", "am_anr")
+EVENT_PID_FIELD = {"am_crash": 0}  # the others are [user, pid, ...]
+CRASH_EVENTS = {"am_crash": "crash", "am_anr": "anr"}
+
+APP_BUFFERS = ("main", "system", "crash")
+
+
+def parse_pidof(output: str) -> Optional[int]:
+    """First PID printed by `pidof` (it prints several if the name is shared)."""
+    for word in output.split():
+        if word.isdigit():
+            return int(word)
+    return None
+
+
+def parse_event_fields(message: str) -> List[str]:
+    """Fields of an event-log entry printed as [a,b,c]."""
+    return [field.strip() for field in message.strip().strip("[]").split(",")]
+
+
+def event_pid(entry: LogEntry) -> Optional[int]:
+    fields = parse_event_fields(entry.message)
+    index = EVENT_PID_FIELD.get(entry.tag, 1)
+    try:
+        return int(fields[index])
+    except (IndexError, ValueError):
+        return None
+
+
+def crash_summary(entry: LogEntry) -> str:
+    """"Exception: message" for am_crash, the reason for am_anr."""
+    fields = parse_event_fields(entry.message)
+    if entry.tag == "am_crash" and len(fields) > 5:
+        return f"{fields[4]}: {fields[5]}" if fields[5] else fields[4]
+    if entry.tag == "am_anr" and len(fields) > 4:
+        return ",".join(fields[4:])
+    return entry.message
+
+
+class BoundedLogFile:
+    """
+    A text log of at most about max_bytes: when full it is moved to
+    <path>.1, replacing the previous one, and started again, so it never
+    takes more than twice max_bytes on disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max(1024, int(max_bytes))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._lock = threading.Lock()
+
+    def write(self, text: str, flush: bool = False):
+        with self._lock:
+            if self._file is None:
+                return
+            if self._size and self._size + len(text) > self.max_bytes:
+                self._file.close()
+                os.replace(self.path, self.path + ".1")
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._size = 0
+            self._file.write(text)
+            self._size += len(text)
+            if flush:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class AppLogSession:
+    """
+    The log of one app launched in a scrcpy window.
+
+    Once `pidof` finds the app's process, a logcat of the main, system and
+    crash buffers filtered on the device with --pid follows it. A second
+    stream watches the event log for the activity manager's start, death,
+    crash and ANR events about the package: crashes and ANRs of the
+    followed process are recorded, and a restarted process moves the PID
+    filter along. Both streams feed one ring for the log view and a
+    size-capped log file that outlives the window.
+    """
+
+    PID_POLL_INTERVAL = 0.5
+    PID_TIMEOUT = 30
+    CAPACITY = 10000
+
+    def __init__(self, adb_path: str, session: ScrcpySession, package: str, log_path: str,
+                 max_bytes: int = 8 * 1024 * 1024, on_changed: Callable = None, on_crash: Callable = None):
+        self.adb_path = adb_path
+        self.session = session
+        self.serial = session.serial
+        self.package = package
+        self.log_path = log_path
+        self.pid: Optional[int] = None  # the app process currently followed
+        self.crashes: List[Dict] = []
+        self.ring = LogRing(self.CAPACITY)
+        self._on_changed = on_changed
+        self._on_crash = on_crash
+        self._file = BoundedLogFile(log_path, max_bytes)
+        self._app_stream: Optional[LogcatStream] = None
+        self._events_stream: Optional[LogcatStream] = None
+        self._restart_pending = False  # the followed process died; follow the next one
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return not self._closed
+
+    def start(self):
+        threading.Thread(target=self._run, name=f"applog-{self.session.pid}", daemon=True).start()
+
+    def _run(self):
+        self._file.write(f"# {self.package} on {self.serial}, window opened {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._events_stream = LogcatStream(
+            self.adb_path, self.serial, buffers=("events",), filters=[f"{tag}:I" for tag in PROCESS_EVENTS],
+            regex=self.package, ring=self.ring, sink=self._on_events,
+        )
+        self._events_stream.start()
+
+        # The app process appears once scrcpy has created the display and started it
+        deadline = time.monotonic() + self.PID_TIMEOUT
+        while self.pid is None and self.session.alive and time.monotonic() < deadline:
+            pid = self._pidof()
+            if pid:
+                self._follow(pid)
+                break
+            time.sleep(self.PID_POLL_INTERVAL)
+        if self.pid is None:
+            log.warning("No process for %s after %ss", self.package, self.PID_TIMEOUT, extra={"serial": self.serial})
+
+        try:
+            self.session.process.wait()
+        except OSError:
+            pass
+        self.close()
+
+    def _pidof(self) -> Optional[int]:
+        try:
+            result = run_adb([self.adb_path, "-s", self.serial, "shell", "pidof", self.package],
+                             capture_output=True, text=True, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return parse_pidof(result.stdout) if result.returncode == 0 else None
+
+    def _follow(self, pid: int):
+        with self._lock:
+            if self._closed or pid == self.pid:
+                return
+            previous = self._app_stream
+            self.pid = pid
+            self._restart_pending = False
+            self._app_stream = LogcatStream(self.adb_path, self.serial, pid=pid, buffers=APP_BUFFERS,
+                                            ring=self.ring, sink=self._write)
+            self._app_stream.start()
+        if previous:
+            previous.stop()
+        self._file.write(f"# following process {pid}\n")
+        if self._on_changed:
+            self._on_changed(self)
+
+    def _write(self, entries: List[LogEntry]):
+        self._file.write("".join(format_entry(entry) + "\n" for entry in entries))
+
+    def _on_events(self, entries: List[LogEntry]):
+        # The event log is dumped from the start; events of other (older)
+        # processes are told apart by PID
+        for entry in entries:
+            pid = event_pid(entry)
+            fields = parse_event_fields(entry.message)
+            if entry.tag == "am_proc_start":
+                if self._restart_pending and self.package in fields and pid:
+                    self._follow(pid)
+                continue
+            if pid is None or pid != self.pid:
+                continue
+            self._file.write(format_entry(entry) + "\n", flush=True)
+            if entry.tag == "am_proc_died":
+                self._restart_pending = True
+            kind = CRASH_EVENTS.get(entry.tag)
+            if kind:
+                self._record_crash(kind, entry)
+
+    def _record_crash(self, kind: str, entry: LogEntry):
+        crash = {"kind": kind, "time": entry.time, "pid": self.pid, "summary": crash_summary(entry)[:300]}
+        self.crashes.append(crash)
+        self._restart_pending = True
+        self._file.write(f"# {kind.upper()} in {self.package} ({self.pid}): {entry.message}\n", flush=True)
+        log.warning("%s in %s: %s", kind.upper(), self.package, crash["summary"], extra={"serial": self.serial})
+        if self._on_crash:
+            self._on_crash(self, crash)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            streams = [self._app_stream, self._events_stream]
+        for stream in streams:
+            if stream:
+                stream.stop()  # late batches find the file closed and are dropped
+        self._file.write(f"# window closed {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._file.close()
+        if self._on_changed:
+            self._on_changed(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            "pid": self.session.pid,
+            "serial": self.serial,
+            "package": self.package,
+            "appPid": self.pid or 0,
+            "logPath": self.log_path,
+            "crashes": list(self.crashes),
+            "running": self.running,
+        }
+
+
+class AppLogManager:
+    """
+    Attaches an AppLogSession to every app window; ended sessions are kept
+    (up to KEEP_ENDED) so their crashes and log files stay reachable.
+    """
+
+    KEEP_ENDED = 20
+
+    def __init__(self, adb_path: str, log_dir: str, max_bytes: int = 8 * 1024 * 1024,
+                 on_changed: Callable = None, on_crash: Callable = None):
+        self.adb_path = adb_path
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.on_changed = on_changed
+        self.on_crash = on_crash
+        self._sessions: Dict[int, AppLogSession] = {}  # scrcpy pid -> session, oldest first
+        self._lock = threading.Lock()
+
+    def attach(self, session: ScrcpySession, package: str) -> Optional[AppLogSession]:
+        if not self.adb_path:
+            return None
+        name = f"{package}_{session.serial.replace(':', '_')}_{time.strftime('%Y%m%d_%H%M%S')}.log"
+        app_log = AppLogSession(self.adb_path, session, package, os.path.join(self.log_dir, name),
+                                self.max_bytes, on_changed=self.on_changed, on_crash=self.on_crash)
+        with self._lock:
+            self._sessions[session.pid] = app_log
+            ended = [pid for pid, s in self._sessions.items() if not s.running]
+            for pid in ended[:max(0, len(ended) - self.KEEP_ENDED)]:
+                del self._sessions[pid]
+        app_log.start()
+        if self.on_changed:
+            self.on_changed(app_log)
+        return app_log
+
+    def get(self, session_pid: int) -> Optional[AppLogSession]:
+        with self._lock:
+            return self._sessions.get(session_pid)
+
+    def sessions(self, serial: str = None) -> List[AppLogSession]:
+        with self._lock:
+            return [s for s in self._sessions.values() if serial is None or s.serial == serial]
+
+    def close_all(self):
+        for app_log in self.sessions():
+            app_log.close()
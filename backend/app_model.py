@@ -0,0 +1,122 @@
+from typing import Dict, List
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QByteArray, QTimer, Property, Signal, Slot
+from .app_search import AppSearchIndex
+
+
+class AppFilterModel(QAbstractListModel):
+    """
+    Filtered, ranked view of the app catalog for the app grid.
+
+    The catalog is indexed once (AppSearchIndex) and updated incrementally
+    when the package list changes. Queries are debounced, run against the
+    index and expose only the top-K hits; an empty query lists the whole
+    catalog by name. Icon arrivals touch just the affected rows.
+    """
+
+    PackageRole = Qt.UserRole + 1
+    LabelRole = Qt.UserRole + 2
+    IconRole = Qt.UserRole + 3
+
+    ROLE_NAMES = {
+        PackageRole: b"packageName",
+        LabelRole: b"label",
+        IconRole: b"iconPath",
+    }
+
+    DEBOUNCE_MS = 60
+    RESULT_LIMIT = 200
+
+    queryChanged = Signal(str)
+    countChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._index = AppSearchIndex()
+        self._apps: Dict[str, Dict] = {}  # package -> app dict from the worker
+        self._sorted: List[str] = []  # packages by label, for the empty query
+        self._rows: List[str] = []
+        self._query = ""
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._refilter)
+
+    def roleNames(self):
+        return {role: QByteArray(name) for role, name in self.ROLE_NAMES.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        app = self._apps.get(self._rows[index.row()])
+        if app is None:
+            return None
+        if role in (self.LabelRole, Qt.DisplayRole):
+            return app.get("name") or app.get("package")
+        if role == self.PackageRole:
+            return app.get("package")
+        if role == self.IconRole:
+            return app.get("icon") or ""
+        return None
+
+    def get_query(self):
+        return self._query
+
+    @Slot(str)
+    def set_query(self, query):
+        if query == self._query:
+            return
+        self._query = query
+        self.queryChanged.emit(query)
+        if query.strip():
+            self._debounce.start()
+        else:
+            # Clearing the field should feel immediate
+            self._debounce.stop()
+            self._refilter()
+
+    def get_count(self):
+        return len(self._rows)
+
+    query = Property(str, fget=get_query, fset=set_query, notify=queryChanged)
+    count = Property(int, fget=get_count, notify=countChanged)
+
+    def set_catalog(self, apps: List[Dict]):
+        """Replaces the catalog; only added, removed or relabelled apps are re-indexed."""
+        self._apps = {app["package"]: app for app in apps if app.get("package")}
+        changed = self._index.update(
+            (package, app.get("name") or package, package) for package, app in self._apps.items()
+        )
+        if changed or len(self._sorted) != len(self._apps):
+            self._sorted = sorted(self._apps, key=lambda p: (self._apps[p].get("name") or p).lower())
+        if not self._refilter() and self._rows:
+            # Same rows, but icons or other fields may have changed
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0))
+
+    def set_icon(self, package: str, icon_path: str):
+        app = self._apps.get(package)
+        if app is None or app.get("icon") == icon_path:
+            return
+        app = dict(app)
+        app["icon"] = icon_path
+        self._apps[package] = app
+        try:
+            row = self._rows.index(package)
+        except ValueError:
+            return
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [self.IconRole])
+
+    def _refilter(self) -> bool:
+        """Re-runs the current query; True if the visible rows changed."""
+        query = self._query.strip()
+        rows = self._index.search(query, self.RESULT_LIMIT) if query else list(self._sorted)
+        if rows == self._rows:
+            return False
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+        self.countChanged.emit()
+        return True
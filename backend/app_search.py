@@ -0,0 +1,172 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Characters that start a new "word" inside labels and package names
+_BOUNDARIES = " ._-/"
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _char_mask(text: str) -> int:
+    """Bit per character class; a subsequence match needs every query bit."""
+    mask = 0
+    for ch in text:
+        mask |= 1 << (ord(ch) % 63)
+    return mask
+
+
+def score_text(query: str, text: str) -> int:
+    """
+    Scores lowercase query against lowercase text, 0 when it doesn't match.
+
+    Exact > prefix > word prefix > substring (earlier is better) > subsequence.
+    Subsequence matches score below 60 and are rewarded for consecutive runs
+    and for hitting word starts, so "gmaps" ranks Google Maps above a name
+    that merely contains those letters scattered around.
+    """
+    if not query or not text:
+        return 0
+    if text == query:
+        return 100
+    if text.startswith(query):
+        return 90
+    position = text.find(query)
+    if position > 0:
+        if text[position - 1] in _BOUNDARIES:
+            return 80
+        return max(61, 70 - position // 4)
+
+    score = 0
+    run = 0
+    best_run = 0
+    cursor = 0
+    for ch in query:
+        found = text.find(ch, cursor)
+        if found < 0:
+            return 0
+        if found == cursor and cursor > 0:
+            run += 1
+        else:
+            run = 1
+        best_run = max(best_run, run)
+        if found == 0 or text[found - 1] in _BOUNDARIES:
+            score += 3
+        score += 2
+        cursor = found + 1
+    score += best_run * 3
+    # Scale into 1..59 relative to the query length
+    return max(1, min(59, score * 59 // (len(query) * 8)))
+
+
+class _Entry:
+    __slots__ = ("key", "label", "package", "label_lower", "package_lower", "grams", "mask")
+
+    def __init__(self, key: str, label: str, package: str):
+        self.key = key
+        self.label = label
+        self.package = package
+        self.label_lower = label.lower()
+        self.package_lower = package.lower()
+        text = self.label_lower + "\n" + self.package_lower
+        self.grams = _grams(text, 2) | _grams(text, 3)
+        self.mask = _char_mask(text)
+
+
+class AppSearchIndex:
+    """
+    Fuzzy search over app labels and package names.
+
+    Bigram and trigram postings narrow a query to the entries that contain
+    all of its n-grams; those are ranked with score_text(). Only when that
+    yields fewer than the requested number of hits are the remaining
+    entries scanned for subsequence matches (with a character-mask check
+    rejecting most of them cheaply). Entries are keyed, so update() only
+    re-indexes what was added, removed or relabelled.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key: str, label: str, package: str):
+        current = self._entries.get(key)
+        if current is not None:
+            if current.label == label and current.package == package:
+                return
+            self.remove(key)
+        entry = _Entry(key, label, package)
+        self._entries[key] = entry
+        for gram in entry.grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry.grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def update(self, items: Iterable[Tuple[str, str, str]]) -> bool:
+        """Makes the index hold exactly items (key, label, package); True if anything changed."""
+        wanted = {key: (label, package) for key, label, package in items}
+        stale = [key for key in self._entries if key not in wanted]
+        changed = bool(stale)
+        for key in stale:
+            self.remove(key)
+        for key, (label, package) in wanted.items():
+            entry = self._entries.get(key)
+            if entry is None or entry.label != label or entry.package != package:
+                self.add(key, label, package)
+                changed = True
+        return changed
+
+    def _score(self, query: str, entry: _Entry) -> int:
+        # Labels win ties with package names
+        label_score = score_text(query, entry.label_lower)
+        package_score = score_text(query, entry.package_lower)
+        return label_score if label_score >= package_score else package_score - 1
+
+    def search(self, query: str, limit: Optional[int] = 200) -> List[str]:
+        """Keys of the best matches for query, best first (at most limit)."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        limit = limit or len(self._entries)
+
+        if len(query) >= 2:
+            grams = _grams(query, 3) if len(query) >= 3 else {query}
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        else:
+            candidates = set()
+
+        scored = []
+        for key in candidates:
+            entry = self._entries[key]
+            score = self._score(query, entry)
+            if score > 0:
+                scored.append((score, entry.label_lower, key))
+
+        if len(scored) < limit:
+            mask = _char_mask(query)
+            for key, entry in self._entries.items():
+                if key in candidates or entry.mask & mask != mask:
+                    continue
+                score = self._score(query, entry)
+                if score > 0:
+                    scored.append((score, entry.label_lower, key))
+
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        return [key for _, _, key in best]
@@ -0,0 +1,332 @@
+"""
+asyncio counterpart of ADBHandler.
+
+Every adb invocation is an asyncio subprocess, so any number of device
+operations can be in flight on one thread. A semaphore caps how many adb
+processes run at once, each call has a timeout, and cancelling a call
+kills its adb process. Parsing is shared with ADBHandler.
+
+Qt code submits coroutines to the shared loop thread (get_async_loop())
+and gets concurrent.futures.Future objects back. Signals emitted from
+their callbacks are queued to the receivers' threads as usual.
+"""
+import asyncio
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .adb_handler import (STATUS_SCRIPT, VOLUME_STREAMS, parse_devices, parse_packages, parse_status,
+                          parse_wm_density, parse_wm_size)
+from .app_catalog import LAUNCHER_QUERY, parse_launchable
+from .metrics import observe_command
+from .tracing import get_logger
+
+log = get_logger("adb.async")
+
+
+class AsyncADBHandler:
+    """Same operations as ADBHandler, as coroutines."""
+
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(self, adb_path: str = None, max_processes: int = 64):
+        self.adb_path = adb_path or shutil.which("adb")
+        self.max_processes = max_processes
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._limit_loop = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._limit_loop is not loop:
+            self._limit = asyncio.Semaphore(self.max_processes)
+            self._limit_loop = loop
+        return self._limit
+
+    async def run(self, args: Sequence[str], timeout: float = DEFAULT_TIMEOUT,
+                  input: bytes = None) -> subprocess.CompletedProcess:
+        """
+        adb <args> with bytes stdout/stderr. Raises subprocess.TimeoutExpired
+        after timeout seconds; on timeout or cancellation the process is killed.
+        """
+        if not self.adb_path:
+            raise FileNotFoundError("adb not found")
+        cmd = [self.adb_path, *args]
+        async with self._semaphore():
+            start = time.perf_counter()
+            ok = False
+            process = await asyncio.create_subprocess_exec(
+                *cmd, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+                ok = process.returncode == 0
+                return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await asyncio.shield(process.wait())
+                observe_command(cmd, time.perf_counter() - start, ok)
+
+    async def shell(self, serial: str, command: Union[str, Sequence[str]],
+                    timeout: float = DEFAULT_TIMEOUT) -> subprocess.CompletedProcess:
+        """adb -s serial shell command, with stdout/stderr decoded to str."""
+        args = ["-s", serial, "shell"] + ([command] if isinstance(command, str) else list(command))
+        result = await self.run(args, timeout)
+        return subprocess.CompletedProcess(result.args, result.returncode,
+                                           result.stdout.decode("utf-8", "replace"),
+                                           result.stderr.decode("utf-8", "replace"))
+
+    async def _shell_ok(self, serial: str, *commands: Sequence[str], timeout: float = 5) -> bool:
+        """Tries commands in order until one exits 0."""
+        for command in commands:
+            try:
+                if (await self.shell(serial, command, timeout)).returncode == 0:
+                    return True
+            except (OSError, subprocess.TimeoutExpired) as e:
+                log.debug("%s failed: %s", " ".join(command), e, extra={"serial": serial})
+        return False
+
+    async def _setting(self, serial: str, namespace: str, key: str) -> Optional[str]:
+        try:
+            result = await self.shell(serial, ["settings", "get", namespace, key], 5)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    async def map_devices(self, serials: Iterable[str], func: Callable[..., Awaitable], *args,
+                          **kwargs) -> Dict[str, object]:
+        """{serial: result} of func(serial, *args) run concurrently; failures map to the exception."""
+        serials = list(serials)
+        results = await asyncio.gather(*(func(serial, *args, **kwargs) for serial in serials), return_exceptions=True)
+        return dict(zip(serials, results))
+
+    # --- devices
+
+    async def connect(self, address: str, timeout: float = 10) -> bool:
+        try:
+            result = await self.run(["connect", address], timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        # adb exits 0 on "failed to connect to ..." too; the verdict is in the output
+        return "connected to" in result.stdout.decode("utf-8", "replace")
+
+    async def disconnect(self, address: str, timeout: float = 5) -> bool:
+        try:
+            return (await self.run(["disconnect", address], timeout)).returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+
+    async def get_devices(self) -> List[Dict[str, str]]:
+        try:
+            result = await self.run(["devices", "-l"], 10)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("ADB Error: %s", e)
+            return []
+        if result.returncode != 0:
+            log.error("ADB Error: %s", result.stderr.decode("utf-8", "replace").strip())
+            return []
+        return parse_devices(result.stdout.decode("utf-8", "replace"))
+
+    async def get_installed_packages(self, serial: str) -> List[str]:
+        try:
+            result = await self.shell(serial, ["pm", "list", "packages", "-3"])
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error fetching packages for %s: %s", serial, e)
+            return []
+        return sorted(parse_packages(result.stdout)) if result.returncode == 0 else []
+
+    async def get_launchable_packages(self, serial: str) -> List[str]:
+        try:
+            result = await self.shell(serial, LAUNCHER_QUERY)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error fetching packages for %s: %s", serial, e)
+            return []
+        return parse_launchable(result.stdout) if result.returncode == 0 else []
+
+    async def get_device_resolution(self, serial: str) -> tuple:
+        try:
+            result = await self.shell(serial, ["wm", "size"], 5)
+            resolution = parse_wm_size(result.stdout)
+            if resolution:
+                return resolution
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error fetching resolution for %s: %s", serial, e)
+        return (1080, 2400)
+
+    async def get_device_density(self, serial: str) -> int:
+        try:
+            result = await self.shell(serial, ["wm", "density"], 5)
+            density = parse_wm_density(result.stdout)
+            if density:
+                return density
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error fetching density for %s: %s", serial, e)
+        return 400
+
+    async def get_device_status_info(self, serial: str) -> Dict[str, object]:
+        """Same fields as ADBHandler.get_device_status_info, from a single adb call."""
+        output = ""
+        try:
+            output = (await self.shell(serial, STATUS_SCRIPT, 5)).stdout
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error fetching status for %s: %s", serial, e)
+        return parse_status(serial, output)
+
+    # --- transfers and screenshots
+
+    async def push_file(self, serial: str, local_path: str, remote_path: str, timeout: float = 300) -> bool:
+        try:
+            return (await self.run(["-s", serial, "push", local_path, remote_path], timeout)).returncode == 0
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error pushing file to %s: %s", serial, e)
+            return False
+
+    async def pull_file(self, serial: str, remote_path: str, local_path: str, timeout: float = 300) -> bool:
+        try:
+            return (await self.run(["-s", serial, "pull", remote_path, local_path], timeout)).returncode == 0
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error pulling file from %s: %s", serial, e)
+            return False
+
+    async def capture_screenshot(self, serial: str, save_path: str) -> bool:
+        try:
+            result = await self.run(["-s", serial, "shell", "screencap", "-p"], 10)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.error("Error capturing screenshot from %s: %s", serial, e)
+            return False
+        if result.returncode != 0 or not result.stdout:
+            return False
+
+        def write():
+            with open(save_path, "wb") as f:
+                f.write(result.stdout)
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, write)
+        except OSError as e:
+            log.error("Error saving screenshot %s: %s", save_path, e)
+            return False
+        return True
+
+    # --- controls
+
+    async def send_keyevents(self, serial: str, keycodes: List[int]) -> bool:
+        if not keycodes:
+            return False
+        return await self._shell_ok(serial, ["input", "keyevent"] + [str(k) for k in keycodes],
+                                    timeout=5 + len(keycodes))
+
+    async def set_volume(self, serial: str, stream: str, level: int) -> bool:
+        stream_type = VOLUME_STREAMS.get(stream.lower(), '3')  # Default to music
+        return await self._shell_ok(
+            serial,
+            ["media", "volume", "--set", str(level), "--stream", stream_type],
+            ["service", "call", "audio", "3", "i32", stream_type, "i32", str(level)],
+        )
+
+    async def get_volume(self, serial: str, stream: str) -> Optional[int]:
+        stream_type = VOLUME_STREAMS.get(stream.lower(), '3')
+        try:
+            result = await self.shell(serial, ["media", "volume", "--get", "--stream", stream_type], 5)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        digits = "".join(ch if ch.isdigit() else " " for ch in result.stdout).split()
+        return int(digits[0]) if result.returncode == 0 and digits else None
+
+    async def set_brightness(self, serial: str, level: int) -> bool:
+        level = max(0, min(255, level))
+        return await self._shell_ok(
+            serial,
+            ["settings", "put", "system", "screen_brightness", str(level)],
+            ["su", "-c", f"echo {level} > /sys/class/leds/lcd-backlight/brightness"],
+            ["service", "call", "power", "28", "i32", str(level)],
+        )
+
+    async def get_brightness(self, serial: str) -> Optional[int]:
+        value = await self._setting(serial, "system", "screen_brightness")
+        return int(value) if value and value.isdigit() else None
+
+    async def set_rotation_lock(self, serial: str, locked: bool) -> bool:
+        # 0 = auto-rotate enabled, 1 = locked
+        return await self._shell_ok(serial, ["settings", "put", "system", "accelerometer_rotation",
+                                             "1" if locked else "0"])
+
+    async def get_rotation_lock(self, serial: str) -> Optional[bool]:
+        value = await self._setting(serial, "system", "accelerometer_rotation")
+        return None if value is None else value == "0"
+
+    async def set_airplane_mode(self, serial: str, enabled: bool) -> bool:
+        value = "1" if enabled else "0"
+        if not await self._shell_ok(serial, ["settings", "put", "global", "airplane_mode_on", value]):
+            return False
+        await self._shell_ok(serial, ["am", "broadcast", "-a", "android.intent.action.AIRPLANE_MODE",
+                                      "--ez", "state", value])
+        return True
+
+    async def get_airplane_mode(self, serial: str) -> Optional[bool]:
+        value = await self._setting(serial, "global", "airplane_mode_on")
+        return None if value is None else value == "1"
+
+    async def set_wifi_enabled(self, serial: str, enabled: bool) -> bool:
+        return await self._shell_ok(
+            serial,
+            ["svc", "wifi", "enable" if enabled else "disable"],
+            ["settings", "put", "global", "wifi_on", "1" if enabled else "0"],
+            ["service", "call", "wifi", "13", "i32", "1" if enabled else "0"],
+        )
+
+    async def get_wifi_enabled(self, serial: str) -> Optional[bool]:
+        value = await self._setting(serial, "global", "wifi_on")
+        return None if value is None else value == "1"
+
+    async def set_bluetooth_enabled(self, serial: str, enabled: bool) -> bool:
+        return await self._shell_ok(
+            serial,
+            ["svc", "bluetooth", "enable" if enabled else "disable"],
+            ["settings", "put", "global", "bluetooth_on", "1" if enabled else "0"],
+            ["service", "call", "bluetooth_manager", "6" if enabled else "8"],
+        )
+
+    async def get_bluetooth_enabled(self, serial: str) -> Optional[bool]:
+        value = await self._setting(serial, "global", "bluetooth_on")
+        return None if value is None else value == "1"
+
+
+class AsyncLoopThread:
+    """An asyncio event loop on its own daemon thread, fed from any other thread."""
+
+    def __init__(self, name: str = "umc-asyncio"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro) -> Future:
+        """Schedules coro on the loop; cancelling the returned future cancels the coroutine."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: float = 2):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+
+_loop_lock = threading.Lock()
+_loop_thread: Optional[AsyncLoopThread] = None
+
+
+def get_async_loop() -> AsyncLoopThread:
+    """Process-wide loop thread shared by every AsyncADBHandler user."""
+    global _loop_thread
+    with _loop_lock:
+        if _loop_thread is None:
+            _loop_thread = AsyncLoopThread()
+        return _loop_thread
@@ -1,13 +1,26 @@
-from PySide6.QtCore import QObject, Slot, Signal, Property, QTimer, QThread, QSettings, QMimeData, QUrl, Qt
+from PySide6.QtCore import QObject, Slot, Signal, Property, QTimer, QThread, QThreadPool, QSettings, QMimeData, QUrl, Qt, QStandardPaths
 from PySide6.QtGui import QGuiApplication, QClipboard
-from PySide6.QtWidgets import QFileDialog
-from .worker import ADBWorker
-from .scrcpy_handler import ScrcpyHandler
-from .adb_handler import ADBHandler
-from .profiles import get_profile_names, get_profile_flags
+from .device import DeviceRegistry, get_adb_handler, get_scrcpy_handler
+from .device_model import DeviceListModel
+from .app_model import AppFilterModel
+from .app_catalog import GlobalAppIndex, guess_label
+from .profiles import get_profile_names, get_profile_flags, get_record_flags, recommend_profile, AUTO_PROFILE
+from .connection_pool import ConnectionManager
+from .discovery import MDNSDiscovery
+from .recorder import RecordingManager
+from .logcat import LogcatPool, PRIORITIES
+from .logcat_model import LogcatModel
+from .app_logs import AppLogManager
+from .installer import APKInstaller, APKSet, InstallError, summarize
+from .clipboard_history import ClipboardHistory
+from .window_layout import LAYOUT_MODES, compute_layout, max_size_for, with_max_size
+from . import metrics
+from .tracing import traced
 import json
 import os
 import subprocess
+import threading
+import time
 
 class BackendBridge(QObject):
     # Signals
@@ -18,7 +31,6 @@ class BackendBridge(QObject):
     fileTransferProgress = Signal(str, str, int, arguments=['serial', 'operation', 'progress'])
     fileTransferComplete = Signal(str, str, bool, arguments=['serial', 'operation', 'success'])
     clipboardChanged = Signal(str, str, arguments=['serial', 'text'])
-    fileSelected = Signal(str, arguments=['filePath'])
     screenshotReady = Signal(str, str, arguments=['serial', 'screenshotPath'])
     deviceControlChanged = Signal(str, str, arguments=['serial', 'controlType'])
     statusMessage = Signal(str, arguments=['message'])
@@ -27,6 +39,15 @@ class BackendBridge(QObject):
     audioForwardingChanged = Signal(bool, arguments=['enabled'])
     currentProfileChanged = Signal(str, arguments=['profile'])
     profilesChanged = Signal(list, arguments=['profiles'])
+    recordingChanged = Signal(str, bool, arguments=['serial', 'recording'])
+    logcatChanged = Signal(str, bool, arguments=['serial', 'running'])
+    _logcatFinished = Signal(str, str)  # serial, error (emitted from logcat reader threads)
+    appLogsChanged = Signal()
+    appCrashed = Signal(str, str, str, str, arguments=['serial', 'package', 'kind', 'logPath'])
+    _appLogChanged = Signal()  # emitted from app log threads
+    _appCrashed = Signal(str, str, str, str, str)  # serial, package, kind, summary, log path (app log threads)
+    clipboardHistoryChanged = Signal()
+    windowLayoutChanged = Signal(str, arguments=['layout'])
     
     # Internal Signals to trigger worker
     requestDevices = Signal()
@@ -34,6 +55,8 @@ class BackendBridge(QObject):
     requestToggleScreen = Signal(str)
     requestIcon = Signal(str, str)  # serial, package_name
     requestDeviceStatus = Signal(str)  # serial
+    requestCapabilities = Signal(str)  # serial
+    requestCatalog = Signal(str)  # serial
     requestPushFile = Signal(str, str, str)  # serial, local_path, remote_path
     requestPullFile = Signal(str, str, str)  # serial, remote_path, local_path
     requestScreenshot = Signal(str)  # serial
@@ -43,52 +66,166 @@ class BackendBridge(QObject):
     requestSetAirplaneMode = Signal(str, bool)  # serial, enabled
     requestSetWifi = Signal(str, bool)  # serial, enabled
     requestSetBluetooth = Signal(str, bool)  # serial, enabled
+    requestClipboardChannel = Signal(str, bool)  # serial, enabled
+    requestKeySequence = Signal(str, list)  # serial, key codes or names
+    requestScrcpyShortcut = Signal(str, str)  # serial, shortcut
+    requestMoveWindows = Signal(list)  # [[pid, x, y, width, height], ...]
+    _recordingFinished = Signal(str, str)  # serial, stop_reason (emitted from supervisor threads)
+    networkDevicesChanged = Signal()
+    _endpointChanged = Signal(str, dict)  # address, endpoint info (emitted from connection threads)
+    discoveredDevicesChanged = Signal(list, arguments=['devices'])
+    _discoveryChanged = Signal(list)  # emitted from the mDNS thread
+    appIndexChanged = Signal()
+    installFinished = Signal(str, str, str, str, arguments=['serial', 'package', 'status', 'message'])
+    installBatchFinished = Signal(str, dict, arguments=['package', 'summary'])
+    _installResult = Signal(dict)  # one device's install/uninstall result (installer threads)
+    _installBatchDone = Signal(str, str, dict)  # package, error, counts per status (installer threads)
 
     def __init__(self):
         super().__init__()
-        self._scrcpy = ScrcpyHandler()
-        self._adb_handler = ADBHandler()  # For synchronous calls from main thread
+        self._scrcpy = get_scrcpy_handler()
+        self._adb_handler = get_adb_handler()  # For synchronous calls from main thread
+        self._registry = DeviceRegistry(self._adb_handler, self._scrcpy)
+        self._device_model = DeviceListModel(self)
         self._current_device_serial = ""
         self._devices = []
         self._packages = []
+        self._app_model = AppFilterModel(self)
+        self._app_index = GlobalAppIndex()  # every connected device's packages and versions
         self._launch_mode = "Tablet" # Default
         self._launch_with_screen_off = False
         self._audio_forwarding = False
         self._current_profile = "Default"
         self._profiles = get_profile_names()
         
-        # Device status cache
-        self._device_status = {}  # serial -> status_info
+        self._capability_requests = set()  # serials with a capability probe in flight
         
         # Device naming and groups
         self._settings = QSettings("UMC", "DeviceManager")
-        self._device_names = self._load_device_names()
-        self._device_groups = self._load_device_groups()
+        self._device_names = {}  # loaded by start()
+        self._device_groups = {}
+        
+        # Window layout for scrcpy sessions ("Free" leaves placement to the window manager)
+        self._window_layout = self._settings.value("window_layout", "Free")
+        if self._window_layout not in LAYOUT_MODES:
+            self._window_layout = "Free"
         
         # Clipboard sync settings
         self._clipboard_sync_enabled = {}  # serial -> bool
-        self._clipboard_history = []  # List of clipboard entries
-        self._max_clipboard_history = 50
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        self._clipboard_history = ClipboardHistory(
+            os.path.join(data_dir, "umc", "clipboard_history.jsonl"),
+            max_entries=50,
+            max_bytes=8 * 1024 * 1024,
+            on_changed=self.clipboardHistoryChanged.emit
+        )
         
-        # Clipboard monitoring
+        # Clipboard monitoring: driven by QClipboard.dataChanged, only connected while
+        # at least one device has sync enabled; bursts are coalesced by a debounce timer
         app = QGuiApplication.instance()
-        if app:
-            self._clipboard = app.clipboard()
-            self._last_clipboard_text = self._clipboard.text() if self._clipboard else ""
-            self._clipboard_timer = QTimer()
-            self._clipboard_timer.timeout.connect(self._check_desktop_clipboard)
-            self._clipboard_timer.start(500)  # Check every 500ms
-        else:
-            self._clipboard = None
-            self._last_clipboard_text = ""
-            self._clipboard_timer = None
+        self._clipboard = app.clipboard() if app else None
+        self._last_clipboard_text = ""
+        self._clipboard_monitoring = False
+        self._clipboard_debounce = QTimer()
+        self._clipboard_debounce.setSingleShot(True)
+        self._clipboard_debounce.setInterval(150)
+        self._clipboard_debounce.timeout.connect(self._check_desktop_clipboard)
+        
+        # Desktop -> device pushes run in parallel off the GUI thread; only the newest
+        # text is sent to a device if several changes queue up behind a slow one
+        self._clipboard_pool = QThreadPool()
+        self._clipboard_pool.setMaxThreadCount(8)
+        self._clipboard_generation = 0
+        self._clipboard_sent_generation = {}  # serial -> last generation pushed
+        self._clipboard_lock = threading.Lock()
         
         # File transfer progress tracking
         self._file_transfer_progress = {}  # (serial, operation) -> progress
         
+        # Screen recording (headless scrcpy sessions with limits and segment rotation)
+        movies_dir = QStandardPaths.writableLocation(QStandardPaths.MoviesLocation)
+        self._recorder = RecordingManager(os.path.join(movies_dir, "UMC"), self._scrcpy)
+        self._recorder.on_finished = lambda session: self._recordingFinished.emit(session.serial, session.stop_reason)
+        self._recordingFinished.connect(self._on_recording_finished)
+        self._recording_time_limit = 0  # seconds, 0 = until stopped
+        self._recording_segment_seconds = 300
+        self._recording_max_bytes = 0  # 0 = only bounded by free disk space
+        
+        # Live logcat: one reader thread per device parsing into a bounded ring
+        self._logcat = LogcatPool(
+            self._adb_handler.adb_path,
+            spill_dir=os.path.join(data_dir, "umc", "logcat"),
+            on_finished=lambda stream: self._logcatFinished.emit(stream.serial, stream.error)
+        )
+        self._logcat_model = LogcatModel(self)
+        self._logcatFinished.connect(self._on_logcat_finished)
+        
+        # Launched apps: PID-filtered logcat, crash/ANR watch and a log file per window
+        self._app_logs = AppLogManager(
+            self._adb_handler.adb_path,
+            os.path.join(data_dir, "umc", "app_logs"),
+            on_changed=lambda app_log: self._appLogChanged.emit(),
+            on_crash=lambda app_log, crash: self._appCrashed.emit(
+                app_log.serial, app_log.package, crash["kind"], crash["summary"], app_log.log_path)
+        )
+        self._appLogChanged.connect(self._on_app_log_changed)
+        self._appCrashed.connect(self._on_app_crashed)
+        
+        # APK installs: one device group at a time in parallel, results applied to the catalogs
+        self._installer = APKInstaller(self._adb_handler.adb_path)
+        self._installResult.connect(self._on_install_result)
+        self._installBatchDone.connect(self._on_install_batch_done)
+        
+        # Wi-Fi devices: kept connected with keepalives and reconnected with backoff
+        self._connections = ConnectionManager(self._adb_handler, on_changed=self._endpointChanged.emit)
+        self._endpoint_states = {}  # address -> last reported state
+        self._endpointChanged.connect(self._on_endpoint_changed)
+        
+        # Diagnostics: signal -> next rendered frame latency, optional exports
+        self._render_marks = {}  # signal name -> perf_counter at emit
+        self._metrics_file = os.environ.get("UMC_METRICS_FILE") or os.path.join(data_dir, "umc", "metrics.prom")
+        self._metrics_server = None
+        self._metrics_dump_timer = QTimer()
+        self._metrics_dump_timer.timeout.connect(self.export_metrics)
+        
+        # Wireless-debugging endpoints advertised over mDNS
+        self._discovered = []
+        self._discovery = MDNSDiscovery(on_changed=self._discoveryChanged.emit)
+        self._discoveryChanged.connect(self._on_discovery_changed)
+        
+        # The worker thread, polling and network services are brought up by start()
+        self._started = False
+        self._thread = None
+        self._worker = None
+        self._timer = None
+
+    @Slot()
+    def start(self):
+        """
+        Starts the device side: settings, the ADB worker thread, polling,
+        Wi-Fi connections, discovery and the optional metrics exports.
+
+        main.py calls this once the window has drawn its first frame, so
+        none of it (nor importing the worker and its adb plumbing) delays
+        the window appearing.
+        """
+        if self._started:
+            return
+        self._started = True
+        from .worker import ADBWorker
+        
+        self._device_names = self._load_device_names()
+        self._device_groups = self._load_device_groups()
+        
+        port = os.environ.get("UMC_METRICS_PORT")
+        if port and port.isdigit():
+            self._metrics_server = metrics.start_http_server(int(port))
+        if os.environ.get("UMC_METRICS_FILE"):
+            self._metrics_dump_timer.start(10000)
+        
         # Setup Worker Thread
         self._thread = QThread()
-        self._worker = ADBWorker()
+        self._worker = ADBWorker(self._scrcpy)
         self._worker.moveToThread(self._thread)
         
         # Connect Signals (use QueuedConnection for cross-thread communication)
@@ -97,6 +234,8 @@ class BackendBridge(QObject):
         self.requestToggleScreen.connect(self._worker.toggle_device_screen, Qt.ConnectionType.QueuedConnection)
         self.requestIcon.connect(self._worker.fetch_icon, Qt.ConnectionType.QueuedConnection)
         self.requestDeviceStatus.connect(self._worker.fetch_device_status, Qt.ConnectionType.QueuedConnection)
+        self.requestCapabilities.connect(self._worker.fetch_capabilities, Qt.ConnectionType.QueuedConnection)
+        self.requestCatalog.connect(self._worker.fetch_catalog, Qt.ConnectionType.QueuedConnection)
         self.requestScreenshot.connect(self._worker.capture_screenshot, Qt.ConnectionType.QueuedConnection)
         self.requestSetVolume.connect(self._worker.set_volume, Qt.ConnectionType.QueuedConnection)
         self.requestSetBrightness.connect(self._worker.set_brightness, Qt.ConnectionType.QueuedConnection)
@@ -104,11 +243,40 @@ class BackendBridge(QObject):
         self.requestSetAirplaneMode.connect(self._worker.set_airplane_mode, Qt.ConnectionType.QueuedConnection)
         self.requestSetWifi.connect(self._worker.set_wifi_enabled, Qt.ConnectionType.QueuedConnection)
         self.requestSetBluetooth.connect(self._worker.set_bluetooth_enabled, Qt.ConnectionType.QueuedConnection)
+        self.requestClipboardChannel.connect(self._worker.set_clipboard_channel, Qt.ConnectionType.QueuedConnection)
+        self.requestKeySequence.connect(self._worker.send_key_sequence, Qt.ConnectionType.QueuedConnection)
+        self.requestScrcpyShortcut.connect(self._worker.send_scrcpy_shortcut, Qt.ConnectionType.QueuedConnection)
+        self.requestMoveWindows.connect(self._worker.move_windows, Qt.ConnectionType.QueuedConnection)
+        
+        # Queue depth / wait time per worker task (direct connections run at emit time)
+        for signal, task in (
+            (self.requestDevices, "fetch_devices"),
+            (self.requestPackages, "fetch_packages"),
+            (self.requestToggleScreen, "toggle_device_screen"),
+            (self.requestIcon, "fetch_icon"),
+            (self.requestDeviceStatus, "fetch_device_status"),
+            (self.requestCapabilities, "fetch_capabilities"),
+            (self.requestCatalog, "fetch_catalog"),
+            (self.requestScreenshot, "capture_screenshot"),
+            (self.requestSetVolume, "set_volume"),
+            (self.requestSetBrightness, "set_brightness"),
+            (self.requestSetRotationLock, "set_rotation_lock"),
+            (self.requestSetAirplaneMode, "set_airplane_mode"),
+            (self.requestSetWifi, "set_wifi_enabled"),
+            (self.requestSetBluetooth, "set_bluetooth_enabled"),
+            (self.requestClipboardChannel, "set_clipboard_channel"),
+            (self.requestKeySequence, "send_key_sequence"),
+            (self.requestScrcpyShortcut, "send_scrcpy_shortcut"),
+            (self.requestMoveWindows, "move_windows"),
+        ):
+            signal.connect(lambda *args, task=task: metrics.WORKER_QUEUE.enqueued(task))
         
         self._worker.devicesReady.connect(self._on_devices_ready)
         self._worker.packagesReady.connect(self._on_packages_ready)
         self._worker.iconReady.connect(self._on_icon_ready)
         self._worker.deviceStatusReady.connect(self._on_device_status_ready)
+        self._worker.capabilitiesReady.connect(self._on_capabilities_ready)
+        self._worker.catalogReady.connect(self._on_catalog_ready)
         self._worker.fileTransferProgress.connect(self._on_file_transfer_progress)
         self._worker.fileTransferComplete.connect(self._on_file_transfer_complete)
         self._worker.clipboardChanged.connect(self._on_device_clipboard_changed)
@@ -125,13 +293,30 @@ class BackendBridge(QObject):
         
         # Initial fetch
         self.requestDevices.emit()
+        self._connections.start()
+        self._discovery.start()
 
     def get_devices(self):
         return self._devices
 
+    def get_device_model(self):
+        return self._device_model
+
+    def get_discovered_devices(self):
+        return self._discovered
+
+    def get_network_endpoints(self):
+        return self._connections.endpoints()
+
     def get_packages(self):
         return self._packages
 
+    def get_app_model(self):
+        return self._app_model
+
+    def get_logcat_model(self):
+        return self._logcat_model
+
     def get_launch_mode(self):
         return self._launch_mode
     
@@ -170,16 +355,37 @@ class BackendBridge(QObject):
     def get_profiles(self):
         return self._profiles
 
+    def get_window_layout(self):
+        return self._window_layout
+
+    def set_window_layout(self, layout):
+        if self._window_layout != layout and layout in LAYOUT_MODES:
+            self._window_layout = layout
+            self._settings.setValue("window_layout", layout)
+            self.windowLayoutChanged.emit(layout)
+            self._retile()
+
+    def get_window_layouts(self):
+        return LAYOUT_MODES
+
     devices = Property(list, fget=get_devices, notify=devicesChanged)
+    deviceModel = Property(QObject, fget=get_device_model, constant=True)
+    discoveredDevices = Property(list, fget=get_discovered_devices, notify=discoveredDevicesChanged)
+    networkDevices = Property(list, fget=get_network_endpoints, notify=networkDevicesChanged)
     packages = Property(list, fget=get_packages, notify=packagesChanged)
+    appModel = Property(QObject, fget=get_app_model, constant=True)
+    logcatModel = Property(QObject, fget=get_logcat_model, constant=True)
     launchMode = Property(str, fget=get_launch_mode, fset=set_launch_mode, notify=launchModeChanged)
     launchWithScreenOff = Property(bool, fget=get_launch_with_screen_off, fset=set_launch_with_screen_off, notify=launchWithScreenOffChanged)
     audioForwarding = Property(bool, fget=get_audio_forwarding, fset=set_audio_forwarding, notify=audioForwardingChanged)
     currentProfile = Property(str, fget=get_current_profile, fset=set_current_profile, notify=currentProfileChanged)
     profiles = Property(list, fget=get_profiles, notify=profilesChanged)
+    windowLayout = Property(str, fget=get_window_layout, fset=set_window_layout, notify=windowLayoutChanged)
+    windowLayouts = Property(list, fget=get_window_layouts, constant=True)
     currentDeviceSerial = Property(str, fget=get_current_device_serial, notify=statusMessage) # statusMessage is emitted when selected, good enough for now or I can add a dedicated signal.
 
     @Slot()
+    @traced("bridge.refresh_devices", start_flow=True, serial_arg=None)
     def refresh_devices(self):
         try:
             # Manual refresh trigger
@@ -188,46 +394,172 @@ class BackendBridge(QObject):
             pass
 
     @Slot(list)
+    @traced("bridge.devices_ready", serial_arg=None)
     def _on_devices_ready(self, devices):
         try:
-            # Add custom names and request status for each device
-            for device in devices:
-                serial = device.get("serial", "")
-                # Add custom name if exists
-                if serial in self._device_names:
-                    device["custom_name"] = self._device_names[serial]
+            # Forget scrcpy windows that have been closed and close the gaps
+            if self._scrcpy.reap():
+                self._retile()
+            
+            added, removed, changed = self._registry.apply(devices)
+            
+            for device in added:
+                device.custom_name = self._device_names.get(device.serial, "")
+                device.capabilities = self._worker.capabilities.get(device.serial)
+            
+            # A device that went away may come back rebooted or reflashed
+            index_changed = False
+            for device in removed:
+                self._worker.capabilities.invalidate(device.serial)
+                index_changed |= self._app_index.remove_device(device.serial)
+            if index_changed:
+                self.appIndexChanged.emit()
+            
+            # Catalogs for the global app index: once per device coming online
+            for device in added:
+                if device.status == "device":
+                    self.requestCatalog.emit(device.serial)
+            for device, fields in changed:
+                if "status" in fields and device.status == "device":
+                    self.requestCatalog.emit(device.serial)
+            
+            for device in self._registry:
+                serial = device.serial
                 # Request device status
-                if serial:
-                    self.requestDeviceStatus.emit(serial)
+                self.requestDeviceStatus.emit(serial)
+                # Static facts are probed once per device appearance, not per launch
+                if device.status == "device" and serial not in self._capability_requests \
+                        and not self._worker.capabilities.is_fresh(serial):
+                    self._capability_requests.add(serial)
+                    self.requestCapabilities.emit(serial)
             
-            if devices != self._devices:
-                self._devices = devices
+            if added or removed or changed:
+                self._device_model.apply(added, removed, changed)
+                self._mark_render("devices")
+                self._devices = self._registry.to_list()
                 self.devicesChanged.emit(self._devices)
         except Exception:
             pass
     
     @Slot(str, dict)
+    @traced("bridge.device_status_ready")
     def _on_device_status_ready(self, serial, status_info):
         """Handle device status update."""
         try:
-            self._device_status[serial] = status_info
+            device = self._registry.get(serial)
+            if device is None:
+                return
+            previous = device.status_info
+            device.status_info = status_info
+            if self._device_model.status_changed(serial, previous, status_info):
+                self._mark_render("status")
             self.deviceStatusChanged.emit(serial, status_info)
-            
-            # Check clipboard if sync is enabled
-            if self._clipboard_sync_enabled.get(serial, False):
-                self._worker.get_clipboard(serial)
         except Exception:
             pass
 
+    @Slot(str, dict)
+    def _on_capabilities_ready(self, serial, caps):
+        """Capability probe finished (caps may be empty if the device didn't answer)."""
+        self._capability_requests.discard(serial)
+        device = self._registry.get(serial)
+        if device is not None and caps:
+            device.capabilities = caps
+
+    @Slot(str, result=dict)
+    def get_device_capabilities(self, serial: str) -> dict:
+        """Cached static facts (resolution, density, SDK, ABI, encoders, scrcpy support)."""
+        try:
+            return self._worker.capabilities.get(serial) or {}
+        except Exception:
+            return {}
+
     @Slot(str, list)
+    @traced("bridge.packages_ready")
     def _on_packages_ready(self, serial, packages):
         try:
             if serial == self._current_device_serial:
                 self._packages = packages
+                self._app_model.set_catalog(packages)
+                self._mark_render("packages")
                 self.packagesChanged.emit(packages)
         except Exception:
             pass
 
+    @Slot(str, list)
+    @traced("bridge.catalog_ready")
+    def _on_catalog_ready(self, serial, apps):
+        try:
+            if self._registry.get(serial) is None:
+                return
+            if self._app_index.update_device(serial, apps):
+                self.appIndexChanged.emit()
+        except Exception:
+            pass
+
+    def _mark_render(self, name: str):
+        """Starts the signal-to-render clock for name (first emit since the last frame wins)."""
+        if metrics.REGISTRY.enabled and name not in self._render_marks:
+            self._render_marks[name] = time.perf_counter()
+
+    @Slot()
+    def report_frame(self):
+        """Called by QML on the first frameSwapped after a tracked signal."""
+        try:
+            if not self._render_marks:
+                return
+            now = time.perf_counter()
+            for name, marked_at in self._render_marks.items():
+                metrics.RENDER_LATENCY_SECONDS.observe(now - marked_at, signal=name)
+            self._render_marks.clear()
+        except Exception:
+            pass
+
+    @Slot(result=dict)
+    def get_diagnostics(self) -> dict:
+        """Metric summaries for the diagnostics panel (times in milliseconds)."""
+        try:
+            def rows(name, label_keys):
+                result = []
+                for row in metrics.REGISTRY.histogram_rows(name):
+                    result.append({
+                        "label": " ".join(row.get(key, "") for key in label_keys).strip() or "-",
+                        "count": row["count"],
+                        "p50": round(row["p50"] * 1000, 1),
+                        "p95": round(row["p95"] * 1000, 1),
+                        "max": round(row["max"] * 1000, 1),
+                    })
+                return result
+
+            errors = {}
+            for sample in metrics.REGISTRY.values("umc_adb_command_errors_total"):
+                errors[f'{sample.get("command", "")} {sample.get("serial", "")}'.strip()] = int(sample["value"])
+            commands = rows("umc_adb_command_seconds", ("command", "serial"))
+            for row in commands:
+                row["errors"] = errors.get(row["label"], 0)
+
+            depth = sum(sample["value"] for sample in metrics.REGISTRY.values("umc_worker_queue_depth"))
+            return {
+                "enabled": metrics.REGISTRY.enabled,
+                "queueDepth": int(depth),
+                "adbCommands": commands,
+                "workerTasks": rows("umc_worker_task_seconds", ("task",)),
+                "workerWait": rows("umc_worker_wait_seconds", ("task",)),
+                "scrcpyFirstFrame": rows("umc_scrcpy_first_frame_seconds", ("kind",)),
+                "renderLatency": rows("umc_signal_render_seconds", ("signal",)),
+            }
+        except Exception:
+            return {}
+
+    @Slot(result=str)
+    def export_metrics(self) -> str:
+        """Writes all metrics in Prometheus text format; returns the file path."""
+        try:
+            if metrics.REGISTRY.dump(self._metrics_file):
+                return self._metrics_file
+        except Exception:
+            pass
+        return ""
+
     @Slot(str)
     def _on_worker_error(self, message):
         try:
@@ -245,8 +577,10 @@ class BackendBridge(QObject):
                     updated_app = app.copy()
                     updated_app["icon"] = icon_path
                     self._packages[i] = updated_app
-                    # Emit signal to update UI
-                    self.packagesChanged.emit(self._packages)
+                    # Only the grid cell showing this app needs to update
+                    self._app_model.set_icon(package_name, icon_path)
+                    self._mark_render("icon")
+                    self.iconReady.emit(package_name, icon_path)
                     break
         except Exception:
             pass
@@ -280,11 +614,13 @@ class BackendBridge(QObject):
         """Handle clipboard change from device."""
         try:
             if self._clipboard_sync_enabled.get(serial, False) and self._clipboard and text:
+                if text == self._last_clipboard_text:
+                    return
                 # Update desktop clipboard
                 self._clipboard.setText(text)
                 self._last_clipboard_text = text
                 # Add to history
-                self._add_to_clipboard_history(text)
+                self._add_to_clipboard_history(text, serial)
         except Exception:
             pass  # Silently handle clipboard errors
     
@@ -297,6 +633,96 @@ class BackendBridge(QObject):
         except Exception:
             pass
     
+    @Slot(str, str)
+    def _on_recording_finished(self, serial, reason):
+        """Handle a recording session ending (stopped, limit reached or failed)."""
+        try:
+            self.recordingChanged.emit(serial, False)
+            self.statusMessage.emit(f"Recording for {serial} ended: {reason}")
+        except Exception:
+            pass
+    
+    @Slot(str, str)
+    def _on_logcat_finished(self, serial, error):
+        """Handle a logcat stream ending (stopped, restarted or device gone)."""
+        try:
+            stream = self._logcat.get(serial)
+            if stream and stream.running:
+                return  # restarted with new filters
+            self.logcatChanged.emit(serial, False)
+            if error:
+                self.statusMessage.emit(f"Logcat for {serial} ended: {error}")
+        except Exception:
+            pass
+    
+    @Slot()
+    def _on_app_log_changed(self):
+        try:
+            self.appLogsChanged.emit()
+        except Exception:
+            pass
+    
+    @Slot(str, str, str, str, str)
+    def _on_app_crashed(self, serial, package, kind, summary, log_path):
+        """Surface a crash or ANR of a launched app."""
+        try:
+            self.statusMessage.emit(f"{package} on {serial}: {kind.upper()} - {summary[:120]}")
+            self.appCrashed.emit(serial, package, kind, log_path)
+            self.appLogsChanged.emit()
+        except Exception:
+            pass
+    
+    @Slot(dict)
+    def _on_install_result(self, result):
+        """Applies one device's install or uninstall to the app catalogs without re-reading them."""
+        try:
+            serial, package, status = result["serial"], result["package"], result["status"]
+            changed = False
+            if status in ("installed", "skipped"):
+                changed = self._app_index.set_app(serial, {"package": package, "version": result.get("version"),
+                                                           "launchable": result.get("launchable", True)})
+            elif status == "uninstalled":
+                changed = self._app_index.remove_app(serial, package)
+            if changed:
+                self.appIndexChanged.emit()
+            if serial == self._current_device_serial and status != "failed":
+                self._update_current_package(package, status != "uninstalled" and result.get("launchable", True))
+            self.installFinished.emit(serial, package, status, result.get("message", ""))
+        except Exception:
+            pass
+    
+    def _update_current_package(self, package: str, launchable: bool):
+        """Adds or removes one app in the current device's grid."""
+        present = any(app.get("package") == package for app in self._packages)
+        if present == launchable:
+            return
+        if launchable:
+            packages = self._packages + [{"package": package, "name": guess_label(package), "icon": None}]
+            packages.sort(key=lambda app: app["name"].lower())
+        else:
+            packages = [app for app in self._packages if app.get("package") != package]
+        self._packages = packages
+        self._app_model.set_catalog(packages)
+        self.packagesChanged.emit(packages)
+    
+    @Slot(str, str, dict)
+    def _on_install_batch_done(self, package, error, summary):
+        try:
+            if error:
+                self.statusMessage.emit(f"Cannot install {package}: {error}")
+            else:
+                counts = ", ".join(f"{count} {status}" for status, count in summary.items() if status != "seconds")
+                self.statusMessage.emit(f"{package}: {counts} in {summary.get('seconds', 0)}s")
+            self.installBatchFinished.emit(package, summary)
+        except Exception:
+            pass
+    
+    def _attach_app_log(self, serial: str, package_name: str):
+        """Follow the logs of the app window just launched on the device."""
+        session = self._scrcpy.latest_session(serial)
+        if session and session.kind == "app" and session.package == package_name:
+            self._app_logs.attach(session, package_name)
+    
     @Slot(str, str)
     def _on_device_control_changed(self, serial, control_type):
         """Handle device control change."""
@@ -305,8 +731,30 @@ class BackendBridge(QObject):
         except Exception:
             pass
     
+    def _update_clipboard_monitoring(self):
+        """Connect to desktop clipboard changes only while some device has sync enabled."""
+        try:
+            if not self._clipboard:
+                return
+            wanted = any(self._clipboard_sync_enabled.values())
+            if wanted and not self._clipboard_monitoring:
+                self._last_clipboard_text = self._clipboard.text()
+                self._clipboard.dataChanged.connect(self._on_desktop_clipboard_changed)
+                self._clipboard_monitoring = True
+            elif not wanted and self._clipboard_monitoring:
+                self._clipboard.dataChanged.disconnect(self._on_desktop_clipboard_changed)
+                self._clipboard_debounce.stop()
+                self._clipboard_monitoring = False
+        except Exception:
+            pass
+    
+    @Slot()
+    def _on_desktop_clipboard_changed(self):
+        """Debounce clipboard change notifications (selection owners often emit bursts)."""
+        self._clipboard_debounce.start()
+    
     def _check_desktop_clipboard(self):
-        """Check for desktop clipboard changes and sync to devices."""
+        """Sync a changed desktop clipboard to devices with sync enabled."""
         try:
             if not self._clipboard:
                 return
@@ -319,13 +767,15 @@ class BackendBridge(QObject):
             
             if current_text and current_text != self._last_clipboard_text:
                 self._last_clipboard_text = current_text
-                # Sync to all devices with clipboard sync enabled
+                with self._clipboard_lock:
+                    self._clipboard_generation += 1
+                    generation = self._clipboard_generation
+                # Fan out to all devices with clipboard sync enabled in parallel
                 for serial, enabled in list(self._clipboard_sync_enabled.items()):
                     if enabled and serial:
-                        try:
-                            self._worker.set_clipboard(serial, current_text)
-                        except Exception:
-                            pass  # Silently fail per device
+                        self._clipboard_pool.start(
+                            lambda s=serial, t=current_text, g=generation: self._push_clipboard(s, t, g)
+                        )
                 # Add to history
                 try:
                     self._add_to_clipboard_history(current_text)
@@ -335,14 +785,26 @@ class BackendBridge(QObject):
             # Silently handle all clipboard access errors
             pass
     
-    def _add_to_clipboard_history(self, text: str):
-        """Add text to clipboard history."""
+    def _push_clipboard(self, serial: str, text: str, generation: int):
+        """Runs on the clipboard pool; drops pushes superseded by a newer clipboard."""
+        with self._clipboard_lock:
+            if generation != self._clipboard_generation:
+                return
+            if self._clipboard_sent_generation.get(serial, 0) >= generation:
+                return
+            self._clipboard_sent_generation[serial] = generation
+        try:
+            # Live control channel when sync opened one, Clipper broadcast otherwise
+            channel = self._worker.control_channels.get(serial, create=False)
+            if not (channel and channel.set_clipboard(text)):
+                self._adb_handler.set_clipboard(serial, text)
+        except Exception:
+            pass  # Silently fail per device
+    
+    def _add_to_clipboard_history(self, text: str, source: str = "desktop"):
+        """Add text to clipboard history (hashing and persistence happen off this thread)."""
         try:
-            if text and text not in self._clipboard_history:
-                self._clipboard_history.insert(0, text)
-                # Limit history size
-                if len(self._clipboard_history) > self._max_clipboard_history:
-                    self._clipboard_history = self._clipboard_history[:self._max_clipboard_history]
+            self._clipboard_history.add(text, source)
         except Exception:
             pass  # Silently handle history errors
     
@@ -381,11 +843,9 @@ class BackendBridge(QObject):
         """Enable/disable clipboard sync for a device."""
         try:
             self._clipboard_sync_enabled[serial] = enabled
-            if enabled:
-                # Start monitoring device clipboard periodically
-                # Create a timer for this device if needed
-                # For now, we'll poll on device status updates
-                pass
+            self._update_clipboard_monitoring()
+            # Device -> desktop changes are pushed over the device's control channel
+            self.requestClipboardChannel.emit(serial, enabled)
         except Exception:
             pass
     
@@ -399,12 +859,54 @@ class BackendBridge(QObject):
     
     @Slot(result=list)
     def get_clipboard_history(self) -> list:
-        """Get clipboard history."""
+        """Get clipboard history (newest first)."""
+        try:
+            return self._clipboard_history.texts()
+        except Exception:
+            return []
+    
+    @Slot(str, int, result=list)
+    def search_clipboard_history(self, query: str, limit: int) -> list:
+        """Search clipboard history; returns previews with id, size, timestamp and source."""
         try:
-            return self._clipboard_history.copy()
+            return self._clipboard_history.search(query, limit)
         except Exception:
             return []
     
+    @Slot(str, result=str)
+    def get_clipboard_entry(self, entry_id: str) -> str:
+        """Get the full text of a clipboard history entry."""
+        try:
+            return self._clipboard_history.get(entry_id) or ""
+        except Exception:
+            return ""
+    
+    @Slot(str)
+    def copy_clipboard_entry(self, entry_id: str):
+        """Put a history entry back on the desktop clipboard (synced devices follow)."""
+        try:
+            text = self._clipboard_history.get(entry_id)
+            if text and self._clipboard:
+                self._clipboard.setText(text)
+        except Exception:
+            pass
+    
+    @Slot(str)
+    def remove_clipboard_entry(self, entry_id: str):
+        """Remove an entry from clipboard history."""
+        try:
+            self._clipboard_history.remove(entry_id)
+        except Exception:
+            pass
+    
+    @Slot()
+    def clear_clipboard_history(self):
+        """Remove all clipboard history entries."""
+        try:
+            self._clipboard_history.clear()
+        except Exception:
+            pass
+    
     @Slot(str, result=str)
     def get_file_transfer_progress(self, serial: str, operation: str) -> int:
         """Get file transfer progress (0-100)."""
@@ -413,29 +915,6 @@ class BackendBridge(QObject):
         except Exception:
             return 0
     
-    @Slot(str)
-    def request_file_selection(self, serial: str):
-        """Open file dialog and push selected file to device."""
-        try:
-            from PySide6.QtWidgets import QFileDialog, QApplication
-            
-            app = QApplication.instance()
-            if not app:
-                self.statusMessage.emit("Application not available")
-                return
-            
-            file_path, _ = QFileDialog.getOpenFileName(
-                None,
-                "Select file to transfer",
-                os.path.expanduser("~"),
-                "All Files (*)"
-            )
-            
-            if file_path:
-                self.push_file_to_device(serial, file_path)
-        except Exception as e:
-            self.statusMessage.emit(f"File dialog error: {str(e)}")
-    
     @Slot(str)
     def fetch_icon_for_package(self, package_name):
         """Request icon fetch for a specific package (non-blocking)."""
@@ -457,60 +936,111 @@ class BackendBridge(QObject):
             pass
 
     @Slot(str)
+    @traced("bridge.select_device", start_flow=True)
     def select_device(self, serial):
         try:
             self._current_device_serial = serial
             self.statusMessage.emit(f"Selected: {serial}")
             # Clear packages immediately to indicate loading
             self._packages = []
+            self._app_model.set_catalog([])
             self.packagesChanged.emit([])
             self.requestPackages.emit(serial)
         except Exception:
             pass
 
     @Slot(str)
+    @traced("bridge.toggle_screen", start_flow=True)
     def toggle_screen(self, serial):
-        """Toggle device screen power (sleep/wake) using ADB directly."""
+        """Toggle device screen power (sleep/wake)."""
         try:
             if not serial:
-                print(f"[DEBUG] toggle_screen: No serial provided")
                 return
             
             if not self._adb_handler.adb_path:
                 self.statusMessage.emit("ADB not found. Please install Android SDK platform-tools.")
                 return
             
-            print(f"[DEBUG] toggle_screen: Toggling power for {serial}")
             self.statusMessage.emit(f"Toggling Power (Sleep/Wake) for {serial}")
-            
-            # Call ADB directly from main thread (it's a quick operation)
-            import subprocess
-            try:
-                subprocess.run(
-                    [self._adb_handler.adb_path, "-s", serial, "shell", "input", "keyevent", "26"],
-                    check=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.PIPE,
-                    timeout=5
-                )
-                print(f"[DEBUG] toggle_screen: Success for {serial}")
-                self.statusMessage.emit(f"Power toggled for {serial}")
-            except subprocess.TimeoutExpired:
-                print(f"[DEBUG] toggle_screen: Timeout for {serial}")
-                self.statusMessage.emit(f"Timeout while toggling screen for {serial}")
-            except subprocess.CalledProcessError as e:
-                error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else str(e)
-                print(f"[DEBUG] toggle_screen: Error for {serial}: {error_msg}")
-                self.statusMessage.emit(f"Failed to toggle screen for {serial}")
-            except Exception as e:
-                print(f"[DEBUG] toggle_screen: Exception for {serial}: {e}")
-                self.statusMessage.emit(f"Error: {str(e)}")
+            self.requestToggleScreen.emit(serial)
         except Exception as e:
-            print(f"[DEBUG] toggle_screen exception: {e}")
-            import traceback
-            traceback.print_exc()
             self.statusMessage.emit(f"Error: {str(e)}")
     
+    @Slot(str)
+    def toggle_scrcpy_display(self, serial):
+        """Toggle the device screen through its scrcpy window (mirroring keeps running)."""
+        try:
+            if serial:
+                self.requestScrcpyShortcut.emit(serial, "toggle")
+        except Exception:
+            pass
+    
+    @Slot(str, "QVariantList")
+    def send_keys(self, serial: str, keys):
+        """Send a key sequence (e.g. ["HOME", "APP_SWITCH"]) to a device in one batch."""
+        try:
+            if serial and keys:
+                self.requestKeySequence.emit(serial, [str(k) for k in keys])
+        except Exception:
+            pass
+    
+
+    def _screen_areas(self) -> list:
+        """Available desktop areas in device pixels, primary screen first."""
+        app = QGuiApplication.instance()
+        if not app:
+            return []
+        screens = list(app.screens())
+        primary = app.primaryScreen()
+        if primary in screens:
+            screens.remove(primary)
+            screens.insert(0, primary)
+        areas = []
+        for screen in screens:
+            geometry = screen.availableGeometry()
+            ratio = screen.devicePixelRatio()
+            areas.append((
+                int(geometry.x() * ratio), int(geometry.y() * ratio),
+                int(geometry.width() * ratio), int(geometry.height() * ratio)
+            ))
+        return areas
+
+    def _plan_window(self, width, height, extra_flags):
+        """
+        Places a new scrcpy window in the current layout, re-tiling live windows.
+        Returns the flags (with --max-size capped to the tile) and geometry kwargs.
+        """
+        if self._window_layout == "Free" or not width or not height:
+            return extra_flags, {}
+        live = self._scrcpy.sessions()
+        tiles = compute_layout(self._window_layout, self._screen_areas(), [s.aspect for s in live] + [width / height])
+        if not tiles:
+            return extra_flags, {}
+        self._move_sessions(live, tiles[:-1])
+        x, y, w, h = tiles[-1]
+        # Don't decode more pixels than the window shows
+        flags = with_max_size(extra_flags, max_size_for(tiles[-1]))
+        return flags, {"window_x": x, "window_y": y, "window_width": w, "window_height": h}
+
+    def _retile(self):
+        """Re-applies the layout to all live scrcpy windows."""
+        try:
+            if self._window_layout == "Free":
+                return
+            live = self._scrcpy.sessions()
+            tiles = compute_layout(self._window_layout, self._screen_areas(), [s.aspect for s in live])
+            self._move_sessions(live, tiles)
+        except Exception:
+            pass
+
+    def _move_sessions(self, sessions, tiles):
+        moves = []
+        for session, tile in zip(sessions, tiles):
+            if session.geometry != tile:
+                session.geometry = tile
+                moves.append([session.pid] + list(tile))
+        if moves:
+            self.requestMoveWindows.emit(moves)
 
     def _get_display_params(self, serial, mode):
         width, height, density = 1280, 800, 240 # Tablet / Default (HD+ @ 240 DPI)
@@ -518,7 +1048,10 @@ class BackendBridge(QObject):
         if mode == "Desktop":
             width, height, density = 1920, 1080, 240 # Full HD @ 240 DPI
         elif mode == "Phone":
-             # Use ADB handler directly to avoid cross-thread calls
+             caps = self._worker.capabilities.get(serial)
+             if caps and caps.get("width") and caps.get("height") and caps.get("density"):
+                 return caps["width"], caps["height"], caps["density"]
+             # Not probed yet: ask ADB directly
              try:
                  w, h = self._adb_handler.get_device_resolution(serial)
                  d = self._adb_handler.get_device_density(serial)
@@ -533,21 +1066,36 @@ class BackendBridge(QObject):
         
         return width, height, density
 
+    def _resolve_profile(self, serial: str) -> str:
+        """The "Auto" profile picks one from the device's measured network link."""
+        if self._current_profile != AUTO_PROFILE:
+            return self._current_profile
+        return recommend_profile(**self._connections.link_stats(serial))
+
+    def _profile_flags(self, serial: str) -> list:
+        return get_profile_flags(self._resolve_profile(serial))
+
     @Slot(str)
+    @traced("bridge.mirror_device", start_flow=True)
     def mirror_device(self, serial):
         try:
             if not serial:
                 return
             self.statusMessage.emit(f"Mirroring {serial}...")
             
-            # Use current profile flags
-            profile_flags = get_profile_flags(self._current_profile)
+            # The real screen size gives the session its aspect for tiling
+            width, height, density = self._get_display_params(serial, "Phone")
+            profile_flags, geometry = self._plan_window(width, height, self._profile_flags(serial))
             
             success = self._scrcpy.mirror(
                 serial,
+                width=width,
+                height=height,
+                dpi=density,
                 forward_audio=self._audio_forwarding,
                 turn_screen_off=self._launch_with_screen_off,
-                extra_flags=profile_flags
+                extra_flags=profile_flags,
+                **geometry
             )
             
             if not success:
@@ -556,6 +1104,7 @@ class BackendBridge(QObject):
             pass
 
     @Slot(str, str)
+    @traced("bridge.open_display", start_flow=True)
     def open_display(self, serial, mode):
         try:
             if not serial:
@@ -563,7 +1112,7 @@ class BackendBridge(QObject):
             self.statusMessage.emit(f"Opening new {mode} display for {serial}...")
             
             width, height, density = self._get_display_params(serial, mode)
-            profile_flags = get_profile_flags(self._current_profile)
+            profile_flags, geometry = self._plan_window(width, height, self._profile_flags(serial))
             
             success = self._scrcpy.create_display(
                 serial,
@@ -572,7 +1121,8 @@ class BackendBridge(QObject):
                 dpi=density,
                 forward_audio=self._audio_forwarding,
                 turn_screen_off=self._launch_with_screen_off,
-                extra_flags=profile_flags
+                extra_flags=profile_flags,
+                **geometry
             )
             
             if not success:
@@ -581,6 +1131,7 @@ class BackendBridge(QObject):
             pass
 
     @Slot(str)
+    @traced("bridge.launch_app", start_flow=True, serial_arg=None)
     def launch_app(self, package_name):
         try:
             if not self._current_device_serial:
@@ -591,7 +1142,7 @@ class BackendBridge(QObject):
             
             width, height, density = self._get_display_params(self._current_device_serial, self._launch_mode)
                 
-            profile_flags = get_profile_flags(self._current_profile)
+            profile_flags, geometry = self._plan_window(width, height, self._profile_flags(self._current_device_serial))
             
             success = self._scrcpy.launch_app(
                 self._current_device_serial, 
@@ -601,10 +1152,12 @@ class BackendBridge(QObject):
                 dpi=density,
                 turn_screen_off=self._launch_with_screen_off,
                 forward_audio=self._audio_forwarding,
-                extra_flags=profile_flags
+                extra_flags=profile_flags,
+                **geometry
             )
             
             if success:
+                self._attach_app_log(self._current_device_serial, package_name)
                 self.statusMessage.emit(f"Launched {package_name}")
             else:
                 self.statusMessage.emit("Failed to launch scrcpy")
@@ -643,10 +1196,12 @@ class BackendBridge(QObject):
                 self._device_names[serial] = name
                 self._save_device_names()
                 # Update devices list
-                for device in self._devices:
-                    if device.get("serial") == serial:
-                        device["custom_name"] = name
-                self.devicesChanged.emit(self._devices)
+                device = self._registry.get(serial)
+                if device is not None:
+                    device.custom_name = name
+                    self._device_model.field_changed(serial, "custom_name")
+                    self._devices = self._registry.to_list()
+                    self.devicesChanged.emit(self._devices)
         except Exception:
             pass
     
@@ -683,6 +1238,14 @@ class BackendBridge(QObject):
         except Exception:
             pass
     
+    @Slot(str, result=list)
+    def get_groups_of_device(self, serial: str) -> list:
+        """Names of the groups serial belongs to."""
+        try:
+            return sorted(name for name, serials in self._device_groups.items() if serial in serials)
+        except Exception:
+            return []
+    
     def get_device_groups(self) -> dict:
         """Get all device groups."""
         return self._device_groups.copy()
@@ -691,11 +1254,92 @@ class BackendBridge(QObject):
         """Get list of device serials in a group."""
         return self._device_groups.get(group_name, []).copy()
     
+    @Slot(str)
+    def add_network_device(self, address: str):
+        """Remembers a host[:port] endpoint and keeps it connected."""
+        try:
+            address = self._connections.add(address)
+            if address:
+                self.statusMessage.emit(f"Connecting to {address}...")
+                self.networkDevicesChanged.emit()
+        except Exception:
+            pass
+    
+    @Slot(str)
+    def remove_network_device(self, address: str):
+        try:
+            self._connections.remove(address)
+            self._endpoint_states.pop(address, None)
+            self.networkDevicesChanged.emit()
+            self.requestDevices.emit()
+        except Exception:
+            pass
+    
+    @Slot()
+    def reconnect_network_devices(self):
+        try:
+            self._connections.reconnect_all()
+        except Exception:
+            pass
+    
+    @Slot(result=list)
+    def get_network_devices(self) -> list:
+        """Endpoints with state, latency_ms and throughput (bytes/s)."""
+        try:
+            return self._connections.endpoints()
+        except Exception:
+            return []
+    
+    @Slot(list)
+    def _on_discovery_changed(self, candidates):
+        try:
+            self._discovered = candidates
+            self.discoveredDevicesChanged.emit(candidates)
+        except Exception:
+            pass
+    
+    @Slot()
+    def refresh_discovery(self):
+        try:
+            self._discovery.refresh()
+        except Exception:
+            pass
+    
+    @Slot()
+    def connect_discovered_devices(self):
+        """Connects every advertised endpoint; the connections run in parallel off the GUI thread."""
+        try:
+            known = set(self._connections.addresses())
+            addresses = [c["address"] for c in self._discovered if c["address"] not in known]
+            for address in addresses:
+                self._connections.add(address)
+            if addresses:
+                self.statusMessage.emit(f"Connecting to {len(addresses)} nearby device(s)...")
+                self.networkDevicesChanged.emit()
+        except Exception:
+            pass
+    
+    @Slot(str, dict)
+    def _on_endpoint_changed(self, address, info):
+        try:
+            state = info.get("state")
+            previous = self._endpoint_states.get(address)
+            self._endpoint_states[address] = state
+            if (state == "connected") != (previous == "connected"):
+                if state == "connected":
+                    self.statusMessage.emit(f"Connected to {address}")
+                # Pick up (or drop) the device without waiting for the next poll
+                self.requestDevices.emit()
+            self.networkDevicesChanged.emit()
+        except Exception:
+            pass
+    
     @Slot(str, result=dict)
     def get_device_status(self, serial: str) -> dict:
         """Get cached device status."""
         try:
-            status = self._device_status.get(serial, {})
+            device = self._registry.get(serial)
+            status = device.status_info if device is not None else {}
             # Ensure all values are properly typed for QML
             result = {}
             if status:
@@ -714,6 +1358,7 @@ class BackendBridge(QObject):
             return {}
     
     @Slot(str, "QVariantList")
+    @traced("bridge.launch_app_on_multiple_devices", start_flow=True, serial_arg=None)
     def launch_app_on_multiple_devices(self, package_name: str, device_serials):
         """Launch an app on multiple devices simultaneously."""
         try:
@@ -732,9 +1377,9 @@ class BackendBridge(QObject):
             for serial in serials_list:
                 if serial:
                     width, height, density = self._get_display_params(serial, self._launch_mode)
-                    profile_flags = get_profile_flags(self._current_profile)
+                    profile_flags, geometry = self._plan_window(width, height, self._profile_flags(serial))
                     
-                    self._scrcpy.launch_app(
+                    launched = self._scrcpy.launch_app(
                         serial,
                         package_name,
                         width=width,
@@ -742,14 +1387,123 @@ class BackendBridge(QObject):
                         dpi=density,
                         turn_screen_off=self._launch_with_screen_off,
                         forward_audio=self._audio_forwarding,
-                        extra_flags=profile_flags
+                        extra_flags=profile_flags,
+                        **geometry
                     )
+                    if launched:
+                        self._attach_app_log(serial, package_name)
             
             self.statusMessage.emit(f"Launched {package_name} on {len(serials_list)} device(s)")
         except Exception:
             pass
+
+    @Slot(str, result=list)
+    def search_all_apps(self, query: str):
+        """Apps matching query across all connected devices, each with the devices (and version codes) that have it."""
+        try:
+            results = self._app_index.search(query)
+            for entry in results:
+                for installed in entry["devices"]:
+                    device = self._registry.get(installed["serial"])
+                    installed["name"] = (device.custom_name or device.model) if device else installed["serial"]
+            return results
+        except Exception:
+            return []
+    
+    @Slot(str, result=dict)
+    def find_app_devices(self, package_name: str):
+        """{serial: versionCode} of the connected devices that have package_name installed."""
+        try:
+            return self._app_index.installs(package_name)
+        except Exception:
+            return {}
+    
+    @Slot()
+    def refresh_app_index(self):
+        """Re-reads every online device's package list; unchanged catalogs leave the index untouched."""
+        try:
+            for device in self._registry:
+                if device.status == "device":
+                    self.requestCatalog.emit(device.serial)
+        except Exception:
+            pass
+    
+    @Slot(str, str)
+    @traced("bridge.launch_app_on_device", start_flow=True)
+    def launch_app_on_device(self, serial: str, package_name: str):
+        """Launches an app on a specific device (e.g. from a global search result)."""
+        self.launch_app_on_multiple_devices(package_name, [serial])
+    
+    @Slot(list, list)
+    @traced("bridge.install_apks", start_flow=True)
+    def install_apks(self, serials, paths):
+        """
+        Installs an APK, or a base APK with its splits, on serials (every
+        online device if empty), all at once in the background. Devices that
+        already have the same APK files are skipped.
+        """
+        try:
+            if not self._adb_handler.adb_path:
+                self.statusMessage.emit("ADB not found. Please install Android SDK platform-tools.")
+                return
+            serials = list(serials) or [device.serial for device in self._registry if device.status == "device"]
+            paths = [path for path in paths if path]
+            if not serials or not paths:
+                return
+            self.statusMessage.emit(f"Installing {os.path.basename(paths[0])} on {len(serials)} device(s)...")
+            threading.Thread(target=self._run_install, args=(serials, paths), name="install", daemon=True).start()
+        except Exception:
+            pass
+    
+    @Slot(str, list)
+    def install_apks_on_group(self, group_name: str, paths):
+        """Installs on the group's devices that are online."""
+        try:
+            online = {device.serial for device in self._registry if device.status == "device"}
+            serials = [serial for serial in self._device_groups.get(group_name, []) if serial in online]
+            if not serials:
+                self.statusMessage.emit(f"No device of {group_name} is online")
+                return
+            self.install_apks(serials, paths)
+        except Exception:
+            pass
+    
+    def _run_install(self, serials: list, paths: list):
+        start = time.monotonic()
+        try:
+            apks = APKSet(paths)
+        except (InstallError, OSError) as e:
+            self._installBatchDone.emit(os.path.basename(paths[0]), str(e), {})
+            return
+        results = self._installer.install(
+            serials, apks, on_result=lambda result: self._installResult.emit(dict(result, launchable=apks.launchable))
+        )
+        self._installBatchDone.emit(apks.package, "", dict(summarize(results), seconds=round(time.monotonic() - start, 1)))
+    
+    @Slot(list, str)
+    @traced("bridge.uninstall_package", start_flow=True)
+    def uninstall_package(self, serials, package_name: str):
+        """Uninstalls package_name from serials in parallel."""
+        try:
+            if not self._adb_handler.adb_path or not serials or not package_name:
+                return
+            self.statusMessage.emit(f"Uninstalling {package_name} from {len(serials)} device(s)...")
+            threading.Thread(target=self._run_uninstall, args=(list(serials), package_name),
+                             name="uninstall", daemon=True).start()
+        except Exception:
+            pass
+    
+    def _run_uninstall(self, serials: list, package_name: str):
+        start = time.monotonic()
+        try:
+            results = self._installer.uninstall(serials, package_name, on_result=self._installResult.emit)
+        except InstallError as e:
+            self._installBatchDone.emit(package_name, str(e), {})
+            return
+        self._installBatchDone.emit(package_name, "", dict(summarize(results), seconds=round(time.monotonic() - start, 1)))
     
     @Slot(str)
+    @traced("bridge.capture_screenshot", start_flow=True)
     def capture_screenshot(self, serial: str):
         """Capture screenshot from device."""
         try:
@@ -758,6 +1512,137 @@ class BackendBridge(QObject):
         except Exception:
             pass
     
+    @Slot(str)
+    def start_recording(self, serial: str):
+        """Start a headless recording of the device screen with the current profile."""
+        try:
+            if not serial:
+                return
+            started = self._recorder.start(
+                serial,
+                time_limit=self._recording_time_limit,
+                segment_seconds=self._recording_segment_seconds,
+                max_bytes=self._recording_max_bytes,
+                extra_flags=get_record_flags(self._resolve_profile(serial))
+            )
+            if started:
+                self.recordingChanged.emit(serial, True)
+                self.statusMessage.emit(f"Recording {serial} to {self._recorder.output_dir}")
+        except Exception as e:
+            self.statusMessage.emit(f"Recording error: {str(e)}")
+    
+    @Slot(str)
+    def stop_recording(self, serial: str):
+        """Stop the recording of a device; the current segment is finalized."""
+        try:
+            if serial:
+                self._recorder.stop(serial)
+        except Exception:
+            pass
+    
+    @Slot(str, result=bool)
+    def is_recording(self, serial: str) -> bool:
+        """Whether a recording session is running for the device."""
+        try:
+            return self._recorder.is_recording(serial)
+        except Exception:
+            return False
+    
+    @Slot(int, int, int)
+    def set_recording_limits(self, time_limit: int, segment_seconds: int, max_megabytes: int):
+        """Configure limits for new recordings (seconds, seconds, MB; 0 disables a limit)."""
+        try:
+            self._recording_time_limit = max(0, time_limit)
+            self._recording_segment_seconds = max(0, segment_seconds)
+            self._recording_max_bytes = max(0, max_megabytes) * 1024 * 1024
+        except Exception:
+            pass
+    
+    @Slot(result=list)
+    def get_recording_stats(self) -> list:
+        """Per-session recording stats (segments, bytes written, disk throughput)."""
+        try:
+            return self._recorder.stats()
+        except Exception:
+            return []
+    
+    @Slot(str, str, str, int, bool)
+    def start_logcat(self, serial: str, filters: str, priority: str, pid: int, spill: bool):
+        """
+        (Re)start streaming the device log into logcatModel. filters are
+        logcat filter specs ("ActivityManager:I MyApp:V"), priority is the
+        minimum level for other tags; both are applied on the device.
+        """
+        try:
+            if not serial:
+                return
+            stream = self._logcat.start(
+                serial,
+                filters=filters.split(),
+                priority=priority if priority in PRIORITIES else "",
+                pid=max(0, pid),
+                spill=spill
+            )
+            if stream:
+                self._logcat_model.set_stream(stream)
+                self.logcatChanged.emit(serial, True)
+                if stream.spill_path:
+                    self.statusMessage.emit(f"Saving logcat to {stream.spill_path}")
+        except Exception as e:
+            self.statusMessage.emit(f"Logcat error: {str(e)}")
+    
+    @Slot(str)
+    def stop_logcat(self, serial: str):
+        """Stop the device's logcat stream; received lines stay visible."""
+        try:
+            if serial:
+                self._logcat.stop(serial)
+        except Exception:
+            pass
+    
+    @Slot(str)
+    def show_logcat(self, serial: str):
+        """Point logcatModel at the device's stream (empty serial detaches it)."""
+        try:
+            self._logcat_model.set_stream(self._logcat.get(serial) if serial else None)
+        except Exception:
+            pass
+    
+    @Slot()
+    def clear_logcat(self):
+        """Clear the visible log."""
+        try:
+            self._logcat_model.clear()
+        except Exception:
+            pass
+    
+    @Slot(str, result=list)
+    def get_app_logs(self, serial: str) -> list:
+        """Launched app windows on the device (empty serial: all) with their process, log file and crashes."""
+        try:
+            return [app_log.to_dict() for app_log in self._app_logs.sessions(serial or None)]
+        except Exception:
+            return []
+    
+    @Slot(int)
+    def show_app_log(self, session_pid: int):
+        """Point logcatModel at the log of the app window with this scrcpy PID."""
+        try:
+            app_log = self._app_logs.get(session_pid)
+            if app_log:
+                self._logcat_model.set_stream(app_log)
+        except Exception:
+            pass
+    
+    @Slot(str, result=bool)
+    def is_logcat_running(self, serial: str) -> bool:
+        """Whether a logcat stream is running for the device."""
+        try:
+            stream = self._logcat.get(serial)
+            return bool(stream and stream.running)
+        except Exception:
+            return False
+    
     @Slot(str, str, int)
     def set_volume(self, serial: str, stream: str, level: int):
         """Set volume for a stream (music, ring, alarm, etc.)."""
@@ -906,8 +1791,22 @@ class BackendBridge(QObject):
         """Stops the worker thread gracefully."""
         try:
             # Stop clipboard monitoring
-            if self._clipboard_timer:
-                self._clipboard_timer.stop()
+            self._clipboard_sync_enabled.clear()
+            self._update_clipboard_monitoring()
+            self._clipboard_pool.clear()
+            self._clipboard_history.close()
+            
+            # Finalize running recordings
+            if self._recorder:
+                self._recorder.stop_all(wait=3)
+            self._logcat.stop_all(wait=1)
+            self._app_logs.close_all()
+            
+            self._metrics_dump_timer.stop()
+            if self._metrics_server:
+                self._metrics_server.shutdown()
+            self._discovery.stop()
+            self._connections.stop()
             
             # Stop worker operations immediately
             if self._worker:
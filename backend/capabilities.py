@@ -0,0 +1,162 @@
+import json
+import threading
+from typing import Dict, Optional
+from PySide6.QtCore import QSettings
+from .adb_handler import parse_wm_size, parse_wm_density, run_adb
+from .tracing import get_logger
+
+log = get_logger("adb")
+
+# Everything static about a device in one shell round trip; sections are
+# delimited by marker lines so a missing command doesn't shift the others
+PROBE_SCRIPT = "; ".join([
+    "echo @size", "wm size",
+    "echo @density", "wm density",
+    "echo @sdk", "getprop ro.build.version.sdk",
+    "echo @abi", "getprop ro.product.cpu.abi",
+    "echo @model", "getprop ro.product.model",
+    "echo @fingerprint", "getprop ro.build.fingerprint",
+    "echo @boot", "cat /proc/sys/kernel/random/boot_id",
+    "echo @encoders",
+    "cat /vendor/etc/media_codecs*.xml /system/etc/media_codecs*.xml 2>/dev/null"
+    " | grep -o 'name=\"[^\"]*[Ee]ncoder[^\"]*\"' | sort -u",
+])
+
+# Cheap check whether cached facts still hold (same build, no reboot since)
+VALIDATE_SCRIPT = "getprop ro.build.fingerprint; cat /proc/sys/kernel/random/boot_id"
+
+# scrcpy requirements by Android API level
+MIN_SDK_SCRCPY = 21
+MIN_SDK_AUDIO = 30
+MIN_SDK_VIRTUAL_DISPLAY = 29
+
+
+def parse_probe(output: str) -> Dict:
+    sections = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("@"):
+            current = line[1:].strip()
+            sections[current] = []
+        elif current is not None:
+            sections[current].append(line.rstrip("\r"))
+
+    def text(name):
+        return "\n".join(sections.get(name, [])).strip()
+
+    try:
+        sdk = int(text("sdk"))
+    except ValueError:
+        sdk = 0
+
+    resolution = parse_wm_size(text("size"))
+    encoders = []
+    for line in sections.get("encoders", []):
+        line = line.strip()
+        if line.startswith('name="'):
+            encoders.append(line[len('name="'):].rstrip('"'))
+
+    return {
+        "width": resolution[0] if resolution else 0,
+        "height": resolution[1] if resolution else 0,
+        "density": parse_wm_density(text("density")) or 0,
+        "sdk": sdk,
+        "abi": text("abi"),
+        "model": text("model"),
+        "fingerprint": text("fingerprint"),
+        "boot_id": text("boot"),
+        "encoders": encoders,
+        "scrcpy_compatible": sdk >= MIN_SDK_SCRCPY,
+        "audio_forwarding": sdk >= MIN_SDK_AUDIO,
+        "virtual_display": sdk >= MIN_SDK_VIRTUAL_DISPLAY,
+    }
+
+
+class CapabilityStore:
+    """
+    Per-serial static device facts, probed once and persisted in QSettings.
+
+    Entries are re-validated once per run (and whenever a device reappears)
+    by comparing the build fingerprint and boot id; a change triggers a new
+    full probe. Readers only ever hit memory.
+    """
+
+    SETTINGS_KEY = "device_capabilities"
+
+    def __init__(self, adb_path: Optional[str]):
+        self.adb_path = adb_path
+        self._lock = threading.Lock()
+        self._validated = set()  # serials confirmed fresh in this run
+        self._caps: Dict[str, Dict] = self._load()
+
+    def get(self, serial: str) -> Optional[Dict]:
+        with self._lock:
+            caps = self._caps.get(serial)
+            return dict(caps) if caps else None
+
+    def is_fresh(self, serial: str) -> bool:
+        with self._lock:
+            return serial in self._validated
+
+    def invalidate(self, serial: str):
+        """Forces re-validation the next time the device is seen (e.g. it went offline)."""
+        with self._lock:
+            self._validated.discard(serial)
+
+    def ensure(self, serial: str) -> Optional[Dict]:
+        """Blocking: validates or (re)probes the device. Call from a worker thread."""
+        if self.is_fresh(serial):
+            return self.get(serial)
+        if not self.adb_path:
+            return self.get(serial)
+
+        cached = self.get(serial)
+        if cached and self._still_valid(serial, cached):
+            with self._lock:
+                self._validated.add(serial)
+            return cached
+
+        caps = self._probe(serial)
+        if caps is None:
+            return cached
+        with self._lock:
+            self._caps[serial] = caps
+            self._validated.add(serial)
+        self._save()
+        return dict(caps)
+
+    def _run(self, serial: str, script: str) -> Optional[str]:
+        try:
+            result = run_adb(
+                [self.adb_path, "-s", serial, "shell", script],
+                capture_output=True, text=True, timeout=10
+            )
+            return result.stdout if result.returncode == 0 else None
+        except Exception as e:
+            log.error("Error probing capabilities for %s: %s", serial, e)
+            return None
+
+    def _still_valid(self, serial: str, cached: Dict) -> bool:
+        output = self._run(serial, VALIDATE_SCRIPT)
+        if output is None:
+            return False
+        lines = [line.strip() for line in output.strip().splitlines()]
+        return len(lines) >= 2 and lines[0] == cached.get("fingerprint") and lines[1] == cached.get("boot_id")
+
+    def _probe(self, serial: str) -> Optional[Dict]:
+        output = self._run(serial, PROBE_SCRIPT)
+        if not output:
+            return None
+        return parse_probe(output)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            data = QSettings("UMC", "DeviceManager").value(self.SETTINGS_KEY, "{}")
+            return json.loads(data) if data else {}
+        except Exception:
+            return {}
+
+    def _save(self):
+        with self._lock:
+            data = json.dumps(self._caps)
+        QSettings("UMC", "DeviceManager").setValue(self.SETTINGS_KEY, data)
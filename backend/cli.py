@@ -0,0 +1,390 @@
+"""
+`umc <command>`: scripted device operations without the GUI.
+
+Each command imports only the handlers it uses, so nothing here loads Qt
+(device groups read the GUI's settings through QtCore alone). Per-device
+work runs concurrently on a thread pool; --json prints one object keyed
+by serial, and the exit status is 1 if any device failed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+COMMANDS = ("devices", "status", "launch", "mirror", "push", "pull", "install", "uninstall", "screenshot", "record",
+            "broadcast", "daemon")
+
+# Same presets as the GUI's launch modes; Phone uses the device's own resolution
+DISPLAY_MODES = {"Tablet": (1280, 800, 240), "Desktop": (1920, 1080, 240), "Phone": None}
+
+# Commands that only read from devices default to every online device
+READ_ONLY = ("status", "screenshot")
+
+# Devices handled in parallel unless -j says otherwise; a rollout takes as
+# long as the slowest device, not the sum of them
+DEFAULT_JOBS = 16
+COMMAND_JOBS = {"install": 64}
+
+
+class CommandError(Exception):
+    pass
+
+
+def _adb():
+    from .device import get_adb_handler
+    return get_adb_handler()
+
+
+def _load_groups() -> dict:
+    try:
+        from PySide6.QtCore import QSettings
+    except ImportError:
+        raise CommandError("--group needs PySide6 (QtCore) to read the UMC settings")
+    try:
+        return json.loads(QSettings("UMC", "DeviceManager").value("device_groups", "{}") or "{}")
+    except ValueError:
+        return {}
+
+
+def resolve_targets(args) -> list:
+    """
+    Serials selected by -s/--group/--all, limited to online devices. The
+    selected ones that are not online are kept in args.offline and reported
+    as failed (see with_offline).
+    """
+    online = [d["serial"] for d in _adb().get_devices() if d.get("status") == "device"]
+    wanted = list(args.serial or [])
+    if args.group:
+        groups = _load_groups()
+        for name in args.group:
+            if name not in groups:
+                raise CommandError(f"Unknown group: {name} (known: {', '.join(sorted(groups)) or 'none'})")
+            wanted += groups[name]
+    if args.all or (not wanted and (args.command in READ_ONLY or len(online) == 1)):
+        wanted += online
+    if not wanted:
+        raise CommandError(f"{len(online)} devices online; choose with -s SERIAL, --group NAME or --all")
+    serials = list(dict.fromkeys(wanted))
+    # Offline group members do not stop the others, but they fail the run
+    args.offline = [serial for serial in serials if serial not in online]
+    return [serial for serial in serials if serial in online]
+
+
+def with_offline(args, results: dict) -> dict:
+    """results plus a failed result for every selected device that was not online."""
+    for serial in getattr(args, "offline", []):
+        results.setdefault(serial, {"ok": False, "error": "not online"})
+    return results
+
+
+def run_on_devices(serials: list, func, jobs: int) -> dict:
+    """{serial: result dict} running func(serial) concurrently; exceptions become errors."""
+    def one(serial):
+        try:
+            result = func(serial)
+            return result if isinstance(result, dict) else {"ok": bool(result)}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    if not serials:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(serials)))) as pool:
+        return dict(zip(serials, pool.map(one, serials)))
+
+
+def display_params(serial: str, args) -> tuple:
+    preset = DISPLAY_MODES[args.mode]
+    if preset is None:
+        adb = _adb()
+        width, height = adb.get_device_resolution(serial)
+        preset = (width, height, adb.get_device_density(serial))
+    width, height, dpi = preset
+    return args.width or width, args.height or height, args.dpi or dpi
+
+
+def _daemon():
+    from .daemon import DaemonClient
+    return DaemonClient.connect_if_running()
+
+
+def _wait_for_processes(processes: list, interrupt_signal=None):
+    """Blocks until every process exits; Ctrl+C forwards interrupt_signal (terminate by default)."""
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            if process.poll() is None:
+                if interrupt_signal is None:
+                    process.terminate()
+                else:
+                    process.send_signal(interrupt_signal)
+        for process in processes:
+            process.wait()
+
+
+# --- commands
+
+def cmd_devices(args):
+    return {device["serial"]: {"ok": True, **device} for device in _adb().get_devices()}
+
+
+def cmd_status(args):
+    adb = _adb()
+    return run_on_devices(resolve_targets(args), lambda serial: {"ok": True, **adb.get_device_status_info(serial)}, args.jobs)
+
+
+def _start_sessions(args, kind: str) -> dict:
+    from .profiles import get_profile_flags
+    serials = resolve_targets(args)
+    flags = get_profile_flags(args.profile)
+    daemon = _daemon()
+    if daemon:
+        # The daemon owns the windows, so this command can return right away
+        def start(serial):
+            width, height, dpi = display_params(serial, args)
+            params = {"serial": serial, "width": width, "height": height, "profile": args.profile,
+                      "turn_screen_off": args.screen_off, "audio": args.audio}
+            if kind == "app":
+                return {"ok": True, **daemon.call("app.launch", package=args.package, dpi=dpi, **params)}
+            return {"ok": True, **daemon.call("device.mirror", **params)}
+        # One connection serializes calls; scrcpy starts are quick
+        return run_on_devices(serials, start, 1)
+
+    from .device import get_scrcpy_handler
+    scrcpy = get_scrcpy_handler()
+
+    def start(serial):
+        width, height, dpi = display_params(serial, args)
+        options = dict(width=width, height=height, dpi=dpi, turn_screen_off=args.screen_off,
+                       forward_audio=args.audio, extra_flags=flags)
+        if kind == "app":
+            ok = scrcpy.launch_app(serial, args.package, **options)
+        else:
+            ok = scrcpy.mirror(serial, **options)
+        session = scrcpy.latest_session(serial) if ok else None
+        return {"ok": bool(session), "pid": session.pid if session else None}
+
+    results = run_on_devices(serials, start, args.jobs)
+    processes = [session.process for session in scrcpy.sessions()]
+    if processes:
+        # Without a daemon the windows belong to this process: report now, stay until they close
+        _print(args, with_offline(args, results))
+        args.printed = True
+        print("umc: close the windows or press Ctrl+C to stop", file=sys.stderr)
+        _wait_for_processes(processes)
+    return results
+
+
+def cmd_launch(args):
+    return _start_sessions(args, "app")
+
+
+def cmd_mirror(args):
+    return _start_sessions(args, "mirror")
+
+
+def cmd_push(args):
+    if not os.path.exists(args.local):
+        raise CommandError(f"No such file: {args.local}")
+    adb = _adb()
+    return run_on_devices(resolve_targets(args), lambda serial: adb.push_file(serial, args.local, args.remote), args.jobs)
+
+
+def cmd_pull(args):
+    adb = _adb()
+    serials = resolve_targets(args)
+    name = os.path.basename(args.remote.rstrip("/"))
+
+    def pull(serial):
+        # One subdirectory per device when pulling from several
+        directory = os.path.join(args.dest, serial) if len(serials) > 1 else args.dest
+        os.makedirs(directory, exist_ok=True)
+        local = os.path.join(directory, name)
+        return {"ok": adb.pull_file(serial, args.remote, local), "local": local}
+
+    return run_on_devices(serials, pull, args.jobs)
+
+
+def _install_result(result: dict, **details) -> dict:
+    if result["status"] == "failed":
+        return {"ok": False, "error": result["message"], **details}
+    return {"ok": True, **details}
+
+
+def cmd_install(args):
+    from .installer import APKInstaller, APKSet, InstallError
+    try:
+        apks = APKSet(args.apks)
+    except (InstallError, OSError) as e:
+        raise CommandError(str(e))
+    installer = APKInstaller(_adb().adb_path, max_workers=args.jobs)
+    results = installer.install(resolve_targets(args), apks, force=args.force, downgrade=args.downgrade,
+                                grant=args.grant)
+    return {result["serial"]: _install_result(result, status=result["status"], version=result["version"],
+                                              seconds=result["seconds"]) for result in results}
+
+
+def cmd_uninstall(args):
+    from .installer import APKInstaller, InstallError
+    installer = APKInstaller(_adb().adb_path, max_workers=args.jobs)
+    try:
+        results = installer.uninstall(resolve_targets(args), args.package)
+    except InstallError as e:
+        raise CommandError(str(e))
+    return {result["serial"]: _install_result(result) for result in results}
+
+
+def cmd_screenshot(args):
+    adb = _adb()
+    os.makedirs(args.dest, exist_ok=True)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+
+    def capture(serial):
+        path = os.path.join(args.dest, f"screenshot_{serial.replace(':', '_')}_{timestamp}.png")
+        return {"ok": adb.capture_screenshot(serial, path), "path": path}
+
+    return run_on_devices(resolve_targets(args), capture, args.jobs)
+
+
+def cmd_record(args):
+    import signal
+    import subprocess
+    from .device import get_scrcpy_handler
+    from .profiles import get_record_flags
+    scrcpy = get_scrcpy_handler()
+    flags = get_record_flags(args.profile)
+    os.makedirs(args.dest, exist_ok=True)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    processes, results = [], {}
+    for serial in resolve_targets(args):
+        path = os.path.join(args.dest, f"recording_{serial.replace(':', '_')}_{timestamp}.mp4")
+        cmd = scrcpy.build_record_command(serial, path, time_limit=args.time_limit, extra_flags=flags)
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            results[serial] = {"ok": False, "error": str(e)}
+            continue
+        processes.append((serial, path, process))
+    if not args.time_limit:
+        print("umc: recording, press Ctrl+C to stop", file=sys.stderr)
+    # SIGINT lets scrcpy finalize the file
+    _wait_for_processes([process for _, _, process in processes], signal.SIGINT)
+    for serial, path, process in processes:
+        results[serial] = {"ok": process.returncode == 0 and os.path.exists(path), "path": path}
+    return results
+
+
+def cmd_broadcast(args):
+    import shlex
+    from .adb_handler import run_adb
+    adb = _adb()
+    if not adb.adb_path:
+        raise CommandError("adb not found")
+    command = args.shell_command[1:] if args.shell_command[:1] == ["--"] else args.shell_command
+    if not command:
+        raise CommandError("Nothing to run; usage: umc broadcast [targets] -- <shell command>")
+
+    def run(serial):
+        result = run_adb([adb.adb_path, "-s", serial, "shell", shlex.join(command)],
+                         capture_output=True, text=True, timeout=args.timeout)
+        return {"ok": result.returncode == 0, "exit_code": result.returncode, "output": result.stdout.rstrip("\n")}
+
+    return run_on_devices(resolve_targets(args), run, args.jobs)
+
+
+def cmd_daemon(argv: list):
+    from .daemon import main as daemon_main
+    return daemon_main(argv)
+
+
+# --- output
+
+def _print(args, results: dict):
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for serial, result in results.items():
+        details = " ".join(f"{key}={value}" for key, value in result.items() if key not in ("ok", "error", "output", "serial"))
+        state = "ok" if result.get("ok") else f"FAILED {result.get('error', '')}".rstrip()
+        print(f"{serial}: {state} {details}".rstrip())
+        if result.get("output"):
+            for line in result["output"].splitlines():
+                print(f"  {line}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="umc", description="Unified Mobile Controller command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print results as JSON")
+
+    targets = argparse.ArgumentParser(add_help=False, parents=[common])
+    targets.add_argument("-s", "--serial", action="append", help="device serial (repeatable)")
+    targets.add_argument("-g", "--group", action="append", help="device group from the GUI (repeatable)")
+    targets.add_argument("-a", "--all", action="store_true", help="every online device")
+    targets.add_argument("-j", "--jobs", type=int,
+                         help=f"devices handled in parallel (default {DEFAULT_JOBS}, {COMMAND_JOBS['install']} for install)")
+
+    display = argparse.ArgumentParser(add_help=False)
+    display.add_argument("--mode", choices=DISPLAY_MODES, default="Tablet")
+    display.add_argument("--width", type=int)
+    display.add_argument("--height", type=int)
+    display.add_argument("--dpi", type=int)
+    display.add_argument("--profile", default="Default", help="performance profile")
+    display.add_argument("--screen-off", action="store_true", help="turn the device screen off")
+    display.add_argument("--audio", action="store_true", help="forward audio")
+
+    commands.add_parser("devices", parents=[common], help="list connected devices")
+    commands.add_parser("status", parents=[targets], help="battery, temperature, storage and network")
+    launch = commands.add_parser("launch", parents=[targets, display], help="launch an app in a new display")
+    launch.add_argument("package")
+    commands.add_parser("mirror", parents=[targets, display], help="mirror the device screen")
+    push = commands.add_parser("push", parents=[targets], help="copy a file to the devices")
+    push.add_argument("local")
+    push.add_argument("remote", nargs="?", default="/sdcard/Download/")
+    pull = commands.add_parser("pull", parents=[targets], help="copy a file from the devices")
+    pull.add_argument("remote")
+    pull.add_argument("dest", nargs="?", default=".")
+    install = commands.add_parser("install", parents=[targets], help="install an APK (or a base APK and its splits)")
+    install.add_argument("apks", nargs="+")
+    install.add_argument("-r", "--force", action="store_true", help="reinstall even if the same APKs are installed")
+    install.add_argument("-d", "--downgrade", action="store_true", help="allow a lower version code")
+    install.add_argument("--grant", action="store_true", help="grant all runtime permissions")
+    uninstall = commands.add_parser("uninstall", parents=[targets], help="remove an app from the devices")
+    uninstall.add_argument("package")
+    screenshot = commands.add_parser("screenshot", parents=[targets], help="capture the screens")
+    screenshot.add_argument("dest", nargs="?", default=".")
+    record = commands.add_parser("record", parents=[targets], help="record the screens (headless)")
+    record.add_argument("dest", nargs="?", default=".")
+    record.add_argument("--time-limit", type=int, default=0, help="seconds (default: until Ctrl+C)")
+    record.add_argument("--profile", default="Default", help="performance profile")
+    broadcast = commands.add_parser("broadcast", parents=[targets], help="run a shell command on the devices")
+    broadcast.add_argument("--timeout", type=float, default=60)
+    broadcast.add_argument("shell_command", nargs=argparse.REMAINDER)
+    commands.add_parser("daemon", help="run headless and serve the JSON-RPC API (see `umc daemon --help`)")
+    return parser
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["daemon"]:
+        # The daemon parses its own options
+        return cmd_daemon(argv[1:])
+    args = build_parser().parse_args(argv)
+    if getattr(args, "jobs", 0) is None:
+        args.jobs = COMMAND_JOBS.get(args.command, DEFAULT_JOBS)
+    try:
+        results = globals()[f"cmd_{args.command}"](args)
+    except CommandError as e:
+        print(f"umc: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    results = with_offline(args, results)
+    if not getattr(args, "printed", False):
+        _print(args, results)
+    return 0 if all(result.get("ok") for result in results.values()) else 1
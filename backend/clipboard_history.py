@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from .tracing import get_logger
+
+log = get_logger("clipboard")
+
+
+class ClipboardHistory:
+    """
+    Clipboard history keyed by content hash.
+
+    Dedup is a dict lookup, eviction honours both an entry count and a total
+    byte budget, and every change is appended to a JSON-lines log that is
+    compacted once it grows well past the live entries; copying text that is
+    already in the history logs a small "touch" record, not the text. Hashing, search
+    indexing and disk writes happen on a private single-threaded executor so
+    large pastes never run on the caller's (GUI) thread; ordering of adds is
+    preserved.
+    """
+
+    PREVIEW_LENGTH = 200
+
+    def __init__(self, path: str, max_entries: int = 50, max_bytes: int = 8 * 1024 * 1024,
+                 max_entry_bytes: int = 1024 * 1024, on_changed: Callable[[], None] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.on_changed = on_changed
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()  # digest -> entry, newest last
+        self._total_bytes = 0
+        self._log_records = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clipboard-history")
+        self._executor.submit(self._load)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def add(self, text: str, source: str = "desktop"):
+        """Queues text for insertion; returns immediately."""
+        if text:
+            self._executor.submit(self._add, text, source, time.time())
+
+    def remove(self, entry_id: str):
+        self._executor.submit(self._remove, entry_id)
+
+    def clear(self):
+        self._executor.submit(self._clear)
+
+    def get(self, entry_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            return entry["text"] if entry else None
+
+    def texts(self) -> List[str]:
+        with self._lock:
+            return [entry["text"] for entry in reversed(self._entries.values())]
+
+    def search(self, query: str = "", limit: int = 50) -> List[Dict]:
+        """Newest-first entries whose text contains query (case-insensitive), as previews."""
+        query = (query or "").lower()
+        results = []
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                if query and query not in entry["lower"]:
+                    continue
+                results.append({
+                    "id": entry["id"],
+                    "preview": entry["text"][:self.PREVIEW_LENGTH],
+                    "size": entry["size"],
+                    "timestamp": entry["timestamp"],
+                    "source": entry["source"]
+                })
+                if limit and len(results) >= limit:
+                    break
+        return results
+
+    def flush(self, timeout: float = 2):
+        """Waits for queued work (used on shutdown)."""
+        try:
+            self._executor.submit(lambda: None).result(timeout)
+        except Exception:
+            pass
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=False)
+
+    # Executor-side operations
+
+    def _add(self, text: str, source: str, timestamp: float):
+        data = text.encode("utf-8", errors="replace")
+        if len(data) > self.max_entry_bytes:
+            # Keep huge blobs out of the history; only the head is remembered
+            data = data[:self.max_entry_bytes]
+            text = data.decode("utf-8", errors="ignore")
+        entry_id = self.digest(data)
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry:
+                entry["timestamp"] = timestamp
+                self._entries.move_to_end(entry_id)
+                # The text is already in the log; only record that it is the newest again
+                record = {"op": "touch", "id": entry_id, "timestamp": timestamp}
+            else:
+                entry = {
+                    "id": entry_id,
+                    "text": text,
+                    "lower": text.lower(),
+                    "size": len(data),
+                    "timestamp": timestamp,
+                    "source": source
+                }
+                self._entries[entry_id] = entry
+                self._total_bytes += entry["size"]
+                record = {"op": "add", "id": entry_id, "text": text, "timestamp": timestamp, "source": source}
+            evicted = self._evict()
+        self._append_log([record] + [{"op": "del", "id": e} for e in evicted])
+        self._notify()
+
+    def _remove(self, entry_id: str):
+        with self._lock:
+            entry = self._entries.pop(entry_id, None)
+            if not entry:
+                return
+            self._total_bytes -= entry["size"]
+        self._append_log([{"op": "del", "id": entry_id}])
+        self._notify()
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        self._compact()
+        self._notify()
+
+    def _evict(self) -> List[str]:
+        evicted = []
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            if len(self._entries) == 1:
+                break
+            entry_id, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry["size"]
+            evicted.append(entry_id)
+        return evicted
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._log_records += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write at the tail
+                    if record.get("op") == "add":
+                        text = record.get("text", "")
+                        data = text.encode("utf-8", errors="replace")
+                        with self._lock:
+                            old = self._entries.pop(record["id"], None)
+                            if old:
+                                self._total_bytes -= old["size"]
+                            self._entries[record["id"]] = {
+                                "id": record["id"],
+                                "text": text,
+                                "lower": text.lower(),
+                                "size": len(data),
+                                "timestamp": record.get("timestamp", 0),
+                                "source": record.get("source", "desktop")
+                            }
+                            self._total_bytes += len(data)
+                    elif record.get("op") == "touch":
+                        with self._lock:
+                            entry = self._entries.get(record.get("id"))
+                            if entry:
+                                entry["timestamp"] = record.get("timestamp", entry["timestamp"])
+                                self._entries.move_to_end(entry["id"])
+                    elif record.get("op") == "del":
+                        with self._lock:
+                            old = self._entries.pop(record.get("id"), None)
+                            if old:
+                                self._total_bytes -= old["size"]
+            with self._lock:
+                self._evict()
+            self._compact()
+        except Exception as e:
+            log.error("Error loading clipboard history: %s", e)
+        self._notify()
+
+    def _append_log(self, records: List[Dict]):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            self._log_records += len(records)
+            if self._log_records > 4 * max(len(self._entries), self.max_entries):
+                self._compact()
+        except Exception as e:
+            log.error("Error saving clipboard history: %s", e)
+
+    def _compact(self):
+        """Rewrites the log with only the live entries (atomic replace)."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with self._lock:
+                entries = list(self._entries.values())
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps({
+                        "op": "add", "id": entry["id"], "text": entry["text"],
+                        "timestamp": entry["timestamp"], "source": entry["source"]
+                    }) + "\n")
+            os.replace(tmp_path, self.path)
+            self._log_records = len(entries)
+        except Exception as e:
+            log.error("Error compacting clipboard history: %s", e)
+
+    def _notify(self):
+        if self.on_changed:
+            try:
+                self.on_changed()
+            except Exception:
+                pass
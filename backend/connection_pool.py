@@ -0,0 +1,292 @@
+import json
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from PySide6.QtCore import QSettings
+from .adb_handler import run_adb
+
+DEFAULT_PORT = 5555
+
+
+def normalize_address(address: str) -> str:
+    """"192.168.1.20" -> "192.168.1.20:5555"; host:port is kept as is."""
+    address = address.strip()
+    if not address:
+        return ""
+    if address.startswith("["):  # [ipv6]:port
+        return address if "]:" in address else f"{address}:{DEFAULT_PORT}"
+    if address.count(":") == 1:
+        return address
+    if ":" in address:  # bare IPv6
+        return f"[{address}]:{DEFAULT_PORT}"
+    return f"{address}:{DEFAULT_PORT}"
+
+
+class Endpoint:
+    """Connection state of one TCP/IP device."""
+    __slots__ = ("address", "state", "failures", "next_attempt", "next_probe", "busy",
+                 "latency_ms", "throughput", "last_ok", "probes", "was_connected")
+
+    def __init__(self, address: str):
+        self.address = address
+        self.state = "offline"  # offline, connecting, connected
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.next_probe = 0.0
+        self.busy = False  # a connect or probe is in flight
+        self.latency_ms: Optional[float] = None  # EWMA of keepalive round trips
+        self.throughput: Optional[float] = None  # bytes/s from the last transfer sample
+        self.last_ok = 0.0
+        self.probes = 0
+        self.was_connected = False
+
+    def to_dict(self) -> Dict:
+        return {
+            "address": self.address,
+            "state": self.state,
+            "failures": self.failures,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "throughput": int(self.throughput) if self.throughput is not None else None,
+        }
+
+
+class ConnectionManager:
+    """
+    Keeps a persistent set of TCP/IP endpoints connected.
+
+    A supervisor thread probes connected endpoints with a cheap shell round
+    trip and reconnects the ones that drop, using exponential backoff with
+    full jitter so a whole rack coming back after a network blip doesn't
+    reconnect in lockstep. Connects and probes run in parallel on a thread
+    pool, each bounded by a timeout.
+    """
+
+    SETTINGS_KEY = "network_endpoints"
+    TICK = 0.5
+    KEEPALIVE_INTERVAL = 5.0
+    CONNECT_TIMEOUT = 5.0
+    PROBE_TIMEOUT = 3.0
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 30.0
+    LATENCY_ALPHA = 0.3
+    THROUGHPUT_EVERY = 12  # keepalives between throughput samples
+    THROUGHPUT_BYTES = 256 * 1024
+
+    def __init__(self, adb, on_changed: Callable[[str, Dict], None] = None, max_workers: int = 32):
+        self.adb = adb
+        self.on_changed = on_changed
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Endpoint] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="adb-conn")
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for address in self._load():
+            self._endpoints[address] = Endpoint(address)
+
+    # --- endpoint list ---
+
+    def add(self, address: str) -> str:
+        address = normalize_address(address)
+        if not address:
+            return ""
+        with self._lock:
+            if address not in self._endpoints:
+                self._endpoints[address] = Endpoint(address)
+        self._save()
+        self._wake.set()
+        return address
+
+    def remove(self, address: str, disconnect: bool = True):
+        address = normalize_address(address)
+        with self._lock:
+            endpoint = self._endpoints.pop(address, None)
+        self._save()
+        if endpoint and disconnect:
+            self._executor.submit(self.adb.disconnect, address)
+
+    def addresses(self) -> List[str]:
+        with self._lock:
+            return list(self._endpoints)
+
+    def endpoints(self) -> List[Dict]:
+        with self._lock:
+            return [endpoint.to_dict() for endpoint in self._endpoints.values()]
+
+    def __contains__(self, address: str) -> bool:
+        with self._lock:
+            return address in self._endpoints
+
+    def link_stats(self, address: str) -> Dict:
+        """Latency and throughput of an endpoint, empty for unknown (e.g. USB) serials."""
+        with self._lock:
+            endpoint = self._endpoints.get(address)
+            if endpoint is None:
+                return {}
+            return {"latency_ms": endpoint.latency_ms, "throughput": endpoint.throughput}
+
+    # --- lifecycle ---
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="adb-connections", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def reconnect_all(self):
+        """Retries every offline endpoint now, ignoring backoff."""
+        with self._lock:
+            for endpoint in self._endpoints.values():
+                if endpoint.state != "connected":
+                    endpoint.failures = 0
+                    endpoint.next_attempt = 0.0
+        self._wake.set()
+
+    def connect_all(self, addresses: List[str] = None, timeout: float = None) -> Dict[str, bool]:
+        """Blocking: connects the given (or all) endpoints in parallel."""
+        timeout = timeout or self.CONNECT_TIMEOUT
+        targets = [self.add(address) for address in addresses] if addresses else self.addresses()
+        futures = {address: self._executor.submit(self.adb.connect, address, timeout) for address in targets if address}
+        results = {}
+        for address, future in futures.items():
+            try:
+                results[address] = future.result(timeout=timeout + 1)
+            except Exception:
+                results[address] = False
+        return results
+
+    # --- supervisor ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            jobs = []
+            with self._lock:
+                for endpoint in self._endpoints.values():
+                    if endpoint.busy:
+                        continue
+                    if endpoint.state == "connected" and now >= endpoint.next_probe:
+                        endpoint.busy = True
+                        jobs.append((self._probe, endpoint))
+                    elif endpoint.state != "connected" and now >= endpoint.next_attempt:
+                        endpoint.busy = True
+                        endpoint.state = "connecting"
+                        jobs.append((self._connect, endpoint))
+            for job, endpoint in jobs:
+                try:
+                    self._executor.submit(job, endpoint)
+                except RuntimeError:  # executor shut down
+                    return
+            self._wake.wait(self.TICK)
+            self._wake.clear()
+
+    def _connect(self, endpoint: Endpoint):
+        try:
+            if endpoint.was_connected:
+                # Drop the stale transport so adb doesn't report "already connected"
+                self.adb.disconnect(endpoint.address)
+            ok = self.adb.connect(endpoint.address, timeout=self.CONNECT_TIMEOUT)
+            if ok:
+                ok = self._measure_latency(endpoint)
+            if ok:
+                # Sample the link right away so profile selection has data
+                self._measure_throughput(endpoint)
+            with self._lock:
+                if ok:
+                    endpoint.state = "connected"
+                    endpoint.failures = 0
+                    endpoint.was_connected = True
+                    endpoint.next_probe = time.monotonic() + self.KEEPALIVE_INTERVAL
+                else:
+                    endpoint.state = "offline"
+                    endpoint.failures += 1
+                    backoff = min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** endpoint.failures))
+                    endpoint.next_attempt = time.monotonic() + random.uniform(0, backoff)
+        finally:
+            endpoint.busy = False
+        self._notify(endpoint)
+
+    def _probe(self, endpoint: Endpoint):
+        try:
+            ok = self._measure_latency(endpoint)
+            if ok:
+                endpoint.probes += 1
+                if endpoint.probes % self.THROUGHPUT_EVERY == 0:
+                    self._measure_throughput(endpoint)
+            with self._lock:
+                if ok:
+                    endpoint.next_probe = time.monotonic() + self.KEEPALIVE_INTERVAL
+                else:
+                    # Reconnect right away; backoff only kicks in if that fails too
+                    endpoint.state = "offline"
+                    endpoint.failures = 0
+                    endpoint.next_attempt = 0.0
+        finally:
+            endpoint.busy = False
+        if not ok:
+            self._wake.set()
+        self._notify(endpoint)
+
+    def _measure_latency(self, endpoint: Endpoint) -> bool:
+        if not self.adb.adb_path:
+            return False
+        start = time.monotonic()
+        try:
+            result = run_adb(
+                [self.adb.adb_path, "-s", endpoint.address, "shell", "echo", "ok"],
+                capture_output=True, text=True, timeout=self.PROBE_TIMEOUT
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+        if result.returncode != 0 or "ok" not in result.stdout:
+            return False
+        sample = (time.monotonic() - start) * 1000
+        if endpoint.latency_ms is None:
+            endpoint.latency_ms = sample
+        else:
+            endpoint.latency_ms += self.LATENCY_ALPHA * (sample - endpoint.latency_ms)
+        endpoint.last_ok = time.time()
+        return True
+
+    def _measure_throughput(self, endpoint: Endpoint):
+        start = time.monotonic()
+        try:
+            result = run_adb(
+                [self.adb.adb_path, "-s", endpoint.address, "exec-out", "head", "-c", str(self.THROUGHPUT_BYTES), "/dev/zero"],
+                capture_output=True, timeout=self.PROBE_TIMEOUT * 3
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return
+        elapsed = time.monotonic() - start
+        if result.returncode == 0 and result.stdout and elapsed > 0:
+            endpoint.throughput = len(result.stdout) / elapsed
+
+    def _notify(self, endpoint: Endpoint):
+        if self.on_changed:
+            try:
+                self.on_changed(endpoint.address, endpoint.to_dict())
+            except Exception:
+                pass
+
+    # --- persistence ---
+
+    def _load(self) -> List[str]:
+        try:
+            data = QSettings("UMC", "DeviceManager").value(self.SETTINGS_KEY, "[]")
+            return [normalize_address(address) for address in json.loads(data)] if data else []
+        except Exception:
+            return []
+
+    def _save(self):
+        QSettings("UMC", "DeviceManager").setValue(self.SETTINGS_KEY, json.dumps(self.addresses()))
@@ -0,0 +1,354 @@
+import os
+import random
+import shutil
+import socket
+import struct
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+from .tracing import get_logger
+
+log = get_logger("control")
+
+# Control message types understood by scrcpy-server (v2.x / v3.x)
+TYPE_INJECT_KEYCODE = 0
+TYPE_GET_CLIPBOARD = 8
+TYPE_SET_CLIPBOARD = 9
+
+# Device message types sent back by scrcpy-server
+DEVICE_MSG_CLIPBOARD = 0
+DEVICE_MSG_ACK_CLIPBOARD = 1
+DEVICE_MSG_UHID_OUTPUT = 2
+
+# Android KeyEvent actions and common key codes
+ACTION_DOWN = 0
+ACTION_UP = 1
+
+KEYCODES = {
+    "HOME": 3,
+    "BACK": 4,
+    "VOLUME_UP": 24,
+    "VOLUME_DOWN": 25,
+    "POWER": 26,
+    "ENTER": 66,
+    "MENU": 82,
+    "VOLUME_MUTE": 164,
+    "APP_SWITCH": 187,
+    "SLEEP": 223,
+    "WAKEUP": 224,
+}
+
+# scrcpy-server refuses control messages larger than 256 KiB
+CLIPBOARD_TEXT_MAX_LENGTH = (1 << 18) - 14
+
+DEVICE_SERVER_PATH = "/data/local/tmp/umc-scrcpy-server.jar"
+
+SERVER_SEARCH_PATHS = [
+    "/usr/share/scrcpy/scrcpy-server",
+    "/usr/local/share/scrcpy/scrcpy-server",
+    "/opt/homebrew/share/scrcpy/scrcpy-server",
+    "/snap/scrcpy/current/usr/share/scrcpy/scrcpy-server",
+]
+
+_scrcpy_version = None
+
+
+def find_scrcpy_server() -> Optional[str]:
+    """Locates the scrcpy-server binary shipped with the desktop scrcpy install."""
+    path = os.environ.get("SCRCPY_SERVER_PATH")
+    if path and os.path.exists(path):
+        return path
+    for path in SERVER_SEARCH_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_scrcpy_version() -> Optional[str]:
+    """The server must be started with the exact version of the installed client."""
+    global _scrcpy_version
+    if _scrcpy_version is None:
+        scrcpy_path = shutil.which("scrcpy")
+        if not scrcpy_path:
+            return None
+        try:
+            result = subprocess.run([scrcpy_path, "--version"], capture_output=True, text=True, timeout=5)
+            # First line: "scrcpy 2.4 <https://github.com/Genymobile/scrcpy>"
+            parts = result.stdout.strip().split()
+            if len(parts) >= 2 and parts[0] == "scrcpy":
+                _scrcpy_version = parts[1]
+        except Exception as e:
+            log.error("Error detecting scrcpy version: %s", e)
+    return _scrcpy_version
+
+
+class ControlChannel:
+    """
+    A persistent control-only scrcpy-server session on one device.
+
+    The server runs without video and audio; only its control socket is used.
+    With clipboard autosync on, the device pushes clipboard changes over the
+    socket as they happen, and the desktop can set the device clipboard
+    without any helper app installed.
+    """
+
+    CONNECT_ATTEMPTS = 50
+    CONNECT_DELAY = 0.1
+
+    def __init__(self, adb_path: str, serial: str, on_clipboard: Callable[[str, str], None] = None,
+                 on_lost: Callable[[str], None] = None):
+        self.adb_path = adb_path
+        self.serial = serial
+        self.on_clipboard = on_clipboard
+        self.on_lost = on_lost  # called with the serial when the channel dies without close()
+        self._scid = "%08x" % random.getrandbits(31)
+        self._port = 0
+        self._server: Optional[subprocess.Popen] = None
+        self._socket: Optional[socket.socket] = None
+        self._reader: Optional[threading.Thread] = None
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def alive(self) -> bool:
+        return self._socket is not None and not self._closed and self._server is not None and self._server.poll() is None
+
+    def open(self) -> bool:
+        """Pushes and starts the server, then connects to its control socket."""
+        server_path = find_scrcpy_server()
+        version = get_scrcpy_version()
+        if not self.adb_path or not server_path or not version:
+            return False
+
+        try:
+            subprocess.run(
+                [self.adb_path, "-s", self.serial, "push", server_path, DEVICE_SERVER_PATH],
+                check=True, capture_output=True, timeout=15
+            )
+            result = subprocess.run(
+                [self.adb_path, "-s", self.serial, "forward", "tcp:0", f"localabstract:scrcpy_{self._scid}"],
+                check=True, capture_output=True, text=True, timeout=5
+            )
+            self._port = int(result.stdout.strip())
+
+            server_cmd = [
+                self.adb_path, "-s", self.serial, "shell",
+                f"CLASSPATH={DEVICE_SERVER_PATH}", "app_process", "/", "com.genymobile.scrcpy.Server", version,
+                f"scid={self._scid}", "log_level=warn",
+                "video=false", "audio=false", "control=true",
+                "tunnel_forward=true", "send_device_meta=false", "send_dummy_byte=true",
+                "clipboard_autosync=true", "cleanup=false"
+            ]
+            self._server = subprocess.Popen(server_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            self._socket = self._connect()
+            if not self._socket:
+                self.close()
+                return False
+
+            self._reader = threading.Thread(target=self._read_loop, name=f"control-{self.serial}", daemon=True)
+            self._reader.start()
+            return True
+        except Exception as e:
+            log.error("Error opening control channel for %s: %s", self.serial, e)
+            self.close()
+            return False
+
+    def _connect(self) -> Optional[socket.socket]:
+        # adb accepts the forwarded connection before the server listens; the
+        # dummy byte confirms the server side is really there
+        for _ in range(self.CONNECT_ATTEMPTS):
+            if self._server.poll() is not None:
+                return None
+            sock = None
+            try:
+                sock = socket.create_connection(("127.0.0.1", self._port), timeout=2)
+                if sock.recv(1):
+                    sock.settimeout(None)
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    return sock
+            except OSError:
+                pass
+            if sock:
+                sock.close()
+            time.sleep(self.CONNECT_DELAY)
+        return None
+
+    def close(self):
+        self._closed = True
+        if self._socket:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+        if self._server and self._server.poll() is None:
+            self._server.terminate()
+            try:
+                self._server.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._server.kill()
+        if self._port and self.adb_path:
+            try:
+                subprocess.run(
+                    [self.adb_path, "-s", self.serial, "forward", "--remove", f"tcp:{self._port}"],
+                    capture_output=True, timeout=5
+                )
+            except Exception:
+                pass
+            self._port = 0
+
+    def send(self, payload: bytes) -> bool:
+        """Writes one or more encoded control messages in a single write."""
+        if not self.alive:
+            return False
+        try:
+            with self._send_lock:
+                self._socket.sendall(payload)
+            return True
+        except OSError:
+            self._lost()
+            return False
+
+    def set_clipboard(self, text: str, paste: bool = False) -> bool:
+        data = text.encode("utf-8")[:CLIPBOARD_TEXT_MAX_LENGTH]
+        # sequence 0 = no acknowledgement requested
+        return self.send(struct.pack(">BQBI", TYPE_SET_CLIPBOARD, 0, int(paste), len(data)) + data)
+
+    def inject_keycodes(self, keycodes: List[int], metastate: int = 0) -> bool:
+        """Sends a down/up pair per key code, the whole sequence in one write."""
+        payload = b"".join(
+            struct.pack(">BBIII", TYPE_INJECT_KEYCODE, action, keycode, 0, metastate)
+            for keycode in keycodes
+            for action in (ACTION_DOWN, ACTION_UP)
+        )
+        return bool(payload) and self.send(payload)
+
+    def request_clipboard(self) -> bool:
+        # copy_key 0 = read the clipboard without injecting COPY/CUT
+        return self.send(struct.pack(">BB", TYPE_GET_CLIPBOARD, 0))
+
+    def _recv_exact(self, size: int) -> bytes:
+        buf = b""
+        while len(buf) < size:
+            chunk = self._socket.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("control socket closed")
+            buf += chunk
+        return buf
+
+    def _read_loop(self):
+        try:
+            while not self._closed and self._socket:
+                msg_type = self._recv_exact(1)[0]
+                if msg_type == DEVICE_MSG_CLIPBOARD:
+                    length = struct.unpack(">I", self._recv_exact(4))[0]
+                    text = self._recv_exact(length).decode("utf-8", errors="replace")
+                    if self.on_clipboard and text:
+                        self.on_clipboard(self.serial, text)
+                elif msg_type == DEVICE_MSG_ACK_CLIPBOARD:
+                    self._recv_exact(8)
+                elif msg_type == DEVICE_MSG_UHID_OUTPUT:
+                    _, size = struct.unpack(">HH", self._recv_exact(4))
+                    self._recv_exact(size)
+                else:
+                    # Unknown message: the stream can't be resynchronized
+                    break
+        except (OSError, ConnectionError):
+            pass
+        finally:
+            self._lost()
+
+    def _lost(self):
+        """Tears down a channel that died on its own and tells the owner about it."""
+        if self._closed:
+            return
+        self.close()
+        if self.on_lost:
+            self.on_lost(self.serial)
+
+
+class ControlChannelPool:
+    """
+    Keeps at most one control channel per device, shared by every user of it.
+
+    Opening a channel takes seconds, so it happens outside the lock: the
+    first caller for a device opens it while later callers for the same
+    device wait on its "opening" event, and callers for other devices are
+    not held up at all.
+    """
+
+    def __init__(self, adb_path: str, on_clipboard: Callable[[str, str], None] = None,
+                 on_lost: Callable[[str], None] = None):
+        self.adb_path = adb_path
+        self.on_clipboard = on_clipboard
+        self.on_lost = on_lost
+        self._channels: Dict[str, ControlChannel] = {}
+        self._opening: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, serial: str, create: bool = True) -> Optional[ControlChannel]:
+        """Returns a live channel for the device, opening one if allowed."""
+        with self._lock:
+            channel = self._channels.get(serial)
+            if channel and channel.alive:
+                return channel
+            if not create:
+                return None
+            opening = self._opening.get(serial)
+            if opening is None:
+                self._opening[serial] = threading.Event()
+
+        if opening is not None:
+            opening.wait()
+            with self._lock:
+                channel = self._channels.get(serial)
+            return channel if channel and channel.alive else None
+
+        channel = ControlChannel(self.adb_path, serial, self.on_clipboard, self._on_lost)
+        opened = False
+        try:
+            opened = channel.open()
+        finally:
+            with self._lock:
+                if opened:
+                    self._channels[serial] = channel
+                else:
+                    self._channels.pop(serial, None)
+                self._opening.pop(serial).set()
+        return channel if opened else None
+
+    def _on_lost(self, serial: str):
+        with self._lock:
+            channel = self._channels.get(serial)
+            if channel and not channel.alive:
+                del self._channels[serial]
+        if self.on_lost:
+            self.on_lost(serial)
+
+    def close(self, serial: str):
+        with self._lock:
+            channel = self._channels.pop(serial, None)
+        if channel:
+            channel.close()
+
+    def close_all(self):
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+        for channel in channels:
+            channel.close()
+
+
+def resolve_keycode(key: Union[int, str]) -> Optional[int]:
+    """Accepts 26, "26", "POWER" or "KEYCODE_POWER"."""
+    if isinstance(key, int):
+        return key
+    key = str(key).strip().upper()
+    if key.isdigit():
+        return int(key)
+    if key.startswith("KEYCODE_"):
+        key = key[len("KEYCODE_"):]
+    return KEYCODES.get(key)
@@ -0,0 +1,562 @@
+"""
+Headless UMC: one process owning device polling, status, scrcpy sessions
+and transfers, exposed as JSON-RPC 2.0 over a local Unix socket.
+
+    python3 -m backend.daemon [--socket PATH]
+
+Requests and responses are one JSON object per line. Clients that call
+"subscribe" also receive "devices.changed" and "sessions.changed"
+notifications. The GUI's worker attaches automatically when the socket is
+live and then takes its device list and status from the daemon instead of
+polling adb itself.
+"""
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import os
+import signal
+import socket
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .async_adb import AsyncADBHandler
+from .device import DeviceRegistry, get_adb_handler, get_scrcpy_handler
+from .profiles import get_profile_flags
+from .tracing import get_logger, setup_logging
+
+log = get_logger("daemon")
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+MAX_REQUEST_BYTES = 1024 * 1024
+# A subscriber that stops reading is dropped rather than buffered without bound
+MAX_PENDING_NOTIFY_BYTES = 1024 * 1024
+
+# Methods "broadcast" may fan out to several devices
+BROADCAST_METHODS = ("app.launch", "device.mirror", "device.status", "file.push", "screenshot")
+
+
+def default_socket_path() -> str:
+    """UMC_DAEMON_SOCKET, else $XDG_RUNTIME_DIR/umc/daemon.sock (per-user temp dir without it)."""
+    path = os.environ.get("UMC_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or _fallback_runtime_dir()
+    return os.path.join(runtime_dir, "umc", "daemon.sock")
+
+
+def _fallback_runtime_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), f"umc-{os.getuid()}")
+
+
+def socket_dirs(socket_path: str) -> List[str]:
+    """
+    The directories that must be private for socket_path to be trusted,
+    outermost first: its own, plus the per-user directory when it lives
+    under the shared temp dir.
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    root = _fallback_runtime_dir()
+    return [root, directory] if directory.startswith(root + os.sep) else [directory]
+
+
+def check_private_dir(path: str):
+    """
+    Raises PermissionError unless path is a real directory (not a symlink)
+    owned by this user with no group or other access, so nobody else can
+    have planted or replaced the socket in it.
+    """
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {info.st_uid}, not {os.getuid()}")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(f"{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})")
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> Dict:
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+class _Client:
+    """One socket connection; writes are serialized so lines never interleave."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.lock = asyncio.Lock()
+        self.tasks = set()
+
+    async def send(self, message: Dict):
+        async with self.lock:
+            self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+            await self.writer.drain()
+
+
+class UMCDaemon:
+    """
+    Device registry, status cache and scrcpy sessions behind the RPC API.
+
+    adb calls are asyncio subprocesses (AsyncADBHandler) and scrcpy
+    launches run on a thread pool, so the event loop never blocks on a
+    device. Status requests for the same device share one adb round trip
+    and are answered from cache while younger than STATUS_MAX_AGE, so any
+    number of attached UIs cost the devices no more than one.
+    """
+
+    POLL_INTERVAL = 3.0
+    STATUS_MAX_AGE = 5.0
+
+    def __init__(self, socket_path: str = None, poll_interval: float = None, adb=None, scrcpy=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self._adb = adb or get_adb_handler()
+        self._scrcpy = scrcpy or get_scrcpy_handler()
+        self._async_adb = AsyncADBHandler(self._adb.adb_path)
+        self.registry = DeviceRegistry(self._adb, self._scrcpy)
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="umc-daemon")
+        self._status_at: Dict[str, float] = {}  # serial -> monotonic time status_info was fetched
+        self._status_pending: Dict[str, asyncio.Future] = {}
+        self._subscribers = set()
+        self._stop: Optional[asyncio.Event] = None
+        self._methods = {
+            "ping": self.rpc_ping,
+            "subscribe": self.rpc_subscribe,
+            "devices.list": self.rpc_devices_list,
+            "device.status": self.rpc_device_status,
+            "sessions.list": self.rpc_sessions_list,
+            "app.launch": self.rpc_app_launch,
+            "device.mirror": self.rpc_device_mirror,
+            "file.push": self.rpc_file_push,
+            "file.pull": self.rpc_file_pull,
+            "screenshot": self.rpc_screenshot,
+            "broadcast": self.rpc_broadcast,
+            "shutdown": self.rpc_shutdown,
+        }
+
+    # --- lifecycle
+
+    async def serve_forever(self):
+        self._stop = asyncio.Event()
+        self._prepare_socket()
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path, limit=MAX_REQUEST_BYTES)
+        os.chmod(self.socket_path, 0o600)
+        log.info("Listening on %s", self.socket_path)
+        poller = asyncio.create_task(self._poll_loop())
+        try:
+            await self._stop.wait()
+        finally:
+            poller.cancel()
+            server.close()
+            await server.wait_closed()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def _prepare_socket(self):
+        directories = socket_dirs(self.socket_path)
+        os.makedirs(os.path.dirname(directories[0]), exist_ok=True)
+        for directory in directories:
+            try:
+                os.mkdir(directory, 0o700)
+            except FileExistsError:
+                pass
+            check_private_dir(directory)
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)  # left behind by a daemon that died
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A UMC daemon is already listening on {self.socket_path}")
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self.refresh_devices()
+            except Exception:
+                log.exception("Device poll failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def refresh_devices(self):
+        entries = await self._async_adb.get_devices()
+        added, removed, changed = self.registry.apply(entries)
+        for device in removed:
+            self._status_at.pop(device.serial, None)
+        if added or removed or changed:
+            self._notify("devices.changed", {"devices": self.registry.to_list()})
+        if self._scrcpy.reap():
+            self._notify("sessions.changed", {"sessions": self._sessions()})
+
+    # --- protocol
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await client.send(self._error(None, RPCError(INVALID_REQUEST, "Request too large")))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Requests on one connection run concurrently; responses carry their id
+                task = asyncio.create_task(self._handle_line(client, line))
+                client.tasks.add(task)
+                task.add_done_callback(client.tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # daemon shutting down
+        finally:
+            self._subscribers.discard(client)
+            for task in list(client.tasks):
+                task.cancel()
+            writer.close()
+
+    async def _handle_line(self, client: _Client, line: bytes):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = self._error(None, RPCError(PARSE_ERROR, "Parse error"))
+        else:
+            if isinstance(message, list):
+                responses = [r for r in await asyncio.gather(*(self._dispatch(client, m) for m in message)) if r]
+                response = responses or None
+            else:
+                response = await self._dispatch(client, message)
+        if response is not None:
+            try:
+                await client.send(response)
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _dispatch(self, client: _Client, message: Any) -> Optional[Dict]:
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return self._error(None, RPCError(INVALID_REQUEST, "Invalid request"))
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        params = message.get("params") or {}
+        try:
+            method = self._methods.get(message["method"])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "params must be an object")
+            try:
+                inspect.signature(method).bind(client, **params)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            result = await method(client, **params)
+        except RPCError as e:
+            return None if is_notification else self._error(request_id, e)
+        except Exception as e:
+            log.exception("%s failed", message["method"])
+            return None if is_notification else self._error(request_id, RPCError(SERVER_ERROR, str(e)))
+        return None if is_notification else {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, error: RPCError) -> Dict:
+        return {"jsonrpc": "2.0", "id": request_id, "error": error.to_dict()}
+
+    def _notify(self, method: str, params: Dict):
+        data = json.dumps({"jsonrpc": "2.0", "method": method, "params": params}).encode("utf-8") + b"\n"
+        for client in list(self._subscribers):
+            transport = client.writer.transport
+            if client.writer.is_closing() or transport.get_write_buffer_size() > MAX_PENDING_NOTIFY_BYTES:
+                self._subscribers.discard(client)
+                client.writer.close()
+                continue
+            client.writer.write(data)
+
+    # --- helpers
+
+    def _device(self, serial: str, online: bool = False):
+        device = self.registry.get(serial)
+        if device is None:
+            raise RPCError(SERVER_ERROR, f"Unknown device: {serial}")
+        if online and device.status != "device":
+            raise RPCError(SERVER_ERROR, f"Device {serial} is {device.status}")
+        return device
+
+    def _sessions(self, serial: str = None) -> List[Dict]:
+        return [
+            {
+                "pid": session.pid, "serial": session.serial, "kind": session.kind, "title": session.title,
+                "first_frame_ms": round((session.first_frame_at - session.started_at) * 1000)
+                if session.first_frame_at else None,
+            }
+            for session in self._scrcpy.sessions(serial)
+        ]
+
+    # --- methods
+
+    async def rpc_ping(self, client):
+        return {"pid": os.getpid(), "devices": len(self.registry), "sessions": len(self._scrcpy.sessions())}
+
+    async def rpc_subscribe(self, client):
+        self._subscribers.add(client)
+        return {"devices": self.registry.to_list(), "sessions": self._sessions()}
+
+    async def rpc_devices_list(self, client):
+        return self.registry.to_list()
+
+    async def rpc_device_status(self, client, serial: str, max_age: float = None):
+        device = self._device(serial, online=True)
+        max_age = self.STATUS_MAX_AGE if max_age is None else max_age
+        fetched_at = self._status_at.get(serial)
+        if fetched_at is not None and time.monotonic() - fetched_at <= max_age:
+            return device.status_info
+        pending = self._status_pending.get(serial)
+        if pending is None:
+            pending = asyncio.ensure_future(self._async_adb.get_device_status_info(serial))
+            self._status_pending[serial] = pending
+            pending.add_done_callback(lambda _: self._status_pending.pop(serial, None))
+        status = await asyncio.shield(pending)
+        device.status_info = status
+        self._status_at[serial] = time.monotonic()
+        return status
+
+    async def rpc_sessions_list(self, client, serial: str = None):
+        return self._sessions(serial)
+
+    async def rpc_app_launch(self, client, serial: str, package: str, width: int = 1280, height: int = 800,
+                             dpi: int = 240, profile: str = "Default", turn_screen_off: bool = False,
+                             audio: bool = False):
+        self._device(serial, online=True)
+        launched = await self._run(
+            self._scrcpy.launch_app, serial, package, width=width, height=height, dpi=dpi,
+            turn_screen_off=turn_screen_off, forward_audio=audio, extra_flags=get_profile_flags(profile),
+        )
+        return self._launched(serial, launched)
+
+    async def rpc_device_mirror(self, client, serial: str, width: int = 1280, height: int = 720,
+                                profile: str = "Default", turn_screen_off: bool = False, audio: bool = False):
+        self._device(serial, online=True)
+        launched = await self._run(
+            self._scrcpy.mirror, serial, width=width, height=height, turn_screen_off=turn_screen_off,
+            forward_audio=audio, extra_flags=get_profile_flags(profile),
+        )
+        return self._launched(serial, launched)
+
+    def _launched(self, serial: str, launched: bool) -> Dict:
+        if not launched:
+            raise RPCError(SERVER_ERROR, "Failed to start scrcpy")
+        session = self._scrcpy.latest_session(serial)
+        self._notify("sessions.changed", {"sessions": self._sessions()})
+        return {"pid": session.pid if session else None}
+
+    async def rpc_file_push(self, client, serial: str, local: str, remote: str = "/sdcard/Download/"):
+        self._device(serial, online=True)
+        if not os.path.exists(local):
+            raise RPCError(INVALID_PARAMS, f"No such file: {local}")
+        if not await self._async_adb.push_file(serial, local, remote):
+            raise RPCError(SERVER_ERROR, f"Push to {serial} failed")
+        return {"remote": remote}
+
+    async def rpc_file_pull(self, client, serial: str, remote: str, local: str = None):
+        self._device(serial, online=True)
+        local = local or os.path.join(os.path.expanduser("~/Downloads"), os.path.basename(remote.rstrip("/")))
+        if not await self._async_adb.pull_file(serial, remote, local):
+            raise RPCError(SERVER_ERROR, f"Pull from {serial} failed")
+        return {"local": local}
+
+    async def rpc_screenshot(self, client, serial: str, path: str = None):
+        self._device(serial, online=True)
+        if not path:
+            cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(cache_dir, "umc", "screenshots", f"screenshot_{serial}_{timestamp}.png")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not await self._async_adb.capture_screenshot(serial, path):
+            raise RPCError(SERVER_ERROR, f"Screenshot of {serial} failed")
+        return {"path": path}
+
+    async def rpc_broadcast(self, client, call: str, serials: List[str] = None, params: Dict = None):
+        """Runs method call on every listed (default: every online) device; per-device results or errors."""
+        if call not in BROADCAST_METHODS:
+            raise RPCError(INVALID_PARAMS, f"Cannot broadcast {call}; one of: {', '.join(BROADCAST_METHODS)}")
+        if serials is None:
+            serials = [device.serial for device in self.registry if device.status == "device"]
+        params = dict(params or {})
+        params.pop("serial", None)
+        handler = self._methods[call]
+
+        async def one(serial):
+            try:
+                return {"result": await handler(client, serial=serial, **params)}
+            except RPCError as e:
+                return {"error": e.to_dict()}
+            except TypeError as e:
+                return {"error": RPCError(INVALID_PARAMS, str(e)).to_dict()}
+            except Exception as e:
+                return {"error": RPCError(SERVER_ERROR, str(e)).to_dict()}
+
+        results = await asyncio.gather(*(one(serial) for serial in serials))
+        return dict(zip(serials, results))
+
+    async def rpc_shutdown(self, client):
+        asyncio.get_running_loop().call_soon(self.stop)
+        return True
+
+
+class DaemonError(Exception):
+    """An error response from the daemon."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class DaemonClient:
+    """
+    Blocking client for the daemon socket. Calls are serialized, so one
+    client can be shared between threads; use one per thread for
+    parallel requests.
+    """
+
+    def __init__(self, socket_path: str = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect_if_running(cls, socket_path: str = None, timeout: float = 30.0) -> Optional["DaemonClient"]:
+        """A connected client, or None when no daemon is listening (or its socket cannot be trusted)."""
+        client = cls(socket_path, timeout)
+        try:
+            client.connect()
+        except PermissionError as e:
+            log.warning("Not attaching to the daemon socket: %s", e)
+            return None
+        except OSError:
+            return None
+        return client
+
+    def connect(self):
+        for directory in socket_dirs(self.socket_path):
+            check_private_dir(directory)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def _send(self, method: str, params: Dict) -> int:
+        if self._sock is None:
+            self.connect()
+        self._next_id += 1
+        message = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self._sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        return self._next_id
+
+    def _read(self) -> Dict:
+        line = self._file.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("UMC daemon closed the connection")
+        return json.loads(line)
+
+    def call(self, method: str, **params) -> Any:
+        with self._lock:
+            request_id = self._send(method, params)
+            while True:
+                message = self._read()
+                if message.get("id") != request_id:
+                    continue  # a notification (this connection is subscribed)
+                if "error" in message:
+                    error = message["error"]
+                    raise DaemonError(error.get("code", SERVER_ERROR), error.get("message", ""), error.get("data"))
+                return message.get("result")
+
+    def events(self):
+        """Subscribes and yields (method, params) for every notification; blocks between them."""
+        snapshot = self.call("subscribe")
+        yield "subscribed", snapshot
+        self._sock.settimeout(None)
+        while True:
+            message = self._read()
+            if "id" not in message:
+                yield message.get("method"), message.get("params") or {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="umc daemon", description="Run UMC headless and serve its JSON-RPC API on a Unix socket.")
+    parser.add_argument("--socket", help=f"socket path (default {default_socket_path()})")
+    parser.add_argument("--poll-interval", type=float, default=UMCDaemon.POLL_INTERVAL,
+                        help="seconds between adb device polls")
+    parser.add_argument("--log-level", help="console log level (default UMC_LOG_LEVEL or INFO)")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_level or os.environ.get("UMC_LOG_LEVEL", "INFO"))
+    daemon = UMCDaemon(args.socket, args.poll_interval)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, daemon.stop)
+        await daemon.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except (RuntimeError, PermissionError) as e:
+        log.error("%s", e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,25 +1,67 @@
-from typing import Optional
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 from .adb_handler import ADBHandler
 from .scrcpy_handler import ScrcpyHandler
 
+_handler_lock = threading.Lock()
+_adb_handler: Optional[ADBHandler] = None
+_scrcpy_handler: Optional[ScrcpyHandler] = None
+
+
+def get_adb_handler() -> ADBHandler:
+    """Process-wide ADBHandler (adb is resolved once)."""
+    global _adb_handler
+    with _handler_lock:
+        if _adb_handler is None:
+            _adb_handler = ADBHandler()
+        return _adb_handler
+
+
+def get_scrcpy_handler() -> ScrcpyHandler:
+    """Process-wide ScrcpyHandler, which also owns the live session table."""
+    global _scrcpy_handler
+    with _handler_lock:
+        if _scrcpy_handler is None:
+            _scrcpy_handler = ScrcpyHandler()
+        return _scrcpy_handler
+
+
 class Device:
     """
     Unified Device API for orchestrating ADB and Scrcpy operations.
     """
-    def __init__(self, serial: str, model: str = "Unknown", status: str = "offline"):
+    __slots__ = ("serial", "model", "status", "custom_name", "status_info", "capabilities", "last_seen", "_adb", "_scrcpy")
+
+    def __init__(self, serial: str, model: str = "Unknown", status: str = "offline",
+                 adb: ADBHandler = None, scrcpy: ScrcpyHandler = None):
         self.serial = serial
         self.model = model
         self.status = status
-        self._adb = ADBHandler()
-        self._scrcpy = ScrcpyHandler()
+        self.custom_name = ""
+        self.status_info: Dict = {}  # battery, temperature, storage, network (refreshed by polling)
+        self.capabilities: Optional[Dict] = None  # static facts from the capability store
+        self.last_seen = time.monotonic()
+        self._adb = adb or get_adb_handler()
+        self._scrcpy = scrcpy or get_scrcpy_handler()
+
+    @property
+    def is_network(self) -> bool:
+        # host:port from `adb connect`, or an mDNS service name for wireless debugging
+        return ":" in self.serial or "._adb-tls-connect." in self.serial
+
+    @property
+    def sessions(self) -> list:
+        """Live scrcpy windows of this device."""
+        return self._scrcpy.sessions(self.serial)
 
     def connect(self) -> bool:
         """
-        Connects to the device. 
+        Connects to the device.
         For network addresses, it attempts `adb connect`.
         For USB devices, it mainly verifies presence.
         """
-        if ":" in self.serial: # Heuristic for network address
+        if self.is_network:
             return self._adb.connect(self.serial)
         # For USB, we assume it's connected if we have the object, but we could re-verify
         return True
@@ -28,7 +70,7 @@ class Device:
         """
         Disconnects the device.
         """
-        if ":" in self.serial:
+        if self.is_network:
             return self._adb.disconnect(self.serial)
         return True
 
@@ -37,12 +79,12 @@ class Device:
         Launches an app in a virtual display (or standard mirror depending on implementation) on this device.
         """
         return self._scrcpy.launch_app(
-            self.serial, 
-            package_name, 
-            width=width, 
-            height=height, 
-            dpi=dpi, 
-            turn_screen_off=turn_screen_off, 
+            self.serial,
+            package_name,
+            width=width,
+            height=height,
+            dpi=dpi,
+            turn_screen_off=turn_screen_off,
             forward_audio=forward_audio
         )
 
@@ -58,17 +100,99 @@ class Device:
             forward_audio=forward_audio
         )
 
-    def record(self, filename: str) -> bool:
+    def record(self, filename: str, time_limit: int = 0, extra_flags: list = None) -> bool:
         """
         Starts recording the screen of this device to a file.
         """
-        return self._scrcpy.record(self.serial, filename)
+        return self._scrcpy.record(self.serial, filename, time_limit=time_limit, extra_flags=extra_flags)
 
     def get_info(self):
         """
         Returns resolution and density info.
         """
+        caps = self.capabilities
+        if caps and caps.get("width") and caps.get("density"):
+            return (caps["width"], caps["height"]), caps["density"]
         return self._adb.get_device_resolution(self.serial), self._adb.get_device_density(self.serial)
 
+    def update(self, model: str, status: str) -> List[str]:
+        """Applies fresh `adb devices` facts; returns the names of fields that changed."""
+        changed = []
+        if model != self.model:
+            self.model = model
+            changed.append("model")
+        if status != self.status:
+            self.status = status
+            changed.append("status")
+        self.last_seen = time.monotonic()
+        return changed
+
+    def to_dict(self) -> Dict:
+        """Plain representation for QML and JSON consumers."""
+        data = {"serial": self.serial, "model": self.model, "status": self.status}
+        if self.custom_name:
+            data["custom_name"] = self.custom_name
+        return data
+
     def __repr__(self):
         return f"<Device serial={self.serial} model={self.model} status={self.status}>"
+
+
+class DeviceRegistry:
+    """
+    Long-lived Device objects keyed by serial, in first-seen order.
+    `adb devices` snapshots are applied as diffs so per-device state
+    (status, capabilities, sessions) survives across polls.
+    """
+
+    def __init__(self, adb: ADBHandler = None, scrcpy: ScrcpyHandler = None):
+        self._adb = adb or get_adb_handler()
+        self._scrcpy = scrcpy or get_scrcpy_handler()
+        self._devices: Dict[str, Device] = {}
+
+    def apply(self, entries: List[Dict]) -> Tuple[List[Device], List[Device], List[Tuple[Device, List[str]]]]:
+        """
+        Reconciles the registry with a device list snapshot.
+        Returns (added, removed, changed) where changed holds (device, fields).
+        """
+        added, changed = [], []
+        seen = set()
+        for entry in entries:
+            serial = entry.get("serial")
+            if not serial or serial in seen:
+                continue
+            seen.add(serial)
+            model = entry.get("model", "Unknown")
+            status = entry.get("status", "offline")
+            device = self._devices.get(serial)
+            if device is None:
+                device = Device(serial, model, status, adb=self._adb, scrcpy=self._scrcpy)
+                self._devices[serial] = device
+                added.append(device)
+            else:
+                fields = device.update(model, status)
+                if fields:
+                    changed.append((device, fields))
+
+        removed = [device for serial, device in self._devices.items() if serial not in seen]
+        for device in removed:
+            del self._devices[device.serial]
+        return added, removed, changed
+
+    def get(self, serial: str) -> Optional[Device]:
+        return self._devices.get(serial)
+
+    def serials(self) -> List[str]:
+        return list(self._devices)
+
+    def to_list(self) -> List[Dict]:
+        return [device.to_dict() for device in self._devices.values()]
+
+    def __contains__(self, serial: str) -> bool:
+        return serial in self._devices
+
+    def __iter__(self) -> Iterator[Device]:
+        return iter(list(self._devices.values()))
+
+    def __len__(self) -> int:
+        return len(self._devices)
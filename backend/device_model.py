@@ -0,0 +1,129 @@
+from typing import Dict, List, Tuple
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QByteArray
+from .device import Device
+
+
+class DeviceListModel(QAbstractListModel):
+    """
+    List model over the DeviceRegistry for the sidebar.
+
+    Registry diffs become row insertions/removals, and field or status
+    changes become dataChanged for just the affected roles, so QML keeps
+    its delegates and only re-evaluates the bindings that actually changed.
+    """
+
+    SerialRole = Qt.UserRole + 1
+    ModelRole = Qt.UserRole + 2
+    StatusRole = Qt.UserRole + 3
+    CustomNameRole = Qt.UserRole + 4
+    BatteryLevelRole = Qt.UserRole + 5
+    BatteryStatusRole = Qt.UserRole + 6
+    TemperatureRole = Qt.UserRole + 7
+    StorageRole = Qt.UserRole + 8
+    NetworkTypeRole = Qt.UserRole + 9
+
+    ROLE_NAMES = {
+        SerialRole: b"serial",
+        ModelRole: b"deviceModel",
+        StatusRole: b"status",
+        CustomNameRole: b"customName",
+        BatteryLevelRole: b"batteryLevel",
+        BatteryStatusRole: b"batteryStatus",
+        TemperatureRole: b"temperature",
+        StorageRole: b"storage",
+        NetworkTypeRole: b"networkType",
+    }
+
+    # Device attributes reported by DeviceRegistry.apply()
+    FIELD_ROLES = {
+        "model": ModelRole,
+        "status": StatusRole,
+        "custom_name": CustomNameRole,
+    }
+
+    # status_info keys (from ADBHandler.get_device_status_info)
+    STATUS_ROLES = {
+        "battery_level": BatteryLevelRole,
+        "battery_status": BatteryStatusRole,
+        "temperature": TemperatureRole,
+        "storage": StorageRole,
+        "network_type": NetworkTypeRole,
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._devices: List[Device] = []
+
+    def roleNames(self):
+        return {role: QByteArray(name) for role, name in self.ROLE_NAMES.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._devices)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._devices):
+            return None
+        device = self._devices[index.row()]
+        if role in (self.SerialRole, Qt.DisplayRole):
+            return device.serial
+        if role == self.ModelRole:
+            return device.model
+        if role == self.StatusRole:
+            return device.status
+        if role == self.CustomNameRole:
+            return device.custom_name
+        for key, status_role in self.STATUS_ROLES.items():
+            if role == status_role:
+                value = device.status_info.get(key)
+                # QML gets undefined for None; strings default to ""
+                if value is None and key in ("battery_status", "network_type"):
+                    return ""
+                return value
+        return None
+
+    def row_of(self, serial: str) -> int:
+        for row, device in enumerate(self._devices):
+            if device.serial == serial:
+                return row
+        return -1
+
+    def apply(self, added: List[Device], removed: List[Device], changed: List[Tuple[Device, List[str]]]):
+        """Mirrors a DeviceRegistry.apply() diff onto the model."""
+        for device in removed:
+            row = self.row_of(device.serial)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._devices[row]
+            self.endRemoveRows()
+
+        if added:
+            first = len(self._devices)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._devices.extend(added)
+            self.endInsertRows()
+
+        for device, fields in changed:
+            roles = [self.FIELD_ROLES[field] for field in fields if field in self.FIELD_ROLES]
+            self._emit_changed(device.serial, roles)
+
+    def field_changed(self, serial: str, field: str):
+        """A Device attribute (e.g. custom_name) was edited in place."""
+        role = self.FIELD_ROLES.get(field)
+        if role is not None:
+            self._emit_changed(serial, [role])
+
+    def status_changed(self, serial: str, old: Dict, new: Dict) -> bool:
+        """Emits dataChanged only for the status keys whose value differs; True if any did."""
+        roles = [role for key, role in self.STATUS_ROLES.items() if (old or {}).get(key) != (new or {}).get(key)]
+        return self._emit_changed(serial, roles)
+
+    def _emit_changed(self, serial: str, roles: List[int]) -> bool:
+        if not roles:
+            return False
+        row = self.row_of(serial)
+        if row < 0:
+            return False
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, roles)
+        return True
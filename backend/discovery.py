@@ -0,0 +1,313 @@
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .tracing import get_logger
+
+log = get_logger("discovery")
+
+MDNS_GROUP = "224.0.0.251"
+MDNS_PORT = 5353
+
+# Advertised by Android 11+ once wireless debugging is on (and the device is paired)
+ADB_CONNECT_SERVICE = "_adb-tls-connect._tcp.local"
+
+TYPE_A = 1
+TYPE_PTR = 12
+TYPE_TXT = 16
+TYPE_AAAA = 28
+TYPE_SRV = 33
+CLASS_IN = 1
+
+
+def build_query(questions: List[Tuple[str, int]], query_id: int = 0) -> bytes:
+    """One DNS query packet with a question per (name, type)."""
+    packet = struct.pack(">HHHHHH", query_id, 0, len(questions), 0, 0, 0)
+    for name, qtype in questions:
+        packet += encode_name(name) + struct.pack(">HH", qtype, CLASS_IN)
+    return packet
+
+
+def encode_name(name: str) -> bytes:
+    out = b""
+    for label in name.rstrip(".").split("."):
+        data = label.encode("utf-8")
+        out += bytes([len(data)]) + data
+    return out + b"\0"
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Reads a possibly compressed name; returns (name, offset after it)."""
+    labels = []
+    end = None
+    for _ in range(128):  # bounds pointer loops in malformed packets
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            pointer = ((length & 0x3F) << 8) | data[offset + 1]
+            if end is None:
+                end = offset + 2
+            offset = pointer
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("utf-8", errors="replace"))
+        offset += length
+    return ".".join(labels), (end if end is not None else offset)
+
+
+def parse_packet(data: bytes) -> List[Dict]:
+    """
+    Parses the answer, authority and additional records of an mDNS response.
+    Each record is {"name", "type", "ttl", "data"} where data is a name (PTR),
+    (target, port) (SRV), an address string (A/AAAA) or raw bytes.
+    """
+    try:
+        _, flags, qdcount, ancount, nscount, arcount = struct.unpack(">HHHHHH", data[:12])
+    except struct.error:
+        return []
+    if not flags & 0x8000:  # queries (ours or other hosts') carry no answers we want
+        return []
+
+    records = []
+    offset = 12
+    try:
+        for _ in range(qdcount):
+            _, offset = _read_name(data, offset)
+            offset += 4
+        for _ in range(ancount + nscount + arcount):
+            name, offset = _read_name(data, offset)
+            rtype, rclass, ttl, length = struct.unpack(">HHIH", data[offset:offset + 10])
+            offset += 10
+            rdata_offset = offset
+            offset += length
+            if rclass & 0x7FFF != CLASS_IN:  # top bit is the cache-flush flag
+                continue
+            if rtype == TYPE_PTR:
+                value, _ = _read_name(data, rdata_offset)
+            elif rtype == TYPE_SRV:
+                _, _, port = struct.unpack(">HHH", data[rdata_offset:rdata_offset + 6])
+                target, _ = _read_name(data, rdata_offset + 6)
+                value = (target, port)
+            elif rtype == TYPE_A and length == 4:
+                value = socket.inet_ntop(socket.AF_INET, data[rdata_offset:offset])
+            elif rtype == TYPE_AAAA and length == 16:
+                value = socket.inet_ntop(socket.AF_INET6, data[rdata_offset:offset])
+            else:
+                value = data[rdata_offset:offset]
+            records.append({"name": name.lower(), "type": rtype, "ttl": ttl, "data": value})
+    except (IndexError, struct.error):
+        pass  # keep what was parsed before the truncation
+    return records
+
+
+class MDNSDiscovery:
+    """
+    Browses for wireless-debugging endpoints on the LAN.
+
+    A background thread sends PTR queries for the adb service (backing off
+    from 1 s to a minute between rounds) and listens on the multicast group.
+    PTR, SRV and A/AAAA records are cached with their TTLs and joined into a
+    live candidate table; goodbye packets (TTL 0) and expiry drop entries.
+    Missing SRV/address records are asked for directly when a new instance
+    or target shows up, then again with the same backoff per name. The
+    group and port are configurable so a local responder stub
+    (bench/fake_mdns.py) can stand in for devices.
+    """
+
+    QUERY_MIN_INTERVAL = 1.0
+    QUERY_MAX_INTERVAL = 60.0
+
+    def __init__(self, on_changed: Callable[[List[Dict]], None] = None,
+                 service: str = ADB_CONNECT_SERVICE, group: str = MDNS_GROUP, port: int = MDNS_PORT):
+        self.on_changed = on_changed
+        self.service = service.lower()
+        self.group = group
+        self.port = port
+        self._lock = threading.Lock()
+        self._ptr: Dict[str, float] = {}  # instance name -> expiry
+        self._srv: Dict[str, Tuple[str, int, float]] = {}  # instance -> (target, port, expiry)
+        self._addresses: Dict[str, Dict[str, float]] = {}  # host -> {address: expiry}
+        self._candidates: List[Dict] = []
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._query_interval = self.QUERY_MIN_INTERVAL
+        self._next_query = 0.0
+        self._asked: Dict[Tuple[str, int], Tuple[float, float]] = {}  # missing (name, type) -> (next ask, interval)
+        self._next_missing = float("inf")
+
+    def start(self) -> bool:
+        if self._thread and self._thread.is_alive():
+            return True
+        try:
+            self._socket = self._open_socket()
+        except OSError as e:
+            log.warning("mDNS discovery unavailable: %s", e)
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mdns-discovery", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def refresh(self):
+        """Sends a query round now and restarts the query backoff."""
+        self._query_interval = self.QUERY_MIN_INTERVAL
+        self._next_query = 0.0
+
+    def candidates(self) -> List[Dict]:
+        with self._lock:
+            return [dict(candidate) for candidate in self._candidates]
+
+    def _open_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                # Share the port with avahi/Bonjour if it is running
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        sock.bind(("", self.port))
+        membership = socket.inet_aton(self.group) + socket.inet_aton("0.0.0.0")
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 255)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        sock.settimeout(0.5)
+        return sock
+
+    def _send(self, questions: List[Tuple[str, int]]):
+        try:
+            self._socket.sendto(build_query(questions), (self.group, self.port))
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= self._next_query:
+                self._send([(self.service, TYPE_PTR)])
+                self._next_query = now + self._query_interval
+                self._query_interval = min(self._query_interval * 2, self.QUERY_MAX_INTERVAL)
+            try:
+                data, _ = self._socket.recvfrom(9000)
+            except socket.timeout:
+                data = None
+            except OSError:
+                break
+            # Queries (our own, looped back, included) parse to no records
+            changed, learned = self._ingest(parse_packet(data)) if data else (False, False)
+            if learned or time.monotonic() >= self._next_missing:
+                self._query_missing()
+            if self._expire() or changed:
+                self._publish()
+
+    def _ingest(self, records: List[Dict]) -> Tuple[bool, bool]:
+        """Caches records; (candidates may have changed, a new PTR or SRV record arrived)."""
+        now = time.monotonic()
+        suffix = "." + self.service
+        changed = learned = False
+        with self._lock:
+            for record in records:
+                rtype, name, ttl, value = record["type"], record["name"], record["ttl"], record["data"]
+                expiry = now + ttl
+                if rtype == TYPE_PTR and name == self.service:
+                    instance = value.lower()
+                    if ttl == 0:
+                        changed |= self._ptr.pop(instance, None) is not None
+                    else:
+                        learned |= instance not in self._ptr
+                        changed |= instance not in self._ptr
+                        self._ptr[instance] = expiry
+                elif rtype == TYPE_SRV and name.endswith(suffix):
+                    target, port = value
+                    if ttl == 0:
+                        changed |= self._srv.pop(name, None) is not None
+                    else:
+                        previous = self._srv.get(name)
+                        learned |= previous is None or previous[:2] != (target.lower(), port)
+                        changed |= previous is None or previous[:2] != (target.lower(), port)
+                        self._srv[name] = (target.lower(), port, expiry)
+                elif rtype in (TYPE_A, TYPE_AAAA):
+                    addresses = self._addresses.setdefault(name, {})
+                    if ttl == 0:
+                        changed |= addresses.pop(value, None) is not None
+                    else:
+                        changed |= value not in addresses
+                        addresses[value] = expiry
+        return changed, learned
+
+    def _query_missing(self):
+        """Asks for whatever responders left out of the additional section, backing off per name."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            missing = [(instance, TYPE_SRV) for instance in self._ptr if instance not in self._srv]
+            missing += [(srv[0], TYPE_A) for instance, srv in self._srv.items()
+                        if instance in self._ptr and not self._addresses.get(srv[0])]
+            asked = {}
+            for key in missing:
+                next_ask, interval = self._asked.get(key, (0.0, self.QUERY_MIN_INTERVAL))
+                if now >= next_ask:
+                    due.append(key)
+                    next_ask, interval = now + interval, min(interval * 2, self.QUERY_MAX_INTERVAL)
+                asked[key] = (next_ask, interval)
+            self._asked = asked  # names answered since are forgotten
+            self._next_missing = min((next_ask for next_ask, _ in asked.values()), default=float("inf"))
+        if due:
+            self._send(due)
+
+    def _expire(self) -> bool:
+        now = time.monotonic()
+        changed = False
+        with self._lock:
+            for instance in [i for i, expiry in self._ptr.items() if expiry <= now]:
+                del self._ptr[instance]
+                changed = True
+            for instance in [i for i, srv in self._srv.items() if srv[2] <= now]:
+                del self._srv[instance]
+                changed = True
+            for host, addresses in self._addresses.items():
+                for address in [a for a, expiry in addresses.items() if expiry <= now]:
+                    del addresses[address]
+                    changed = True
+        return changed
+
+    def _publish(self):
+        suffix = "." + self.service
+        candidates = []
+        with self._lock:
+            for instance in self._ptr:
+                srv = self._srv.get(instance)
+                if not srv:
+                    continue
+                target, port, _ = srv
+                addresses = sorted(self._addresses.get(target, {}), key=lambda a: ":" in a)  # IPv4 first
+                if not addresses:
+                    continue
+                host = addresses[0]
+                candidates.append({
+                    "name": instance[:-len(suffix)] if instance.endswith(suffix) else instance,
+                    "host": target,
+                    "port": port,
+                    "address": f"[{host}]:{port}" if ":" in host else f"{host}:{port}",
+                    "addresses": addresses,
+                })
+            candidates.sort(key=lambda c: c["name"])
+            if candidates == self._candidates:
+                return
+            self._candidates = candidates
+        if self.on_changed:
+            try:
+                self.on_changed(self.candidates())
+            except Exception:
+                pass
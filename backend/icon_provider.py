@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from PySide6.QtCore import QSize, QStandardPaths, QThreadPool, Qt
+from PySide6.QtGui import QImage, QImageReader
+from PySide6.QtQuick import QQuickAsyncImageProvider, QQuickImageResponse, QQuickTextureFactory
+from .tracing import get_logger
+
+log = get_logger("icons")
+
+# Grid cells draw icons at 56 px; thumbnails default to that when QML asks for no size
+THUMBNAIL_SIZE = 56
+
+
+def icon_cache_dir() -> str:
+    """Where ADBWorker stores the launcher icons pulled from APKs."""
+    cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    return os.path.join(cache_dir, "umc", "icons")
+
+
+class ThumbnailCache:
+    """
+    Downscaled app icons, in memory and on disk.
+
+    Thumbnails are written to <icon dir>/thumbs/<size>/<package>.png the
+    first time a size is asked for and rebuilt when the source icon is
+    newer. The decoded QImages are kept in an LRU bounded by pixel count,
+    so scrolling back over a grid costs neither disk reads nor decodes.
+    """
+
+    def __init__(self, icon_dir: str, max_pixels: int = 1024 * THUMBNAIL_SIZE * THUMBNAIL_SIZE):
+        self.icon_dir = icon_dir
+        self.max_pixels = max_pixels
+        self._images = OrderedDict()  # (package, width, height) -> QImage
+        self._pixels = 0
+        self._lock = threading.Lock()
+
+    def _thumbnail_path(self, package: str, size: QSize) -> str:
+        return os.path.join(self.icon_dir, "thumbs", f"{size.width()}x{size.height()}", f"{package}.png")
+
+    def get(self, package: str, size: QSize) -> Optional[QImage]:
+        key = (package, size.width(), size.height())
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+        image = self._load(package, size)
+        if image is None:
+            return None
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = image
+                self._pixels += image.width() * image.height()
+                while self._pixels > self.max_pixels and len(self._images) > 1:
+                    _, evicted = self._images.popitem(last=False)
+                    self._pixels -= evicted.width() * evicted.height()
+        return image
+
+    def _load(self, package: str, size: QSize) -> Optional[QImage]:
+        source = os.path.join(self.icon_dir, f"{package}.png")
+        thumbnail = self._thumbnail_path(package, size)
+        try:
+            source_mtime = os.path.getmtime(source)
+        except OSError:
+            return None
+
+        try:
+            if os.path.getmtime(thumbnail) >= source_mtime:
+                image = QImage(thumbnail)
+                if not image.isNull():
+                    return image
+        except OSError:
+            pass
+
+        reader = QImageReader(source)
+        original = reader.size()
+        if original.isValid() and (original.width() > size.width() or original.height() > size.height()):
+            # Lets the decoder scale while reading instead of materialising the full image first
+            reader.setScaledSize(original.scaled(size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            log.debug("Cannot decode icon %s: %s", source, reader.errorString())
+            return None
+        if image.width() > size.width() or image.height() > size.height():
+            image = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # Write then rename so a concurrent reader never sees a partial file
+        temp = f"{thumbnail}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(thumbnail), exist_ok=True)
+            if image.save(temp, "PNG"):
+                os.replace(temp, thumbnail)
+        except OSError as e:
+            log.debug("Cannot store thumbnail %s: %s", thumbnail, e)
+        return image
+
+
+class _ThumbnailResponse(QQuickImageResponse):
+    def __init__(self):
+        super().__init__()
+        self._image = QImage()
+
+    def textureFactory(self):
+        return QQuickTextureFactory.textureFactoryForImage(self._image)
+
+    def deliver(self, image: Optional[QImage]):
+        # finished may be emitted from any thread
+        if image is not None:
+            self._image = image
+        self.finished.emit()
+
+
+class IconImageProvider(QQuickAsyncImageProvider):
+    """
+    Serves image://icons/<package> from a ThumbnailCache.
+
+    Decoding and scaling run on a small thread pool, so delegates created
+    while scrolling never decode on the GUI or render thread, and each
+    image request only concerns its own package.
+    """
+
+    def __init__(self, icon_dir: str = None, threads: int = 2):
+        super().__init__()
+        self.cache = ThumbnailCache(icon_dir or icon_cache_dir())
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(threads)
+
+    def requestImageResponse(self, image_id, requested_size):
+        package = image_id.split("?", 1)[0]
+        size = requested_size if requested_size.isValid() and not requested_size.isEmpty() \
+            else QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        response = _ThumbnailResponse()
+        self._pool.start(lambda: response.deliver(self.cache.get(package, size)))
+        return response
@@ -0,0 +1,304 @@
+import hashlib
+import os
+import re
+import struct
+import subprocess
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence
+from .adb_handler import run_adb
+from .tracing import get_logger
+
+log = get_logger("installer")
+
+# Binary XML (AXML) chunk types used by a compiled AndroidManifest.xml
+_RES_STRING_POOL = 0x0001
+_RES_XML = 0x0003
+_RES_XML_START_ELEMENT = 0x0102
+_RES_XML_END_ELEMENT = 0x0103
+_RES_XML_RESOURCE_MAP = 0x0180
+_UTF8_FLAG = 1 << 8
+_TYPE_STRING = 0x03
+_NO_STRING = 0xFFFFFFFF
+
+# android:* attributes are matched by resource id; obfuscated APKs blank their names
+ANDROID_ATTRS = {0x01010003: "name", 0x0101021B: "versionCode", 0x0101021C: "versionName"}
+
+_PACKAGE_RE = re.compile(r"[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*")
+
+# Hashes of the installed APK files (base and splits), in one round trip
+INSTALLED_HASHES_SCRIPT = "for p in $(pm path {package}); do sha256sum ${{p#package:}}; done"
+
+INSTALL_TIMEOUT = 600
+MAX_PARALLEL = 64
+
+
+class InstallError(Exception):
+    pass
+
+
+def _read_string_pool(data: bytes, offset: int) -> List[str]:
+    _, header_size, _, count, _, flags, strings_start = struct.unpack_from("<HHIIIII", data, offset)
+    offsets = struct.unpack_from(f"<{count}I", data, offset + header_size)
+    base = offset + strings_start
+    utf8 = flags & _UTF8_FLAG
+    strings = []
+    for string_offset in offsets:
+        pos = base + string_offset
+        if utf8:
+            # Length in characters, then in bytes; each one or two bytes
+            pos += 2 if data[pos] & 0x80 else 1
+            length = data[pos]
+            if length & 0x80:
+                length = (length & 0x7F) << 8 | data[pos + 1]
+                pos += 1
+            pos += 1
+            strings.append(data[pos:pos + length].decode("utf-8", "replace"))
+        else:
+            length = struct.unpack_from("<H", data, pos)[0]
+            pos += 2
+            if length & 0x8000:
+                length = (length & 0x7FFF) << 16 | struct.unpack_from("<H", data, pos)[0]
+                pos += 2
+            strings.append(data[pos:pos + length * 2].decode("utf-16-le", "replace"))
+    return strings
+
+
+def parse_manifest(data: bytes) -> Dict:
+    """
+    {package, versionCode, versionName, split, launchable} from a compiled
+    (binary XML) AndroidManifest.xml. Only the chunks needed for these are
+    decoded: the string pool, the resource map and element starts/ends.
+    """
+    if len(data) < 8 or struct.unpack_from("<H", data)[0] != _RES_XML:
+        raise InstallError("not a binary AndroidManifest.xml")
+    strings: List[str] = []
+    resource_ids: Sequence[int] = ()
+    manifest: Dict = {"package": "", "versionCode": "", "versionName": "", "split": "", "launchable": False}
+    in_filter = has_main = has_launcher = False
+
+    def attribute_name(index: int) -> str:
+        if index < len(resource_ids) and resource_ids[index] in ANDROID_ATTRS:
+            return ANDROID_ATTRS[resource_ids[index]]
+        return strings[index] if index < len(strings) else ""
+
+    offset = struct.unpack_from("<H", data, 2)[0]
+    end = min(len(data), struct.unpack_from("<I", data, 4)[0])
+    while offset + 8 <= end:
+        chunk_type, header_size, chunk_size = struct.unpack_from("<HHI", data, offset)
+        if chunk_size < 8:
+            break
+        if chunk_type == _RES_STRING_POOL:
+            strings = _read_string_pool(data, offset)
+        elif chunk_type == _RES_XML_RESOURCE_MAP:
+            resource_ids = struct.unpack_from(f"<{(chunk_size - header_size) // 4}I", data, offset + header_size)
+        elif chunk_type in (_RES_XML_START_ELEMENT, _RES_XML_END_ELEMENT):
+            ext = offset + header_size
+            name = strings[struct.unpack_from("<I", data, ext + 4)[0]]
+            if chunk_type == _RES_XML_END_ELEMENT:
+                if name == "intent-filter":
+                    manifest["launchable"] = manifest["launchable"] or (has_main and has_launcher)
+                    in_filter = False
+            else:
+                attr_start, attr_size, attr_count = struct.unpack_from("<HHH", data, ext + 8)
+                attributes = {}
+                for i in range(attr_count):
+                    pos = ext + attr_start + i * attr_size
+                    _, attr_name, raw, _, _, value_type, value = struct.unpack_from("<IIIHBBI", data, pos)
+                    if raw != _NO_STRING:
+                        attributes[attribute_name(attr_name)] = strings[raw]
+                    elif value_type == _TYPE_STRING:
+                        attributes[attribute_name(attr_name)] = strings[value]
+                    else:
+                        attributes[attribute_name(attr_name)] = str(value)
+                if name == "manifest":
+                    for key in ("package", "versionCode", "versionName", "split"):
+                        manifest[key] = attributes.get(key, "")
+                elif name == "intent-filter":
+                    in_filter, has_main, has_launcher = True, False, False
+                elif in_filter and name == "action":
+                    has_main = has_main or attributes.get("name") == "android.intent.action.MAIN"
+                elif in_filter and name == "category":
+                    has_launcher = has_launcher or attributes.get("name") == "android.intent.category.LAUNCHER"
+        offset += chunk_size
+    if not manifest["package"]:
+        raise InstallError("manifest has no package name")
+    return manifest
+
+
+def read_apk_manifest(path: str) -> Dict:
+    try:
+        with zipfile.ZipFile(path) as apk:
+            data = apk.read("AndroidManifest.xml")
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        raise InstallError(f"{os.path.basename(path)} is not an APK: {e}")
+    try:
+        return parse_manifest(data)
+    except (struct.error, IndexError) as e:
+        raise InstallError(f"{os.path.basename(path)}: unreadable manifest ({e})")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_sha256sums(output: str) -> List[str]:
+    """Digests from `sha256sum` lines ("<hex>  <path>"); errors are skipped."""
+    digests = []
+    for line in output.splitlines():
+        digest = line.split(" ", 1)[0]
+        if len(digest) == 64 and all(c in "0123456789abcdef" for c in digest):
+            digests.append(digest)
+    return digests
+
+
+def parse_install_output(output: str) -> str:
+    """"" for a successful `adb install`, else the reason it gives."""
+    match = re.search(r"Failure \[([^\]]+)\]", output)
+    if match:
+        return match.group(1)
+    if "Success" in output:
+        return ""
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    return lines[-1] if lines else "install failed"
+
+
+class APKSet:
+    """
+    One app to install: a base APK and optionally its split APKs, read
+    and hashed once however many devices it goes to.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        if not paths:
+            raise InstallError("no APK given")
+        self.paths = [os.path.abspath(path) for path in paths]
+        manifests = [read_apk_manifest(path) for path in self.paths]
+        packages = {manifest["package"] for manifest in manifests}
+        if len(packages) > 1:
+            raise InstallError(f"APKs of different apps: {', '.join(sorted(packages))}")
+        bases = [manifest for manifest in manifests if not manifest["split"]]
+        if len(bases) != 1:
+            raise InstallError("need exactly one base APK (the others must be its splits)")
+        base = bases[0]
+        self.package = base["package"]
+        if not _PACKAGE_RE.fullmatch(self.package):
+            raise InstallError(f"invalid package name: {self.package}")
+        self.version = base["versionCode"]
+        self.version_name = base["versionName"]
+        self.launchable = base["launchable"]
+        self.size = sum(os.path.getsize(path) for path in self.paths)
+        self.hashes = sorted(file_sha256(path) for path in self.paths)
+
+    def __repr__(self):
+        return f"APKSet({self.package} {self.version_name or self.version}, {len(self.paths)} file(s))"
+
+
+class APKInstaller:
+    """
+    Installs one APKSet on many devices at once, one thread per device.
+
+    adb install (install-multiple for splits) streams the files into
+    `cmd package install -S` on the device instead of pushing them to
+    /data/local/tmp first, and falls back to a push on old devices by
+    itself. Before installing, the device's installed APKs are hashed in a
+    single shell call: if they are the same files the device is skipped.
+    """
+
+    def __init__(self, adb_path: str, max_workers: int = MAX_PARALLEL):
+        self.adb_path = adb_path
+        self.max_workers = max(1, max_workers)
+
+    def installed_hashes(self, serial: str, package: str) -> List[str]:
+        """Sorted digests of package's installed APK files ([] if absent or unknown)."""
+        try:
+            result = run_adb([self.adb_path, "-s", serial, "shell", INSTALLED_HASHES_SCRIPT.format(package=package)],
+                             capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return []
+        return sorted(parse_sha256sums(result.stdout))
+
+    def install_one(self, serial: str, apks: APKSet, force: bool = False, downgrade: bool = False,
+                    grant: bool = False) -> Dict:
+        start = time.monotonic()
+        result = {"serial": serial, "package": apks.package, "version": apks.version, "status": "installed", "message": ""}
+        if not force and self.installed_hashes(serial, apks.package) == apks.hashes:
+            result["status"] = "skipped"
+            result["message"] = "same APKs already installed"
+        else:
+            command = "install" if len(apks.paths) == 1 else "install-multiple"
+            options = ["-r"] + (["-d"] if downgrade else []) + (["-g"] if grant else [])
+            try:
+                completed = run_adb([self.adb_path, "-s", serial, command] + options + apks.paths,
+                                    capture_output=True, text=True, timeout=INSTALL_TIMEOUT)
+                error = parse_install_output(completed.stdout + "\n" + completed.stderr)
+                if completed.returncode != 0 and not error:
+                    error = f"adb exited with {completed.returncode}"
+            except subprocess.TimeoutExpired:
+                error = f"timed out after {INSTALL_TIMEOUT}s"
+            except OSError as e:
+                error = str(e)
+            if error:
+                result["status"] = "failed"
+                result["message"] = error
+                log.warning("Install of %s failed: %s", apks.package, error, extra={"serial": serial})
+        result["seconds"] = round(time.monotonic() - start, 2)
+        return result
+
+    def install(self, serials: Sequence[str], apks: APKSet, on_result: Callable[[Dict], None] = None,
+                **options) -> List[Dict]:
+        """Installs on every device in parallel; results in serials order, each also passed to on_result as it ends."""
+        def one(serial):
+            result = self.install_one(serial, apks, **options)
+            if on_result:
+                on_result(result)
+            return result
+
+        return self._run(serials, one)
+
+    def uninstall_one(self, serial: str, package: str) -> Dict:
+        result = {"serial": serial, "package": package, "status": "uninstalled", "message": ""}
+        try:
+            completed = run_adb([self.adb_path, "-s", serial, "uninstall", package],
+                                capture_output=True, text=True, timeout=120)
+            error = parse_install_output(completed.stdout + "\n" + completed.stderr)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            error = str(e) or "timed out"
+        if error:
+            result["status"] = "failed"
+            result["message"] = error
+        return result
+
+    def uninstall(self, serials: Sequence[str], package: str, on_result: Callable[[Dict], None] = None) -> List[Dict]:
+        if not _PACKAGE_RE.fullmatch(package or ""):
+            raise InstallError(f"invalid package name: {package}")
+
+        def one(serial):
+            result = self.uninstall_one(serial, package)
+            if on_result:
+                on_result(result)
+            return result
+
+        return self._run(serials, one)
+
+    def _run(self, serials: Sequence[str], func: Callable[[str], Dict]) -> List[Dict]:
+        serials = list(dict.fromkeys(serials))
+        if not serials:
+            return []
+        # Devices install concurrently, so the batch takes as long as the slowest one
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(serials)), thread_name_prefix="install") as pool:
+            return list(pool.map(func, serials))
+
+
+def summarize(results: Sequence[Dict]) -> Dict[str, int]:
+    """Counts per status, e.g. {"installed": 38, "skipped": 1, "failed": 1}."""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return counts
+
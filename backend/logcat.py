@@ -0,0 +1,338 @@
+import gzip
+import os
+import re
+import shlex
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Sequence
+from .tracing import get_logger
+
+log = get_logger("logcat")
+
+LogEntry = namedtuple("LogEntry", "time pid tid level tag message")
+
+# android_LogPriority -> the letter logcat prints
+PRIORITY_LETTERS = {0: "?", 1: "?", 2: "V", 3: "D", 4: "I", 5: "W", 6: "E", 7: "F", 8: "S"}
+PRIORITIES = ("V", "D", "I", "W", "E", "F")
+
+# struct logger_entry: len, hdr_size, pid, tid, sec, nsec (lid and uid follow in v3/v4)
+_ENTRY_HEADER = struct.Struct("<HHiIII")
+_V1_HEADER_SIZE = 20
+
+# "-v threadtime": 10-19 08:24:08.776  1234  1250 I ActivityManager: message
+_THREADTIME_RE = re.compile(r"(\d\d-\d\d \d\d:\d\d:\d\d)\.(\d+)\s+(\d+)\s+(\d+) ([VDIWEFS]) (.*?)\s*: (.*)")
+
+DEFAULT_CAPACITY = 50000
+
+
+def build_logcat_command(adb_path: str, serial: str, binary: bool = True, filters: Sequence[str] = (),
+                         priority: str = "", pid: int = 0, buffers: Sequence[str] = (),
+                         regex: str = "", tail: int = 0) -> List[str]:
+    """
+    The adb command streaming a device's log. Filtering happens in logcat on
+    the device: filter specs ("Tag:W"), a minimum priority for everything
+    else, --pid and -e, so rejected lines never cross the USB/Wi-Fi link.
+    exec-out keeps binary output free of pty newline translation.
+    """
+    args = ["logcat", "-B"] if binary else ["logcat", "-v", "threadtime"]
+    for buffer in buffers:
+        args += ["-b", buffer]
+    if pid:
+        args.append(f"--pid={int(pid)}")
+    if tail:
+        args += ["-T", str(int(tail))]
+    if regex:
+        args += ["-e", regex]
+    specs = [spec for spec in filters if spec]
+    if priority in PRIORITIES:
+        # Named tags keep their own level; the rest need at least `priority`
+        specs.append(f"*:{priority}")
+    elif specs:
+        specs.append("*:S")
+    args += specs
+    # The device shell re-splits the command line: quote specs like "*:S"
+    return [adb_path, "-s", serial, "exec-out", " ".join(shlex.quote(arg) for arg in args)]
+
+
+class BinaryLogParser:
+    """Incremental parser for `logcat -B` output (struct logger_entry records)."""
+
+    def __init__(self):
+        self._pending = b""
+
+    def feed(self, data: bytes) -> List[LogEntry]:
+        buf = self._pending + data if self._pending else data
+        entries = []
+        append = entries.append
+        unpack = _ENTRY_HEADER.unpack_from
+        intern = sys.intern
+        offset = 0
+        end = len(buf)
+        while end - offset >= _V1_HEADER_SIZE:
+            length, header_size, pid, tid, sec, nsec = unpack(buf, offset)
+            if header_size < _V1_HEADER_SIZE:
+                header_size = _V1_HEADER_SIZE  # v1 has padding where hdr_size is
+            record_end = offset + header_size + length
+            if record_end > end:
+                break
+            start = offset + header_size
+            offset = record_end
+            if length < 2:
+                continue
+            tag_end = buf.find(b"\0", start + 1, record_end)
+            if tag_end < 0:
+                continue  # event-log payload; binary events are not text
+            message_end = buf.find(b"\0", tag_end + 1, record_end)
+            if message_end < 0:
+                message_end = record_end
+            append(LogEntry(
+                sec + nsec / 1e9, pid, tid, PRIORITY_LETTERS.get(buf[start], "?"),
+                intern(buf[start + 1:tag_end].decode("utf-8", "replace")),
+                buf[tag_end + 1:message_end].decode("utf-8", "replace").rstrip("\n"),
+            ))
+        self._pending = buf[offset:]
+        return entries
+
+
+class TextLogParser:
+    """Incremental parser for `logcat -v threadtime` output."""
+
+    def __init__(self):
+        self._pending = b""
+        self._year = time.localtime().tm_year
+        self._seconds: Dict[str, float] = {}  # "MM-DD HH:MM:SS" -> epoch, threadtime has no year
+
+    def _epoch(self, stamp: str) -> float:
+        seconds = self._seconds.get(stamp)
+        if seconds is None:
+            if len(self._seconds) > 4096:
+                self._seconds.clear()
+            try:
+                seconds = time.mktime(time.strptime(f"{self._year}-{stamp}", "%Y-%m-%d %H:%M:%S"))
+            except ValueError:
+                seconds = 0.0
+            self._seconds[stamp] = seconds
+        return seconds
+
+    def feed(self, data: bytes) -> List[LogEntry]:
+        lines = (self._pending + data).split(b"\n")
+        self._pending = lines.pop()
+        entries = []
+        match = _THREADTIME_RE.match
+        intern = sys.intern
+        for line in lines:
+            m = match(line.decode("utf-8", "replace").rstrip("\r"))
+            if m is None:
+                continue  # "--------- beginning of main" and the like
+            stamp, fraction, pid, tid, level, tag, message = m.groups()
+            entries.append(LogEntry(
+                self._epoch(stamp) + int(fraction) / 10 ** len(fraction),
+                int(pid), int(tid), level, intern(tag), message,
+            ))
+        return entries
+
+
+def format_entry(entry: LogEntry) -> str:
+    """An entry as a threadtime line."""
+    stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(entry.time))
+    millis = int(entry.time * 1000) % 1000
+    return f"{stamp}.{millis:03d} {entry.pid:5d} {entry.tid:5d} {entry.level} {entry.tag}: {entry.message}"
+
+
+class LogRing:
+    """
+    Fixed-size ring of log entries addressed by sequence number.
+
+    Sequence numbers grow forever; the ring holds [first, total). Memory is
+    bounded by capacity no matter how fast the device logs.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, int(capacity))
+        self.total = 0
+        self._slots: List[Optional[LogEntry]] = [None] * self.capacity
+        self._lock = threading.Lock()
+
+    @property
+    def first(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def __len__(self):
+        return self.total - self.first
+
+    def extend(self, entries: Sequence[LogEntry], evicted: list = None):
+        """Appends entries; the ones pushed out are added to evicted if given."""
+        with self._lock:
+            slots = self._slots
+            capacity = self.capacity
+            total = self.total
+            for entry in entries:
+                index = total % capacity
+                if evicted is not None and total >= capacity:
+                    evicted.append(slots[index])
+                slots[index] = entry
+                total += 1
+            self.total = total
+
+    def get(self, seq: int) -> Optional[LogEntry]:
+        with self._lock:
+            if not self.first <= seq < self.total:
+                return None
+            return self._slots[seq % self.capacity]
+
+    def snapshot(self, start: int = 0) -> List[LogEntry]:
+        """Entries from sequence number start (clamped to first) to the newest."""
+        with self._lock:
+            return [self._slots[seq % self.capacity] for seq in range(max(start, self.first), self.total)]
+
+
+class LogcatStream:
+    """
+    One device's logcat, read and parsed on a background thread into a
+    LogRing (its own, or one shared with other streams). With spill_path
+    set, entries leaving the ring (and the ring's contents when the stream
+    stops) are appended to a gzip file, so a long capture costs disk rather
+    than memory.
+    """
+
+    READ_SIZE = 1 << 16
+
+    def __init__(self, adb_path: str, serial: str, binary: bool = True, filters: Sequence[str] = (),
+                 priority: str = "", pid: int = 0, buffers: Sequence[str] = (), regex: str = "",
+                 capacity: int = DEFAULT_CAPACITY, spill_path: str = None, on_finished: Callable = None,
+                 ring: LogRing = None, sink: Callable[[List[LogEntry]], None] = None):
+        self.serial = serial
+        # Event-log records carry binary payloads; only logcat can render them
+        self.binary = binary and "events" not in buffers
+        self.command = build_logcat_command(adb_path, serial, self.binary, filters, priority, pid, buffers, regex)
+        self.ring = ring if ring is not None else LogRing(capacity)
+        self.sink = sink  # also receives every parsed batch, on the reader thread
+        self.spill_path = spill_path
+        self.bytes_read = 0
+        self.error = ""
+        self._on_finished = on_finished
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = False
+        self._finished = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._finished
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"logcat-{self.serial}", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: float = 0):
+        self._stopped = True
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+        if wait:
+            self.join(wait)
+
+    def join(self, timeout: float = None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        parser = BinaryLogParser() if self.binary else TextLogParser()
+        spill = None
+        try:
+            if self.spill_path:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                # Level 1: a fast device produces megabytes per second
+                spill = gzip.open(self.spill_path, "at", encoding="utf-8", compresslevel=1)
+            self._process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+            if self._stopped:
+                self._process.terminate()
+            read = self._process.stdout.read
+            evicted = [] if spill else None
+            while True:
+                data = read(self.READ_SIZE)
+                if not data:
+                    break
+                self.bytes_read += len(data)
+                entries = parser.feed(data)
+                if not entries:
+                    continue
+                self.ring.extend(entries, evicted)
+                if self.sink:
+                    self.sink(entries)
+                if evicted:
+                    spill.write("".join(format_entry(entry) + "\n" for entry in evicted))
+                    evicted.clear()
+            if self._process.wait() != 0 and not self._stopped:
+                self.error = self._process.stderr.read().decode("utf-8", "replace").strip()
+        except OSError as e:
+            self.error = str(e)
+        finally:
+            if self._process and self._process.poll() is None:
+                self._process.kill()
+                self._process.wait()
+            if spill:
+                try:
+                    spill.write("".join(format_entry(entry) + "\n" for entry in self.ring.snapshot()))
+                    spill.close()
+                except OSError as e:
+                    log.error("Cannot write %s: %s", self.spill_path, e)
+            if self.error:
+                log.warning("logcat for %s ended: %s", self.serial, self.error, extra={"serial": self.serial})
+            self._finished = True
+            if self._on_finished:
+                self._on_finished(self)
+
+
+class LogcatPool:
+    """At most one logcat stream per device."""
+
+    def __init__(self, adb_path: str, spill_dir: str = None, on_finished: Callable = None):
+        self.adb_path = adb_path
+        self.spill_dir = spill_dir
+        self.on_finished = on_finished
+        self._streams: Dict[str, LogcatStream] = {}
+        self._lock = threading.Lock()
+
+    def start(self, serial: str, spill: bool = False, **options) -> Optional[LogcatStream]:
+        """(Re)starts the device's stream with new filters; the previous one is stopped."""
+        if not self.adb_path:
+            return None
+        spill_path = None
+        if spill and self.spill_dir:
+            name = f"logcat_{serial.replace(':', '_')}_{time.strftime('%Y%m%d_%H%M%S')}.log.gz"
+            spill_path = os.path.join(self.spill_dir, name)
+        stream = LogcatStream(self.adb_path, serial, spill_path=spill_path, on_finished=self._finished, **options)
+        with self._lock:
+            previous = self._streams.get(serial)
+            self._streams[serial] = stream
+        if previous:
+            previous.stop()
+        stream.start()
+        return stream
+
+    def _finished(self, stream: LogcatStream):
+        if self.on_finished:
+            self.on_finished(stream)
+
+    def get(self, serial: str) -> Optional[LogcatStream]:
+        with self._lock:
+            return self._streams.get(serial)
+
+    def stop(self, serial: str):
+        stream = self.get(serial)
+        if stream:
+            stream.stop()
+
+    def stop_all(self, wait: float = 0):
+        with self._lock:
+            streams = list(self._streams.values())
+        for stream in streams:
+            stream.stop()
+        if wait:
+            for stream in streams:
+                stream.join(wait)
@@ -0,0 +1,141 @@
+import time
+from typing import Optional
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QByteArray, QTimer, Property, Signal
+from .logcat import LogcatStream
+
+
+class LogcatModel(QAbstractListModel):
+    """
+    The lines of one LogcatStream, oldest first.
+
+    The stream's reader thread only appends to its ring; this model polls
+    the ring's sequence numbers on a timer and turns them into row removals
+    at the top and insertions at the bottom. Rows are read from the ring on
+    demand, so the list view only ever materialises what is on screen.
+    """
+
+    TimeRole = Qt.UserRole + 1
+    PidRole = Qt.UserRole + 2
+    TidRole = Qt.UserRole + 3
+    LevelRole = Qt.UserRole + 4
+    TagRole = Qt.UserRole + 5
+    MessageRole = Qt.UserRole + 6
+
+    ROLE_NAMES = {
+        TimeRole: b"time",
+        PidRole: b"pid",
+        TidRole: b"tid",
+        LevelRole: b"level",
+        TagRole: b"tag",
+        MessageRole: b"message",
+    }
+
+    SYNC_INTERVAL_MS = 100
+
+    countChanged = Signal()
+    serialChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._stream: Optional[LogcatStream] = None
+        self._start = 0  # sequence number of row 0
+        self._end = 0  # sequence number after the last row
+        self._floor = 0  # entries before this were cleared from the view
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.SYNC_INTERVAL_MS)
+        self._timer.timeout.connect(self._sync)
+
+    def roleNames(self):
+        return {role: QByteArray(name) for role, name in self.ROLE_NAMES.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._end - self._start
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self._stream is None:
+            return None
+        entry = self._stream.ring.get(self._start + index.row())
+        if entry is None:
+            return None  # evicted since the last sync; the row goes away on the next one
+        if role in (self.MessageRole, Qt.DisplayRole):
+            return entry.message
+        if role == self.TimeRole:
+            return time.strftime("%H:%M:%S", time.localtime(entry.time)) + f".{int(entry.time * 1000) % 1000:03d}"
+        if role == self.PidRole:
+            return entry.pid
+        if role == self.TidRole:
+            return entry.tid
+        if role == self.LevelRole:
+            return entry.level
+        if role == self.TagRole:
+            return entry.tag
+        return None
+
+    def get_count(self):
+        return self._end - self._start
+
+    def get_serial(self):
+        return self._stream.serial if self._stream else ""
+
+    count = Property(int, fget=get_count, notify=countChanged)
+    serial = Property(str, fget=get_serial, notify=serialChanged)
+
+    def set_stream(self, stream: Optional[LogcatStream]):
+        """
+        Shows another stream (or none); the old stream keeps running. Anything
+        with ring, serial and running will do, such as an AppLogSession.
+        """
+        if stream is self._stream:
+            if stream is not None and not self._timer.isActive():
+                self._timer.start()
+            return
+        self.beginResetModel()
+        self._stream = stream
+        self._floor = 0
+        self._start = self._end = stream.ring.first if stream else 0
+        self.endResetModel()
+        self.countChanged.emit()
+        self.serialChanged.emit()
+        if stream is None:
+            self._timer.stop()
+        else:
+            self._timer.start()
+            self._sync()
+
+    def clear(self):
+        """Hides everything received so far; the ring itself is untouched."""
+        if self._stream is None:
+            return
+        self.beginResetModel()
+        self._floor = self._start = self._end = self._stream.ring.total
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def _sync(self):
+        stream = self._stream
+        if stream is None:
+            return
+        ring = stream.ring
+        total = ring.total
+        first = max(ring.first, self._floor)
+        if first == self._start and total == self._end:
+            if not stream.running:
+                self._timer.stop()
+            return
+        if self._end == self._start:
+            self._start = self._end = first  # nothing shown yet
+        if first >= self._end > self._start:
+            # Everything shown has been evicted: cheaper to start over
+            self.beginResetModel()
+            self._start, self._end = first, total
+            self.endResetModel()
+        else:
+            if first > self._start:
+                self.beginRemoveRows(QModelIndex(), 0, first - self._start - 1)
+                self._start = first
+                self.endRemoveRows()
+            if total > self._end:
+                self.beginInsertRows(QModelIndex(), self._end - self._start, total - self._start - 1)
+                self._end = total
+                self.endInsertRows()
+        self.countChanged.emit()
@@ -0,0 +1,347 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from .tracing import get_logger, span, current_flow, TRACER
+
+log = get_logger("metrics")
+
+# Latency buckets in seconds, from a quick `getprop` to a large pull
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(key)} {value}" for key, value in self.samples()]
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        lines += [f"{self.name}{_format_labels(key)} {value}" for key, value in self.samples()]
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and three additions under a lock."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelKey, list] = {}  # key -> [bucket counts..., count, sum, max]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0, 0.0, 0.0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-3] += 1
+            series[-2] += value
+            if value > series[-1]:
+                series[-1] = value
+
+    def summary(self, key: LabelKey) -> Dict:
+        """count, mean, max and bucket-interpolated p50/p95 (seconds)."""
+        with self._lock:
+            series = list(self._series.get(key, []))
+        if not series or not series[-3]:
+            return {"count": 0, "mean": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0}
+        count, total, peak = series[-3], series[-2], series[-1]
+        return {
+            "count": count,
+            "mean": total / count,
+            "max": peak,
+            "p50": self._quantile(series, count, 0.5),
+            "p95": self._quantile(series, count, 0.95),
+        }
+
+    def _quantile(self, series: list, count: int, q: float) -> float:
+        rank = q * count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.buckets, series):
+            if n and seen + n >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / n, series[-1])
+            seen += n
+            lower = bound
+        return series[-1]  # beyond the last bucket: report the max
+
+    def keys(self) -> List[LabelKey]:
+        with self._lock:
+            return list(self._series)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series[-3]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-3]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics. When disabled (UMC_METRICS=0) the recording helpers
+    below (observe_command, timed, QueueTracker) return immediately, so
+    instrumented code needs no checks of its own.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.expose()
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> bool:
+        """Writes the Prometheus text format to path (atomically)."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            log.error("Error writing metrics to %s: %s", path, e)
+            return False
+
+    def histogram_rows(self, name: str) -> List[Dict]:
+        """One summary dict per label set, slowest p95 first (for the diagnostics panel)."""
+        with self._lock:
+            metric = self._metrics.get(name)
+        if not isinstance(metric, Histogram):
+            return []
+        rows = []
+        for key in metric.keys():
+            row = dict(key)
+            row.update(metric.summary(key))
+            rows.append(row)
+        rows.sort(key=lambda r: r["p95"], reverse=True)
+        return rows
+
+    def values(self, name: str) -> List[Dict]:
+        """Counter/gauge samples as dicts with a "value" field."""
+        with self._lock:
+            metric = self._metrics.get(name)
+        if not isinstance(metric, Counter):
+            return []
+        return [dict(key, value=value) for key, value in metric.samples()]
+
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get("UMC_METRICS", "1") != "0")
+
+ADB_COMMAND_SECONDS = REGISTRY.histogram("umc_adb_command_seconds", "Wall time of adb invocations by command type and device")
+ADB_COMMAND_ERRORS = REGISTRY.counter("umc_adb_command_errors_total", "adb invocations that failed or timed out")
+WORKER_TASK_SECONDS = REGISTRY.histogram("umc_worker_task_seconds", "Run time of ADB worker slots")
+WORKER_WAIT_SECONDS = REGISTRY.histogram("umc_worker_wait_seconds", "Time requests spend queued before the worker runs them")
+WORKER_QUEUE_DEPTH = REGISTRY.gauge("umc_worker_queue_depth", "Requests queued for the ADB worker")
+SCRCPY_SPAWN_SECONDS = REGISTRY.histogram("umc_scrcpy_spawn_seconds", "Time to start a scrcpy process")
+SCRCPY_FIRST_FRAME_SECONDS = REGISTRY.histogram("umc_scrcpy_first_frame_seconds", "Time from launching scrcpy until its first frame is displayed")
+RENDER_LATENCY_SECONDS = REGISTRY.histogram("umc_signal_render_seconds", "Time from a bridge signal to the next rendered frame")
+STARTUP_FIRST_FRAME_SECONDS = REGISTRY.gauge("umc_startup_first_frame_seconds", "Time from process start until the main window rendered its first frame")
+
+
+def command_label(cmd: list) -> str:
+    """
+    Groups adb argv by what it does: ["adb", "-s", X, "shell", "dumpsys", "battery"]
+    -> "shell dumpsys"; ["adb", "-s", X, "pull", ...] -> "pull".
+    """
+    args = list(cmd[1:])
+    if len(args) >= 2 and args[0] == "-s":
+        args = args[2:]
+    if not args:
+        return "adb"
+    if args[0] in ("shell", "exec-out") and len(args) > 1:
+        return f"{args[0]} {args[1].split()[0] if args[1].strip() else ''}".strip()
+    return args[0]
+
+
+def command_serial(cmd: list) -> str:
+    return cmd[2] if len(cmd) > 2 and cmd[1] == "-s" else ""
+
+
+def observe_command(cmd: list, seconds: float, ok: bool = True):
+    if not REGISTRY.enabled:
+        return
+    command = command_label(cmd)
+    serial = command_serial(cmd)
+    ADB_COMMAND_SECONDS.observe(seconds, command=command, serial=serial)
+    if not ok:
+        ADB_COMMAND_ERRORS.inc(command=command, serial=serial)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels):
+    if not REGISTRY.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+class QueueTracker:
+    """
+    Depth and wait time of a queued-connection worker. The sender calls
+    enqueued(task) when it emits a request, the worker slot is wrapped with
+    track() which records the wait and the run time. The sender's trace flow
+    (if any) is carried across the queue so the worker span joins it.
+    """
+
+    def __init__(self, queue: str):
+        self.queue = queue
+        self._pending: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _active() -> bool:
+        return REGISTRY.enabled or TRACER.enabled
+
+    def enqueued(self, task: str):
+        if not self._active():
+            return
+        with self._lock:
+            self._pending.setdefault(task, deque()).append((time.perf_counter(), current_flow()))
+        WORKER_QUEUE_DEPTH.inc(queue=self.queue)
+
+    def _started(self, task: str) -> Tuple[Optional[float], Optional[int]]:
+        with self._lock:
+            pending = self._pending.get(task)
+            if not pending:
+                return None, None  # called directly, not through the queue
+            queued_at, flow = pending.popleft()
+        WORKER_QUEUE_DEPTH.dec(queue=self.queue)
+        return time.perf_counter() - queued_at, flow
+
+    def track(self, task: str):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._active():
+                    return func(*args, **kwargs)
+                waited, flow = self._started(task)
+                if waited is not None:
+                    WORKER_WAIT_SECONDS.observe(waited, queue=self.queue, task=task)
+                # Worker slots take the device serial first (after self)
+                serial = args[1] if len(args) > 1 and isinstance(args[1], str) else None
+                start = time.perf_counter()
+                try:
+                    with span(f"worker.{task}", serial=serial, flow=flow):
+                        return func(*args, **kwargs)
+                finally:
+                    WORKER_TASK_SECONDS.observe(time.perf_counter() - start, queue=self.queue, task=task)
+            return wrapper
+        return decorator
+
+
+WORKER_QUEUE = QueueTracker("adb_worker")
+
+
+def start_http_server(port: int, host: str = "127.0.0.1"):
+    """Serves /metrics in Prometheus text format on a daemon thread."""
+    # http.server pulls in email/html parsing; only pay for it when the endpoint is enabled
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = REGISTRY.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        log.error("Error starting metrics endpoint on %s:%s: %s", host, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -5,7 +5,7 @@ class ScrcpyProfile:
         self.name = name
         self.args = args
 
-    def to_flags(self) -> list:
+    def to_flags(self, playback: bool = True) -> list:
         flags = []
         if self.args.get("max_size", 0) > 0:
             flags.append(f"--max-size={self.args['max_size']}")
@@ -16,7 +16,8 @@ class ScrcpyProfile:
         if self.args.get("max_fps", 0) > 0:
             flags.append(f"--max-fps={self.args['max_fps']}")
             
-        if "buffer" in self.args and self.args["buffer"] is not None:
+        # Buffering only affects local playback, recordings are muxed as received
+        if playback and "buffer" in self.args and self.args["buffer"] is not None:
              # scrcpy v2.0+ uses --display-buffer=ms (waiting for audio) or --video-buffer=ms?
              # Actually --display-buffer is for v1.x. v2.x uses --video-buffer?
              # Let's stick to generic if possible, or assume v2.0+
@@ -68,9 +69,30 @@ PROFILES = {
     })
 }
 
+# Picks a profile per device from its measured link (see ConnectionManager)
+AUTO_PROFILE = "Auto"
+
 def get_profile_names():
-    return list(PROFILES.keys())
+    return [AUTO_PROFILE] + list(PROFILES.keys())
+
+def recommend_profile(latency_ms: float = None, throughput: float = None) -> str:
+    """
+    Chooses a profile for a network link. throughput is in bytes/s; unknown
+    values (USB devices, not yet measured) leave the choice to the default.
+    The video bit rate is kept well under the measured link capacity.
+    """
+    bits = throughput * 8 if throughput else None
+    if (latency_ms is not None and latency_ms > 150) or (bits is not None and bits < 3 * PROFILES["Low Latency"].args["bit_rate"] / 2):
+        return "Battery Saver"
+    if (latency_ms is not None and latency_ms > 50) or (bits is not None and bits < 3 * PROFILES["Default"].args["bit_rate"] / 2):
+        return "Low Latency"
+    return "Default"
 
 def get_profile_flags(name: str):
     profile = PROFILES.get(name, PROFILES["Default"])
     return profile.to_flags()
+
+def get_record_flags(name: str):
+    """Profile flags applicable to headless recording (no playback buffers)."""
+    profile = PROFILES.get(name, PROFILES["Default"])
+    return profile.to_flags(playback=False)
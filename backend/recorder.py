@@ -0,0 +1,252 @@
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from .scrcpy_handler import ScrcpyHandler
+from .tracing import get_logger
+
+log = get_logger("scrcpy")
+
+
+class RecordingSession:
+    """
+    A supervised headless scrcpy recording for one device.
+
+    Output is rotated into fixed-length segments by running scrcpy with
+    --time-limit per segment. The session stops on its own once the total
+    duration limit, the byte budget or the free disk floor is reached.
+    """
+
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, scrcpy: ScrcpyHandler, serial: str, output_dir: str, time_limit: int = 0,
+                 segment_seconds: int = 300, max_bytes: int = 0, min_free_bytes: int = 1024 ** 3,
+                 extra_flags: list = None, container: str = "mp4", on_finished: Callable = None):
+        self.serial = serial
+        self.output_dir = output_dir
+        self.time_limit = max(0, int(time_limit))
+        self.segment_seconds = max(0, int(segment_seconds))
+        self.max_bytes = max(0, int(max_bytes))
+        self.min_free_bytes = max(0, int(min_free_bytes))
+        self.extra_flags = list(extra_flags or [])
+        self.container = container
+        self.segments: List[str] = []
+        self.bytes_written = 0
+        self.throughput = 0.0  # bytes/s over the last poll interval
+        self.started_at = 0.0
+        self.stop_reason = ""
+        self._scrcpy = scrcpy
+        self._on_finished = on_finished
+        self._process: Optional[subprocess.Popen] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._prefix = f"record_{serial.replace(':', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.running:
+            return False
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"record-{self.serial}", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, reason: str = "stopped", wait: float = 0):
+        """Requests the recording to stop; scrcpy is interrupted so the file gets finalized."""
+        if not self.stop_reason:
+            self.stop_reason = reason
+        self._stop_event.set()
+        self._interrupt()
+        if wait and self._thread:
+            self._thread.join(wait)
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            "serial": self.serial,
+            "running": self.running,
+            "elapsed": int(elapsed),
+            "segments": list(self.segments),
+            "bytes_written": self.bytes_written,
+            "throughput": int(self.throughput),
+            "average_throughput": int(self.bytes_written / elapsed) if elapsed > 0 else 0,
+            "stop_reason": self.stop_reason
+        }
+
+    def _remaining(self) -> float:
+        if not self.time_limit:
+            return 0
+        return self.time_limit - (time.monotonic() - self.started_at)
+
+    def _next_segment_length(self) -> int:
+        """Seconds for the next segment; 0 once the time limit is used up."""
+        if self.time_limit:
+            remaining = int(self._remaining())
+            # scrcpy takes whole seconds; under one left means the limit is reached
+            if remaining < 1:
+                return 0
+            return min(self.segment_seconds, remaining) if self.segment_seconds else remaining
+        return self.segment_seconds
+
+    def _next_segment_path(self) -> str:
+        index = len(self.segments) + 1
+        return os.path.join(self.output_dir, f"{self._prefix}_{index:03d}.{self.container}")
+
+    def _interrupt(self):
+        process = self._process
+        if process and process.poll() is None:
+            try:
+                # SIGINT lets scrcpy write the container trailer before exiting
+                process.send_signal(signal.SIGINT)
+            except Exception:
+                pass
+
+    def _check_limits(self, current_bytes: int) -> Optional[str]:
+        if self.time_limit and self._remaining() <= 0:
+            return "time limit reached"
+        if self.max_bytes and current_bytes >= self.max_bytes:
+            return "size limit reached"
+        if self.min_free_bytes:
+            try:
+                if shutil.disk_usage(self.output_dir).free < self.min_free_bytes:
+                    return "low disk space"
+            except OSError:
+                pass
+        return None
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                segment_length = self._next_segment_length()
+                if self.time_limit and segment_length <= 0:
+                    self.stop_reason = self.stop_reason or "time limit reached"
+                    break
+
+                path = self._next_segment_path()
+                cmd = self._scrcpy.build_record_command(
+                    self.serial, path, time_limit=segment_length, extra_flags=self.extra_flags
+                )
+                try:
+                    self._process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                except Exception as e:
+                    log.error("Failed to record: %s", e)
+                    self.stop_reason = self.stop_reason or "failed to start scrcpy"
+                    break
+                self.segments.append(path)
+
+                completed_bytes = self.bytes_written
+                last_size = 0
+                last_sample = time.monotonic()
+                while self._process.poll() is None:
+                    if self._stop_event.wait(self.POLL_INTERVAL):
+                        break
+                    size = self._file_size(path)
+                    now = time.monotonic()
+                    self.throughput = (size - last_size) / max(now - last_sample, 1e-3)
+                    last_size, last_sample = size, now
+                    self.bytes_written = completed_bytes + size
+                    reason = self._check_limits(self.bytes_written)
+                    if reason:
+                        self.stop(reason)
+
+                try:
+                    returncode = self._process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    returncode = self._process.wait()
+                self.bytes_written = completed_bytes + self._file_size(path)
+                self.throughput = 0.0
+
+                if returncode != 0 and not self._stop_event.is_set():
+                    # Device went away or scrcpy refused the options; don't spin
+                    self.stop_reason = self.stop_reason or f"scrcpy exited with code {returncode}"
+                    break
+                if not segment_length:
+                    # No rotation requested and scrcpy ended cleanly
+                    break
+        finally:
+            self._process = None
+            if not self.stop_reason:
+                self.stop_reason = "finished"
+            if self._on_finished:
+                try:
+                    self._on_finished(self)
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+
+class RecordingManager:
+    """
+    Owns recording sessions for any number of devices, one session per serial.
+    """
+
+    def __init__(self, output_dir: str, scrcpy: ScrcpyHandler = None):
+        self.output_dir = output_dir
+        self._scrcpy = scrcpy or ScrcpyHandler()
+        self._sessions: Dict[str, RecordingSession] = {}
+        self._lock = threading.Lock()
+        self.on_finished: Optional[Callable[[RecordingSession], None]] = None
+
+    def start(self, serial: str, time_limit: int = 0, segment_seconds: int = 300, max_bytes: int = 0,
+              extra_flags: list = None) -> bool:
+        with self._lock:
+            session = self._sessions.get(serial)
+            if session and session.running:
+                return False
+            session = RecordingSession(
+                self._scrcpy, serial, self.output_dir,
+                time_limit=time_limit,
+                segment_seconds=segment_seconds,
+                max_bytes=max_bytes,
+                extra_flags=extra_flags,
+                on_finished=self._session_finished
+            )
+            self._sessions[serial] = session
+        return session.start()
+
+    def stop(self, serial: str, wait: float = 0) -> bool:
+        session = self._sessions.get(serial)
+        if not session or not session.running:
+            return False
+        session.stop(wait=wait)
+        return True
+
+    def stop_all(self, wait: float = 0):
+        for session in list(self._sessions.values()):
+            if session.running:
+                session.stop()
+        if wait:
+            deadline = time.monotonic() + wait
+            for session in list(self._sessions.values()):
+                if session._thread:
+                    session._thread.join(max(0, deadline - time.monotonic()))
+
+    def is_recording(self, serial: str) -> bool:
+        session = self._sessions.get(serial)
+        return bool(session and session.running)
+
+    def stats(self) -> List[dict]:
+        return [session.stats() for session in list(self._sessions.values())]
+
+    def total_throughput(self) -> int:
+        """Combined disk write rate of all running sessions in bytes/s."""
+        return int(sum(s.throughput for s in list(self._sessions.values()) if s.running))
+
+    def _session_finished(self, session: RecordingSession):
+        if self.on_finished:
+            self.on_finished(session)
@@ -1,9 +1,110 @@
 import subprocess
 import shutil
+import threading
+import time
+from typing import List, Optional
+from .metrics import SCRCPY_SPAWN_SECONDS, SCRCPY_FIRST_FRAME_SECONDS
+from .tracing import get_logger
+
+log = get_logger("scrcpy")
+
+
+class ScrcpySession:
+    """
+    A scrcpy window process launched by UMC.
+    """
+    def __init__(self, process: subprocess.Popen, serial: str, kind: str, title: str, screen_on: bool = True, aspect: float = 0):
+        self.process = process
+        self.pid = process.pid
+        self.serial = serial
+        self.kind = kind  # "app", "display" or "mirror"
+        self.title = title
+        self.started_at = time.monotonic()
+        self.window_id: Optional[int] = None  # resolved once from _NET_WM_PID
+        self.screen_on = screen_on  # device screen state as last set through this session
+        self.aspect = aspect  # content width / height, used by the window layout
+        self.geometry = None  # (x, y, width, height) last assigned by the window layout
+        self.first_frame_at: Optional[float] = None
+        self.package: Optional[str] = None  # app started with --start-app, for "app" sessions
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def __repr__(self):
+        return f"<ScrcpySession pid={self.pid} serial={self.serial} kind={self.kind}>"
+
 
 class ScrcpyHandler:
     def __init__(self):
         self.scrcpy_path = shutil.which("scrcpy") or "scrcpy"
+        self._sessions = {}  # pid -> ScrcpySession
+        self._sessions_lock = threading.Lock()
+
+    def _spawn(self, cmd: list, serial: str, kind: str, title: str, turn_screen_off: bool = False,
+               aspect: float = 0, geometry: tuple = None) -> ScrcpySession:
+        # Don't suppress stderr so we can see errors in console; stdout carries
+        # scrcpy's INFO log, which is watched for the first frame
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=None, text=True, errors="replace")
+        SCRCPY_SPAWN_SECONDS.observe(time.perf_counter() - start, kind=kind)
+        session = ScrcpySession(process, serial, kind, title, screen_on=not turn_screen_off, aspect=aspect)
+        session.geometry = geometry
+        with self._sessions_lock:
+            self._sessions[session.pid] = session
+        threading.Thread(target=self._watch_output, args=(session,), name=f"scrcpy-{session.pid}", daemon=True).start()
+        return session
+
+    @staticmethod
+    def _watch_output(session: ScrcpySession):
+        """Times the first frame ("INFO: Texture: WxH") and keeps the pipe drained."""
+        try:
+            for line in session.process.stdout:
+                if session.first_frame_at is None and "Texture:" in line:
+                    session.first_frame_at = time.monotonic()
+                    SCRCPY_FIRST_FRAME_SECONDS.observe(session.first_frame_at - session.started_at, kind=session.kind)
+        except (OSError, ValueError):
+            pass
+
+    def sessions(self, serial: str = None) -> List[ScrcpySession]:
+        """Live sessions, oldest first, optionally for one device."""
+        with self._sessions_lock:
+            return [s for s in self._sessions.values() if s.alive and (serial is None or s.serial == serial)]
+
+    def get_session(self, pid: int) -> Optional[ScrcpySession]:
+        with self._sessions_lock:
+            return self._sessions.get(pid)
+
+    def latest_session(self, serial: str) -> Optional[ScrcpySession]:
+        sessions = self.sessions(serial)
+        return sessions[-1] if sessions else None
+
+    def reap(self) -> List[ScrcpySession]:
+        """Forgets sessions whose scrcpy process has exited and returns them."""
+        with self._sessions_lock:
+            exited = [s for s in self._sessions.values() if not s.alive]
+            for session in exited:
+                del self._sessions[session.pid]
+        return exited
+
+    @staticmethod
+    def _window_flags(window_x: int = None, window_y: int = None, window_width: int = None, window_height: int = None) -> list:
+        flags = []
+        if window_x is not None:
+            flags.append(f"--window-x={window_x}")
+        if window_y is not None:
+            flags.append(f"--window-y={window_y}")
+        if window_width is not None:
+            flags.append(f"--window-width={window_width}")
+        if window_height is not None:
+            flags.append(f"--window-height={window_height}")
+        return flags
+
+    @staticmethod
+    def _geometry(window_x, window_y, window_width, window_height) -> Optional[tuple]:
+        if None in (window_x, window_y, window_width, window_height):
+            return None
+        return (window_x, window_y, window_width, window_height)
 
     def launch_app(self, serial: str, package_name: str, width: int = 1280, height: int = 720, dpi: int = 0, turn_screen_off: bool = False, forward_audio: bool = False, extra_flags: list = None, window_x: int = None, window_y: int = None, window_width: int = None, window_height: int = None):
         """
@@ -31,14 +132,7 @@ class ScrcpyHandler:
             "--shortcut-mod=lsuper"           # Use Left Super key for shortcuts (MOD key)
         ]
         
-        if window_x is not None:
-            cmd.append(f"--window-x={window_x}")
-        if window_y is not None:
-            cmd.append(f"--window-y={window_y}")
-        if window_width is not None:
-            cmd.append(f"--window-width={window_width}")
-        if window_height is not None:
-            cmd.append(f"--window-height={window_height}")
+        cmd.extend(self._window_flags(window_x, window_y, window_width, window_height))
         
         if extra_flags:
             cmd.extend(extra_flags)
@@ -51,21 +145,22 @@ class ScrcpyHandler:
         if turn_screen_off:
             cmd.append("--turn-screen-off")
         
-        print(f"Executing: {' '.join(cmd)}")
+        log.debug("Executing: %s", ' '.join(cmd))
         
         try:
             # We use Popen to keep it running non-blocking
-            # Don't suppress stderr so we can see errors in console
-            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=None)
+            session = self._spawn(cmd, serial, "app", window_title, turn_screen_off, aspect=width / height,
+                                  geometry=self._geometry(window_x, window_y, window_width, window_height))
+            session.package = package_name
             return True
         except FileNotFoundError:
-            print("Scrcpy not found")
+            log.error("Scrcpy not found")
             return False
         except Exception as e:
-            print(f"Failed to launch scrcpy: {e}")
+            log.error("Failed to launch scrcpy: %s", e)
             return False
 
-    def create_display(self, serial: str, width: int = 1280, height: int = 720, dpi: int = 0, turn_screen_off: bool = False, forward_audio: bool = False, extra_flags: list = None):
+    def create_display(self, serial: str, width: int = 1280, height: int = 720, dpi: int = 0, turn_screen_off: bool = False, forward_audio: bool = False, extra_flags: list = None, window_x: int = None, window_y: int = None, window_width: int = None, window_height: int = None):
         """
         Creates a new virtual display without launching a specific app.
         """
@@ -85,6 +180,8 @@ class ScrcpyHandler:
             "--shortcut-mod=lsuper"           # Use Left Super key for shortcuts (MOD key)
         ]
         
+        cmd.extend(self._window_flags(window_x, window_y, window_width, window_height))
+        
         if extra_flags:
             cmd.extend(extra_flags)
         
@@ -94,17 +191,17 @@ class ScrcpyHandler:
         if turn_screen_off:
             cmd.append("--turn-screen-off")
         
-        print(f"Executing Create Display: {' '.join(cmd)}")
+        log.debug("Executing Create Display: %s", ' '.join(cmd))
         
         try:
-            # Don't suppress stderr so we can see errors in console
-            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=None)
+            self._spawn(cmd, serial, "display", window_title, turn_screen_off, aspect=width / height,
+                        geometry=self._geometry(window_x, window_y, window_width, window_height))
             return True
         except FileNotFoundError:
-            print("Scrcpy not found")
+            log.error("Scrcpy not found")
             return False
         except Exception as e:
-            print(f"Failed to create display: {e}")
+            log.error("Failed to create display: %s", e)
             return False
 
     def mirror(self, serial: str, width: int = 1280, height: int = 720, dpi: int = 0, turn_screen_off: bool = False, forward_audio: bool = False, extra_flags: list = None, window_x: int = None, window_y: int = None, window_width: int = None, window_height: int = None):
@@ -120,19 +217,14 @@ class ScrcpyHandler:
         cmd = [
             self.scrcpy_path,
             "--serial", serial,
-            f"--max-size={max(width, height)}", # Approximate scaling
             "--window-title", window_title,
             "--shortcut-mod=lsuper"           # Use Left Super key for shortcuts (MOD key)
         ]
+        # A tiled window brings its own, smaller cap in extra_flags
+        if not any(flag.startswith("--max-size=") for flag in extra_flags or []):
+            cmd.insert(3, f"--max-size={max(width, height)}") # Approximate scaling
         
-        if window_x is not None:
-            cmd.append(f"--window-x={window_x}")
-        if window_y is not None:
-            cmd.append(f"--window-y={window_y}")
-        if window_width is not None:
-            cmd.append(f"--window-width={window_width}")
-        if window_height is not None:
-            cmd.append(f"--window-height={window_height}")
+        cmd.extend(self._window_flags(window_x, window_y, window_width, window_height))
         
         if extra_flags:
             cmd.extend(extra_flags)
@@ -143,40 +235,51 @@ class ScrcpyHandler:
         if turn_screen_off:
             cmd.append("--turn-screen-off")
             
-        print(f"Executing Mirror: {' '.join(cmd)}")
+        log.debug("Executing Mirror: %s", ' '.join(cmd))
         
         try:
-            # Don't suppress stderr so we can see errors in console
-            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=None)
+            self._spawn(cmd, serial, "mirror", window_title, turn_screen_off, aspect=width / height,
+                        geometry=self._geometry(window_x, window_y, window_width, window_height))
             return True
         except Exception as e:
-            print(f"Failed to mirror: {e}")
+            log.error("Failed to mirror: %s", e)
             return False
 
-    def record(self, serial: str, filename: str, time_limit: int = 0):
+    def build_record_command(self, serial: str, filename: str, time_limit: int = 0, extra_flags: list = None, headless: bool = True) -> list:
         """
-        Records the device screen to a file.
+        Builds the scrcpy command line for recording the device screen to a file.
         """
         cmd = [
             self.scrcpy_path,
             "--serial", serial,
-            "--no-display",
             f"--record={filename}"
         ]
-        
+
+        if headless:
+            # scrcpy v2.5+: no window and no local decoding, only muxing to the file
+            cmd.extend(["--no-window", "--no-playback"])
+
         if time_limit > 0:
-            # Requires 'timeout' command or handling process termination manually.
-            # Scrcpy doesn't have a built-in time limit flag usually, 
-            # so we might rely on the caller to kill it or use subprocess logic.
-            # For simplicity, we just start recording.
-            pass
+            # scrcpy stops by itself and finalizes the file once the limit is reached
+            cmd.append(f"--time-limit={int(time_limit)}")
+
+        if extra_flags:
+            cmd.extend(extra_flags)
+
+        return cmd
+
+    def record(self, serial: str, filename: str, time_limit: int = 0, extra_flags: list = None):
+        """
+        Records the device screen to a file.
+        """
+        cmd = self.build_record_command(serial, filename, time_limit=time_limit, extra_flags=extra_flags)
 
-        print(f"Executing Record: {' '.join(cmd)}")
+        log.debug("Executing Record: %s", ' '.join(cmd))
         
         try:
             # Don't suppress stderr so we can see errors in console
             subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=None)
             return True
         except Exception as e:
-            print(f"Failed to record: {e}")
+            log.error("Failed to record: %s", e)
             return False
@@ -0,0 +1,238 @@
+import atexit
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Per-subsystem loggers: umc.adb, umc.worker, umc.scrcpy, umc.bridge, ...
+ROOT_LOGGER = "umc"
+
+_LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s%(fields)s"
+
+_flow_ids = itertools.count(1)
+_local = threading.local()
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+class _FieldsFilter(logging.Filter):
+    """Renders structured extras (serial=..., op=..., ms=...) after the message."""
+
+    KEYS = ("serial", "op", "ms", "flow")
+
+    def filter(self, record):
+        parts = [f"{key}={getattr(record, key)}" for key in self.KEYS if getattr(record, key, None) is not None]
+        record.fields = (" " + " ".join(parts)) if parts else ""
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last N records (unformatted until dumped) for crash reports."""
+
+    def __init__(self, capacity: int = 2000):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self) -> List[str]:
+        formatter = self.formatter or logging.Formatter(_LOG_FORMAT)
+        fields = _FieldsFilter()
+        lines = []
+        for record in list(self.records):
+            fields.filter(record)
+            lines.append(formatter.format(record))
+        return lines
+
+
+class Tracer:
+    """
+    Collects completed spans as Chrome trace events ("X" slices plus flow
+    arrows). Only active when enabled, so spans cost a log call otherwise.
+    Load the exported JSON in chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, capacity: int = 100000):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._flows_started = set()
+
+    def _ts(self, t: float) -> float:
+        return (t - self._origin) * 1e6
+
+    def add_span(self, name: str, start: float, end: float, args: Dict):
+        self.events.append({
+            "name": name, "cat": name.split(".")[0], "ph": "X",
+            "ts": self._ts(start), "dur": (end - start) * 1e6,
+            "pid": self._pid, "tid": threading.get_ident(), "args": args,
+        })
+
+    def add_flow(self, flow: int, t: float):
+        # The first slice of a flow starts the arrow ("s"), later ones continue it ("t")
+        phase = "t" if flow in self._flows_started else "s"
+        self._flows_started.add(flow)
+        self.events.append({
+            "name": "flow", "cat": "flow", "ph": phase, "id": flow, "bp": "e",
+            "ts": self._ts(t), "pid": self._pid, "tid": threading.get_ident(),
+        })
+
+    def export(self, path: str) -> bool:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            names = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": t.ident, "args": {"name": t.name}}
+                     for t in threading.enumerate()]
+            with open(path, "w") as f:
+                json.dump({"traceEvents": names + list(self.events), "displayTimeUnit": "ms"}, f)
+            return True
+        except OSError as e:
+            get_logger("trace").error("Error writing trace to %s: %s", path, e)
+            return False
+
+
+TRACER = Tracer()
+RING_BUFFER = RingBufferHandler()
+_span_logger = get_logger("span")
+
+
+def new_flow() -> int:
+    """An id that ties spans on different threads into one flow (click -> worker -> adb)."""
+    return next(_flow_ids)
+
+
+def current_flow() -> Optional[int]:
+    return getattr(_local, "flow", None)
+
+
+@contextmanager
+def span(op: str, serial: str = None, flow: int = None, **fields):
+    """
+    Times a block. On exit a DEBUG record carries op, serial and ms, and
+    with tracing on a Chrome trace slice is recorded. Nested spans on the
+    same thread inherit the flow id.
+    """
+    parent_flow = current_flow()
+    flow = flow if flow is not None else parent_flow
+    _local.flow = flow
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _local.flow = parent_flow
+        ms = round((end - start) * 1000, 2)
+        if _span_logger.isEnabledFor(logging.DEBUG):
+            _span_logger.debug(op, extra={"op": op, "serial": serial, "ms": ms, "flow": flow})
+        if TRACER.enabled:
+            args = dict(fields)
+            if serial:
+                args["serial"] = serial
+            TRACER.add_span(op, start, end, args)
+            if flow is not None and flow != parent_flow:
+                TRACER.add_flow(flow, start)
+
+
+def traced(op: str, start_flow: bool = False, serial_arg: Optional[int] = 1):
+    """
+    Decorator form of span() for slots. start_flow begins a new flow (user
+    actions), so queued worker tasks emitted inside show up connected to it.
+    serial_arg is the positional index (counting self) of the device serial.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            serial = None
+            if serial_arg is not None and len(args) > serial_arg and isinstance(args[serial_arg], str):
+                serial = args[serial_arg]
+            with span(op, serial=serial, flow=new_flow() if start_flow else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _crash_dir() -> str:
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "umc")
+
+
+def write_crash_dump(exc_type, exc, tb, thread_name: str = None) -> Optional[str]:
+    """Writes the traceback plus the recent log records; returns the file path."""
+    try:
+        directory = _crash_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("crash-%Y%m%d-%H%M%S.log"))
+        with open(path, "w") as f:
+            f.write(f"Unhandled exception in thread {thread_name or threading.current_thread().name}\n")
+            f.write("".join(traceback.format_exception(exc_type, exc, tb)))
+            f.write("\nRecent log records:\n")
+            f.write("\n".join(RING_BUFFER.dump()) + "\n")
+        if TRACER.enabled:
+            TRACER.export(path[:-len(".log")] + ".trace.json")
+        return path
+    except Exception:
+        return None
+
+
+def setup_logging(level: str = None):
+    """
+    Configures the umc logger tree once. UMC_LOG_LEVEL picks the console
+    level (default WARNING); the ring buffer keeps INFO and up (DEBUG when
+    the console level is DEBUG). UMC_TRACE=<file> enables Chrome tracing and
+    writes the trace there on exit.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    if getattr(root, "_umc_configured", False):
+        return
+    root._umc_configured = True
+
+    level_name = (level or os.environ.get("UMC_LOG_LEVEL", "WARNING")).upper()
+    console_level = getattr(logging, level_name, logging.WARNING)
+    root.setLevel(min(console_level, logging.INFO))
+    root.propagate = False
+
+    formatter = logging.Formatter(_LOG_FORMAT)
+    fields = _FieldsFilter()
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(console_level)
+    console.setFormatter(formatter)
+    console.addFilter(fields)
+    root.addHandler(console)
+
+    RING_BUFFER.setFormatter(formatter)
+    root.addHandler(RING_BUFFER)
+
+    trace_path = os.environ.get("UMC_TRACE")
+    if trace_path:
+        TRACER.enabled = True
+        atexit.register(TRACER.export, trace_path)
+
+    previous_hook = sys.excepthook
+
+    def excepthook(exc_type, exc, tb):
+        path = write_crash_dump(exc_type, exc, tb)
+        root.critical("Unhandled exception%s", f" (crash dump: {path})" if path else "", exc_info=(exc_type, exc, tb))
+        if previous_hook is not sys.__excepthook__:
+            previous_hook(exc_type, exc, tb)
+
+    def thread_excepthook(args):
+        if args.exc_type is SystemExit:
+            return
+        path = write_crash_dump(args.exc_type, args.exc_value, args.exc_traceback,
+                                args.thread.name if args.thread else None)
+        root.critical("Unhandled exception in thread%s", f" (crash dump: {path})" if path else "",
+                      exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
@@ -0,0 +1,118 @@
+import math
+from typing import List, Tuple
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+LAYOUT_MODES = ["Free", "Grid", "Columns", "Per Monitor"]
+
+
+def grid_tiles(area: Rect, count: int, aspect: float = 0, gap: int = 8) -> List[Rect]:
+    """
+    Splits area into count cells, picking the column count that gives each
+    window the largest size at the given aspect ratio (width / height).
+    """
+    if count <= 0:
+        return []
+    x0, y0, width, height = area
+    best = None
+    for cols in range(1, count + 1):
+        rows = math.ceil(count / cols)
+        cell_w = (width - gap * (cols - 1)) / cols
+        cell_h = (height - gap * (rows - 1)) / rows
+        if cell_w <= 0 or cell_h <= 0:
+            continue
+        if aspect > 0:
+            # Area actually used by a window letterboxed into the cell
+            used_w = min(cell_w, cell_h * aspect)
+            score = used_w * (used_w / aspect)
+        else:
+            score = cell_w * cell_h
+        if best is None or score > best[0]:
+            best = (score, cols, rows, cell_w, cell_h)
+    if best is None:
+        return [area] * count
+    _, cols, rows, cell_w, cell_h = best
+
+    tiles = []
+    for index in range(count):
+        row, col = divmod(index, cols)
+        tiles.append((
+            int(x0 + col * (cell_w + gap)),
+            int(y0 + row * (cell_h + gap)),
+            int(cell_w),
+            int(cell_h)
+        ))
+    return tiles
+
+
+def column_tiles(area: Rect, count: int, gap: int = 8) -> List[Rect]:
+    """Side-by-side full-height columns."""
+    if count <= 0:
+        return []
+    x0, y0, width, height = area
+    cell_w = (width - gap * (count - 1)) / count
+    return [(int(x0 + i * (cell_w + gap)), y0, int(cell_w), height) for i in range(count)]
+
+
+def fit_aspect(tile: Rect, aspect: float) -> Rect:
+    """Shrinks a tile to the content aspect ratio so scrcpy doesn't letterbox."""
+    x, y, width, height = tile
+    if aspect <= 0 or width <= 0 or height <= 0:
+        return tile
+    if width / height > aspect:
+        new_w = int(height * aspect)
+        return (x + (width - new_w) // 2, y, new_w, height)
+    new_h = int(width / aspect)
+    return (x, y + (height - new_h) // 2, width, new_h)
+
+
+def compute_layout(mode: str, screens: List[Rect], aspects: List[float], gap: int = 8) -> List[Rect]:
+    """
+    Places one window per entry in aspects (width / height of its content).
+    screens are available desktop areas, primary first. Returns [] for "Free".
+    """
+    count = len(aspects)
+    if mode not in LAYOUT_MODES[1:] or not screens or count == 0:
+        return []
+
+    # Dominant aspect decides the grid shape; each window is then fitted to its own
+    common_aspect = sorted(aspects)[len(aspects) // 2]
+
+    if mode == "Per Monitor":
+        per_screen = [[] for _ in screens]
+        for index in range(count):
+            per_screen[index % len(screens)].append(index)
+        tiles = [None] * count
+        for screen, indices in zip(screens, per_screen):
+            for index, tile in zip(indices, grid_tiles(screen, len(indices), common_aspect, gap)):
+                tiles[index] = tile
+    elif mode == "Columns":
+        tiles = column_tiles(screens[0], count, gap)
+    else:
+        tiles = grid_tiles(screens[0], count, common_aspect, gap)
+
+    return [fit_aspect(tile, aspect) for tile, aspect in zip(tiles, aspects)]
+
+
+def max_size_for(tile: Rect) -> int:
+    """Largest video dimension worth decoding for a window of this size."""
+    return max(tile[2], tile[3])
+
+
+def with_max_size(flags: list, max_size: int) -> list:
+    """Replaces (or caps) any --max-size in flags with max_size."""
+    result = []
+    current = 0
+    for flag in flags or []:
+        if flag.startswith("--max-size="):
+            try:
+                current = int(flag.split("=", 1)[1])
+            except ValueError:
+                pass
+            continue
+        result.append(flag)
+    if max_size > 0:
+        result.append(f"--max-size={min(current, max_size) if current else max_size}")
+    elif current:
+        result.append(f"--max-size={current}")
+    return result
@@ -0,0 +1,133 @@
+import shutil
+import subprocess
+import threading
+from typing import Optional
+
+try:
+    from Xlib import X, XK, display as xdisplay, protocol
+except ImportError:  # python-xlib is optional; xdotool is used instead
+    xdisplay = None
+
+
+class WindowTracker:
+    """
+    Finds scrcpy windows by process id and sends them input.
+
+    With python-xlib installed a single X connection is kept open and windows
+    are matched through _NET_CLIENT_LIST / _NET_WM_PID, so no process is
+    spawned per action. Without it, each lookup is one `xdotool search --pid`
+    and each key one `xdotool key`. Callers cache the returned window id on
+    the session so the lookup happens once per window.
+    """
+
+    MODIFIERS = {"super": "Mod4Mask", "shift": "ShiftMask", "ctrl": "ControlMask", "alt": "Mod1Mask"}
+
+    def __init__(self):
+        self._display = None
+        self._lock = threading.Lock()
+        self.xdotool_path = shutil.which("xdotool")
+        if xdisplay is not None:
+            try:
+                self._display = xdisplay.Display()
+                self._atom_client_list = self._display.intern_atom("_NET_CLIENT_LIST")
+                self._atom_pid = self._display.intern_atom("_NET_WM_PID")
+            except Exception:
+                self._display = None
+
+    @property
+    def available(self) -> bool:
+        return self._display is not None or self.xdotool_path is not None
+
+    def find_window(self, pid: int) -> Optional[int]:
+        """Returns the top-level window owned by pid, if it is mapped yet."""
+        if self._display is not None:
+            with self._lock:
+                try:
+                    root = self._display.screen().root
+                    clients = root.get_full_property(self._atom_client_list, X.AnyPropertyType)
+                    for window_id in (clients.value if clients else []):
+                        window = self._display.create_resource_object("window", window_id)
+                        prop = window.get_full_property(self._atom_pid, X.AnyPropertyType)
+                        if prop and prop.value and prop.value[0] == pid:
+                            return int(window_id)
+                except Exception:
+                    pass
+            return None
+
+        if not self.xdotool_path:
+            return None
+        try:
+            result = subprocess.run(
+                [self.xdotool_path, "search", "--pid", str(pid)],
+                capture_output=True, text=True, timeout=2
+            )
+            ids = result.stdout.split()
+            return int(ids[-1]) if ids else None
+        except (subprocess.TimeoutExpired, ValueError, OSError):
+            return None
+
+    def send_key(self, window_id: int, combo: str) -> bool:
+        """Sends a key combination like "super+shift+o" to a window without focusing it."""
+        if self._display is not None:
+            with self._lock:
+                try:
+                    return self._send_key_xlib(window_id, combo)
+                except Exception:
+                    return False
+
+        if not self.xdotool_path:
+            return False
+        try:
+            subprocess.run(
+                [self.xdotool_path, "key", "--window", str(window_id), combo],
+                check=True, capture_output=True, timeout=2
+            )
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            return False
+
+    def move_resize(self, window_id: int, x: int, y: int, width: int, height: int) -> bool:
+        """Moves and resizes a window (used when re-tiling live sessions)."""
+        if self._display is not None:
+            with self._lock:
+                try:
+                    window = self._display.create_resource_object("window", window_id)
+                    window.configure(x=x, y=y, width=width, height=height)
+                    self._display.flush()
+                    return True
+                except Exception:
+                    return False
+
+        if not self.xdotool_path:
+            return False
+        try:
+            subprocess.run(
+                [self.xdotool_path,
+                 "windowsize", str(window_id), str(width), str(height),
+                 "windowmove", str(window_id), str(x), str(y)],
+                check=True, capture_output=True, timeout=2
+            )
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            return False
+
+    def _send_key_xlib(self, window_id: int, combo: str) -> bool:
+        parts = combo.lower().split("+")
+        state = 0
+        for modifier in parts[:-1]:
+            state |= getattr(X, self.MODIFIERS[modifier])
+        keysym = XK.string_to_keysym(parts[-1])
+        keycode = self._display.keysym_to_keycode(keysym)
+        if not keycode:
+            return False
+
+        root = self._display.screen().root
+        window = self._display.create_resource_object("window", window_id)
+        for event_class in (protocol.event.KeyPress, protocol.event.KeyRelease):
+            event = event_class(
+                time=X.CurrentTime, root=root, window=window, same_screen=1, child=X.NONE,
+                root_x=0, root_y=0, event_x=0, event_y=0, state=state, detail=keycode
+            )
+            window.send_event(event, propagate=True)
+        self._display.flush()
+        return True
@@ -2,9 +2,22 @@ import subprocess
 import shutil
 import re
 import os
+import time
 from typing import List, Dict, Optional, Tuple
-from PySide6.QtCore import QObject, Signal, Slot, QThread, QStandardPaths
-from .adb_handler import ADBHandler
+from PySide6.QtCore import QObject, Signal, Slot, QThread, QTimer, QStandardPaths
+from .control_channel import ControlChannelPool, KEYCODES, resolve_keycode
+from .scrcpy_handler import ScrcpyHandler
+from .device import get_adb_handler, get_scrcpy_handler
+from .window_tracker import WindowTracker
+from .capabilities import CapabilityStore
+from .adb_handler import run_adb
+from .async_adb import AsyncADBHandler, get_async_loop
+from .app_catalog import CATALOG_SCRIPT, LAUNCHER_QUERY, guess_label, parse_catalog, parse_launchable
+from .daemon import DaemonClient, DaemonError
+from .metrics import WORKER_QUEUE
+from .tracing import get_logger
+
+log = get_logger("worker")
 
 class ADBWorker(QObject):
     """
@@ -12,24 +25,51 @@ class ADBWorker(QObject):
     """
     devicesReady = Signal(list)
     packagesReady = Signal(str, list)
+    catalogReady = Signal(str, list)  # serial, [{package, name, version, launchable}]
     iconReady = Signal(str, str)  # package_name, icon_path
     deviceStatusReady = Signal(str, dict)  # serial, status_info
+    capabilitiesReady = Signal(str, dict)  # serial, static device facts
     fileTransferProgress = Signal(str, str, int, arguments=['serial', 'operation', 'progress'])  # serial, operation (push/pull), progress 0-100
     fileTransferComplete = Signal(str, str, bool, arguments=['serial', 'operation', 'success'])  # serial, operation, success
     clipboardChanged = Signal(str, str, arguments=['serial', 'text'])  # serial, clipboard_text
     screenshotReady = Signal(str, str, arguments=['serial', 'screenshotPath'])  # serial, screenshot_path
     deviceControlChanged = Signal(str, str, arguments=['serial', 'controlType'])  # serial, control_type (volume, brightness, etc.)
     errorOccurred = Signal(str)
+    _channelLost = Signal(str)  # serial; emitted from control channel reader threads
+
+    # Reconnect delays for a dropped clipboard channel, doubling per failed attempt
+    CHANNEL_RETRY_MIN = 1.0
+    CHANNEL_RETRY_MAX = 60.0
+    # After a channel fails to open for key injection, keys go through `input` for this long
+    CHANNEL_OPEN_COOLDOWN = 30.0
     
-    def __init__(self):
+    def __init__(self, scrcpy_handler: ScrcpyHandler = None):
         super().__init__()
-        self.adb_handler = ADBHandler()
+        self.adb_handler = get_adb_handler()
+        self.scrcpy_handler = scrcpy_handler or get_scrcpy_handler()
+        self.window_tracker = WindowTracker()
         self.adb_path = self.adb_handler.adb_path
+        self.capabilities = CapabilityStore(self.adb_path)
+        # Status polls for every device run concurrently on the shared asyncio loop
+        self.async_adb = AsyncADBHandler(self.adb_path)
+        self._status_pending = {}  # serial -> concurrent.futures.Future
         self._should_stop = False  # Flag to stop operations quickly
         
-        # Track scrcpy screen state per device (True = on, False = off)
-        # Default to True (screen on) when scrcpy starts
-        self._scrcpy_screen_state = {}
+        # Persistent control-only scrcpy-server sessions; device clipboard changes
+        # are pushed from their reader threads straight into clipboardChanged
+        self.control_channels = ControlChannelPool(self.adb_path, on_clipboard=self.clipboardChanged.emit,
+                                                   on_lost=self._channelLost.emit)
+        # serial -> (next reconnect delay, time the channel last came up) while clipboard sync is on
+        self._clipboard_sync: Dict[str, Tuple[float, float]] = {}
+        self._channelLost.connect(self._on_channel_lost)
+        # Key events go over the same channel: one socket write instead of an `input` JVM per key
+        self.adb_handler.key_injector = self._inject_keycodes
+        self._channel_open_failed: Dict[str, float] = {}  # serial -> end of its open cooldown (monotonic)
+        
+        # A running `umc` daemon already polls adb; attach and read its state instead
+        self.daemon = DaemonClient.connect_if_running(timeout=10)
+        if self.daemon:
+            log.info("Attached to UMC daemon at %s", self.daemon.socket_path)
         
         # Set up icon cache directory
         cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
@@ -41,28 +81,71 @@ class ADBWorker(QObject):
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     @Slot()
+    @WORKER_QUEUE.track("fetch_devices")
     def fetch_devices(self):
         """Fetches the list of connected devices."""
+        if self.daemon:
+            try:
+                self.devicesReady.emit(self.daemon.call("devices.list"))
+                return
+            except (OSError, ValueError, DaemonError) as e:
+                self._detach_daemon(e)
         try:
             devices = self.adb_handler.get_devices()
             self.devicesReady.emit(devices)
         except Exception:
+            log.exception("Failed to fetch devices")
             self.devicesReady.emit([])
     
     @Slot(str)
+    @WORKER_QUEUE.track("fetch_device_status")
     def fetch_device_status(self, serial: str):
         """Fetches device status information (battery, temperature, storage, etc.)."""
         if not serial or not self.adb_path:
             return
         
+        if self.daemon:
+            try:
+                self.deviceStatusReady.emit(serial, self.daemon.call("device.status", serial=serial))
+                return
+            except DaemonError as e:
+                log.debug("Status fetch failed: %s", e, extra={"serial": serial})
+                return
+            except (OSError, ValueError) as e:
+                self._detach_daemon(e)
+        if serial in self._status_pending:
+            return  # previous poll still in flight
+        future = get_async_loop().submit(self.async_adb.get_device_status_info(serial))
+        self._status_pending[serial] = future
+        future.add_done_callback(lambda f: self._status_done(serial, f))
+
+    def _status_done(self, serial: str, future):
+        # Runs on the asyncio loop thread; the signal is queued to the bridge
+        self._status_pending.pop(serial, None)
+        if future.cancelled() or self._should_stop:
+            return
         try:
-            status_info = self.adb_handler.get_device_status_info(serial)
-            self.deviceStatusReady.emit(serial, status_info)
+            self.deviceStatusReady.emit(serial, future.result())
         except Exception as e:
-            # Silently fail - status fetching is optional
-            pass
+            # Status fetching is optional; keep it out of the UI
+            log.debug("Status fetch failed: %s", e, extra={"serial": serial})
 
     @Slot(str)
+    @WORKER_QUEUE.track("fetch_capabilities")
+    def fetch_capabilities(self, serial: str):
+        """Validates cached device capabilities, probing the device if they are stale."""
+        if self._should_stop or not serial:
+            return
+        
+        try:
+            caps = self.capabilities.ensure(serial)
+            self.capabilitiesReady.emit(serial, caps or {})
+        except Exception as e:
+            log.debug("Capability probe failed: %s", e, extra={"serial": serial})
+            self.capabilitiesReady.emit(serial, {})
+
+    @Slot(str)
+    @WORKER_QUEUE.track("fetch_packages")
     def fetch_packages(self, serial: str):
         """Fetches all launchable packages (users apps + system apps with launcher activity)."""
         try:
@@ -72,175 +155,171 @@ class ADBWorker(QObject):
 
             # Use cmd package query-activities to get all launchable apps
             # This is faster and more accurate than pm list packages
-            cmd = [
-                self.adb_path, "-s", serial, "shell", 
-                "cmd", "package", "query-activities", "--brief", 
-                "-a", "android.intent.action.MAIN", 
-                "-c", "android.intent.category.LAUNCHER"
-            ]
+            cmd = [self.adb_path, "-s", serial, "shell"] + LAUNCHER_QUERY.split()
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_adb(cmd, capture_output=True, text=True, check=True)
             apps = []
             
-            seen_packages = set()
-            
-            for line in result.stdout.strip().split('\n'):
-                line = line.strip()
-                if not line or line.startswith("Activity"):
-                    continue
+            for package_name in parse_launchable(result.stdout):
+                # Use fast heuristic for app name (don't call pm dump - too slow)
+                # Icons and proper labels can be fetched lazily later
+                app_label = guess_label(package_name)
                 
-                # Format is usually: package/activity or package/.Activity
-                # e.g., com.android.settings/com.android.settings.Settings
+                # Only check if icon exists in cache (lazy loading)
+                # Don't fetch icons synchronously - too slow for many apps
+                icon_path = None
+                cache_file = os.path.join(self.icon_cache_dir, f"{package_name}.png")
+                if os.path.exists(cache_file):
+                    icon_path = cache_file
                 
-                if "/" in line:
-                    parts = line.split("/")
-                    package_name = parts[0]
-                    
-                    if package_name not in seen_packages:
-                        # Use fast heuristic for app name (don't call pm dump - too slow)
-                        # Icons and proper labels can be fetched lazily later
-                        app_label = package_name
-                        if "." in package_name:
-                            # Use the last part of the package name as a heuristic for the name
-                            app_label = package_name.split(".")[-1].capitalize()
-                        
-                        # Only check if icon exists in cache (lazy loading)
-                        # Don't fetch icons synchronously - too slow for many apps
-                        icon_path = None
-                        cache_file = os.path.join(self.icon_cache_dir, f"{package_name}.png")
-                        if os.path.exists(cache_file):
-                            icon_path = cache_file
-                        
-                        apps.append({
-                            "package": package_name,
-                            "name": app_label,
-                            "icon": icon_path if icon_path else None
-                        })
-                        seen_packages.add(package_name)
+                apps.append({
+                    "package": package_name,
+                    "name": app_label,
+                    "icon": icon_path if icon_path else None
+                })
 
             apps.sort(key=lambda x: x["name"].lower())
             self.packagesReady.emit(serial, apps)
 
         except Exception as e:
+            log.warning("Failed to fetch packages: %s", e, extra={"serial": serial})
             self.errorOccurred.emit(f"Failed to fetch packages: {str(e)}")
 
     @Slot(str)
+    @WORKER_QUEUE.track("fetch_catalog")
+    def fetch_catalog(self, serial: str):
+        """Fetches every package with its version code (and whether it is launchable) for the global app index."""
+        if self._should_stop or not serial or not self.adb_path:
+            return
+        
+        try:
+            result = run_adb([self.adb_path, "-s", serial, "shell", CATALOG_SCRIPT],
+                             capture_output=True, text=True, check=True, timeout=30)
+            self.catalogReady.emit(serial, parse_catalog(result.stdout))
+        except Exception as e:
+            log.debug("Catalog fetch failed: %s", e, extra={"serial": serial})
+
+    def _inject_keycodes(self, serial: str, keycodes: List[int]) -> bool:
+        """
+        Injects keys over the device's persistent control channel (opened on first use).
+        A failed open takes seconds, so for CHANNEL_OPEN_COOLDOWN afterwards the device
+        is not retried and False sends its keys straight to the `input` fallback.
+        """
+        channel = self.control_channels.get(serial, create=False)
+        if not channel:
+            if time.monotonic() < self._channel_open_failed.get(serial, 0.0):
+                return False
+            channel = self.control_channels.get(serial)
+            if not channel:
+                self._channel_open_failed[serial] = time.monotonic() + self.CHANNEL_OPEN_COOLDOWN
+                log.debug("Control channel unavailable; using input for %.0f s", self.CHANNEL_OPEN_COOLDOWN,
+                          extra={"serial": serial})
+                return False
+            self._channel_open_failed.pop(serial, None)
+        return channel.inject_keycodes(keycodes)
+
+    @Slot(str)
+    @WORKER_QUEUE.track("toggle_device_screen")
     def toggle_device_screen(self, serial: str):
         """Toggles the device screen power (KEYCODE_POWER)."""
-        print(f"[DEBUG] toggle_device_screen called for {serial}")
         if not self.adb_path:
-            print(f"[DEBUG] toggle_device_screen: ADB path not found")
             self.errorOccurred.emit("ADB not found. Please install Android SDK platform-tools.")
             return
 
         try:
-            print(f"[DEBUG] toggle_device_screen: Executing ADB command for {serial}")
-            # KEYCODE_POWER = 26
-            result = subprocess.run(
-                [self.adb_path, "-s", serial, "shell", "input", "keyevent", "26"], 
-                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=5
-            )
-            print(f"[DEBUG] toggle_device_screen: Success for {serial}")
-        except subprocess.TimeoutExpired:
-            print(f"[DEBUG] toggle_device_screen: Timeout for {serial}")
-            self.errorOccurred.emit(f"Timeout while toggling screen for {serial}")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else str(e)
-            print(f"[DEBUG] toggle_device_screen: Error for {serial}: {error_msg}")
-            self.errorOccurred.emit(f"Failed to toggle screen for {serial}: {error_msg}")
+            if not self.adb_handler.send_keyevents(serial, [KEYCODES["POWER"]]):
+                self.errorOccurred.emit(f"Failed to toggle screen for {serial}")
         except Exception as e:
-            print(f"[DEBUG] toggle_device_screen: Exception for {serial}: {e}")
             self.errorOccurred.emit(f"Failed to toggle screen for {serial}: {str(e)}")
 
+    @Slot(str, list)
+    @WORKER_QUEUE.track("send_key_sequence")
+    def send_key_sequence(self, serial: str, keys: list):
+        """Sends a key macro (codes or names like "HOME", "KEYCODE_BACK") as one batch."""
+        if self._should_stop or not self.adb_path:
+            return
+
+        keycodes = [resolve_keycode(key) for key in keys]
+        if not keycodes or None in keycodes:
+            self.errorOccurred.emit(f"Unknown key in sequence: {keys}")
+            return
+
+        try:
+            if self.adb_handler.send_keyevents(serial, keycodes):
+                self.deviceControlChanged.emit(serial, "keys")
+            else:
+                self.errorOccurred.emit(f"Failed to send keys to {serial}")
+        except Exception as e:
+            self.errorOccurred.emit(f"Key injection error: {str(e)}")
+
     @Slot(str, str)
+    @WORKER_QUEUE.track("send_scrcpy_shortcut")
     def send_scrcpy_shortcut(self, serial: str, shortcut: str):
         """
-        Sends a keyboard shortcut to the scrcpy window for the given serial using xdotool.
+        Sends a keyboard shortcut to the newest scrcpy window of the given serial.
         shortcut: 'toggle' - toggles scrcpy screen on/off
         MOD+o turns screen OFF, MOD+Shift+o turns screen ON (MOD = Super on Linux)
         """
-        print(f"[DEBUG] send_scrcpy_shortcut called for {serial}, shortcut: {shortcut}")
-        window_name = f"UMC - {serial}"
-        
-        # Initialize state to ON (True) if not set
-        if serial not in self._scrcpy_screen_state:
-            self._scrcpy_screen_state[serial] = True
-        
-        # Determine which key combination to send based on current state
-        # MOD+o turns OFF, MOD+Shift+o turns ON
-        current_state = self._scrcpy_screen_state[serial]
-        if current_state:
-            # Screen is ON, send MOD+o to turn OFF
-            key_combo = "super+o"
-            new_state = False
-        else:
-            # Screen is OFF, send MOD+Shift+o to turn ON
-            key_combo = "super+shift+o"
-            new_state = True
-        
-        print(f"[DEBUG] send_scrcpy_shortcut: Current state={current_state}, sending {key_combo}")
-        
+        if shortcut != "toggle":
+            self.errorOccurred.emit(f"Unknown scrcpy shortcut: {shortcut}")
+            return
+
+        if not self.window_tracker.available:
+            self.errorOccurred.emit("xdotool not found. Install it to use this feature.")
+            return
+
+        session = self.scrcpy_handler.latest_session(serial)
+        if not session:
+            self.errorOccurred.emit(f"No scrcpy window open for device {serial}")
+            return
+
         try:
-            # Check if xdotool exists first
-            if not shutil.which("xdotool"):
-                print(f"[DEBUG] send_scrcpy_shortcut: xdotool not found")
-                self.errorOccurred.emit("xdotool not found. Install it to use this feature.")
+            # Window is matched to the session by _NET_WM_PID once and then cached
+            if session.window_id is None:
+                session.window_id = self.window_tracker.find_window(session.pid)
+            if session.window_id is None:
+                self.errorOccurred.emit(f"Could not find scrcpy window for device {serial}")
                 return
 
-            # Search for window and send key combination
-            # Try multiple window title patterns (with and without serial variations)
-            window_patterns = [
-                window_name,
-                f"UMC - {serial} (Virtual)",
-                f"scrcpy {serial}"
-            ]
-            
-            window_found = False
-            for pattern in window_patterns:
-                try:
-                    print(f"[DEBUG] send_scrcpy_shortcut: Searching for window pattern: {pattern}")
-                    # Search for window ID
-                    search_cmd = ["xdotool", "search", "--name", pattern]
-                    result = subprocess.run(search_cmd, capture_output=True, text=True, check=True)
-                    window_ids = result.stdout.strip().split('\n')
-                    
-                    if window_ids and window_ids[0]:
-                        window_id = window_ids[0].strip()
-                        if window_id:
-                            print(f"[DEBUG] send_scrcpy_shortcut: Found window {window_id}, sending {key_combo}")
-                            # Send key combination directly to window without activating it
-                            # This avoids blocking the Qt event loop
-                            key_cmd = ["xdotool", "key", "--window", window_id, key_combo]
-                            subprocess.run(key_cmd, check=True, capture_output=True, text=True, timeout=2)
-                            
-                            # Update state after sending command
-                            self._scrcpy_screen_state[serial] = new_state
-                            print(f"[DEBUG] send_scrcpy_shortcut: Success, new state={new_state}")
-                            window_found = True
-                            break
-                except (subprocess.CalledProcessError, subprocess.TimeoutExpired, ValueError) as e:
-                    print(f"[DEBUG] send_scrcpy_shortcut: Pattern {pattern} failed: {e}")
-                    continue
-            
-            if not window_found:
-                print(f"[DEBUG] send_scrcpy_shortcut: Window not found for {serial}")
-                self.errorOccurred.emit(f"Could not find scrcpy window for device {serial}")
-            
+            key_combo = "super+o" if session.screen_on else "super+shift+o"
+            if self.window_tracker.send_key(session.window_id, key_combo):
+                session.screen_on = not session.screen_on
+            else:
+                # The window may have been recreated; look it up again next time
+                session.window_id = None
+                self.errorOccurred.emit(f"Failed to send shortcut to scrcpy window for {serial}")
         except Exception as e:
-            print(f"[DEBUG] send_scrcpy_shortcut: Exception: {e}")
-            import traceback
-            traceback.print_exc()
             self.errorOccurred.emit(f"Failed to send shortcut: {str(e)}")
 
+    @Slot(list)
+    @WORKER_QUEUE.track("move_windows")
+    def move_windows(self, moves: list):
+        """Moves scrcpy windows to layout tiles: [[pid, x, y, width, height], ...]."""
+        for pid, x, y, width, height in moves:
+            session = self.scrcpy_handler.get_session(pid)
+            if not session or not session.alive:
+                continue
+            try:
+                if session.window_id is None:
+                    session.window_id = self.window_tracker.find_window(pid)
+                if session.window_id is not None:
+                    self.window_tracker.move_resize(session.window_id, x, y, width, height)
+            except Exception:
+                pass
+
     def get_device_info(self, serial: str) -> Tuple[int, int, int]:
         """
         Synchronous helper to get resolution and density.
         """
+        caps = self.capabilities.get(serial)
+        if caps and caps.get("width") and caps.get("density"):
+            return caps["width"], caps["height"], caps["density"]
         width, height = self.adb_handler.get_device_resolution(serial)
         density = self.adb_handler.get_device_density(serial)
         return width, height, density
     
     @Slot(str, str)
+    @WORKER_QUEUE.track("fetch_icon")
     def fetch_icon(self, serial: str, package_name: str):
         """Fetches icon for a specific package in background (non-blocking, optional)."""
         if self._should_stop or not self.adb_path:
@@ -295,16 +374,16 @@ class ADBWorker(QObject):
             self.fileTransferComplete.emit(serial, "pull", False)
             self.errorOccurred.emit(f"File transfer failed: {str(e)}")
     
-    @Slot(str, str)
+    @Slot(str)
     def get_clipboard(self, serial: str):
-        """Get clipboard from device."""
+        """Request the device clipboard; the answer arrives through clipboardChanged."""
         if self._should_stop or not self.adb_path:
             return
         
         try:
-            text = self.adb_handler.get_clipboard(serial)
-            if text:
-                self.clipboardChanged.emit(serial, text)
+            channel = self.control_channels.get(serial)
+            if channel:
+                channel.request_clipboard()
         except Exception as e:
             pass  # Silently fail
     
@@ -315,11 +394,60 @@ class ADBWorker(QObject):
             return
         
         try:
-            self.adb_handler.set_clipboard(serial, text)
+            channel = self.control_channels.get(serial, create=False)
+            if not (channel and channel.set_clipboard(text)):
+                self.adb_handler.set_clipboard(serial, text)
         except Exception as e:
             pass  # Silently fail
     
+    @Slot(str, bool)
+    @WORKER_QUEUE.track("set_clipboard_channel")
+    def set_clipboard_channel(self, serial: str, enabled: bool):
+        """Open or close the push-based clipboard channel for a device."""
+        if self._should_stop or not self.adb_path:
+            return
+        
+        try:
+            if enabled:
+                self._clipboard_sync[serial] = (self.CHANNEL_RETRY_MIN, time.monotonic())
+                if not self.control_channels.get(serial):
+                    self.errorOccurred.emit(f"Clipboard channel unavailable for {serial} (scrcpy-server not found?)")
+                    self._schedule_channel_reopen(serial)
+            else:
+                self._clipboard_sync.pop(serial, None)
+                self.control_channels.close(serial)
+        except Exception as e:
+            self.errorOccurred.emit(f"Clipboard channel error: {str(e)}")
+    
     @Slot(str)
+    def _on_channel_lost(self, serial: str):
+        """A control channel died on its own; keep clipboard sync going if it is on."""
+        if self._should_stop or serial not in self._clipboard_sync:
+            return
+        _, opened_at = self._clipboard_sync[serial]
+        if time.monotonic() - opened_at > self.CHANNEL_RETRY_MAX:
+            # It had been up for a while: a fresh drop, not a flapping channel
+            self._clipboard_sync[serial] = (self.CHANNEL_RETRY_MIN, opened_at)
+        log.info("Clipboard channel lost; reconnecting", extra={"serial": serial})
+        self._schedule_channel_reopen(serial)
+    
+    def _schedule_channel_reopen(self, serial: str):
+        delay, _ = self._clipboard_sync[serial]
+        QTimer.singleShot(int(delay * 1000), lambda: self._reopen_clipboard_channel(serial))
+    
+    def _reopen_clipboard_channel(self, serial: str):
+        if self._should_stop or serial not in self._clipboard_sync:
+            return
+        delay, opened_at = self._clipboard_sync[serial]
+        if self.control_channels.get(serial):
+            self._clipboard_sync[serial] = (delay, time.monotonic())
+            log.info("Clipboard channel reconnected", extra={"serial": serial})
+            return
+        self._clipboard_sync[serial] = (min(delay * 2, self.CHANNEL_RETRY_MAX), opened_at)
+        self._schedule_channel_reopen(serial)
+    
+    @Slot(str)
+    @WORKER_QUEUE.track("capture_screenshot")
     def capture_screenshot(self, serial: str):
         """Capture screenshot from device."""
         if self._should_stop or not self.adb_path:
@@ -341,6 +469,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"Screenshot error: {str(e)}")
     
     @Slot(str, str, int)
+    @WORKER_QUEUE.track("set_volume")
     def set_volume(self, serial: str, stream: str, level: int):
         """Set volume for a stream."""
         if self._should_stop or not self.adb_path:
@@ -356,6 +485,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"Volume control error: {str(e)}")
     
     @Slot(str, int)
+    @WORKER_QUEUE.track("set_brightness")
     def set_brightness(self, serial: str, level: int):
         """Set screen brightness."""
         if self._should_stop or not self.adb_path:
@@ -371,6 +501,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"Brightness control error: {str(e)}")
     
     @Slot(str, bool)
+    @WORKER_QUEUE.track("set_rotation_lock")
     def set_rotation_lock(self, serial: str, locked: bool):
         """Set rotation lock."""
         if self._should_stop or not self.adb_path:
@@ -386,6 +517,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"Rotation lock error: {str(e)}")
     
     @Slot(str, bool)
+    @WORKER_QUEUE.track("set_airplane_mode")
     def set_airplane_mode(self, serial: str, enabled: bool):
         """Set airplane mode."""
         if self._should_stop or not self.adb_path:
@@ -399,6 +531,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"Airplane mode error: {str(e)}")
     
     @Slot(str, bool)
+    @WORKER_QUEUE.track("set_wifi_enabled")
     def set_wifi_enabled(self, serial: str, enabled: bool):
         """Enable/disable WiFi."""
         if self._should_stop or not self.adb_path:
@@ -414,6 +547,7 @@ class ADBWorker(QObject):
             self.errorOccurred.emit(f"WiFi control error: {str(e)}")
     
     @Slot(str, bool)
+    @WORKER_QUEUE.track("set_bluetooth_enabled")
     def set_bluetooth_enabled(self, serial: str, enabled: bool):
         """Enable/disable Bluetooth."""
         if self._should_stop or not self.adb_path:
@@ -428,6 +562,17 @@ class ADBWorker(QObject):
         except Exception as e:
             self.errorOccurred.emit(f"Bluetooth control error: {str(e)}")
     
+    def _detach_daemon(self, error):
+        log.warning("Lost the UMC daemon (%s); polling adb directly", error)
+        self.daemon.close()
+        self.daemon = None
+
     def stop(self):
         """Stop all operations immediately."""
         self._should_stop = True
+        self._clipboard_sync.clear()
+        if self.daemon:
+            self.daemon.close()
+        for future in list(self._status_pending.values()):
+            future.cancel()
+        self.control_channels.close_all()
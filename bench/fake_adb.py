@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the adb client, driven by a scenario file.
+
+UMC only ever talks to adb by executing the client binary, so the benchmark
+puts this script on PATH as `adb`. The "server" side is the scenario JSON
+named by UMC_BENCH_SCENARIO: how many devices there are, how long every
+command takes, how fast transfers run and how big the APKs are. Outputs
+are deterministic per (seed, serial, command) so runs are comparable.
+"""
+import hashlib
+import io
+import json
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+
+DEFAULT_SCENARIO = {
+    "seed": 1,
+    "devices": 4,             # USB devices: BENCH0001, BENCH0002, ...
+    "network_devices": 0,     # Wi-Fi devices: 192.168.50.<n>:5555
+    "offline": [],            # serials listed as "offline"
+    "latency_ms": 20,         # per command round trip
+    "jitter_ms": 5,
+    "device_latency_ms": {},  # per-serial overrides of latency_ms
+    "packages": 80,           # launchable packages per device
+    "apk_kb": 256,            # APK size pulled for icon extraction
+    "icon_px": 96,
+    "files": 50,              # entries in `ls -lh`
+    "transfer_mb_s": 40.0,    # push/pull throughput
+    "logcat_lines_s": 10000,  # log lines per second per device
+    "logcat_seconds": 0,      # stream length, 0 = until killed
+    "crash_after_s": 0,       # launched apps crash (and restart) after this long, 0 = never
+    "install_ms": 1500,       # package manager time per install, after the transfer
+}
+
+
+def load_scenario() -> dict:
+    scenario = dict(DEFAULT_SCENARIO)
+    path = os.environ.get("UMC_BENCH_SCENARIO")
+    if path:
+        with open(path) as f:
+            scenario.update(json.load(f))
+    return scenario
+
+
+def device_serials(scenario: dict) -> list:
+    serials = [f"BENCH{i:04d}" for i in range(1, scenario["devices"] + 1)]
+    serials += [f"192.168.50.{i}:5555" for i in range(1, scenario["network_devices"] + 1)]
+    return serials
+
+
+def package_names(scenario: dict, serial: str) -> list:
+    rng = random.Random(f"{scenario['seed']}:{serial}:packages")
+    words = ["mail", "maps", "camera", "notes", "music", "photos", "chat", "files", "clock",
+             "calendar", "weather", "wallet", "fitness", "reader", "browser", "podcasts"]
+    vendors = ["com.example", "org.sample", "net.demo", "io.bench", "com.android"]
+    names = []
+    for i in range(scenario["packages"]):
+        names.append(f"{rng.choice(vendors)}.{rng.choice(words)}{i}")
+    return names
+
+
+def png_bytes(size: int, seed: str) -> bytes:
+    """A valid solid-colour RGB PNG."""
+    rng = random.Random(seed)
+    pixel = bytes([rng.randrange(256), rng.randrange(256), rng.randrange(256)])
+    raw = b"".join(b"\0" + pixel * size for _ in range(size))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def manifest_axml(package: str, version_code: int, split: str = "") -> bytes:
+    """A compiled (binary XML) AndroidManifest.xml with a launcher activity."""
+    strings = ["name", "versionCode", "versionName", "package", "split", "manifest", "application", "activity",
+               "intent-filter", "action", "category", package, f"1.{version_code}", split, ".MainActivity",
+               "android.intent.action.MAIN", "android.intent.category.LAUNCHER"]
+    index = {text: i for i, text in enumerate(strings)}
+    resource_ids = [0x01010003, 0x0101021B, 0x0101021C]  # android:name, versionCode, versionName
+
+    data = b""
+    offsets = []
+    for text in strings:  # UTF-16 pool
+        offsets.append(len(data))
+        data += struct.pack("<H", len(text)) + text.encode("utf-16-le") + b"\0\0"
+    data += b"\0" * (-len(data) % 4)
+    body = struct.pack(f"<{len(strings)}I", *offsets) + data
+    pool = struct.pack("<HHIIIIII", 0x0001, 28, 28 + len(body), len(strings), 0, 0, 28 + 4 * len(strings), 0) + body
+    resource_map = struct.pack(f"<HHI{len(resource_ids)}I", 0x0180, 8, 8 + 4 * len(resource_ids), *resource_ids)
+
+    def attr(name, text=None, number=0):
+        if text is not None:
+            return struct.pack("<IIIHBBI", 0xFFFFFFFF, index[name], index[text], 8, 0, 0x03, index[text])
+        return struct.pack("<IIIHBBI", 0xFFFFFFFF, index[name], 0xFFFFFFFF, 8, 0, 0x10, number)
+
+    def start(name, *attrs):
+        ext = struct.pack("<IIHHHHHH", 0xFFFFFFFF, index[name], 20, 20, len(attrs), 0, 0, 0) + b"".join(attrs)
+        return struct.pack("<HHIII", 0x0102, 16, 16 + len(ext), 1, 0xFFFFFFFF) + ext
+
+    def end(name):
+        return struct.pack("<HHIIIII", 0x0103, 16, 24, 1, 0xFFFFFFFF, 0xFFFFFFFF, index[name])
+
+    manifest_attrs = [attr("versionCode", number=version_code), attr("versionName", f"1.{version_code}"),
+                      attr("package", package)] + ([attr("split", split)] if split else [])
+    elements = (start("manifest", *manifest_attrs) + start("application")
+                + start("activity", attr("name", ".MainActivity")) + start("intent-filter")
+                + start("action", attr("name", "android.intent.action.MAIN")) + end("action")
+                + start("category", attr("name", "android.intent.category.LAUNCHER")) + end("category")
+                + end("intent-filter") + end("activity") + end("application") + end("manifest"))
+    xml = pool + resource_map + elements
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(xml)) + xml
+
+
+def preinstalled_version(package: str) -> int:
+    return 100 + len(package) % 7
+
+
+def apk_bytes(scenario: dict, package: str, version_code: int = None, split: str = "") -> bytes:
+    """A zip shaped like an APK: binary manifest, dex padding and a launcher icon."""
+    if version_code is None:
+        version_code = preinstalled_version(package)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as apk:
+        apk.writestr("AndroidManifest.xml", manifest_axml(package, version_code, split))
+        apk.writestr("res/mipmap-xxxhdpi/ic_launcher.png", png_bytes(scenario["icon_px"], package))
+        padding = random.Random(f"{package}:{version_code}:{split}").randbytes(max(0, scenario["apk_kb"] * 1024))
+        apk.writestr("classes.dex", padding)
+    return buffer.getvalue()
+
+
+def _installs_path(serial: str) -> str:
+    base = os.environ.get("UMC_BENCH_SCENARIO") or os.path.join(tempfile.gettempdir(), "umc-fake-adb")
+    return os.path.join(base + ".installs", serial.replace(":", "_") + ".json")
+
+
+def load_installs(serial: str) -> dict:
+    """{package: {version, hashes} or None if uninstalled} changed since the scenario's own packages."""
+    try:
+        with open(_installs_path(serial)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_installs(serial: str, installs: dict):
+    path = _installs_path(serial)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(installs, f)
+    os.replace(path + ".tmp", path)
+
+
+def installed_packages(scenario: dict, serial: str) -> dict:
+    """{package: versionCode} of what the device has now."""
+    packages = {p: preinstalled_version(p) for p in package_names(scenario, serial)}
+    for package, record in load_installs(serial).items():
+        if record is None:
+            packages.pop(package, None)
+        else:
+            packages[package] = record["version"]
+    return packages
+
+
+def installed_hashes(scenario: dict, serial: str, package: str) -> str:
+    """sha256sum lines for the package's APK files, as the hash check script prints them."""
+    record = load_installs(serial).get(package, False)
+    if record is False and package in package_names(scenario, serial):
+        record = {"hashes": [hashlib.sha256(apk_bytes(scenario, package)).hexdigest()]}
+    if not record:
+        return ""
+    return "".join(f"{digest}  /data/app/~~bench/{package}-1/split_{i}.apk\n" for i, digest in enumerate(record["hashes"]))
+
+
+def install(scenario: dict, serial: str, paths: list) -> str:
+    """Streams the APKs in, then records the package with their hashes."""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from backend.installer import InstallError, read_apk_manifest
+    hashes = []
+    package = version = None
+    for path in paths:
+        try:
+            manifest = read_apk_manifest(path)
+            with open(path, "rb") as f:
+                data = f.read()
+        except (OSError, InstallError):
+            return "Failure [INSTALL_PARSE_FAILED_NOT_APK]"
+        simulate_transfer(scenario, len(data))
+        hashes.append(hashlib.sha256(data).hexdigest())
+        if not manifest["split"]:
+            package, version = manifest["package"], int(manifest["versionCode"] or 0)
+    if package is None:
+        return "Failure [INSTALL_FAILED_MISSING_SPLIT]"
+    time.sleep(scenario["install_ms"] / 1000)
+    installs = load_installs(serial)
+    installs[package] = {"version": version, "hashes": sorted(hashes)}
+    save_installs(serial, installs)
+    return "Success"
+
+
+def _file_record(serial: str, remote: str) -> str:
+    """Where a pushed file's size is remembered, so a later pull returns as many bytes."""
+    base = os.environ.get("UMC_BENCH_SCENARIO") or os.path.join(tempfile.gettempdir(), "umc-fake-adb")
+    key = hashlib.sha1(f"{serial}:{remote}".encode()).hexdigest()
+    return os.path.join(base + ".files", key)
+
+
+def simulate_latency(scenario: dict, serial: str, argv: list):
+    latency = scenario["device_latency_ms"].get(serial, scenario["latency_ms"])
+    rng = random.Random(f"{scenario['seed']}:{serial}:{' '.join(argv)}")
+    delay = latency + rng.uniform(-1, 1) * scenario["jitter_ms"]
+    if delay > 0:
+        time.sleep(delay / 1000)
+
+
+def simulate_transfer(scenario: dict, size: int):
+    rate = scenario["transfer_mb_s"] * 1024 * 1024
+    if rate > 0:
+        time.sleep(size / rate)
+
+
+def shell(scenario: dict, serial: str, command: str) -> str:
+    """Answers one shell command (scripts are split on ';' first)."""
+    rng = random.Random(f"{scenario['seed']}:{serial}")
+    words = command.split()
+    if not words:
+        return ""
+    head = words[0]
+
+    if head == "echo":
+        return " ".join(words[1:]) + "\n"
+    if words[:2] == ["dumpsys", "battery"]:
+        return ("Current Battery Service state:\n  AC powered: false\n  USB powered: true\n"
+                f"  status: {rng.choice([2, 3, 5])}\n  health: 2\n  present: true\n"
+                f"  level: {rng.randint(5, 100)}\n  scale: 100\n  voltage: 4200\n"
+                f"  temperature: {rng.randint(250, 420)}\n  technology: Li-ion\n")
+    if words[:2] == ["df", "/data"]:
+        total = rng.choice([64, 128, 256]) * 1024 * 1024
+        used = int(total * rng.uniform(0.2, 0.9))
+        return ("Filesystem     1K-blocks     Used Available Use% Mounted on\n"
+                f"/dev/block/dm-5 {total} {used} {total - used} {used * 100 // total}% /data\n")
+    if words[:2] == ["wm", "size"]:
+        return "Physical size: 1080x2400\n"
+    if words[:2] == ["wm", "density"]:
+        return "Physical density: 420\n"
+    if head == "pidof" and len(words) > 1:
+        return f"{app_pid(words[1])}\n"
+    if head == "getprop":
+        props = {
+            "ro.build.version.sdk": "34",
+            "ro.product.cpu.abi": "arm64-v8a",
+            "ro.product.model": f"Bench_Phone_{serial[-4:]}",
+            "ro.build.fingerprint": f"bench/phone/{serial}:14/UQ1A/1:user/release-keys",
+        }
+        return props.get(words[1], "") + "\n" if len(words) > 1 else ""
+    if command.startswith("cat /proc/sys/kernel/random/boot_id"):
+        return hashlib.md5(f"{scenario['seed']}:{serial}:boot".encode()).hexdigest() + "\n"
+    if command.startswith("cat /vendor/etc/media_codecs"):
+        return 'name="c2.android.avc.encoder"\nname="c2.android.hevc.encoder"\nname="c2.android.opus.encoder"\n'
+    if words[:3] == ["cmd", "package", "query-activities"]:
+        return "".join(f"{p}/.MainActivity\n" for p in installed_packages(scenario, serial))
+    if words[:3] == ["pm", "list", "packages"]:
+        packages = installed_packages(scenario, serial)
+        if "--show-versioncode" in words:
+            return "".join(f"package:{p} versionCode:{version}\n" for p, version in packages.items())
+        return "".join(f"package:{p}\n" for p in packages)
+    if words[:2] == ["pm", "path"] and len(words) > 2:
+        return f"package:/data/app/~~bench/{words[2]}-1/base.apk\n"
+    if words[:2] == ["pm", "dump"] and len(words) > 2:
+        label = words[2].split(".")[-1].rstrip("0123456789").capitalize()
+        return f"Packages:\n  Package [{words[2]}]:\n    versionCode=1 minSdk=24\n    label={label}\n"
+    if head == "ls":
+        lines = []
+        for i in range(scenario["files"]):
+            if i % 5 == 0:
+                lines.append(f"drwxrwx--x 2 root sdcard_rw 3.4K 2024-01-01 12:00 Folder {i}")
+            else:
+                lines.append(f"-rw-rw---- 1 root sdcard_rw {rng.randint(1, 900)}K 2024-01-01 12:00 file_{i}.jpg")
+        return "\n".join(lines) + "\n"
+    if words[:2] == ["screencap", "-p"]:
+        return png_bytes(256, serial).decode("latin-1")
+    return ""
+
+
+def app_pid(package: str) -> int:
+    return 10000 + int(hashlib.md5(package.encode()).hexdigest(), 16) % 5000
+
+
+def event_log(scenario: dict, words: list):
+    """Activity manager events for the -e package: its start and, with crash_after_s, a crash and restart."""
+    package = words[words.index("-e") + 1] if "-e" in words else "io.bench.app"
+    pid = app_pid(package)
+
+    def emit(tag, fields):
+        now = time.time()
+        stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(now)) + f".{int(now % 1 * 1000):03d}"
+        sys.stdout.write(f"{stamp}  1000  1200 I {tag}: [{','.join(str(f) for f in fields)}]\n")
+        sys.stdout.flush()
+
+    try:
+        emit("am_proc_start", [0, pid, 10123, package, "activity", f"{{{package}/.MainActivity}}"])
+        if scenario["crash_after_s"]:
+            time.sleep(scenario["crash_after_s"])
+            emit("am_crash", [pid, 0, package, 952745540, "java.lang.IllegalStateException", "bench crash",
+                              "MainActivity.java", 42, 0])
+            emit("am_proc_died", [0, pid, package, 900, 2])
+            emit("am_proc_start", [0, pid + 1, 10123, package, "activity", f"{{{package}/.MainActivity}}"])
+        while True:
+            time.sleep(1)
+    except BrokenPipeError:
+        return
+
+
+LOG_TAGS = ["ActivityManager", "WindowManager", "chatty", "OpenGLRenderer", "BenchApp", "NetworkMonitor"]
+
+
+def logcat(scenario: dict, serial: str, words: list):
+    """Streams synthetic log lines at logcat_lines_s, binary with -B and threadtime otherwise."""
+    rng = random.Random(f"{scenario['seed']}:{serial}:logcat")
+    binary = "-B" in words
+    pid_filter = next((int(w.split("=", 1)[1]) for w in words if w.startswith("--pid=")), 0)
+    levels = "VDIWEF"
+    min_level = next((levels.index(w[2]) for w in words if w.startswith("*:") and w[2:3] in levels), 0)
+    rate = max(1, int(scenario["logcat_lines_s"]))
+    deadline = time.monotonic() + scenario["logcat_seconds"] if scenario["logcat_seconds"] else None
+    out = sys.stdout.buffer
+    batch = max(1, rate // 100)  # one write every ~10 ms
+    started = time.monotonic()
+    sent = 0
+    while deadline is None or time.monotonic() < deadline:
+        chunk = []
+        now = time.time()
+        for _ in range(batch):
+            level = rng.randint(0, 5)
+            pid = pid_filter or rng.choice([1000, 1234, 2048, 4321])
+            if level < min_level:
+                continue
+            tag = rng.choice(LOG_TAGS)
+            message = f"bench event {sent} on {serial} value={rng.random():.6f}"
+            if binary:
+                payload = bytes([level + 2]) + tag.encode() + b"\0" + message.encode() + b"\0"
+                chunk.append(struct.pack("<HHiIIIII", len(payload), 28, pid, pid + 1, int(now),
+                                         int(now % 1 * 1e9), 0, 10000) + payload)
+            else:
+                stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(now)) + f".{int(now % 1 * 1000):03d}"
+                chunk.append(f"{stamp} {pid:5d} {pid + 1:5d} {levels[level]} {tag}: {message}\n".encode())
+            sent += 1
+        try:
+            out.write(b"".join(chunk))
+            out.flush()
+        except BrokenPipeError:
+            return
+        ahead = started + sent / rate - time.monotonic()
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+def main(argv: list) -> int:
+    scenario = load_scenario()
+    serials = device_serials(scenario)
+
+    serial = os.environ.get("ANDROID_SERIAL")
+    if len(argv) >= 2 and argv[0] == "-s":
+        serial, argv = argv[1], argv[2:]
+    if not argv:
+        return 1
+    command = argv[0]
+
+    if command == "version":
+        print("Android Debug Bridge version 1.0.41 (fake)")
+        return 0
+    if command in ("start-server", "kill-server", "forward", "reverse"):
+        return 0
+
+    simulate_latency(scenario, serial or "", argv)
+
+    if command == "devices":
+        print("List of devices attached")
+        for s in serials:
+            state = "offline" if s in scenario["offline"] else "device"
+            print(f"{s:<22} {state} product:bench model:Bench_Phone_{s[-4:]} device:bench transport_id:1")
+        print()
+        return 0
+    if command == "connect":
+        address = argv[1] if len(argv) > 1 else ""
+        if address in serials:
+            print(f"connected to {address}")
+        else:
+            print(f"failed to connect to {address}")
+        return 0
+    if command == "disconnect":
+        print(f"disconnected {argv[1] if len(argv) > 1 else 'everything'}")
+        return 0
+
+    if serial is None and len(serials) == 1:
+        serial = serials[0]
+    if serial not in serials or serial in scenario["offline"]:
+        sys.stderr.write(f"adb: device '{serial}' not found\n")
+        return 1
+
+    if command in ("shell", "exec-out"):
+        script = " ".join(argv[1:])
+        words = [w.strip("'") for w in script.split()]
+        if words[:1] == ["logcat"]:
+            if "events" in words:
+                event_log(scenario, words)
+            else:
+                logcat(scenario, serial, words)
+            return 0
+        if "sha256sum" in script and "pm path" in script:
+            package = words[words.index("path") + 1].rstrip(");")
+            sys.stdout.write(installed_hashes(scenario, serial, package))
+            return 0
+        output = "".join(shell(scenario, serial, part.strip()) for part in script.split(";"))
+        if command == "exec-out" or "screencap" in script:
+            sys.stdout.buffer.write(output.encode("latin-1"))
+        else:
+            sys.stdout.write(output)
+        return 0
+    if command == "pull" and len(argv) >= 3:
+        remote, local = argv[1], argv[2]
+        if remote.endswith(".apk"):
+            data = apk_bytes(scenario, os.path.basename(os.path.dirname(remote)).rsplit("-", 1)[0])
+        else:
+            try:
+                with open(_file_record(serial, remote)) as f:
+                    size = int(f.read())
+            except (OSError, ValueError):
+                size = int(scenario.get("pull_kb", 1024)) * 1024
+            data = random.Random(remote).randbytes(size)
+        simulate_transfer(scenario, len(data))
+        if os.path.isdir(local):
+            local = os.path.join(local, os.path.basename(remote))
+        with open(local, "wb") as f:
+            f.write(data)
+        print(f"{remote}: 1 file pulled, 0 skipped.")
+        return 0
+    if command == "push" and len(argv) >= 3:
+        try:
+            size = os.path.getsize(argv[1])
+        except OSError:
+            sys.stderr.write(f"adb: error: cannot stat '{argv[1]}'\n")
+            return 1
+        simulate_transfer(scenario, size)
+        record = _file_record(serial, argv[2])
+        os.makedirs(os.path.dirname(record), exist_ok=True)
+        with open(record, "w") as f:
+            f.write(str(size))
+        print(f"{argv[1]}: 1 file pushed, 0 skipped.")
+        return 0
+    if command in ("install", "install-multiple"):
+        message = install(scenario, serial, [arg for arg in argv[1:] if not arg.startswith("-")])
+        print(message)
+        return 0 if message == "Success" else 1
+    if command == "uninstall" and len(argv) > 1:
+        if argv[-1] not in installed_packages(scenario, serial):
+            print("Failure [DELETE_FAILED_INTERNAL_ERROR]")
+            return 1
+        installs = load_installs(serial)
+        installs[argv[-1]] = None
+        save_installs(serial, installs)
+        print("Success")
+        return 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Stand-in for devices advertising wireless debugging over mDNS.
+
+Joins the multicast group on a configurable port and answers PTR queries
+for the adb service with PTR records only, leaving SRV and A out of the
+additional section so the browser has to ask for them, as some Android
+responders do. Every question received is counted, which is what the
+`mdns` benchmark reports.
+"""
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from backend.discovery import (ADB_CONNECT_SERVICE, CLASS_IN, MDNS_GROUP, TYPE_A, TYPE_PTR, TYPE_SRV,
+                               _read_name, encode_name)
+
+
+def record(name: str, rtype: int, ttl: int, rdata: bytes) -> bytes:
+    return encode_name(name) + struct.pack(">HHIH", rtype, CLASS_IN, ttl, len(rdata)) + rdata
+
+
+class FakeMDNSResponder:
+    """Answers for `devices` fake endpoints on group:port until stopped."""
+
+    def __init__(self, devices: int = 4, service: str = ADB_CONNECT_SERVICE, group: str = MDNS_GROUP,
+                 port: int = 15353, ttl: int = 120, delay: float = 0.0):
+        self.service = service.lower()
+        self.group = group
+        self.port = port
+        self.ttl = ttl
+        self.delay = delay  # before each answer, like a slow Wi-Fi link
+        self.instances = {f"adb-bench{i:04d}-fake.{self.service}": (f"bench-{i}.local", 37000 + i, f"127.0.0.{i + 1}")
+                          for i in range(1, devices + 1)}
+        self.queries = 0  # packets received with the QR bit clear
+        self.questions = {TYPE_PTR: 0, TYPE_SRV: 0, TYPE_A: 0}
+        self._socket = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", self.port))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                        socket.inet_aton(self.group) + socket.inet_aton("0.0.0.0"))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        sock.settimeout(0.2)
+        self._socket = sock
+        self._thread = threading.Thread(target=self._run, name="fake-mdns", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._socket:
+            self._socket.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                data, _ = self._socket.recvfrom(9000)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            answers = self._answer(data)
+            if answers:
+                if self.delay:
+                    time.sleep(self.delay)
+                packet = struct.pack(">HHHHHH", 0, 0x8400, 0, len(answers), 0, 0) + b"".join(answers)
+                self._socket.sendto(packet, (self.group, self.port))
+
+    def _answer(self, data: bytes) -> list:
+        try:
+            _, flags, qdcount = struct.unpack(">HHH", data[:6])
+        except struct.error:
+            return []
+        if flags & 0x8000:
+            return []  # a response, ours looped back included
+        self.queries += 1
+        answers = []
+        offset = 12
+        try:
+            for _ in range(qdcount):
+                name, offset = _read_name(data, offset)
+                qtype, _ = struct.unpack(">HH", data[offset:offset + 4])
+                offset += 4
+                name = name.lower()
+                if qtype in self.questions:
+                    self.questions[qtype] += 1
+                if qtype == TYPE_PTR and name == self.service:
+                    answers += [record(self.service, TYPE_PTR, self.ttl, encode_name(i)) for i in self.instances]
+                elif qtype == TYPE_SRV and name in self.instances:
+                    host, port, _ = self.instances[name]
+                    answers.append(record(name, TYPE_SRV, self.ttl, struct.pack(">HHH", 0, 0, port) + encode_name(host)))
+                elif qtype == TYPE_A:
+                    for host, _, address in self.instances.values():
+                        if host == name:
+                            answers.append(record(host, TYPE_A, self.ttl, socket.inet_aton(address)))
+        except (IndexError, struct.error):
+            pass
+        return answers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fake wireless-debugging mDNS responder.")
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--port", type=int, default=15353)
+    parser.add_argument("--group", default=MDNS_GROUP)
+    args = parser.parse_args(argv)
+    responder = FakeMDNSResponder(args.devices, group=args.group, port=args.port)
+    responder.start()
+    print(f"answering for {args.devices} devices on {args.group}:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"queries received: {responder.queries} {responder.questions}")
+    except KeyboardInterrupt:
+        responder.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Stand-in for scrcpy: prints the INFO lines UMC watches, reporting the first
+frame after the scenario's scrcpy_startup_ms, then idles until killed (or
+for --time-limit seconds). Opens no window and touches no device.
+"""
+import json
+import os
+import signal
+import sys
+import time
+
+
+def main(argv: list) -> int:
+    scenario = {"scrcpy_startup_ms": 350, "width": 1080, "height": 2400}
+    path = os.environ.get("UMC_BENCH_SCENARIO")
+    if path:
+        with open(path) as f:
+            scenario.update(json.load(f))
+
+    if "--version" in argv or "-v" in argv:
+        print("scrcpy 2.4 (fake)")
+        return 0
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    serial = next((a.split("=", 1)[1] for a in argv if a.startswith("--serial=")), None)
+    for flag in ("--serial", "-s"):
+        if serial is None and flag in argv[:-1]:
+            serial = argv[argv.index(flag) + 1]
+
+    print("scrcpy 2.4 (fake) <https://github.com/Genymobile/scrcpy>", flush=True)
+    print(f"INFO: Device: [bench] bench Bench_Phone ({serial or 'default'})", flush=True)
+    time.sleep(scenario["scrcpy_startup_ms"] / 1000)
+    print("INFO: Renderer: opengl", flush=True)
+    print(f"INFO: Texture: {scenario['width']}x{scenario['height']}", flush=True)
+
+    limit = next((a.split("=", 1)[1] for a in argv if a.startswith("--time-limit=")), None)
+    deadline = time.monotonic() + float(limit) if limit else None
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
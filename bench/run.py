@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+UMC benchmark suite.
+
+Runs the backend against bench/fake_adb.py and bench/fake_scrcpy.py (put on
+PATH as `adb` and `scrcpy`) with a throwaway HOME/XDG tree, so results do
+not depend on attached devices or on caches from earlier runs. Results are
+written as JSON; pass --compare with an older file to see the deltas.
+
+    python -m bench.run --devices 8 --latency-ms 30 -o bench-results.json
+    python -m bench.run -o new.json --compare old.json
+
+Benchmarks that need Qt (package load through the worker, UI-thread stall,
+time to first frame) are reported as skipped when PySide6 is not importable.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from bench.fake_adb import DEFAULT_SCENARIO, apk_bytes, device_serials, package_names
+
+BENCHMARKS = ["spawn_overhead", "device_refresh", "status_latency", "package_load",
+              "icon_load", "transfer", "scrcpy_first_frame", "ui_stall", "startup", "logcat", "install", "mdns"]
+
+
+def summarize(samples_ms: list) -> dict:
+    """count/mean/p50/p95/max of millisecond samples."""
+    if not samples_ms:
+        return {"count": 0}
+    ordered = sorted(samples_ms)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 2),
+        "p50": round(pick(0.50), 2),
+        "p95": round(pick(0.95), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def timed_ms(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def prepare_environment(scenario: dict, workdir: str):
+    """Writes the scenario, installs the fake tools on PATH and isolates config/cache dirs."""
+    scenario_path = os.path.join(workdir, "scenario.json")
+    with open(scenario_path, "w") as f:
+        json.dump(scenario, f)
+
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir)
+    for name, script in (("adb", "fake_adb.py"), ("scrcpy", "fake_scrcpy.py")):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(BENCH_DIR, script)}" "$@"\n')
+        os.chmod(path, 0o755)
+
+    os.environ["UMC_BENCH_SCENARIO"] = scenario_path
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["HOME"] = os.path.join(workdir, "home")
+    for var in ("XDG_CONFIG_HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_STATE_HOME"):
+        os.environ[var] = os.path.join(workdir, var.lower())
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def bench_spawn_overhead(ctx: dict) -> dict:
+    """Cost of one fake adb invocation with no simulated latency (subtract from the rest)."""
+    samples = [timed_ms(subprocess.run, ["adb", "version"], capture_output=True)[0] for _ in range(ctx["iterations"])]
+    return summarize(samples)
+
+
+def bench_device_refresh(ctx: dict) -> dict:
+    from backend.adb_handler import ADBHandler
+    handler = ADBHandler()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(ctx["iterations"]):
+        elapsed, devices = timed_ms(handler.get_devices)
+        samples.append(elapsed)
+    total = time.perf_counter() - start
+    result = summarize(samples)
+    result["devices"] = len(devices)
+    result["refreshes_per_s"] = round(ctx["iterations"] / total, 2)
+    return result
+
+
+def bench_status_latency(ctx: dict) -> dict:
+    from backend.adb_handler import ADBHandler
+    handler = ADBHandler()
+    per_device, rounds = [], []
+    for _ in range(max(1, ctx["iterations"] // 10)):
+        round_start = time.perf_counter()
+        for serial in ctx["serials"]:
+            per_device.append(timed_ms(handler.get_device_status_info, serial)[0])
+        rounds.append((time.perf_counter() - round_start) * 1000)
+    return {"per_device": summarize(per_device), "all_devices": summarize(rounds)}
+
+
+def bench_package_load(ctx: dict) -> dict:
+    try:
+        from backend.worker import ADBWorker
+    except ImportError as e:
+        return {"skipped": f"needs PySide6 ({e})"}
+    worker = ADBWorker()
+    packages = {}
+    worker.packagesReady.connect(lambda serial, apps: packages.__setitem__(serial, apps))
+    samples = []
+    for _ in range(max(1, ctx["iterations"] // 10)):
+        for serial in ctx["serials"]:
+            samples.append(timed_ms(worker.fetch_packages, serial)[0])
+    result = summarize(samples)
+    result["packages"] = len(packages.get(ctx["serials"][0], []))
+    return result
+
+
+def bench_icon_load(ctx: dict) -> dict:
+    from backend.adb_handler import ADBHandler
+    handler = ADBHandler()
+    serial = ctx["serials"][0]
+    names = package_names(ctx["scenario"], serial)[:ctx["icons"]]
+    cache_dir = os.path.join(ctx["workdir"], "icons")
+
+    start = time.perf_counter()
+    cold = [timed_ms(handler.get_app_icon_path, serial, name, cache_dir)[0] for name in names]
+    cold_total = time.perf_counter() - start
+    warm = [timed_ms(handler.get_app_icon_path, serial, name, cache_dir)[0] for name in names]
+    loaded = sum(1 for name in names if os.path.exists(os.path.join(cache_dir, f"{name}.png")))
+    return {
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "icons_loaded": loaded,
+        "icons_per_s": round(len(names) / cold_total, 2) if cold_total else 0,
+    }
+
+
+def bench_transfer(ctx: dict) -> dict:
+    from backend.adb_handler import ADBHandler
+    handler = ADBHandler()
+    serial = ctx["serials"][0]
+    size = ctx["transfer_mb"] * 1024 * 1024
+    local = os.path.join(ctx["workdir"], "payload.bin")
+    with open(local, "wb") as f:
+        f.write(os.urandom(size))
+
+    push_ms, pushed = timed_ms(handler.push_file, serial, local, "/sdcard/payload.bin")
+    pulled_path = os.path.join(ctx["workdir"], "pulled.bin")
+    pull_ms, pulled = timed_ms(handler.pull_file, serial, "/sdcard/payload.bin", pulled_path)
+    pulled_size = os.path.getsize(pulled_path) if os.path.exists(pulled_path) else 0
+    listing = [timed_ms(handler.list_files, serial, "/sdcard")[0] for _ in range(max(1, ctx["iterations"] // 5))]
+    return {
+        "push_ok": pushed,
+        "push_mb_s": round(size / 1024 / 1024 / (push_ms / 1000), 2),
+        "pull_ok": pulled,
+        "pull_mb_s": round(pulled_size / 1024 / 1024 / (pull_ms / 1000), 2),
+        "list_files": summarize(listing),
+    }
+
+
+def bench_scrcpy_first_frame(ctx: dict) -> dict:
+    from backend.scrcpy_handler import ScrcpyHandler
+    handler = ScrcpyHandler()
+    samples = []
+    for serial in ctx["serials"][:4]:
+        handler.mirror(serial)
+        session = handler.latest_session(serial)
+        if session is None:
+            continue
+        deadline = time.monotonic() + 10
+        while session.first_frame_at is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        if session.first_frame_at is not None:
+            samples.append((session.first_frame_at - session.started_at) * 1000)
+        session.process.terminate()
+        session.process.wait(timeout=5)
+    return summarize(samples)
+
+
+def bench_ui_stall(ctx: dict) -> dict:
+    """
+    Drives the bridge the way the sidebar does (refreshes plus device
+    selection) while a 5 ms timer on the GUI thread records how late each
+    tick fires. Lateness is time the event loop could not paint.
+    """
+    try:
+        from PySide6.QtCore import QTimer, QElapsedTimer
+        from PySide6.QtGui import QGuiApplication
+        from backend.bridge import BackendBridge
+    except ImportError as e:
+        return {"skipped": f"needs PySide6 ({e})"}
+
+    app = QGuiApplication.instance() or QGuiApplication([])
+    bridge = BackendBridge()
+    bridge.start()
+    clock = QElapsedTimer()
+    gaps = []
+    state = {"last": None, "step": 0}
+    interval = 5
+
+    def tick():
+        now = clock.elapsed()
+        if state["last"] is not None:
+            gaps.append(max(0, now - state["last"] - interval))
+        state["last"] = now
+
+    def drive():
+        serials = ctx["serials"]
+        bridge.refresh_devices()
+        bridge.select_device(serials[state["step"] % len(serials)])
+        state["step"] += 1
+
+    probe = QTimer()
+    probe.setInterval(interval)
+    probe.timeout.connect(tick)
+    driver = QTimer()
+    driver.setInterval(250)
+    driver.timeout.connect(drive)
+
+    # Let the startup fetches settle before measuring
+    QTimer.singleShot(1000, lambda: (clock.start(), probe.start(), driver.start()))
+    QTimer.singleShot(1000 + int(ctx["ui_seconds"] * 1000), app.quit)
+    app.exec()
+    probe.stop()
+    driver.stop()
+    bridge.cleanup()
+
+    result = summarize(gaps)
+    result["stalls_over_16ms"] = sum(1 for gap in gaps if gap > 16)
+    result["stalled_ms"] = sum(gap for gap in gaps if gap > 16)
+    result["selections"] = state["step"]
+    return result
+
+
+def bench_startup(ctx: dict) -> dict:
+    """
+    Launches main.py until the window's first frame (UMC_EXIT_AFTER_FIRST_FRAME)
+    and reports the app's own first-frame time plus the process wall time.
+    Cold runs get empty QML and bytecode caches; warm runs share one.
+    """
+    import importlib.util
+    if importlib.util.find_spec("PySide6") is None:
+        return {"skipped": "needs PySide6"}
+
+    def launch(cache_dir: str):
+        env = dict(os.environ, UMC_EXIT_AFTER_FIRST_FRAME="1", XDG_CACHE_HOME=cache_dir,
+                   PYTHONPYCACHEPREFIX=os.path.join(cache_dir, "pycache"))
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, os.path.join(REPO_DIR, "main.py")], env=env,
+                              capture_output=True, text=True, timeout=60)
+        wall = (time.perf_counter() - start) * 1000
+        for line in reversed(proc.stdout.splitlines()):
+            if line.startswith("{"):
+                return json.loads(line)["first_frame_ms"], wall
+        raise RuntimeError(f"main.py exited with {proc.returncode} before a frame: {proc.stderr.strip()[-300:]}")
+
+    cold, cold_wall, warm, warm_wall = [], [], [], []
+    warm_cache = os.path.join(ctx["workdir"], "startup-warm")
+    launch(warm_cache)  # populate the shared caches
+    for i in range(ctx["startup_runs"]):
+        frame, wall = launch(os.path.join(ctx["workdir"], f"startup-cold-{i}"))
+        cold.append(frame)
+        cold_wall.append(wall)
+        frame, wall = launch(warm_cache)
+        warm.append(frame)
+        warm_wall.append(wall)
+    return {
+        "cold_first_frame": summarize(cold), "cold_wall": summarize(cold_wall),
+        "warm_first_frame": summarize(warm), "warm_wall": summarize(warm_wall),
+    }
+
+
+def bench_logcat(ctx: dict) -> dict:
+    """
+    Streams logcat from up to four devices at the scenario's line rate for
+    --logcat-seconds and reports parsed lines per second, lines lost against
+    what the fake emitted and the process's peak RSS growth.
+    """
+    import resource
+    from backend.logcat import LogcatPool
+    seconds = ctx["logcat_seconds"]
+    scenario = dict(ctx["scenario"], logcat_seconds=seconds)
+    scenario_path = os.path.join(ctx["workdir"], "logcat-scenario.json")
+    with open(scenario_path, "w") as f:
+        json.dump(scenario, f)
+    previous = os.environ["UMC_BENCH_SCENARIO"]
+    os.environ["UMC_BENCH_SCENARIO"] = scenario_path
+    results = {}
+    try:
+        for mode in ("binary", "text"):
+            rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            pool = LogcatPool("adb")
+            start = time.perf_counter()
+            streams = [pool.start(serial, binary=mode == "binary") for serial in ctx["serials"][:4]]
+            for stream in streams:
+                stream.join(seconds + 30)
+            elapsed = time.perf_counter() - start
+            expected = int(scenario["logcat_lines_s"] * seconds)
+            results[mode] = {
+                "devices": len(streams),
+                "lines_per_s": round(sum(stream.ring.total for stream in streams) / elapsed / len(streams)),
+                "lost": sum(max(0, expected - stream.ring.total) for stream in streams),
+                "mb_read": round(sum(stream.bytes_read for stream in streams) / 1024 / 1024, 2),
+                "peak_rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024, 1),
+            }
+    finally:
+        os.environ["UMC_BENCH_SCENARIO"] = previous
+    return results
+
+
+def bench_install(ctx: dict) -> dict:
+    """
+    Rolls a base APK and one split out to every device, then again: the
+    first run's wall time against its slowest device and the sum of all of
+    them (a one-by-one rollout), the second run's time to skip them all.
+    """
+    from backend.installer import APKInstaller, APKSet
+    from backend.installer import summarize as count_statuses
+    paths = []
+    for split in ("", "config.arm64_v8a"):
+        path = os.path.join(ctx["workdir"], f"bench-{split or 'base'}.apk")
+        with open(path, "wb") as f:
+            f.write(apk_bytes(ctx["scenario"], "io.bench.rollout", 2, split))
+        paths.append(path)
+    installer = APKInstaller("adb")
+    serials = [s for s in ctx["serials"] if s not in ctx["scenario"]["offline"]]
+    result = {"devices": len(serials)}
+    for run in ("install", "reinstall"):
+        start = time.perf_counter()
+        results = installer.install(serials, APKSet(paths))
+        result[run] = {
+            "wall_s": round(time.perf_counter() - start, 2),
+            "slowest_device_s": max(r["seconds"] for r in results),
+            "sum_of_devices_s": round(sum(r["seconds"] for r in results), 2),
+            **count_statuses(results),
+        }
+    installer.uninstall(serials, "io.bench.rollout")
+    return result
+
+
+def bench_mdns(ctx: dict) -> dict:
+    """
+    Browses for the scenario's devices against bench/fake_mdns.py (which
+    leaves SRV and A records to be asked for, and answers after a delay)
+    for --mdns-seconds: time until all are found and how many query
+    packets the browser sent meanwhile.
+    """
+    from backend.discovery import TYPE_A, TYPE_PTR, TYPE_SRV, MDNSDiscovery
+    from bench.fake_mdns import FakeMDNSResponder
+    results = {}
+    for name, delay in (("fast", 0.0), ("slow_link", 0.3)):
+        responder = FakeMDNSResponder(len(ctx["serials"]), port=15353, delay=delay)
+        responder.start()
+        found = []
+        discovery = MDNSDiscovery(on_changed=lambda candidates: found.append((time.perf_counter(), len(candidates))),
+                                  port=15353)
+        start = time.perf_counter()
+        discovery.start()
+        time.sleep(ctx["mdns_seconds"])
+        discovery.stop()
+        responder.stop()
+        complete = [at for at, count in found if count == len(ctx["serials"])]
+        results[name] = {
+            "devices_found": found[-1][1] if found else 0,
+            "discover_ms": round((complete[0] - start) * 1000, 1) if complete else None,
+            "queries_sent": responder.queries,
+            "ptr_questions": responder.questions[TYPE_PTR],
+            "srv_questions": responder.questions[TYPE_SRV],
+            "a_questions": responder.questions[TYPE_A],
+        }
+    return results
+
+
+def compare(old: dict, new: dict, prefix: str = "") -> list:
+    """Lines of 'metric: old -> new (+x%)' for numeric leaves present in both."""
+    lines = []
+    for key, value in new.items():
+        name = f"{prefix}{key}"
+        previous = old.get(key) if isinstance(old, dict) else None
+        if isinstance(value, dict):
+            lines += compare(previous or {}, value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(previous, (int, float)):
+            delta = f" ({(value - previous) / previous * 100:+.1f}%)" if previous else ""
+            lines.append(f"{name}: {previous} -> {value}{delta}")
+    return lines
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the UMC benchmark suite against a fake adb/scrcpy.")
+    parser.add_argument("--devices", type=int, default=DEFAULT_SCENARIO["devices"])
+    parser.add_argument("--network-devices", type=int, default=DEFAULT_SCENARIO["network_devices"])
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_SCENARIO["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_SCENARIO["jitter_ms"])
+    parser.add_argument("--packages", type=int, default=DEFAULT_SCENARIO["packages"])
+    parser.add_argument("--apk-kb", type=int, default=DEFAULT_SCENARIO["apk_kb"])
+    parser.add_argument("--transfer-mb-s", type=float, default=DEFAULT_SCENARIO["transfer_mb_s"])
+    parser.add_argument("--scenario", help="JSON file merged over the options above")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--icons", type=int, default=20)
+    parser.add_argument("--transfer-mb", type=int, default=32)
+    parser.add_argument("--ui-seconds", type=float, default=5.0)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--logcat-seconds", type=float, default=5.0)
+    parser.add_argument("--mdns-seconds", type=float, default=5.0)
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("-o", "--output", default="bench-results.json")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args(argv)
+
+    scenario = dict(DEFAULT_SCENARIO)
+    scenario.update({
+        "devices": args.devices, "network_devices": args.network_devices,
+        "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "packages": args.packages,
+        "apk_kb": args.apk_kb, "transfer_mb_s": args.transfer_mb_s,
+    })
+    if args.scenario:
+        with open(args.scenario) as f:
+            scenario.update(json.load(f))
+
+    selected = args.only.split(",") if args.only else BENCHMARKS
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="umc-bench-") as workdir:
+        prepare_environment(scenario, workdir)
+        ctx = {
+            "scenario": scenario, "workdir": workdir, "serials": device_serials(scenario),
+            "iterations": args.iterations, "icons": args.icons,
+            "transfer_mb": args.transfer_mb, "ui_seconds": args.ui_seconds,
+            "startup_runs": args.startup_runs, "logcat_seconds": args.logcat_seconds,
+            "mdns_seconds": args.mdns_seconds,
+        }
+        results = {}
+        for name in BENCHMARKS:
+            if name not in selected:
+                continue
+            print(f"running {name}...", file=sys.stderr)
+            try:
+                results[name] = globals()[f"bench_{name}"](ctx)
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenario": scenario,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"wrote {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {baseline.get('meta', {}).get('commit') or args.compare}:")
+        for line in compare(baseline.get("results", {}), results):
+            print("  " + line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
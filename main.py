@@ -1,17 +1,34 @@
+import time
+
+# Reference point for the time-to-first-frame measurement
+_STARTED = time.perf_counter()
+
 import sys
+
+# `umc <command>` is the command line interface: dispatch before Qt is imported
+if __name__ == "__main__" and len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    from backend.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 import os
+import json
 import signal
-from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtQml import QQmlApplicationEngine
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QUrl, QMetaObject, Qt
 from backend.bridge import BackendBridge
+from backend.tracing import setup_logging, get_logger
+from backend.icon_provider import IconImageProvider
+from backend import metrics
 
 def main():
-    # Use QApplication instead of QGuiApplication for file dialogs
-    app = QApplication(sys.argv)
+    setup_logging()
+
+    # File pickers are QtQuick dialogs, so the widgets module is never loaded
+    app = QGuiApplication(sys.argv)
     engine = QQmlApplicationEngine()
 
-    # Create the bridge
+    # Create the bridge (models and settings only; devices are started after the first frame)
     bridge = BackendBridge()
     
     # Handle SIGINT (Ctrl+C) for quick shutdown
@@ -25,6 +42,10 @@ def main():
     # Expose bridge to QML context
     engine.rootContext().setContextProperty("bridge", bridge)
 
+    # App icons are served as cached thumbnails: image://icons/<package>
+    icon_provider = IconImageProvider()
+    engine.addImageProvider("icons", icon_provider)
+
     # Load main QML file
     # When installed, UI files are in /usr/share/umc/ui/
     ui_dir = os.path.join(os.path.dirname(__file__), "../share/umc/ui")
@@ -38,6 +59,29 @@ def main():
     if not engine.rootObjects():
         sys.exit(-1)
 
+    # Show the window first, then bring up adb, the worker thread and network services
+    window = engine.rootObjects()[0]
+    first_frame = []
+
+    # frameSwapped comes from the render thread, so hand work back to the GUI thread
+    def on_first_frame():
+        if first_frame:
+            return
+        elapsed = time.perf_counter() - _STARTED
+        first_frame.append(elapsed)
+        # Only the first frame matters; don't get called for every frame after it
+        window.frameSwapped.disconnect(on_first_frame)
+        metrics.STARTUP_FIRST_FRAME_SECONDS.set(elapsed)
+        get_logger("startup").info("First frame after %.0f ms", elapsed * 1000)
+        if os.environ.get("UMC_EXIT_AFTER_FIRST_FRAME"):
+            # Used by the startup benchmark
+            print(json.dumps({"first_frame_ms": round(elapsed * 1000, 1)}), flush=True)
+            QMetaObject.invokeMethod(app, "quit", Qt.QueuedConnection)
+            return
+        QMetaObject.invokeMethod(bridge, "start", Qt.QueuedConnection)
+
+    window.frameSwapped.connect(on_first_frame)
+
     ret = app.exec()
     bridge.cleanup()
     sys.exit(ret)
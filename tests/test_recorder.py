@@ -0,0 +1,29 @@
+import time
+
+from backend.recorder import RecordingSession
+
+
+def session_at(elapsed: float, time_limit: int, segment_seconds: int) -> RecordingSession:
+    session = RecordingSession(None, "SERIAL", "/tmp", time_limit=time_limit, segment_seconds=segment_seconds)
+    session.started_at = time.monotonic() - elapsed
+    return session
+
+
+def test_segments_cover_time_limit_that_is_not_a_multiple():
+    # 650 s in 300 s segments: 300, 300, then the whole seconds left of the last 50
+    assert session_at(0, 650, 300)._next_segment_length() == 300
+    assert session_at(300.2, 650, 300)._next_segment_length() == 300
+    assert session_at(600.4, 650, 300)._next_segment_length() == 49
+    # Without segments one recording runs for what is left
+    assert session_at(0.5, 90, 0)._next_segment_length() == 89
+
+
+def test_no_segment_past_time_limit():
+    # Under a second left must not start another full-length segment
+    assert session_at(649.5, 650, 300)._next_segment_length() == 0
+    assert session_at(651, 650, 300)._next_segment_length() == 0
+
+
+def test_without_time_limit_segments_keep_their_length():
+    assert session_at(10_000, 0, 300)._next_segment_length() == 300
+    assert session_at(0, 0, 0)._next_segment_length() == 0
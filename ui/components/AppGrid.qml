@@ -6,95 +6,9 @@ import ".."
 Item {
     id: root
     
-    property var fullPackageList: bridge ? bridge.packages : []
-    property var filteredList: []
-
-    onFullPackageListChanged: updateFilter()
-
-    // Fuzzy search function - calculates similarity score
-    function fuzzyMatch(query, text) {
-        if (!query || !text) return 0
-        
-        var queryLower = query.toLowerCase()
-        var textLower = text.toLowerCase()
-        
-        // Exact match gets highest score
-        if (textLower === queryLower) return 100
-        if (textLower.indexOf(queryLower) === 0) return 90  // Starts with
-        if (textLower.indexOf(queryLower) !== -1) return 70  // Contains
-        
-        // Fuzzy matching: check if all query characters appear in order
-        var queryIndex = 0
-        var score = 0
-        var consecutiveMatches = 0
-        var maxConsecutive = 0
-        
-        for (var i = 0; i < textLower.length && queryIndex < queryLower.length; i++) {
-            if (textLower[i] === queryLower[queryIndex]) {
-                score += 10
-                consecutiveMatches++
-                maxConsecutive = Math.max(maxConsecutive, consecutiveMatches)
-                queryIndex++
-            } else {
-                consecutiveMatches = 0
-            }
-        }
-        
-        // Bonus for consecutive matches
-        score += maxConsecutive * 5
-        
-        // If all query characters were found, add bonus
-        if (queryIndex === queryLower.length) {
-            score += 20
-        } else {
-            // Penalty for missing characters
-            score -= (queryLower.length - queryIndex) * 15
-        }
-        
-        return Math.max(0, Math.min(100, score))
-    }
-
-    function updateFilter() {
-        var query = searchField.text.trim()
-        if (query === "") {
-            filteredList = fullPackageList
-        } else {
-            var queryLower = query.toLowerCase()
-            var temp = []
-            var scoredApps = []
-            
-            for (var i = 0; i < fullPackageList.length; i++) {
-                var app = fullPackageList[i]
-                var packageName = app.package || app
-                var appName = app.name || app
-                
-                // Calculate match scores for both name and package
-                var nameScore = fuzzyMatch(queryLower, appName)
-                var packageScore = fuzzyMatch(queryLower, packageName)
-                var maxScore = Math.max(nameScore, packageScore)
-                
-                // Only include if score is above threshold
-                if (maxScore > 20) {
-                    scoredApps.push({
-                        app: app,
-                        score: maxScore
-                    })
-                }
-            }
-            
-            // Sort by score (descending)
-            scoredApps.sort(function(a, b) {
-                return b.score - a.score
-            })
-            
-            // Extract apps in sorted order
-            for (var j = 0; j < scoredApps.length; j++) {
-                temp.push(scoredApps[j].app)
-            }
-            
-            filteredList = temp
-        }
-    }
+    // Filtering and ranking happen in the backend (AppFilterModel); the
+    // field only forwards the query, which the model debounces
+    property var appModel: bridge ? bridge.appModel : null
 
     ColumnLayout {
         anchors.fill: parent
@@ -135,7 +49,7 @@ Item {
                         font: Style.bodyFont
                         background: null
                         selectByMouse: true
-                        onTextChanged: root.updateFilter()
+                        onTextChanged: if (root.appModel) root.appModel.query = text
                     }
                     
                     // Clear button
@@ -172,11 +86,16 @@ Item {
             cellHeight: 160
             clip: true
             
-            model: root.filteredList
+            model: root.appModel
             
             delegate: Item {
+                id: appDelegate
                 width: 140
                 height: 160
+
+                required property string packageName
+                required property string label
+                required property string iconPath
                 
                 Rectangle {
                     id: cardBg
@@ -214,8 +133,10 @@ Item {
                                 id: appIconImage
                                 anchors.fill: parent
                                 anchors.margins: 2
-                                property string iconSource: modelData.icon ? "file://" + modelData.icon : ""
+                                // Downscaled thumbnail from the icon provider instead of the full-size PNG
+                                property string iconSource: appDelegate.iconPath ? "image://icons/" + appDelegate.packageName : ""
                                 source: iconSource
+                                sourceSize: Qt.size(56, 56)
                                 fillMode: Image.PreserveAspectFit
                                 visible: iconSource !== "" && status === Image.Ready
                                 smooth: true
@@ -224,29 +145,17 @@ Item {
                                 
                                 // Request icon fetch if not available and item is visible
                                 Component.onCompleted: {
-                                    if (!modelData.icon && bridge) {
+                                    if (!appDelegate.iconPath && bridge) {
                                         // Request icon fetch in background
-                                        bridge.fetch_icon_for_package(modelData.package || modelData)
+                                        bridge.fetch_icon_for_package(appDelegate.packageName)
                                     }
                                 }
                             }
                             
-                            // Listen for icon updates
-                            Connections {
-                                target: bridge
-                                function onIconReady(pkg, iconPath) {
-                                    var currentPackage = modelData.package || modelData
-                                    if (currentPackage === pkg) {
-                                        // Update image source
-                                        appIconImage.iconSource = "file://" + iconPath
-                                    }
-                                }
-                            }
-
                             // Fallback: First letter if no icon
                             Text {
                                 anchors.centerIn: parent
-                                text: (modelData.name || modelData.package || modelData).substring(0, 1).toUpperCase()
+                                text: appDelegate.label.substring(0, 1).toUpperCase()
                                 color: Style.accent
                                 font.bold: true
                                 font.pixelSize: 24
@@ -258,7 +167,7 @@ Item {
                         Text {
                             Layout.fillWidth: true
                             Layout.fillHeight: true
-                            text: modelData.name || modelData.package || modelData
+                            text: appDelegate.label
                             color: Style.textPrimary
                             wrapMode: Text.Wrap
                             horizontalAlignment: Text.AlignHCenter
@@ -274,7 +183,7 @@ Item {
                         anchors.fill: parent
                         hoverEnabled: true
                         cursorShape: Qt.PointingHandCursor
-                        onClicked: bridge.launch_app(modelData.package || modelData)
+                        onClicked: bridge.launch_app(appDelegate.packageName)
                         acceptedButtons: Qt.LeftButton | Qt.RightButton
                         
                         onPressAndHold: {
@@ -298,7 +207,7 @@ Item {
                         MenuItem {
                             text: "Launch on Selected Device"
                             font: Style.bodySmallFont
-                            onTriggered: bridge.launch_app(modelData.package || modelData)
+                            onTriggered: bridge.launch_app(appDelegate.packageName)
                             
                             contentItem: Row {
                                 spacing: 8
@@ -341,7 +250,7 @@ Item {
                                             serials.push(devices[i].serial)
                                         }
                                     }
-                                    bridge.launch_app_on_multiple_devices(modelData.package || modelData, serials)
+                                    bridge.launch_app_on_multiple_devices(appDelegate.packageName, serials)
                                 }
                             }
                             
@@ -371,6 +280,14 @@ Item {
         }
     }
     
+    Text {
+        anchors.centerIn: parent
+        visible: root.appModel !== null && root.appModel.count === 0 && searchField.text.trim() !== "" && bridge.packages.length > 0
+        text: "No apps match \"" + searchField.text.trim() + "\""
+        color: Style.textSecondary
+        font: Style.bodyFont
+    }
+
     // Empty State
     Item {
         anchors.centerIn: parent
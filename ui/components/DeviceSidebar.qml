@@ -1,6 +1,7 @@
 import QtQuick 2.15
 import QtQuick.Controls 2.15
 import QtQuick.Layouts 1.15
+import QtQuick.Dialogs
 import ".."
 
 Rectangle {
@@ -9,6 +10,79 @@ Rectangle {
     height: parent.height
     color: Style.surface
     
+    // One picker for every device card; QtQuick's dialog keeps QtWidgets out of the process
+    FileDialog {
+        id: transferDialog
+        property string targetSerial: ""
+        title: "Select file to transfer"
+        onAccepted: {
+            var filePath = decodeURIComponent(selectedFile.toString().replace("file://", ""))
+            if (bridge && filePath && targetSerial) {
+                if (/\.apk$/i.test(filePath)) installMenu.openFor(targetSerial, [filePath])
+                else bridge.push_file_to_device(targetSerial, filePath)
+            }
+        }
+    }
+    
+    component InstallMenuItem: MenuItem {
+        font: Style.bodySmallFont
+        contentItem: Text {
+            text: parent.text
+            font: parent.font
+            color: parent.highlighted ? Style.accent : Style.textPrimary
+            horizontalAlignment: Text.AlignLeft
+            verticalAlignment: Text.AlignVCenter
+            leftPadding: 12
+        }
+        background: Rectangle {
+            color: parent.highlighted ? Style.surfaceLight : "transparent"
+        }
+    }
+    
+    // APKs dropped on a device card: install them there, on one of its groups or everywhere
+    Menu {
+        id: installMenu
+        property string targetSerial: ""
+        property var paths: []
+        property var groups: []
+        width: 220
+        
+        function openFor(serial, apkPaths) {
+            targetSerial = serial
+            paths = apkPaths
+            groups = bridge ? bridge.get_groups_of_device(serial) : []
+            popup()
+        }
+        
+        background: Rectangle {
+            implicitWidth: 220
+            implicitHeight: 40
+            color: Style.surface
+            border.color: Style.divider
+            radius: 4
+        }
+        
+        InstallMenuItem {
+            text: installMenu.paths.length > 1 ? "Install " + installMenu.paths.length + " APKs here" : "Install on this device"
+            onTriggered: if (bridge) bridge.install_apks([installMenu.targetSerial], installMenu.paths)
+        }
+        
+        Instantiator {
+            model: installMenu.groups
+            delegate: InstallMenuItem {
+                text: "Install on group " + modelData
+                onTriggered: if (bridge) bridge.install_apks_on_group(modelData, installMenu.paths)
+            }
+            onObjectAdded: (index, object) => installMenu.insertItem(index + 1, object)
+            onObjectRemoved: (index, object) => installMenu.removeItem(object)
+        }
+        
+        InstallMenuItem {
+            text: "Install on all devices"
+            onTriggered: if (bridge) bridge.install_apks([], installMenu.paths)
+        }
+    }
+    
     ColumnLayout {
         anchors.fill: parent
         anchors.margins: 0
@@ -108,45 +182,32 @@ Rectangle {
             Layout.fillWidth: true
             Layout.fillHeight: true
             clip: true
-            model: bridge ? bridge.devices : []
+            model: bridge ? bridge.deviceModel : null
             boundsBehavior: Flickable.StopAtBounds
             
             delegate: Rectangle {
                 id: deviceDelegate
                 width: ListView.view.width
-                height: modelData.expanded ? 120 : 50
+                height: deviceDelegate.expanded ? 120 : 50
                 color: {
-                    if (bridge && bridge.currentDeviceSerial === modelData.serial) return Style.surfaceHighlight
+                    if (bridge && bridge.currentDeviceSerial === deviceDelegate.serial) return Style.surfaceHighlight
                     return ma.containsMouse ? Style.surfaceLight : "transparent"
                 }
                 
-                property bool isSelected: bridge && bridge.currentDeviceSerial === modelData.serial
-                property bool expanded: false
-                property var deviceStatus: ({})
-                
-                // Load device status
-                Component.onCompleted: {
-                    try {
-                        if (bridge && modelData.serial) {
-                            var status = bridge.get_device_status(modelData.serial)
-                            if (status) {
-                                deviceStatus = status
-                            }
-                        }
-                    } catch (e) {
-                        // Silently fail - device may not be ready
-                    }
-                }
+                required property string serial
+                required property string deviceModel
+                required property string customName
+                required property var batteryLevel
+                required property string batteryStatus
+                required property var temperature
+                required property var storage
+                required property string networkType
                 
-                // Listen for status updates
-                Connections {
-                    target: bridge
-                    function onDeviceStatusChanged(serial, status) {
-                        if (serial === modelData.serial) {
-                            deviceDelegate.deviceStatus = status
-                        }
-                    }
-                }
+                property bool isSelected: bridge && bridge.currentDeviceSerial === serial
+                property bool expanded: false
+                property bool hasStatus: (batteryLevel !== undefined && batteryLevel !== null)
+                                         || (temperature !== undefined && temperature !== null)
+                                         || networkType !== ""
 
                 MouseArea {
                     id: ma
@@ -154,7 +215,7 @@ Rectangle {
                     hoverEnabled: true
                     cursorShape: Qt.PointingHandCursor
                     onClicked: {
-                        bridge.select_device(modelData.serial)
+                        bridge.select_device(deviceDelegate.serial)
                     }
                     onDoubleClicked: {
                         deviceDelegate.expanded = !deviceDelegate.expanded
@@ -179,7 +240,7 @@ Rectangle {
                         spacing: 2
                         
                         Text {
-                            text: modelData.custom_name || modelData.model
+                            text: deviceDelegate.customName || deviceDelegate.deviceModel
                             color: parent.parent.parent.isSelected ? Style.textPrimary : Style.textSecondary
                             font.family: Style.bodyFont.family
                             font.pixelSize: 12
@@ -188,7 +249,7 @@ Rectangle {
                             Layout.fillWidth: true
                         }
                         Text {
-                            text: modelData.serial
+                            text: deviceDelegate.serial
                             color: Style.textDisabled
                             font.pixelSize: 10
                             elide: Text.ElideRight
@@ -199,11 +260,11 @@ Rectangle {
                         RowLayout {
                             Layout.fillWidth: true
                             spacing: 8
-                            visible: deviceDelegate.deviceStatus && Object.keys(deviceDelegate.deviceStatus).length > 0
+                            visible: deviceDelegate.hasStatus
                             
                             // Battery indicator
                             Item {
-                                visible: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.battery_level !== undefined && deviceDelegate.deviceStatus.battery_level !== null
+                                visible: deviceDelegate.batteryLevel !== undefined && deviceDelegate.batteryLevel !== null
                                 width: 40
                                 height: 12
                                 
@@ -214,10 +275,10 @@ Rectangle {
                                     radius: 2
                                     
                                     Rectangle {
-                                        width: parent.width * Math.min(deviceDelegate.deviceStatus.battery_level || 0, 100) / 100
+                                        width: parent.width * Math.min(deviceDelegate.batteryLevel || 0, 100) / 100
                                         height: parent.height
                                         color: {
-                                            var level = deviceDelegate.deviceStatus.battery_level || 0
+                                            var level = deviceDelegate.batteryLevel || 0
                                             if (level > 50) return "#4CAF50"
                                             if (level > 20) return "#FF9800"
                                             return "#F44336"
@@ -228,7 +289,7 @@ Rectangle {
                                 
                                 Text {
                                     anchors.centerIn: parent
-                                    text: (deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.battery_level !== undefined ? deviceDelegate.deviceStatus.battery_level : 0) + "%"
+                                    text: (deviceDelegate.batteryLevel !== undefined && deviceDelegate.batteryLevel !== null ? deviceDelegate.batteryLevel : 0) + "%"
                                     font.pixelSize: 8
                                     color: Style.textPrimary
                                 }
@@ -236,19 +297,19 @@ Rectangle {
                             
                             // Network type indicator
                             Text {
-                                visible: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.network_type !== undefined && deviceDelegate.deviceStatus.network_type !== ""
-                                text: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.network_type === "wifi" ? "WiFi" : "USB"
+                                visible: deviceDelegate.networkType !== ""
+                                text: deviceDelegate.networkType === "wifi" ? "WiFi" : "USB"
                                 font.pixelSize: 8
                                 color: Style.textSecondary
                             }
                             
                             // Temperature indicator
                             Text {
-                                visible: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.temperature !== undefined && deviceDelegate.deviceStatus.temperature !== null
-                                text: Math.round((deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.temperature) ? deviceDelegate.deviceStatus.temperature : 0) + "°C"
+                                visible: deviceDelegate.temperature !== undefined && deviceDelegate.temperature !== null
+                                text: Math.round(deviceDelegate.temperature ? deviceDelegate.temperature : 0) + "°C"
                                 font.pixelSize: 8
                                 color: {
-                                    var temp = deviceDelegate.deviceStatus.temperature || 0
+                                    var temp = deviceDelegate.temperature || 0
                                     if (temp > 45) return "#F44336"
                                     if (temp > 40) return "#FF9800"
                                     return Style.textSecondary
@@ -336,7 +397,7 @@ Rectangle {
                                 MenuItem {
                                     text: "Mirror (Default)"
                                     font: Style.bodySmallFont
-                                    onTriggered: if(bridge) bridge.mirror_device(modelData.serial)
+                                    onTriggered: if(bridge) bridge.mirror_device(deviceDelegate.serial)
                                     
                                     contentItem: Text {
                                         text: parent.text
@@ -362,7 +423,7 @@ Rectangle {
                                 MenuItem {
                                     text: "New Phone Screen"
                                     font: Style.bodySmallFont
-                                    onTriggered: if(bridge) bridge.open_display(modelData.serial, "Phone")
+                                    onTriggered: if(bridge) bridge.open_display(deviceDelegate.serial, "Phone")
                                     
                                     contentItem: Text {
                                         text: parent.text
@@ -380,7 +441,7 @@ Rectangle {
                                 MenuItem {
                                     text: "New Tablet Screen"
                                     font: Style.bodySmallFont
-                                    onTriggered: if(bridge) bridge.open_display(modelData.serial, "Tablet")
+                                    onTriggered: if(bridge) bridge.open_display(deviceDelegate.serial, "Tablet")
                                     
                                     contentItem: Text {
                                         text: parent.text
@@ -398,7 +459,7 @@ Rectangle {
                                 MenuItem {
                                     text: "New Desktop Screen"
                                     font: Style.bodySmallFont
-                                    onTriggered: if(bridge) bridge.open_display(modelData.serial, "Desktop")
+                                    onTriggered: if(bridge) bridge.open_display(deviceDelegate.serial, "Desktop")
                                     
                                     contentItem: Text {
                                         text: parent.text
@@ -415,6 +476,37 @@ Rectangle {
                             }
                         }
 
+                        // Scrcpy Screen Toggle Button
+                        Rectangle {
+                            width: 24
+                            height: 24
+                            radius: 4
+                            color: scrcpyScreenBtnArea.containsMouse ? Style.background : "transparent"
+                            
+                            Icon {
+                                anchors.centerIn: parent
+                                name: "screen_off"
+                                size: 14
+                                color: scrcpyScreenBtnArea.pressed ? Style.accent : Style.textSecondary
+                            }
+                            
+                            MouseArea {
+                                id: scrcpyScreenBtnArea
+                                anchors.fill: parent
+                                hoverEnabled: true
+                                cursorShape: Qt.PointingHandCursor
+                                onClicked: (mouse) => {
+                                    if (bridge) {
+                                        bridge.toggle_scrcpy_display(deviceDelegate.serial)
+                                        mouse.accepted = true
+                                    }
+                                }
+                                ToolTip.visible: containsMouse
+                                ToolTip.text: "Toggle Screen (Scrcpy)"
+                                ToolTip.delay: 500
+                            }
+                        }
+
                         // Power Button
                         Rectangle {
                             width: 24
@@ -436,7 +528,7 @@ Rectangle {
                                 cursorShape: Qt.PointingHandCursor
                                 onClicked: (mouse) => {
                                     if (bridge) {
-                                        bridge.toggle_screen(modelData.serial)
+                                        bridge.toggle_screen(deviceDelegate.serial)
                                         // Prevent selecting the row when clicking the button
                                         mouse.accepted = true
                                     }
@@ -469,7 +561,7 @@ Rectangle {
                     Item {
                         Layout.fillWidth: true
                         height: 20
-                        visible: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.storage !== undefined && deviceDelegate.deviceStatus.storage !== null
+                        visible: deviceDelegate.storage !== undefined && deviceDelegate.storage !== null
                         
                         Text {
                             anchors.left: parent.left
@@ -481,8 +573,8 @@ Rectangle {
                         Text {
                             anchors.right: parent.right
                             text: {
-                                if (deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.storage) {
-                                    var s = deviceDelegate.deviceStatus.storage
+                                if (deviceDelegate.storage) {
+                                    var s = deviceDelegate.storage
                                     if (s && s.used !== undefined && s.total !== undefined) {
                                         var used = Math.round(s.used / 1024)
                                         var total = Math.round(s.total / 1024)
@@ -499,8 +591,8 @@ Rectangle {
                     // Battery status
                     Text {
                         Layout.fillWidth: true
-                        visible: deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.battery_status !== undefined && deviceDelegate.deviceStatus.battery_status !== ""
-                        text: "Battery: " + (deviceDelegate.deviceStatus && deviceDelegate.deviceStatus.battery_status ? deviceDelegate.deviceStatus.battery_status : "")
+                        visible: deviceDelegate.batteryStatus !== ""
+                        text: "Battery: " + deviceDelegate.batteryStatus
                         font.pixelSize: 10
                         color: Style.textSecondary
                     }
@@ -514,7 +606,7 @@ Rectangle {
                             id: deviceNameField
                             Layout.fillWidth: true
                             placeholderText: "Custom name..."
-                            text: modelData.custom_name || ""
+                            text: deviceDelegate.customName
                             font.pixelSize: 10
                             height: 24
                             
@@ -527,7 +619,7 @@ Rectangle {
                             
                             onAccepted: {
                                 if (bridge) {
-                                    bridge.set_device_name(modelData.serial, text)
+                                    bridge.set_device_name(deviceDelegate.serial, text)
                                 }
                             }
                         }
@@ -552,7 +644,7 @@ Rectangle {
                                 cursorShape: Qt.PointingHandCursor
                                 onClicked: {
                                     if (bridge) {
-                                        bridge.set_device_name(modelData.serial, deviceNameField.text)
+                                        bridge.set_device_name(deviceDelegate.serial, deviceNameField.text)
                                     }
                                 }
                             }
@@ -589,7 +681,7 @@ Rectangle {
                             
                             Component.onCompleted: {
                                 if (bridge) {
-                                    enabled = bridge.get_clipboard_sync(modelData.serial)
+                                    enabled = bridge.get_clipboard_sync(deviceDelegate.serial)
                                 }
                             }
                             
@@ -610,7 +702,7 @@ Rectangle {
                                 onClicked: {
                                     if (bridge) {
                                         var newState = !clipboardToggle.enabled
-                                        bridge.set_clipboard_sync(modelData.serial, newState)
+                                        bridge.set_clipboard_sync(deviceDelegate.serial, newState)
                                         clipboardToggle.enabled = newState
                                     }
                                 }
@@ -634,13 +726,13 @@ Rectangle {
                         Connections {
                             target: bridge
                             function onFileTransferProgress(serial, operation, progress) {
-                                if (serial === modelData.serial) {
+                                if (serial === deviceDelegate.serial) {
                                     parent.transferProgress = progress
                                     parent.currentOperation = operation
                                 }
                             }
                             function onFileTransferComplete(serial, operation, success) {
-                                if (serial === modelData.serial) {
+                                if (serial === deviceDelegate.serial) {
                                     parent.transferProgress = 0
                                     parent.currentOperation = ""
                                 }
@@ -653,14 +745,19 @@ Rectangle {
                             anchors.fill: parent
                             
                             onDropped: function(drop) {
-                                if (drop.hasUrls && bridge && modelData.serial) {
+                                if (drop.hasUrls && bridge && deviceDelegate.serial) {
                                     var urls = drop.urls
+                                    // APKs (a base and its splits) are installed together, anything else is copied
+                                    var apks = []
                                     for (var i = 0; i < urls.length; i++) {
-                                        var filePath = urls[i].toString().replace("file://", "")
-                                        if (filePath && modelData.serial) {
-                                            bridge.push_file_to_device(modelData.serial, filePath)
+                                        var filePath = decodeURIComponent(urls[i].toString().replace("file://", ""))
+                                        if (/\.apk$/i.test(filePath)) {
+                                            apks.push(filePath)
+                                        } else if (filePath) {
+                                            bridge.push_file_to_device(deviceDelegate.serial, filePath)
                                         }
                                     }
+                                    if (apks.length) installMenu.openFor(deviceDelegate.serial, apks)
                                 }
                             }
                             
@@ -741,25 +838,13 @@ Rectangle {
                                 hoverEnabled: true
                                 cursorShape: Qt.PointingHandCursor
                                 onClicked: {
-                                    // Request file selection
-                                    if (bridge) {
-                                        bridge.request_file_selection(modelData.serial)
-                                    }
+                                    transferDialog.targetSerial = deviceDelegate.serial
+                                    transferDialog.open()
                                 }
                             }
                         }
                     }
                     
-                    // File dialog - using native file picker via bridge
-                    Connections {
-                        target: bridge
-                        function onFileSelected(filePath) {
-                            if (filePath && modelData.serial) {
-                                bridge.push_file_to_device(modelData.serial, filePath)
-                            }
-                        }
-                    }
-                    
                     Rectangle {
                         Layout.fillWidth: true
                         height: 1
@@ -799,7 +884,7 @@ Rectangle {
                                 cursorShape: Qt.PointingHandCursor
                                 onClicked: {
                                     if (bridge) {
-                                        bridge.capture_screenshot(modelData.serial)
+                                        bridge.capture_screenshot(deviceDelegate.serial)
                                     }
                                 }
                                 ToolTip.visible: containsMouse
@@ -809,6 +894,70 @@ Rectangle {
                         }
                     }
                     
+                    // Screen recording toggle
+                    RowLayout {
+                        Layout.fillWidth: true
+                        spacing: 8
+                        
+                        property bool recording: false
+                        
+                        Component.onCompleted: {
+                            if (bridge) {
+                                recording = bridge.is_recording(deviceDelegate.serial)
+                            }
+                        }
+                        
+                        Connections {
+                            target: bridge
+                            function onRecordingChanged(serial, recording) {
+                                if (serial === deviceDelegate.serial) {
+                                    parent.recording = recording
+                                }
+                            }
+                        }
+                        
+                        Text {
+                            text: parent.recording ? "Recording..." : "Record:"
+                            font.pixelSize: 10
+                            color: parent.recording ? "#F44336" : Style.textSecondary
+                        }
+                        
+                        Item { Layout.fillWidth: true }
+                        
+                        Rectangle {
+                            width: 24
+                            height: 24
+                            radius: 4
+                            color: recordBtnArea.containsMouse ? Style.background : "transparent"
+                            
+                            Icon {
+                                anchors.centerIn: parent
+                                name: parent.parent.recording ? "stop" : "record"
+                                size: 14
+                                color: parent.parent.recording ? "#F44336" : Style.textSecondary
+                            }
+                            
+                            MouseArea {
+                                id: recordBtnArea
+                                anchors.fill: parent
+                                hoverEnabled: true
+                                cursorShape: Qt.PointingHandCursor
+                                onClicked: {
+                                    if (bridge) {
+                                        if (parent.parent.recording) {
+                                            bridge.stop_recording(deviceDelegate.serial)
+                                        } else {
+                                            bridge.start_recording(deviceDelegate.serial)
+                                        }
+                                    }
+                                }
+                                ToolTip.visible: containsMouse
+                                ToolTip.text: parent.parent.recording ? "Stop Recording" : "Record Screen"
+                                ToolTip.delay: 500
+                            }
+                        }
+                    }
+                    
                     Rectangle {
                         Layout.fillWidth: true
                         height: 1
@@ -875,15 +1024,15 @@ Rectangle {
                                 
                                 onValueChanged: {
                                     volumeText.text = Math.round(value)
-                                    if (bridge && modelData.serial) {
-                                        bridge.set_volume(modelData.serial, "music", Math.round(value))
+                                    if (bridge && deviceDelegate.serial) {
+                                        bridge.set_volume(deviceDelegate.serial, "music", Math.round(value))
                                     }
                                 }
                                 
                                 Component.onCompleted: {
                                     try {
-                                        if (bridge && modelData.serial) {
-                                            var vol = bridge.get_volume(modelData.serial, "music")
+                                        if (bridge && deviceDelegate.serial) {
+                                            var vol = bridge.get_volume(deviceDelegate.serial, "music")
                                             if (vol !== undefined && vol !== null) {
                                                 value = vol
                                             }
@@ -943,15 +1092,15 @@ Rectangle {
                             
                             onValueChanged: {
                                 brightnessText.text = Math.round(value)
-                                if (bridge && modelData.serial) {
-                                    bridge.set_brightness(modelData.serial, Math.round(value))
+                                if (bridge && deviceDelegate.serial) {
+                                    bridge.set_brightness(deviceDelegate.serial, Math.round(value))
                                 }
                             }
                             
                             Component.onCompleted: {
                                 try {
-                                    if (bridge && modelData.serial) {
-                                        var bright = bridge.get_brightness(modelData.serial)
+                                    if (bridge && deviceDelegate.serial) {
+                                        var bright = bridge.get_brightness(deviceDelegate.serial)
                                         if (bright !== undefined && bright !== null) {
                                             value = bright
                                         }
@@ -999,8 +1148,8 @@ Rectangle {
                                 
                                 Component.onCompleted: {
                                     try {
-                                        if (bridge && modelData.serial) {
-                                            var locked = bridge.get_rotation_lock(modelData.serial)
+                                        if (bridge && deviceDelegate.serial) {
+                                            var locked = bridge.get_rotation_lock(deviceDelegate.serial)
                                             if (locked !== undefined && locked !== null) {
                                                 enabled = locked
                                             }
@@ -1025,9 +1174,9 @@ Rectangle {
                                     anchors.fill: parent
                                     cursorShape: Qt.PointingHandCursor
                                     onClicked: {
-                                        if (bridge && modelData.serial) {
+                                        if (bridge && deviceDelegate.serial) {
                                             var newState = !rotationToggle.enabled
-                                            bridge.set_rotation_lock(modelData.serial, newState)
+                                            bridge.set_rotation_lock(deviceDelegate.serial, newState)
                                             rotationToggle.enabled = newState
                                         }
                                     }
@@ -1064,8 +1213,8 @@ Rectangle {
                                 
                                 Component.onCompleted: {
                                     try {
-                                        if (bridge && modelData.serial) {
-                                            var airplane = bridge.get_airplane_mode(modelData.serial)
+                                        if (bridge && deviceDelegate.serial) {
+                                            var airplane = bridge.get_airplane_mode(deviceDelegate.serial)
                                             if (airplane !== undefined && airplane !== null) {
                                                 enabled = airplane
                                             }
@@ -1090,9 +1239,9 @@ Rectangle {
                                     anchors.fill: parent
                                     cursorShape: Qt.PointingHandCursor
                                     onClicked: {
-                                        if (bridge && modelData.serial) {
+                                        if (bridge && deviceDelegate.serial) {
                                             var newState = !airplaneToggle.enabled
-                                            bridge.set_airplane_mode(modelData.serial, newState)
+                                            bridge.set_airplane_mode(deviceDelegate.serial, newState)
                                             airplaneToggle.enabled = newState
                                         }
                                     }
@@ -1129,8 +1278,8 @@ Rectangle {
                                 
                                 Component.onCompleted: {
                                     try {
-                                        if (bridge && modelData.serial) {
-                                            var wifi = bridge.get_wifi_enabled(modelData.serial)
+                                        if (bridge && deviceDelegate.serial) {
+                                            var wifi = bridge.get_wifi_enabled(deviceDelegate.serial)
                                             if (wifi !== undefined && wifi !== null) {
                                                 enabled = wifi
                                             }
@@ -1155,9 +1304,9 @@ Rectangle {
                                     anchors.fill: parent
                                     cursorShape: Qt.PointingHandCursor
                                     onClicked: {
-                                        if (bridge && modelData.serial) {
+                                        if (bridge && deviceDelegate.serial) {
                                             var newState = !wifiToggle.enabled
-                                            bridge.set_wifi_enabled(modelData.serial, newState)
+                                            bridge.set_wifi_enabled(deviceDelegate.serial, newState)
                                             wifiToggle.enabled = newState
                                         }
                                     }
@@ -1194,8 +1343,8 @@ Rectangle {
                                 
                                 Component.onCompleted: {
                                     try {
-                                        if (bridge && modelData.serial) {
-                                            var bluetooth = bridge.get_bluetooth_enabled(modelData.serial)
+                                        if (bridge && deviceDelegate.serial) {
+                                            var bluetooth = bridge.get_bluetooth_enabled(deviceDelegate.serial)
                                             if (bluetooth !== undefined && bluetooth !== null) {
                                                 enabled = bluetooth
                                             }
@@ -1220,9 +1369,9 @@ Rectangle {
                                     anchors.fill: parent
                                     cursorShape: Qt.PointingHandCursor
                                     onClicked: {
-                                        if (bridge && modelData.serial) {
+                                        if (bridge && deviceDelegate.serial) {
                                             var newState = !bluetoothToggle.enabled
-                                            bridge.set_bluetooth_enabled(modelData.serial, newState)
+                                            bridge.set_bluetooth_enabled(deviceDelegate.serial, newState)
                                             bluetoothToggle.enabled = newState
                                         }
                                     }
@@ -1240,6 +1389,146 @@ Rectangle {
             color: Style.divider
         }
 
+        // Wireless devices: mDNS-advertised endpoints and manual host:port entry
+        ColumnLayout {
+            Layout.fillWidth: true
+            Layout.margins: Style.spacingMedium
+            id: nearbySection
+            spacing: 6
+            
+            property var endpointStates: {
+                var states = {}
+                var endpoints = bridge ? bridge.networkDevices : []
+                for (var i = 0; i < endpoints.length; i++) {
+                    states[endpoints[i].address] = endpoints[i].state
+                }
+                return states
+            }
+            
+            RowLayout {
+                Layout.fillWidth: true
+                
+                Text {
+                    text: "NEARBY DEVICES"
+                    font.family: Style.bodySmallFont.family
+                    font.pixelSize: 10
+                    font.weight: Font.DemiBold
+                    color: Style.textSecondary
+                    Layout.fillWidth: true
+                }
+                
+                Text {
+                    text: "Connect All"
+                    visible: bridge && bridge.discoveredDevices.length > 0
+                    font.pixelSize: 10
+                    color: connectAllArea.containsMouse ? Style.accent : Style.textSecondary
+                    
+                    MouseArea {
+                        id: connectAllArea
+                        anchors.fill: parent
+                        hoverEnabled: true
+                        cursorShape: Qt.PointingHandCursor
+                        onClicked: bridge.connect_discovered_devices()
+                    }
+                }
+            }
+            
+            Repeater {
+                model: bridge ? bridge.discoveredDevices : []
+                delegate: RowLayout {
+                    Layout.fillWidth: true
+                    spacing: 8
+                    
+                    property string linkState: nearbySection.endpointStates[modelData.address] || ""
+                    
+                    Rectangle {
+                        width: 6
+                        height: 6
+                        radius: 3
+                        color: linkState === "connected" ? "#4CAF50" : (linkState === "" ? Style.textDisabled : "#FF9800")
+                    }
+                    
+                    Text {
+                        text: modelData.name
+                        font.pixelSize: 10
+                        color: Style.textPrimary
+                        elide: Text.ElideRight
+                        Layout.fillWidth: true
+                    }
+                    
+                    Text {
+                        text: linkState === "" ? "Connect" : modelData.address
+                        font.pixelSize: 10
+                        color: linkState === "" && rowConnectArea.containsMouse ? Style.accent : Style.textSecondary
+                        
+                        MouseArea {
+                            id: rowConnectArea
+                            anchors.fill: parent
+                            hoverEnabled: true
+                            enabled: linkState === ""
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: bridge.add_network_device(modelData.address)
+                        }
+                    }
+                }
+            }
+            
+            RowLayout {
+                Layout.fillWidth: true
+                spacing: 4
+                
+                TextField {
+                    id: addressField
+                    Layout.fillWidth: true
+                    placeholderText: "host[:port]"
+                    font.pixelSize: 10
+                    height: 24
+                    
+                    background: Rectangle {
+                        color: Style.surfaceLight
+                        radius: 2
+                        border.color: addressField.activeFocus ? Style.accent : "transparent"
+                        border.width: 1
+                    }
+                    
+                    onAccepted: {
+                        if (bridge && text) {
+                            bridge.add_network_device(text)
+                            text = ""
+                        }
+                    }
+                }
+                
+                Rectangle {
+                    width: 24
+                    height: 24
+                    radius: 2
+                    color: addArea.containsMouse ? Style.accent : Style.surfaceLight
+                    
+                    Text {
+                        anchors.centerIn: parent
+                        text: "+"
+                        color: addArea.containsMouse ? "white" : Style.textSecondary
+                        font.pixelSize: 12
+                    }
+                    
+                    MouseArea {
+                        id: addArea
+                        anchors.fill: parent
+                        hoverEnabled: true
+                        cursorShape: Qt.PointingHandCursor
+                        onClicked: addressField.accepted()
+                    }
+                }
+            }
+        }
+        
+        Rectangle {
+            Layout.fillWidth: true
+            height: 1
+            color: Style.divider
+        }
+
         // Settings / Launch Mode Area
         ColumnLayout {
             Layout.fillWidth: true
@@ -1286,6 +1575,40 @@ Rectangle {
                 }
             }
             
+            // Window Layout Switcher
+            RowLayout {
+                Layout.fillWidth: true
+                spacing: 0
+                
+                Repeater {
+                    model: bridge ? bridge.windowLayouts : []
+                    delegate: Rectangle {
+                        Layout.fillWidth: true
+                        height: 24
+                        color: (bridge && bridge.windowLayout === modelData) ? Style.accent : Style.surfaceLight
+                        radius: 2
+                        
+                        Text {
+                            anchors.centerIn: parent
+                            text: modelData
+                            color: (bridge && bridge.windowLayout === modelData) ? "white" : Style.textSecondary
+                            font.pixelSize: 10
+                            font.weight: Font.Medium
+                        }
+                        
+                        MouseArea {
+                            anchors.fill: parent
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: if (bridge) bridge.windowLayout = modelData
+                            ToolTip.visible: containsMouse
+                            ToolTip.text: "Window layout for scrcpy sessions"
+                            ToolTip.delay: 500
+                            hoverEnabled: true
+                        }
+                    }
+                }
+            }
+            
             // Checkboxes
             ColumnLayout {
                 spacing: 8
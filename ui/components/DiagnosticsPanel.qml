@@ -0,0 +1,158 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+import ".."
+
+Popup {
+    id: panel
+    width: 640
+    height: 520
+    anchors.centerIn: Overlay.overlay
+    modal: false
+    padding: Style.spacingMedium
+    closePolicy: Popup.CloseOnEscape | Popup.CloseOnPressOutside
+
+    property var diagnostics: ({})
+
+    function refresh() {
+        if (bridge) diagnostics = bridge.get_diagnostics()
+    }
+
+    onOpened: refresh()
+
+    // Only poll while visible
+    Timer {
+        interval: 1000
+        repeat: true
+        running: panel.visible
+        onTriggered: panel.refresh()
+    }
+
+    background: Rectangle {
+        color: Style.surface
+        border.color: Style.divider
+        radius: 4
+    }
+
+    component MetricTable: ColumnLayout {
+        property string title: ""
+        property var rows: []
+        property bool showErrors: false
+        Layout.fillWidth: true
+        spacing: 2
+
+        Text {
+            text: title
+            font.family: Style.bodySmallFont.family
+            font.pixelSize: 10
+            font.weight: Font.DemiBold
+            color: Style.textSecondary
+            Layout.topMargin: 8
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            Text { text: "Name"; font.pixelSize: 9; color: Style.textDisabled; Layout.fillWidth: true }
+            Text { text: "Count"; font.pixelSize: 9; color: Style.textDisabled; Layout.preferredWidth: 50 }
+            Text { text: "p50 ms"; font.pixelSize: 9; color: Style.textDisabled; Layout.preferredWidth: 60 }
+            Text { text: "p95 ms"; font.pixelSize: 9; color: Style.textDisabled; Layout.preferredWidth: 60 }
+            Text { text: "Max ms"; font.pixelSize: 9; color: Style.textDisabled; Layout.preferredWidth: 60 }
+            Text { text: "Errors"; font.pixelSize: 9; color: Style.textDisabled; Layout.preferredWidth: 45; visible: showErrors }
+        }
+
+        Repeater {
+            model: rows
+            delegate: RowLayout {
+                Layout.fillWidth: true
+                Text { text: modelData.label; font.pixelSize: 10; color: Style.textPrimary; elide: Text.ElideRight; Layout.fillWidth: true }
+                Text { text: modelData.count; font.pixelSize: 10; color: Style.textSecondary; Layout.preferredWidth: 50 }
+                Text { text: modelData.p50; font.pixelSize: 10; color: Style.textSecondary; Layout.preferredWidth: 60 }
+                Text {
+                    text: modelData.p95
+                    font.pixelSize: 10
+                    color: modelData.p95 > 1000 ? "#F44336" : (modelData.p95 > 250 ? "#FF9800" : Style.textSecondary)
+                    Layout.preferredWidth: 60
+                }
+                Text { text: modelData.max; font.pixelSize: 10; color: Style.textSecondary; Layout.preferredWidth: 60 }
+                Text {
+                    text: modelData.errors || 0
+                    visible: showErrors
+                    font.pixelSize: 10
+                    color: modelData.errors ? "#F44336" : Style.textSecondary
+                    Layout.preferredWidth: 45
+                }
+            }
+        }
+
+        Text {
+            visible: rows.length === 0
+            text: "No samples yet"
+            font.pixelSize: 10
+            color: Style.textDisabled
+        }
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 8
+
+        RowLayout {
+            Layout.fillWidth: true
+
+            Text {
+                text: "Diagnostics"
+                font: Style.headerFont
+                color: Style.textPrimary
+                Layout.fillWidth: true
+            }
+
+            Text {
+                text: "Worker queue: " + (panel.diagnostics.queueDepth || 0)
+                font.pixelSize: 11
+                color: Style.textSecondary
+            }
+
+            Button {
+                text: "Export"
+                font: Style.bodySmallFont
+                onClicked: {
+                    var path = bridge ? bridge.export_metrics() : ""
+                    exportStatus.text = path ? "Saved to " + path : "Export failed"
+                }
+            }
+        }
+
+        Text {
+            id: exportStatus
+            visible: text !== ""
+            font.pixelSize: 10
+            color: Style.textSecondary
+            elide: Text.ElideMiddle
+            Layout.fillWidth: true
+        }
+
+        Text {
+            visible: panel.diagnostics.enabled === false
+            text: "Metrics are disabled (UMC_METRICS=0)"
+            font.pixelSize: 10
+            color: Style.textSecondary
+        }
+
+        ScrollView {
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+
+            ColumnLayout {
+                width: panel.availableWidth
+                spacing: 4
+
+                MetricTable { title: "ADB COMMANDS"; rows: panel.diagnostics.adbCommands || []; showErrors: true }
+                MetricTable { title: "WORKER TASKS"; rows: panel.diagnostics.workerTasks || [] }
+                MetricTable { title: "WORKER QUEUE WAIT"; rows: panel.diagnostics.workerWait || [] }
+                MetricTable { title: "SCRCPY FIRST FRAME"; rows: panel.diagnostics.scrcpyFirstFrame || [] }
+                MetricTable { title: "SIGNAL TO RENDER"; rows: panel.diagnostics.renderLatency || [] }
+            }
+        }
+    }
+}
@@ -0,0 +1,178 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+import ".."
+
+Popup {
+    id: panel
+    width: 600
+    height: 520
+    anchors.centerIn: Overlay.overlay
+    modal: false
+    padding: Style.spacingMedium
+    closePolicy: Popup.CloseOnEscape | Popup.CloseOnPressOutside
+
+    property var results: []
+
+    function refresh() {
+        if (bridge) results = bridge.search_all_apps(searchField.text)
+    }
+
+    onOpened: {
+        searchField.forceActiveFocus()
+        refresh()
+    }
+
+    Timer {
+        id: searchDebounce
+        interval: 60
+        onTriggered: panel.refresh()
+    }
+
+    // Catalogs arrive per device in the background; re-run the query while open
+    Connections {
+        target: bridge
+        enabled: panel.visible
+        function onAppIndexChanged() { searchDebounce.restart() }
+    }
+
+    background: Rectangle {
+        color: Style.surface
+        border.color: Style.divider
+        radius: 4
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 8
+
+        RowLayout {
+            Layout.fillWidth: true
+
+            Text {
+                text: "Find App on All Devices"
+                font: Style.headerFont
+                color: Style.textPrimary
+                Layout.fillWidth: true
+            }
+
+            Button {
+                text: "Rescan"
+                font: Style.bodySmallFont
+                onClicked: if (bridge) bridge.refresh_app_index()
+            }
+        }
+
+        TextField {
+            id: searchField
+            Layout.fillWidth: true
+            placeholderText: "App name or package..."
+            color: Style.textPrimary
+            font: Style.bodyFont
+            selectByMouse: true
+            onTextChanged: searchDebounce.restart()
+        }
+
+        ListView {
+            id: resultList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            spacing: 6
+            model: panel.results
+
+            delegate: ColumnLayout {
+                id: resultDelegate
+                width: resultList.width
+                spacing: 4
+
+                property var app: modelData
+
+                RowLayout {
+                    Layout.fillWidth: true
+
+                    ColumnLayout {
+                        Layout.fillWidth: true
+                        spacing: 0
+
+                        Text {
+                            text: resultDelegate.app.label
+                            font: Style.bodyFont
+                            color: Style.textPrimary
+                            elide: Text.ElideRight
+                            Layout.fillWidth: true
+                        }
+
+                        Text {
+                            text: resultDelegate.app.package
+                            font.pixelSize: 10
+                            color: Style.textSecondary
+                            elide: Text.ElideMiddle
+                            Layout.fillWidth: true
+                        }
+                    }
+
+                    Text {
+                        visible: resultDelegate.app.versions.length > 1
+                        text: resultDelegate.app.versions.length + " versions"
+                        font.pixelSize: 10
+                        color: "#FF9800"
+                    }
+
+                    Button {
+                        visible: resultDelegate.app.launchable && resultDelegate.app.devices.length > 1
+                        text: "Launch on all"
+                        font: Style.bodySmallFont
+                        onClicked: {
+                            var serials = []
+                            for (var i = 0; i < resultDelegate.app.devices.length; i++)
+                                serials.push(resultDelegate.app.devices[i].serial)
+                            bridge.launch_app_on_multiple_devices(resultDelegate.app.package, serials)
+                        }
+                    }
+                }
+
+                // One chip per device that has the app; clicking launches it there
+                Flow {
+                    Layout.fillWidth: true
+                    spacing: 4
+
+                    Repeater {
+                        model: resultDelegate.app.devices
+
+                        delegate: Rectangle {
+                            height: 22
+                            width: chipText.implicitWidth + 16
+                            radius: 11
+                            color: chipArea.containsMouse && resultDelegate.app.launchable ? Style.surfaceHighlight : Style.surfaceLight
+
+                            Text {
+                                id: chipText
+                                anchors.centerIn: parent
+                                text: modelData.name + (modelData.version ? "  v" + modelData.version : "")
+                                font.pixelSize: 10
+                                color: Style.textPrimary
+                            }
+
+                            MouseArea {
+                                id: chipArea
+                                anchors.fill: parent
+                                hoverEnabled: true
+                                enabled: resultDelegate.app.launchable
+                                cursorShape: Qt.PointingHandCursor
+                                onClicked: bridge.launch_app_on_device(modelData.serial, resultDelegate.app.package)
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        Text {
+            visible: panel.results.length === 0
+            text: searchField.text ? "No device has a matching app" : "No app catalogs yet"
+            font.pixelSize: 11
+            color: Style.textSecondary
+        }
+    }
+}
@@ -359,6 +359,18 @@ Item {
                 ctx.lineTo(cx + 6, cy);
                 ctx.stroke();
             }
+            else if (root.name === "record") {
+                // Outlined dot
+                ctx.beginPath();
+                ctx.arc(cx, cy, w/2 - p, 0, Math.PI * 2);
+                ctx.stroke();
+                ctx.beginPath();
+                ctx.arc(cx, cy, w/2 - p - 3, 0, Math.PI * 2);
+                ctx.fill();
+            }
+            else if (root.name === "stop") {
+                ctx.fillRect(p + 1, p + 1, w - 2*p - 2, h - 2*p - 2);
+            }
             else {
                 // Down arrow (chevron)
                 ctx.beginPath();
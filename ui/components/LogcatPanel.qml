@@ -0,0 +1,282 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+import ".."
+
+Popup {
+    id: panel
+    width: 900
+    height: 600
+    anchors.centerIn: Overlay.overlay
+    modal: false
+    padding: Style.spacingMedium
+    closePolicy: Popup.CloseOnEscape
+
+    property string serial: bridge ? bridge.currentDeviceSerial : ""
+    property bool running: false
+    // Stick to the newest line until the user scrolls up
+    property bool follow: true
+    // Launched app windows on the device; appSession is the scrcpy PID of the one shown, 0 = whole device
+    property var appLogs: []
+    property int appSession: 0
+    property var appLog: {
+        for (var i = 0; i < appLogs.length; i++) {
+            if (appLogs[i].pid === appSession) return appLogs[i]
+        }
+        return null
+    }
+
+    function refresh() {
+        running = bridge && serial ? bridge.is_logcat_running(serial) : false
+        refreshAppLogs()
+        if (!bridge) return
+        if (appLog) bridge.show_app_log(appSession)
+        else bridge.show_logcat(serial)
+    }
+
+    function refreshAppLogs() {
+        appLogs = bridge && serial ? bridge.get_app_logs(serial) : []
+        if (appSession && !appLog) appSession = 0
+    }
+
+    function sourceLabel(entry) {
+        var label = entry.package + (entry.appPid ? " (" + entry.appPid + ")" : "")
+        if (entry.crashes.length) label += " - " + entry.crashes.length + " crash(es)"
+        if (!entry.running) label += " - closed"
+        return label
+    }
+
+    function start() {
+        if (!bridge || !serial) return
+        bridge.start_logcat(serial, filterField.text, priorityBox.currentText,
+                            parseInt(pidField.text) || 0, spillBox.checked)
+        follow = true
+    }
+
+    onOpened: refresh()
+    onSerialChanged: {
+        appSession = 0
+        if (visible) refresh()
+    }
+    // Detached while hidden so the view stops polling; the stream keeps running
+    onClosed: if (bridge) bridge.show_logcat("")
+
+    Connections {
+        target: bridge
+        function onLogcatChanged(serial, running) {
+            if (serial === panel.serial) panel.running = running
+        }
+        function onAppLogsChanged() {
+            if (panel.visible) panel.refreshAppLogs()
+        }
+    }
+
+    background: Rectangle {
+        color: Style.surface
+        border.color: Style.divider
+        radius: 4
+    }
+
+    function levelColor(level) {
+        switch (level) {
+        case "F":
+        case "E": return Style.error
+        case "W": return Style.warning
+        case "I": return Style.textPrimary
+        default: return Style.textSecondary
+        }
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 8
+
+        RowLayout {
+            Layout.fillWidth: true
+
+            Text {
+                text: "Logcat"
+                font: Style.headerFont
+                color: Style.textPrimary
+            }
+
+            Text {
+                readonly property bool live: panel.appLog ? panel.appLog.running : panel.running
+                text: !panel.serial ? "Select a device"
+                      : panel.appLog ? panel.serial + " - " + panel.appLog.package + (live ? "" : " (window closed)")
+                      : panel.serial + (live ? " - streaming" : "")
+                font: Style.bodySmallFont
+                color: live ? Style.success : Style.textSecondary
+                elide: Text.ElideRight
+                Layout.fillWidth: true
+            }
+
+            Text {
+                text: bridge ? bridge.logcatModel.count + " lines" : ""
+                font.pixelSize: 11
+                color: Style.textSecondary
+            }
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 6
+
+            ComboBox {
+                id: sourceBox
+                Layout.preferredWidth: 260
+                font: Style.bodySmallFont
+                model: ["Whole device"].concat(panel.appLogs.map(panel.sourceLabel))
+                currentIndex: {
+                    for (var i = 0; i < panel.appLogs.length; i++) {
+                        if (panel.appLogs[i].pid === panel.appSession) return i + 1
+                    }
+                    return 0
+                }
+                onActivated: (index) => {
+                    panel.appSession = index > 0 ? panel.appLogs[index - 1].pid : 0
+                    panel.follow = true
+                    panel.refresh()
+                }
+                ToolTip.visible: hovered
+                ToolTip.text: "Apps launched in a window log only their own process"
+                ToolTip.delay: 500
+            }
+
+            TextField {
+                id: filterField
+                visible: panel.appSession === 0
+                Layout.fillWidth: true
+                placeholderText: "Filter specs, e.g. ActivityManager:I MyApp:V"
+                color: Style.textPrimary
+                font: Style.bodySmallFont
+                selectByMouse: true
+                onAccepted: panel.start()
+            }
+
+            ComboBox {
+                id: priorityBox
+                visible: panel.appSession === 0
+                model: ["V", "D", "I", "W", "E", "F"]
+                font: Style.bodySmallFont
+                implicitWidth: 60
+                ToolTip.visible: hovered
+                ToolTip.text: "Minimum level for other tags"
+                ToolTip.delay: 500
+            }
+
+            TextField {
+                id: pidField
+                visible: panel.appSession === 0
+                implicitWidth: 80
+                placeholderText: "PID"
+                color: Style.textPrimary
+                font: Style.bodySmallFont
+                validator: IntValidator { bottom: 0 }
+                selectByMouse: true
+                onAccepted: panel.start()
+            }
+
+            CheckBox {
+                id: spillBox
+                visible: panel.appSession === 0
+                text: "Save to disk"
+                font: Style.bodySmallFont
+            }
+
+            Text {
+                visible: panel.appLog !== null
+                text: panel.appLog ? panel.appLog.logPath : ""
+                font.pixelSize: 10
+                color: Style.textSecondary
+                elide: Text.ElideMiddle
+                Layout.fillWidth: true
+            }
+
+            Button {
+                visible: panel.appSession === 0
+                text: panel.running ? "Restart" : "Start"
+                font: Style.bodySmallFont
+                enabled: panel.serial !== ""
+                onClicked: panel.start()
+            }
+
+            Button {
+                visible: panel.appSession === 0
+                text: "Stop"
+                font: Style.bodySmallFont
+                enabled: panel.running
+                onClicked: if (bridge) bridge.stop_logcat(panel.serial)
+            }
+
+            Button {
+                text: "Clear"
+                font: Style.bodySmallFont
+                onClicked: if (bridge) bridge.clear_logcat()
+            }
+        }
+
+        Text {
+            readonly property var crash: panel.appLog && panel.appLog.crashes.length
+                                         ? panel.appLog.crashes[panel.appLog.crashes.length - 1] : null
+            visible: crash !== null
+            text: crash ? crash.kind.toUpperCase() + " in process " + crash.pid + ": " + crash.summary : ""
+            font.pixelSize: 11
+            color: Style.error
+            elide: Text.ElideRight
+            Layout.fillWidth: true
+        }
+
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            color: Style.background
+            border.color: Style.divider
+
+            ListView {
+                id: logView
+                anchors.fill: parent
+                anchors.margins: 1
+                clip: true
+                model: bridge ? bridge.logcatModel : null
+                // Delegates are recycled while scrolling through long logs
+                reuseItems: true
+                boundsBehavior: Flickable.StopAtBounds
+                ScrollBar.vertical: ScrollBar {}
+
+                onCountChanged: if (panel.follow) positionViewAtEnd()
+                onMovementEnded: panel.follow = atYEnd
+
+                delegate: Row {
+                    width: ListView.view.width
+                    height: 16
+                    spacing: 8
+                    leftPadding: 4
+
+                    Text { text: model.time; width: 86; font.family: "monospace"; font.pixelSize: 11; color: Style.textDisabled }
+                    Text { text: model.pid; width: 44; font.family: "monospace"; font.pixelSize: 11; color: Style.textDisabled; horizontalAlignment: Text.AlignRight }
+                    Text { text: model.level; width: 10; font.family: "monospace"; font.pixelSize: 11; font.bold: true; color: panel.levelColor(model.level) }
+                    Text { text: model.tag; width: 140; font.family: "monospace"; font.pixelSize: 11; color: Style.accentSecondary; elide: Text.ElideRight }
+                    Text {
+                        text: model.message
+                        width: parent.width - 320
+                        font.family: "monospace"
+                        font.pixelSize: 11
+                        color: panel.levelColor(model.level)
+                        elide: Text.ElideRight
+                        textFormat: Text.PlainText
+                    }
+                }
+            }
+
+            Text {
+                anchors.centerIn: parent
+                visible: logView.count === 0
+                text: panel.appLog ? (panel.appLog.appPid ? "Waiting for log lines..." : "Waiting for the app process...")
+                      : (panel.running ? "Waiting for log lines..." : "Press Start to stream the device log")
+                font: Style.bodySmallFont
+                color: Style.textDisabled
+            }
+        }
+    }
+}
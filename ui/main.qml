@@ -11,6 +11,35 @@ ApplicationWindow {
     height: 850
     title: "Unified Mobile Controller"
     color: Style.background
+    
+    property bool renderPending: false
+    
+    // Rarely used panels are compiled and created the first time they are opened
+    function openPanel(loader) {
+        if (loader.item) loader.item.open()
+        else loader.active = true
+    }
+
+    Loader {
+        id: diagnosticsLoader
+        active: false
+        source: "components/DiagnosticsPanel.qml"
+        onLoaded: item.open()
+    }
+
+    Loader {
+        id: appSearchLoader
+        active: false
+        source: "components/GlobalAppSearch.qml"
+        onLoaded: item.open()
+    }
+
+    Loader {
+        id: logcatLoader
+        active: false
+        source: "components/LogcatPanel.qml"
+        onLoaded: item.open()
+    }
 
     RowLayout {
         anchors.fill: parent
@@ -46,6 +75,48 @@ ApplicationWindow {
                     
                     Item { Layout.fillWidth: true } // Spacer
                     
+                    Text {
+                        text: "Find App"
+                        font: Style.bodySmallFont
+                        color: findAppArea.containsMouse ? Style.accent : Style.textSecondary
+                        
+                        MouseArea {
+                            id: findAppArea
+                            anchors.fill: parent
+                            hoverEnabled: true
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: window.openPanel(appSearchLoader)
+                        }
+                    }
+                    
+                    Text {
+                        text: "Logcat"
+                        font: Style.bodySmallFont
+                        color: logcatArea.containsMouse ? Style.accent : Style.textSecondary
+                        
+                        MouseArea {
+                            id: logcatArea
+                            anchors.fill: parent
+                            hoverEnabled: true
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: window.openPanel(logcatLoader)
+                        }
+                    }
+                    
+                    Text {
+                        text: "Diagnostics"
+                        font: Style.bodySmallFont
+                        color: diagnosticsArea.containsMouse ? Style.accent : Style.textSecondary
+                        
+                        MouseArea {
+                            id: diagnosticsArea
+                            anchors.fill: parent
+                            hoverEnabled: true
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: window.openPanel(diagnosticsLoader)
+                        }
+                    }
+                    
                     // Status Badge
                     Rectangle {
                         visible: statusText.text !== ""
@@ -91,6 +162,25 @@ ApplicationWindow {
                 }
             }
             
+            // Signal-to-render latency: report the first frame after a tracked update
+            Connections {
+                target: bridge
+                function onDevicesChanged() { window.renderPending = true }
+                function onDeviceStatusChanged() { window.renderPending = true }
+                function onPackagesChanged() { window.renderPending = true }
+                function onIconReady() { window.renderPending = true }
+            }
+            
+            Connections {
+                target: window
+                function onFrameSwapped() {
+                    if (window.renderPending && bridge) {
+                        window.renderPending = false
+                        bridge.report_frame()
+                    }
+                }
+            }
+            
             Timer {
                 id: statusTimer
                 interval: 3000